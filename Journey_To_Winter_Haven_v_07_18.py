@@ -24,7 +24,7 @@ from titles import (
 from combat_log import COMBAT_LOG, log, log_attack, log_dot, log_battle_summary, reset_battle_stats, reset_run_stats, show_run_score, view_combat_log, get_run_stats
 from gold import calculate_gold_reward, display_gold_earned, award_pending_gold, bookie_encounter, display_run_score, award_gold
 from score import record_fight_score
-from leaderboard import display_at_end_of_run, show_leaderboard, show_global_leaderboard
+from leaderboard import display_at_end_of_run, show_leaderboard, show_global_leaderboard, resume_pending_submissions
 
 # Shared constants, utilities and base classes (version-independent)
 from shared import (
@@ -105,7 +105,7 @@ def handle_monster_select_shortcut(raw, *, warrior=None, in_combat=False):
     if raw != "__MONSTER_SELECT__":
         return False, raw
 
-    monster = monster_select_menu()
+    monster = monster_select_menu(warrior if warrior else GAME_WARRIOR)
 
     if not monster:
         return True, None
@@ -396,6 +396,14 @@ _story_module._real_input       = _real_input
 # being silently swallowed (the _try_dev_shortcut docstring always claimed
 # this worked; now it actually does).
 import shared as _shared_module
+# v0.7.21: session snapshots — scene boundaries + resume (see snapshot.py),
+# the player save file + autosave (see savegame.py), --profile turn spans
+# (see spans.py) and run recording / replay (see replay.py)
+import snapshot as _snapshot
+import savegame as _savegame
+import spans as _spans
+import replay as _replay
+import auto_resolve as _auto_resolve
 _shared_module._dev_shortcut_hook = _try_dev_shortcut
 _story_module.arena_battle        = lambda warrior, rounds_to_win=5: arena_battle(warrior, rounds_to_win)
 _story_module.prompt_play_again   = lambda: prompt_play_again()   # v0.7.11: fix NoneType crash at end of run
@@ -940,11 +948,15 @@ from monsters import *  # noqa: F401,F403  -- pull in 18 monster classes + moves
 
 
 
-def arena_battle(warrior, rounds_to_win=5):
+def arena_battle(warrior, rounds_to_win=5, start_round=1, from_quarters=False):
     """
     Tournament:
     - Fight `rounds_to_win` random monsters in a row.
     - Lose or run once → run ends.
+
+    v0.7.21: `start_round` / `from_quarters` let a restored session (see
+    snapshot.py) pick the tournament back up at the round it was on, or
+    inside the round 4-5 quarters interlude, instead of from round 1.
     """
 
     # -------------------------------
@@ -966,10 +978,19 @@ def arena_battle(warrior, rounds_to_win=5):
             WIDTH
         ))
 
-        defeated_names = []
+        defeated_names = list(_snapshot.SESSION.get("defeated_names", [])) if start_round > 1 else []
         champion = False
 
-        for round_num in range(1, rounds_to_win + 1):
+        if from_quarters and warrior.is_alive():
+            arena_quarters_interlude(warrior)
+            clear_screen()
+
+        for round_num in range(start_round, rounds_to_win + 1):
+            # v0.7.21: scene boundary — a disconnect from here on resumes
+            # at the start of this round (see snapshot.py).
+            _snapshot.mark_scene("arena_round", warrior, round_num=round_num,
+                                 rounds_to_win=rounds_to_win,
+                                 defeated_names=list(defeated_names))
             print(f"\n--- Round {round_num} ---")
 
             if round_num == rounds_to_win:
@@ -1121,6 +1142,10 @@ def arena_battle(warrior, rounds_to_win=5):
 
             # 5) After penultimate round, send player to quarters (NO break)
             if round_num == rounds_to_win - 1 and warrior.is_alive():
+                # v0.7.21: fresh interlude — clear any stock left in SESSION
+                _snapshot.mark_scene("arena_quarters", warrior, round_num=round_num + 1,
+                                     defeated_names=list(defeated_names),
+                                     merchant_stock=None, crafter_stock=None)
                 arena_quarters_interlude(warrior)
                 clear_screen()
 
@@ -1331,19 +1356,91 @@ def main_menu():
             input("   Press Enter to try again...")
 
 
-if __name__ == "__main__":
+def resume_run(path=None):
+    """
+    v0.7.21: pick a run back up from a session snapshot (see snapshot.py).
+    The snapshot's scene position decides where play resumes — the start
+    of the arena round it was on, or the round 4-5 quarters interlude with
+    the same merchant/crafter stock. Used on reconnect by the hosted build
+    and when a session is moved to another worker, and by --continue to
+    load the player's autosave (`path` may be either kind of file).
+    """
+    path = path or _snapshot.SNAPSHOT_FILE
+    if _savegame.is_save_file(path):
+        # v0.7.21: a player save (savegame.py) — same scene dispatch.
+        warrior = _savegame.load_game(path)
+        if warrior is None:
+            print(wrap("No run in progress in that save — starting from the main menu."))
+            return False
+    else:
+        warrior = _snapshot.restore_snapshot(_snapshot.load_snapshot(path))
+    session = _snapshot.SESSION
+
+    if session["scene"] == "arena_round":
+        print(wrap(f"🔄 Resuming {warrior.name}'s run at round {session['round_num']}..."))
+        arena_battle(warrior, session["rounds_to_win"], start_round=session["round_num"])
+    elif session["scene"] == "arena_quarters":
+        print(wrap(f"🔄 Resuming {warrior.name}'s run in the arena quarters..."))
+        arena_battle(warrior, session["rounds_to_win"], start_round=session["round_num"],
+                     from_quarters=True)
+    elif session["scene"] == "post_prologue":
+        print(wrap(f"🔄 Resuming {warrior.name}'s journey after the prologue..."))
+        intro_story(warrior, after_prologue=True)
+    elif session["scene"] == "finale":
+        print(wrap(f"🔄 Resuming {warrior.name}'s run at the final battle..."))
+        if session.get("path") == "evil":
+            _combat_module.patronus_fight(warrior)
+        else:
+            _combat_module.chimera_fight(warrior)
+    else:
+        print(wrap("Nothing to resume in that snapshot — starting from the main menu."))
+        return False
+    return True
+
+
+def offer_warm_start():
+    """
+    v0.7.21: on "play again", offer to skip the opening story and start
+    from the previous run's post-prologue checkpoint (see snapshot.py) —
+    same hero and prologue choices, the difficulty just picked, fresh
+    rolls. Returns the restored warrior, or None to play the opening.
+    """
+    if _snapshot.checkpoint("post_prologue") is None:
+        return None
+    while True:
+        choice = input("Skip the prologue and start where it ended last time? (y/n): ").strip().lower()
+        if choice in ("y", "yes"):
+            return _snapshot.warm_start("post_prologue")
+        if choice in ("n", "no"):
+            return None
+        print("Please enter y or n.")
+
+
+def play(resume_path=None):
+    """
+    The whole game, from the main menu (or a resumed run) to the ending.
+    v0.7.21: moved out of the __main__ block so replay.py can drive the
+    exact same loop when re-executing a recorded run.
+    """
+    global GAME_WARRIOR
     # Outer loop wraps the entire game so "play again" can fully restart
     # without relying on os.execv (which fails silently in some environments).
     # Each iteration represents one full playthrough from main menu to ending.
     while True:
         try:
+            if resume_path:
+                _path, resume_path = resume_path, None
+                if resume_run(_path):
+                    break
             main_menu()
-            GAME_WARRIOR = Warrior()
-            GAME_WARRIOR.difficulty = DIFFICULTY
-            import story as _s; _s._set_gw(GAME_WARRIOR)
+            _snapshot.reset_session()
             COMBAT_LOG.clear()
             reset_run_stats()
-            intro_story(GAME_WARRIOR)
+            warm = offer_warm_start()
+            GAME_WARRIOR = warm or Warrior()
+            GAME_WARRIOR.difficulty = DIFFICULTY
+            import story as _s; _s._set_gw(GAME_WARRIOR)
+            intro_story(GAME_WARRIOR, after_prologue=warm is not None)
             # If the run completes without raising PlayAgainException, the
             # endpoint already called sys.exit(0). Break defensively just in
             # case any endpoint returns normally.
@@ -1353,6 +1450,47 @@ if __name__ == "__main__":
             # to the top — global state will be re-initialised by the
             # statements at the head of the loop.
             continue
+        except (EOFError, KeyboardInterrupt):
+            # v0.7.21: the input stream went away (dropped hosted connection
+            # or Ctrl+C). Keep the last clean scene boundary so the run can
+            # come back with --resume instead of being lost.
+            if _snapshot.write_last_boundary():
+                print(f"\n💾 Session saved — resume with --resume {_snapshot.SNAPSHOT_FILE}")
+            _savegame.flush()
+            raise
+
+
+if __name__ == "__main__":
+    import argparse
+    _parser = argparse.ArgumentParser(description="Journey to Winter Haven")
+    _parser.add_argument("--resume", nargs="?", const=_snapshot.SNAPSHOT_FILE, default=None,
+                         metavar="SNAPSHOT",
+                         help="resume a run from a session snapshot (default: session.snap)")
+    _parser.add_argument("--continue", dest="continue_run", action="store_true",
+                         help="continue the last autosaved run (winter_haven.sav)")
+    _parser.add_argument("--profile", nargs="?", const=_spans.TRACE_FILE, default=None,
+                         metavar="TRACE",
+                         help="record turn timings; writes a Chrome/Perfetto trace at exit")
+    _parser.add_argument("--record", default=_replay.LAST_RUN_FILE, metavar="REC",
+                         help="where to record this session for replay.py (default: last_run.rec)")
+    _parser.add_argument("--auto-resolve", nargs="?", type=float, const=_auto_resolve.DEFAULT_MIN_WIN,
+                         default=None, metavar="MIN_WIN",
+                         help="offer to auto-resolve fights you win at least this often (default 0.95)")
+    _args = _parser.parse_args()
+    if _args.profile:
+        # v0.7.21: per-turn spans — trace + percentiles written at exit
+        _spans.start_profile(_args.profile, label=os.path.splitext(os.path.basename(__file__))[0])
+    # v0.7.21: opt-in auto-resolve for near-certain fights (auto_resolve.py)
+    _auto_resolve.THRESHOLD[0] = _args.auto_resolve
+    _resume_path = _args.resume or (_savegame.SAVE_FILE if _args.continue_run else None)
+    # v0.7.21: every session is recorded (seed + inputs) so a bug report
+    # can ship last_run.rec and be replayed exactly
+    _replay.start_recording(_args.record, resume_path=_resume_path)
+    _savegame.enable_autosave()
+    # v0.7.21: retry global scores a previous session couldn't deliver
+    resume_pending_submissions()
+
+    play(_resume_path)
     
 
 
@@ -0,0 +1,127 @@
+"""
+auto_resolve.py — Skip the screens on a fight that's already won
+----------------------------------------------------------------
+Late in a run a geared hero still clicks through every Green Slime. With
+auto-resolve on (--auto-resolve [MIN_WIN]), battle_inner offers — once the
+fight is set up, before anyone swings — to play it out headless when the
+hero's cached win odds (win_odds.estimate, taken before the set-up) are at
+least MIN_WIN:
+
+    1) Fight it yourself
+    2) Auto-resolve — basic attacks      (fight_sim policy "attack")
+    3) Auto-resolve — best attack        (fight_sim policy "best")
+
+resolve() runs fight_sim on the real hero and enemy with the run's own
+dice, so HP, AP and statuses simply end up where the fight left them. It
+then settles the outcome the way battle_inner's death blocks do: gold,
+essence, fight score, loot (straight into the bag), XP, the battle summary,
+the rest phase and the payout. What you see is one compact result line plus
+the fight's combat-log lines. A fight that's still going after
+fight_sim.MAX_TURNS is handed back to you mid-fight.
+
+Off by default. The setting rides along in replay recordings so a recorded
+run replays with the same prompts.
+"""
+
+THRESHOLD = [None]          # min win chance to offer it; None = feature off
+DEFAULT_MIN_WIN = 0.95
+_CHOICES = {"2": "attack", "3": "best"}
+
+
+def enabled():
+    return THRESHOLD[0] is not None
+
+
+def odds(warrior, enemy):
+    """The win_odds estimate offer() goes by, or None. Take it before
+    battle_inner's battle-start setup (Charismatic Speaker, Flayed One's
+    opening debuff): fight_sim applies that setup itself, and estimating
+    after it would count it twice."""
+    import fight_sim
+    import win_odds
+    if not enabled() or not fight_sim.supported(enemy):
+        return None
+    return win_odds.estimate(warrior, enemy)
+
+
+def offer(est):
+    """The fight_sim policy the player picked, or None to fight it out.
+    `est` is odds() from before the fight was set up."""
+    if not enabled() or est is None or est["win"] < THRESHOLD[0]:
+        return None
+    print(f"\n⚡ This one looks decided ({est['win']:.0%} to win, ~{max(1, round(est['turns']))} turns).")
+    print("1) Fight it yourself")
+    print("2) Auto-resolve — basic attacks")
+    print("3) Auto-resolve — best attack")
+    return _CHOICES.get(input("> ").strip())
+
+
+def _summary(warrior, enemy, won, turn_count, hp_before, loot):
+    outcome = f"Victory over {enemy.display_name}" if won else f"Defeated by {enemy.display_name}"
+    line = (f"⚡ AUTO-RESOLVED — {outcome} ({turn_count} turns)"
+            f"  ·  HP {hp_before} → {warrior.hp}/{warrior.max_hp}  ·  AP {warrior.ap}")
+    if loot is not None:
+        line += f"  ·  loot: {loot.name}"
+    return line
+
+
+def resolve(warrior, enemy, policy, round_num=0, skip_rest=False):
+    """
+    Play the rest of this fight headless and settle it. Returns battle_inner's
+    result (True won / False lost), or None if it stalled and the player
+    should take over.
+    """
+    import combat
+    import combat_log
+    import fight_sim
+    from ui import animate_xp_results
+
+    mark = len(combat_log.COMBAT_LOG)
+    hp_before = warrior.hp
+    combat.log(f"  [AUTO] {warrior.name} auto-resolves vs {enemy.display_name} (policy: {policy})")
+    with fight_sim.quiet():
+        won, taken, turn_count = fight_sim.run(warrior, enemy, policy, setup=False)
+    if won is None:
+        print(f"\n⚡ {enemy.display_name} is still standing after {taken} turns — you take over.")
+        return None
+
+    loot = None
+    if won:
+        # Mirrors battle_inner's player-turn death block (regular fights only).
+        combat.log(f"  [DEATH] {enemy.display_name} defeated by {warrior.name} on turn {turn_count}.")
+        if hasattr(warrior, "original_defence"):
+            warrior.defence = warrior.original_defence
+            del warrior.original_defence
+        combat.award_gold(warrior, enemy.gold)
+        warrior.monster_essence.extend(enemy.essence)
+        combat.record_fight_score(warrior, enemy, turn_count)
+        warrior.fatigue_def_loss = 0
+        warrior.fatigue_save_tier = 0
+        loot = combat.make_loot(enemy.name, monster_level=getattr(enemy, "level", 1), round_num=round_num)
+
+    print()
+    print(_summary(warrior, enemy, won, turn_count, hp_before, loot))
+    for line in combat_log.COMBAT_LOG[mark + 1:]:
+        print(line)
+
+    if not won:
+        combat.log(f"  [DEATH] {warrior.name} was killed by {enemy.display_name} on turn {turn_count}.")
+        combat.log(f"  [RESULT] DEFEAT — {warrior.name} fell to {enemy.display_name}.")
+        combat.log_battle_summary(warrior.name, enemy.display_name, "DEFEAT", turn_count)
+        return False
+
+    if loot:
+        warrior.inventory.append(loot)
+        combat.log(f"  [LOOT] {loot.short_label()} dropped — saved to your bag.")
+    animate_xp_results(warrior, combat._xp_with_difficulty_mult(enemy.xp), duration=0,
+                       spend_points_fn=combat.spend_points_menu)
+    combat.log(f"  [RESULT] VICTORY — {warrior.name} defeated {enemy.display_name}. Final HP: {warrior.hp}/{warrior.max_hp}")
+    combat.log_battle_summary(warrior.name, enemy.display_name, "VICTORY", turn_count)
+    input("\nPress Enter to continue.")
+    if not skip_rest:
+        combat.rest_phase(warrior)
+    combat.reset_between_rounds(warrior)
+    gold_result = combat.calculate_gold_reward(enemy, turn_count, warrior)
+    combat.display_gold_earned(gold_result)
+    combat.award_pending_gold(warrior, gold_result)
+    return True
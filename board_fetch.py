@@ -0,0 +1,185 @@
+"""
+board_fetch.py — Keep-alive HTTP, parallel fetches and a stale-while-revalidate cache
+-------------------------------------------------------------------------------------
+The global leaderboard used to open a fresh HTTPS connection (TLS handshake
+and all) for every tier it showed, one after another, and fetch again on
+every tab switch. This module gives leaderboard.py three small pieces:
+
+  ConnectionPool   http.client connections kept alive and reused. One per
+                   host per thread — http.client isn't thread-safe — and
+                   a dropped keep-alive connection is reopened once.
+  fetch pool       a small persistent ThreadPoolExecutor, so all four tiers
+                   load at the same time and each worker keeps its
+                   connection warm between visits.
+  BoardCache       TTL cache. Fresh entries are returned as-is; stale ones
+                   are returned immediately while a background refresh
+                   runs; only a cold or very old entry waits on the network.
+                   Failed loads (None) never replace good data.
+
+Nothing here knows about Supabase — leaderboard.py supplies the loaders.
+"""
+
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+FETCH_WORKERS = 4          # one per leaderboard tier
+FRESH_SECONDS = 60.0       # serve straight from cache
+STALE_SECONDS = 60.0 * 60  # serve stale + refresh in the background
+
+
+# ============================================================
+# KEEP-ALIVE CONNECTIONS
+# ============================================================
+
+class ConnectionPool:
+    """Reusable http.client connections, one per (scheme, host) per thread."""
+
+    def __init__(self, timeout=5.0):
+        self.timeout = timeout
+        self._local = threading.local()
+        self.opened = 0            # connections created (handy for tests)
+
+    def _conns(self):
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        return conns
+
+    def _new(self, scheme, netloc):
+        self.opened += 1
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout)
+
+    def request(self, method, url, body=None, headers=None):
+        """Returns (status, body bytes). Raises OSError / HTTPException."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        key = (parts.scheme, parts.netloc)
+        conns = self._conns()
+
+        for attempt in (0, 1):
+            conn = conns.get(key)
+            reused = conn is not None
+            if conn is None:
+                conn = conns[key] = self._new(*key)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+                if resp.getheader("Connection", "").lower() == "close":
+                    conn.close()
+                    conns.pop(key, None)
+                return resp.status, data
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                conns.pop(key, None)
+                # A keep-alive connection the server already closed fails on
+                # first use — reconnect once. A brand-new one failing is real.
+                if not reused or attempt:
+                    raise
+        raise OSError("unreachable")
+
+    def close(self):
+        for conn in self._conns().values():
+            conn.close()
+        self._conns().clear()
+
+
+# ============================================================
+# FETCH POOL
+# ============================================================
+
+_executor = [None]
+_executor_lock = threading.Lock()
+
+
+def executor():
+    with _executor_lock:
+        if _executor[0] is None:
+            _executor[0] = ThreadPoolExecutor(max_workers=FETCH_WORKERS,
+                                              thread_name_prefix="jtwh-board")
+        return _executor[0]
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class BoardCache:
+    """
+    key -> value cache with stale-while-revalidate. `loader(key)` returns
+    the value, or None on failure.
+    """
+
+    def __init__(self, loader, fresh=FRESH_SECONDS, stale=STALE_SECONDS, clock=time.monotonic):
+        self.loader = loader
+        self.fresh = fresh
+        self.stale = stale
+        self.clock = clock
+        self._data = {}            # key -> (value, loaded_at)
+        self._inflight = {}        # key -> Future
+        self._lock = threading.Lock()
+
+    def _load(self, key):
+        try:
+            value = self.loader(key)
+        except Exception:
+            value = None
+        with self._lock:
+            if value is not None:
+                self._data[key] = (value, self.clock())
+            self._inflight.pop(key, None)
+        return value
+
+    def _refresh(self, key):
+        """Start (or join) a background load. Call with the lock held."""
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = self._inflight[key] = executor().submit(self._load, key)
+        return fut
+
+    def prefetch(self, keys):
+        """Start loading every key that isn't fresh — all at once."""
+        now = self.clock()
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None or now - entry[1] >= self.fresh:
+                    self._refresh(key)
+
+    def get(self, key, default=None):
+        """
+        Fresh -> cached. Stale (but younger than `stale`) -> cached now, and
+        refreshed in the background. Otherwise wait for a load; on failure
+        fall back to whatever we had, then `default`.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                age = now - entry[1]
+                if age < self.fresh:
+                    return entry[0]
+                if age < self.stale:
+                    self._refresh(key)
+                    return entry[0]
+            fut = self._refresh(key)
+        value = fut.result()
+        if value is not None:
+            return value
+        return entry[0] if entry is not None else default
+
+    def expire(self, key=None):
+        """Mark one key (or everything) stale, e.g. after submitting a score."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._data)
+            for k in keys:
+                if k in self._data:
+                    value, _ = self._data[k]
+                    self._data[k] = (value, self.clock() - self.fresh)
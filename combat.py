@@ -32,6 +32,9 @@ from monsters import (
 )
 from crafter import pack_hunter_active, apex_predator_active, get_weapon_socket_procs
 from leaderboard import display_at_end_of_run
+import savegame as _savegame
+import snapshot as _snapshot
+import spans as _spans
 # --- Runtime callbacks injected by main (avoids circular imports) ---
 DIFFICULTY              = "warrior"
 DIFFICULTY_BOSS_MULT    = {"noob": 0.80, "warrior": 1.20, "champion": 1.50}  # v0.7.11: champion 1.30 → 1.50
@@ -1253,6 +1256,9 @@ def rest_phase(hero):
         print("Invalid choice.\n")
         space()
 
+    # v0.7.21: scene boundary — autosave the post-fight hero (savegame.py).
+    _savegame.autosave(hero, "rest")
+
 
 
 
@@ -4415,6 +4421,8 @@ def fallen_warrior_moral_choice(warrior, fallen=None):
 
             # Clear all status effects before final boss
             reset_between_rounds(warrior, full_rest=True)
+            # v0.7.21: warm-start checkpoint (see snapshot.py)
+            _snapshot.mark_scene("finale", warrior, path="good")
             chimera_fight(warrior)
             return "good"
 
@@ -4514,6 +4522,8 @@ def fallen_warrior_moral_choice(warrior, fallen=None):
 
             # Clear all status effects before final boss
             reset_between_rounds(warrior, full_rest=True)
+            # v0.7.21: warm-start checkpoint (see snapshot.py)
+            _snapshot.mark_scene("finale", warrior, path="evil")
             patronus_fight(warrior)
             return "evil"
 
@@ -5399,7 +5409,8 @@ def battle(warrior, enemy, skip_rest=False, round_num=0):
       "win" -> special tournament win condition (fallen warrior)
     """
     try:
-        result = battle_inner(warrior, enemy, skip_rest=skip_rest, round_num=round_num)
+        with _spans.span("battle", enemy=getattr(enemy, "name", "?")):
+            result = battle_inner(warrior, enemy, skip_rest=skip_rest, round_num=round_num)
 
         # battle_inner now always returns True, False, or "win".
         # This guard handles any unexpected None as a loss (should never fire).
@@ -5407,6 +5418,12 @@ def battle(warrior, enemy, skip_rest=False, round_num=0):
             print("[DEBUG] battle_inner returned None — treating as loss. Please report this!")
             return False
 
+        # v0.7.21: scene boundary. A won fight autosaves (the save resumes at
+        # the next arena step); a loss or an ending closes the run out.
+        if result is True:
+            _savegame.autosave(warrior, "battle")
+        elif not result or not warrior.is_alive():
+            _savegame.autosave(warrior, "run_over")
         return result
 
     except RestartException:
@@ -5469,6 +5486,16 @@ def battle_inner(warrior, enemy, skip_rest=False, round_num=0):
         print(f"\n{warrior.name} enters the arena!")
         print(f"You face a {enemy.display_name}!")
 
+        # v0.7.21: pre-fight win odds (cached per matchup — see win_odds.py)
+        from win_odds import odds_line
+        odds = odds_line(warrior, enemy)
+        if odds:
+            print(odds)
+        # auto-resolve's odds too, before the battle-start buffs / debuffs
+        # below — fight_sim's battle_start() applies those on its copies
+        from auto_resolve import odds as auto_odds, offer, resolve
+        auto_est = auto_odds(warrior, enemy)
+
         # Reset bonus action for every new opponent
         warrior.bonus_action_used = False
 
@@ -5518,6 +5545,14 @@ def battle_inner(warrior, enemy, skip_rest=False, round_num=0):
         log("=" * 40)
         reset_battle_stats()
 
+        # v0.7.21: auto-resolve (opt-in) — a near-certain win can be played
+        # out headless and settled in one step. See auto_resolve.py.
+        policy = offer(auto_est)
+        if policy:
+            result = resolve(warrior, enemy, policy, round_num=round_num, skip_rest=skip_rest)
+            if result is not None:
+                return result
+
         # Decide who starts
         warrior_turn = random.choice([True, False])
         player_turn_started = False
@@ -5537,6 +5572,7 @@ def battle_inner(warrior, enemy, skip_rest=False, round_num=0):
             enemy_went_first = True
 
             # Enemy attacks immediately BEFORE the loop
+            _spans.phase("enemy_turn", turn=0, enemy=enemy.name)
             _eatk = enemy_attack(enemy, warrior)
             if _eatk:
                 _eroll = _eatk + max(0, getattr(warrior, "defence", 0))
@@ -5583,6 +5619,10 @@ def battle_inner(warrior, enemy, skip_rest=False, round_num=0):
                 # ---------------------------------------
                 if not player_turn_started:
                     player_turn_started = True
+                    # v0.7.21: profiling (spans.py) — a no-op unless --profile.
+                    # Opened here, not at the header, so menu detours that
+                    # loop back without spending the turn stay in one span.
+                    _spans.phase("player_turn", turn=turn_count, enemy=enemy.name)
 
                     # v0.6.14: Combat fatigue save (player side).
                     # Fires once per player turn after the threshold (10 for
@@ -6273,6 +6313,7 @@ def battle_inner(warrior, enemy, skip_rest=False, round_num=0):
             else:
                 log()
                 log(f"--- Turn {turn_count}: {enemy.display_name}'s turn  (HP:{enemy.hp}/{enemy.max_hp}) ---")
+                _spans.phase("enemy_turn", turn=turn_count, enemy=enemy.name)
 
                 # v0.6.14: Combat fatigue save (monster side). Independent from
                 # the player's save — both sides roll their own d20s. Fires
@@ -6728,6 +6769,7 @@ def battle_inner(warrior, enemy, skip_rest=False, round_num=0):
     finally:
         # ALWAYS turns off monster select when combat exits
         ALLOW_MONSTER_SELECT = False
+        _spans.phase(None)
 
 
 
@@ -0,0 +1,493 @@
+"""
+craft_planner.py — Plan a whole batch of crafts at once
+-------------------------------------------------------
+The recipe menus craft one piece at a time, and each craft greedily takes
+whichever copies of its components come first — so a player building a
+full set works out by hand which pelt goes where, which raw pelts to cure
+first, and whether the gold stretches, across four nested menus.
+
+plan(warrior, recipe_names, goal) solves the whole batch at once: every
+requested piece (Wolf-Hide and Dire Wolf recipes, Sharpened Tusk upgrades)
+gets a specific set of component copies from the bag + equipped gear, and
+raw pelts can stand in for cured ones (cured on the way, CURE_COST each,
+with the usual rarity bump). A piece's gold cost follows the crafter's
+rarity curve (CRAFT_RARITY_COST_MULTIPLIER — Poor input crafts at half
+price, better input costs more), so which copy feeds which piece changes
+the bill.
+
+Search: only the weakest non-crystal copy in a piece sets its rarity and
+price (plus CURE_COST per raw pelt cured), so pieces are placed by tier,
+not by copy. A memoised sweep walks the tiers top down; at each one it
+decides which pieces still to make get that tier as their weakest copy,
+and which component supplies it. Everything else a piece needs comes from
+the copies at or above its tier — any of them will do, so all the state keeps is
+how many direct and how many cured-on-the-way copies are left there
+(capped at what the remaining pieces could still take). Each state keeps
+the Pareto front of (gold, quality) for the pieces still to make; quality
+is the sum of output rarity ranks (pieces, crystals, tusks). Picks that
+land in the same state are cut to their own front (and to the budget)
+before the sweep goes deeper. On top of that:
+  - crystals never change a price (only their own bonus), so they're left
+    out of the search and the best copies are handed out afterwards;
+  - pieces that share no source items (Wolf-Hide pelts vs Dire Wolf
+    pelts) are searched separately and their fronts added together.
+Goals pick from the combined front:
+
+    "cheapest"   least gold; ties -> best quality
+    "best"       best quality the player can afford; ties -> least gold
+
+carry_out(warrior, plan) then makes it — cures, sharpens and crafts,
+consuming exactly the planned copies (bag copies before equipped ones).
+"""
+
+
+GOALS = ("cheapest", "best")
+
+
+def _crafter():
+    import crafter
+    return crafter
+
+
+def _ext_order():
+    return _crafter().RARITY_ORDER + ["mythril_plus"]
+
+
+# ============================================================
+# MODEL
+# ============================================================
+# A "unit" is one component copy a piece will consume:
+#   (component, source item name, source rarity, rarity it counts as, cure gold,
+#    (source name, source rarity rank) — the inventory key it draws on)
+# e.g. ("Cured Wolf Pelt", "Wolf Pelt", "normal", "uncommon", 5) — a raw
+# Normal pelt cured into an Uncommon Cured Wolf Pelt on the way.
+
+def _sources(comp):
+    """[(source item name, cured on the way?)] that can fill `comp`."""
+    crafter = _crafter()
+    out = [(comp, False)]
+    raw = comp[len("Cured "):] if comp.startswith("Cured ") else None
+    if raw in crafter.CURABLE_PELTS:
+        out.append((raw, True))
+    return out
+
+
+def _recipe(name):
+    crafter = _crafter()
+    recipe = crafter.ALL_RECIPES.get(name)
+    if recipe is None:
+        raise KeyError(f"no recipe {name!r}")
+    return recipe
+
+
+def _unit_options(comp, keys):
+    """Every unit that can fill `comp`, given the (source, rank) keys owned."""
+    crafter = _crafter()
+    order = _ext_order()
+    options = []
+    for source, cure in _sources(comp):
+        for (name, rank) in keys:
+            if name != source:
+                continue
+            rarity = order[rank]
+            if cure:
+                out, _ = crafter._cured_rarity(comp, rarity)
+                options.append((comp, source, rarity, out, crafter.CURE_COST, (name, rank)))
+            else:
+                options.append((comp, source, rarity, rarity, 0, (name, rank)))
+    return options
+
+
+def _pools(counts, names):
+    """
+    {component: {rank it counts as: [units]}} over the non-crystal
+    components of `names` — one unit per copy owned, direct copies first.
+    """
+    crafter = _crafter()
+    order = _ext_order()
+    rank = {r: i for i, r in enumerate(order)}
+    pools = {}
+    for name in dict.fromkeys(names):
+        for comp in _recipe(name)["components"]:
+            if comp in crafter.CRYSTAL_TYPES or comp in pools:
+                continue                # handed out after the search (_add_crystals)
+            tiers = pools[comp] = {}
+            for unit in _unit_options(comp, counts):
+                tiers.setdefault(rank[unit[3]], []).extend([unit] * counts[unit[5]])
+            for units in tiers.values():
+                units.sort(key=lambda u: u[4])
+    return pools
+
+
+def _price(name, tier):
+    """
+    (gold before curing, quality, rarity made) for one `name` whose weakest
+    copy counts as `tier` — nothing else about the copies changes the bill.
+    """
+    crafter = _crafter()
+    order = _ext_order()
+    recipe = _recipe(name)
+    if name in crafter.TUSK_RECIPES:
+        out, _, _ = crafter._sharpened_tusk(order[tier])
+        gold = crafter.TUSK_UPGRADE_GOLD_BY_RARITY.get(order[tier], recipe["gold_cost"])
+        return gold, order.index(out) if out in order else 0, out
+    # Same "highest common tier" rule as _highest_input_rarity: the
+    # weakest non-crystal copy sets the piece's rarity (and its price).
+    return crafter._scale_craft_cost(recipe["gold_cost"], order[tier]), tier, order[tier]
+
+
+def _splits(n, ways):
+    """Every way to share n pieces among `ways`, as ((way, count > 0), ...)."""
+    if n == 0:
+        yield ()
+        return
+    if not ways:
+        return
+    for m in range(n, -1, -1):
+        for rest in _splits(n - m, ways[1:]):
+            yield (((ways[0], m),) if m else ()) + rest
+
+
+def _inventory_keys(warrior, names):
+    """{(item name, rarity rank): copies} over bag + equipped."""
+    crafter = _crafter()
+    rank = {r: i for i, r in enumerate(_ext_order())}
+    counts = {}
+    for name in names:
+        for item in crafter._all_matching_items(warrior, name):
+            r = rank.get(getattr(item, "rarity", "normal"))
+            if r is not None:
+                counts[(name, r)] = counts.get((name, r), 0) + 1
+    return counts
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _front(entries, budget):
+    """Pareto front of (gold, quality, tail): cheaper or better, never both worse.
+    Entries over `budget` are dropped, bar the cheapest (to report how short)."""
+    entries.sort(key=lambda e: (e[0], -e[1]))
+    front, best = [], None
+    for entry in entries:
+        if best is not None and entry[1] <= best:
+            continue
+        if front and entry[0] > budget:
+            break
+        front.append(entry)
+        best = entry[1]
+    return front
+
+
+def solve(counts, names, budget):
+    """
+    Pareto front [(gold, quality, plan)] for making every recipe in `names`
+    from `counts` ({(item name, rank): copies}). plan is a tuple of
+    (name, units, gold, craft rarity). [] if the components don't stretch.
+    """
+    crafter = _crafter()
+    pools = _pools(counts, names)
+    comps = sorted(pools)
+    kinds = list(dict.fromkeys(names))
+    need = [[_recipe(k)["components"].get(c, 0) for c in comps] for k in kinds]
+    # draw[k][c]: most copies of comps[c] one kinds[k] takes from the shared
+    # copies — its weakest copy never does, so a lone component gives one back
+    draw = [[n - (1 if n and sum(1 for m in row if m) == 1 else 0) for n in row]
+            for row in need]
+    tiers = sorted({t for c in comps for t in pools[c]}, reverse=True)
+    price = [[_price(k, t) for t in tiers] for k in kinds]
+    # fresh[i][c]: (direct, cured-on-the-way) copies of comps[c] counting as exactly tiers[i]
+    fresh = [tuple((sum(1 for u in pools[c].get(t, ()) if not u[4]),
+                    sum(1 for u in pools[c].get(t, ()) if u[4])) for c in comps)
+             for t in tiers]
+    # below[i][c]: copies of comps[c] counting as tiers[i] or lower
+    below = [[0] * len(comps) for _ in range(len(tiers) + 1)]
+    for i in range(len(tiers) - 1, -1, -1):
+        below[i] = [below[i + 1][c] + sum(fresh[i][c]) for c in range(len(comps))]
+    memo = {}
+
+    def fits(i, left, pool):
+        return all(sum(n * need[k][c] for k, n in enumerate(left))
+                   <= sum(pool[c]) + below[i][c] for c in range(len(comps)))
+
+    def best_from(i, left, pool):
+        if not any(left):
+            return [(0, 0, ())]
+        if i == len(tiers):
+            return []
+        key = (i, left, pool)
+        hit = memo.get(key)
+        if hit is not None:
+            return hit
+        # Which pieces left get tiers[i] as their weakest copy, and which
+        # component supplies that copy. Whatever they need beyond it comes
+        # from the copies at or above tiers[i], direct ones before cured.
+        have = [sum(f) for f in fresh[i]]
+        picks = [(left, (0,) * len(comps), (0,) * len(comps), 0, 0, ())]
+        for k, n in enumerate(left):
+            if not n:
+                continue
+            ways = tuple(c for c in range(len(comps)) if need[k][c] and have[c])
+            each_gold, each_quality, _ = price[k][i]
+            grown = []
+            for split in (split for m in range(n + 1) for split in _splits(m, ways)):
+                m = sum(count for _, count in split)
+                for rest, witness, demand, g, q, done in picks:
+                    witness = list(witness)
+                    for c, count in split:
+                        witness[c] += count
+                    if any(w > h for w, h in zip(witness, have)):
+                        continue
+                    grown.append((rest[:k] + (rest[k] - m,) + rest[k + 1:], tuple(witness),
+                                  tuple(d + m * x for d, x in zip(demand, need[k])),
+                                  g + m * each_gold, q + m * each_quality,
+                                  done + tuple((kinds[k], c, count) for c, count in split)))
+            picks = grown
+        children = {}
+        for rest, witness, demand, gold, quality, done in picks:
+            after, cured = [], 0
+            for c in range(len(comps)):
+                (direct, raw), (p_direct, p_raw) = fresh[i][c], pool[c]
+                w_direct = min(witness[c], direct)
+                p_direct += direct - w_direct
+                p_raw += raw - (witness[c] - w_direct)
+                extra = demand[c] - witness[c]
+                e_direct = min(extra, p_direct)
+                if extra - e_direct > p_raw:
+                    break
+                cured += witness[c] - w_direct + extra - e_direct
+                after.append((p_direct - e_direct, p_raw - (extra - e_direct)))
+            else:
+                # Copies past what the pieces left could ever take don't tell states apart.
+                for c, (p_direct, p_raw) in enumerate(after):
+                    want = sum(n * draw[k][c] for k, n in enumerate(rest))
+                    after[c] = (min(p_direct, want), min(p_raw, max(0, want - p_direct)))
+                child = (tuple(rest), tuple(after))
+                step = ((tiers[i], tuple(done)),) if done else ()
+                children.setdefault(child, []).append(
+                    (gold + cured * crafter.CURE_COST, quality, step))
+        entries = []
+        for (rest, after), here in children.items():
+            if not fits(i + 1, rest, after):
+                continue
+            here = _front(here, budget)
+            for g2, q2, tail in best_from(i + 1, rest, after):
+                for g, q, step in here:
+                    entries.append((g + g2, q + q2, step + tail))
+        memo[key] = result = _front(entries, budget)
+        return result
+
+    start = tuple(names.count(k) for k in kinds)
+    return [(g, q, _assign(pools, comps, tiers, decisions))
+            for g, q, decisions in best_from(0, start, ((0, 0),) * len(comps))]
+
+
+def _assign(pools, comps, tiers, decisions):
+    """
+    The copies behind a solve() result: each piece takes its weakest copy
+    at its own tier, and the rest from what's left above it (direct copies
+    before cured ones) — the same draws solve() counted.
+    """
+    crafter = _crafter()
+    rank = {r: i for i, r in enumerate(_ext_order())}
+    picked = dict(decisions)
+    spare = {comp: [] for comp in comps}
+    steps = []
+    for tier in tiers:
+        fresh = {comp: list(pools[comp].get(tier, ())) for comp in comps}
+        pieces = []
+        for name, c, m in picked.get(tier, ()):
+            for _ in range(m):
+                pieces.append((name, {comps[c]: [fresh[comps[c]].pop(0)]}))
+        for comp in comps:
+            spare[comp] = sorted(spare[comp] + fresh[comp], key=lambda u: (u[4], rank[u[3]]))
+        for name, taken in pieces:
+            units = []
+            for comp, needed in _recipe(name)["components"].items():
+                if comp in crafter.CRYSTAL_TYPES:
+                    continue
+                mine = taken.get(comp, [])
+                while len(mine) < needed:
+                    mine.append(spare[comp].pop(0))
+                units.extend(mine)
+            gold, _, craft = _price(name, tier)
+            steps.append((name, tuple(units), gold + sum(u[4] for u in units), craft))
+    return tuple(steps)
+
+
+def plan(warrior, recipe_names, goal="cheapest", gold=None):
+    """
+    Plan crafting every recipe in `recipe_names` (repeats allowed, e.g. two
+    Sharpened Tusks). Returns a dict:
+        steps    [(recipe name, units, gold, craft rarity), ...] in order
+        cost     total gold        quality  sum of output rarity ranks
+        ok       feasible and affordable
+        short    gold missing for the cheapest plan (0 if affordable)
+        missing  ["2x Cured Wolf Pelt", ...] when the components don't stretch
+    """
+    if goal not in GOALS:
+        raise ValueError(f"goal must be one of {GOALS}")
+    crafter = _crafter()
+    budget = warrior.gold if gold is None else gold
+    # Same recipe back-to-back, so repeats read together in the plan.
+    names = sorted(recipe_names, key=list(dict.fromkeys(recipe_names)).index)
+    sources = {s for n in names for comp in _recipe(n)["components"]
+               for s, _ in _sources(comp)}
+    counts = _inventory_keys(warrior, sources)
+    result = {"goal": goal, "gold": budget, "names": names, "steps": [],
+              "cost": 0, "quality": 0, "ok": False, "short": 0, "missing": []}
+    missing = _missing(counts, names)
+    if missing:
+        result["missing"] = missing
+        return result
+
+    front = [(0, 0, ())]
+    for group in _groups(names):
+        group_counts = {k: n for k, n in counts.items()
+                        if k[0] in _group_sources(group)}
+        found = solve(group_counts, group, budget)
+        front = _front([(g1 + g2, q1 + q2, t1 + t2)
+                        for g1, q1, t1 in front
+                        for g2, q2, t2 in found], budget)
+        if not front:
+            result["missing"] = [f"the right mix of {', '.join(sorted(_group_sources(group)))}"]
+            return result
+    front = [(g, q + bonus, _in_order(names, steps))
+             for g, q, steps in front
+             for steps, bonus in [_add_crystals(crafter, counts, steps)]]
+    affordable = [e for e in front if e[0] <= budget]
+    if not affordable:
+        pick = front[0]
+        result["short"] = pick[0] - budget
+    elif goal == "cheapest":
+        pick = affordable[0]
+    else:
+        pick = max(affordable, key=lambda e: (e[1], -e[0]))
+    result.update(steps=list(pick[2]), cost=pick[0], quality=pick[1], ok=bool(affordable))
+    return result
+
+
+def _group_sources(names):
+    crafter = _crafter()
+    return {s for n in names for comp in _recipe(n)["components"]
+            if comp not in crafter.CRYSTAL_TYPES for s, _ in _sources(comp)}
+
+
+def _groups(names):
+    """Split `names` into runs that share no (non-crystal) source items."""
+    groups = []                       # [(sources, [names])]
+    for name in names:
+        mine = _group_sources([name])
+        joined = [g for g in groups if g[0] & mine]
+        for g in joined:
+            groups.remove(g)
+            mine |= g[0]
+        merged = [n for g in joined for n in g[1]] + [name]
+        groups.append((mine, merged))
+    return [sorted(g[1], key=names.index) for g in groups]
+
+
+def _in_order(names, steps):
+    """Steps back in the requested order (groups were solved apart)."""
+    pending = list(steps)
+    ordered = []
+    for name in names:
+        for i, step in enumerate(pending):
+            if step[0] == name:
+                ordered.append(pending.pop(i))
+                break
+    return tuple(ordered)
+
+
+def _add_crystals(crafter, counts, steps):
+    """
+    Give each piece that needs a crystal the best copy left (a crystal's
+    rarity only sizes its own bonus — it never changes a price).
+    Returns (steps with the crystal units added, quality they add).
+    """
+    order = _ext_order()
+    spare = {}
+    for (name, rank), n in counts.items():
+        if name in crafter.CRYSTAL_TYPES:
+            spare.setdefault(name, []).extend([rank] * n)
+    for ranks in spare.values():
+        ranks.sort(reverse=True)
+    out, bonus = [], 0
+    for name, units, gold, craft in steps:
+        extra = []
+        for comp, needed in _recipe(name)["components"].items():
+            if comp in crafter.CRYSTAL_TYPES:
+                for _ in range(needed):
+                    rank = spare[comp].pop(0)
+                    bonus += rank
+                    extra.append((comp, comp, order[rank], order[rank], 0, (comp, rank)))
+        out.append((name, units + tuple(extra), gold, craft))
+    return tuple(out), bonus
+
+
+def _missing(counts, names):
+    """What the batch is short of, per component (raw pelts count for cured)."""
+    need = {}
+    for name in names:
+        for comp, n in _recipe(name)["components"].items():
+            need[comp] = need.get(comp, 0) + n
+    have = {}
+    for (name, _), n in counts.items():
+        have[name] = have.get(name, 0) + n
+    out = []
+    for comp, n in need.items():
+        owned = sum(have.get(source, 0) for source, _ in _sources(comp))
+        if owned < n:
+            out.append(f"{n - owned}x {comp}")
+    return out
+
+
+# ============================================================
+# CARRYING IT OUT
+# ============================================================
+
+def carry_out(warrior, batch):
+    """
+    Make a plan() result: cure / sharpen / craft with exactly the planned
+    copies. Returns the new items, or None (nothing touched) if the bag
+    or purse no longer matches the plan.
+    """
+    crafter = _crafter()
+    if not batch["ok"] or warrior.gold < batch["cost"]:
+        return None
+    pools = {}
+    for _, units, _, _ in batch["steps"]:
+        for unit in units:
+            if (unit[1], unit[2]) not in pools:
+                pools[(unit[1], unit[2])] = [
+                    it for it in crafter._all_matching_items(warrior, unit[1])
+                    if getattr(it, "rarity", "normal") == unit[2]]
+    wanted = {}
+    for _, units, _, _ in batch["steps"]:
+        for unit in units:
+            wanted[(unit[1], unit[2])] = wanted.get((unit[1], unit[2]), 0) + 1
+    if any(len(pools[k]) < n for k, n in wanted.items()):
+        return None
+
+    made = []
+    for name, units, gold, craft_rarity in batch["steps"]:
+        items = []
+        crystal_bonus = (None, 0)
+        for comp, source, rarity, _, cure_gold, _ in units:
+            item = pools[(source, rarity)].pop(0)
+            if cure_gold:
+                item = crafter._cure_pelt_item(warrior, item)
+            if comp in crafter.CRYSTAL_TYPES:
+                crystal_bonus = (crafter.CRYSTAL_FIELD[comp],
+                                 crafter.CRYSTAL_RARITY_VALUE[comp].get(item.rarity, 0))
+            items.append(item)
+        if name in crafter.TUSK_RECIPES:
+            made.append(crafter._sharpen_tusk_item(warrior, items[0]))
+            continue
+        recipe = crafter.ALL_RECIPES[name]
+        cost = crafter._scale_craft_cost(recipe["gold_cost"], craft_rarity)
+        made.append(crafter._craft_from_items(warrior, name, recipe, items,
+                                              craft_rarity, cost, crystal_bonus))
+        crafter._check_set_completion_titles(warrior, name)
+    return made
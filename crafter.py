@@ -47,6 +47,9 @@ Why a separate module:
 """
 
 import random
+from bisect import bisect_left
+
+from inventory_index import bag as _bag
 
 
 # ============================================================
@@ -112,6 +115,15 @@ WILDCARD_RARITY_WEIGHTS = [
 # 20% epic-weapon-variant roll in merchant.py, reused here for consistency.
 CHAMPION_EPIC_CHANCE = 0.20
 
+# v0.7.21: the wildcard weights as (rarities, running totals), built once.
+# _roll_wildcard_rarity bisects one randint(1, total) into it — the same
+# pick the old per-call cumulative walk made.
+_WILDCARD_TABLE = (
+    tuple(r for r, _ in WILDCARD_RARITY_WEIGHTS),
+    tuple(sum(w for _, w in WILDCARD_RARITY_WEIGHTS[:i + 1])
+          for i in range(len(WILDCARD_RARITY_WEIGHTS))),
+)
+
 # Per-listing stock. Nathan's call: "2 total wolf pup pelts if the crafter
 # draws them" — so each rarity variant that appears has 2 in stock.
 COMPONENT_STOCK_PER_VARIANT = 2
@@ -228,9 +240,8 @@ def _lowest_rarity_copy(warrior, comp_name):
     matching = _all_matching_items(warrior, comp_name)
     if not matching:
         return None
-    matching.sort(key=lambda it: RARITY_ORDER.index(getattr(it, "rarity", "normal"))
-                  if getattr(it, "rarity", "normal") in RARITY_ORDER else 0)
-    return matching[0]
+    return min(matching, key=lambda it: RARITY_ORDER.index(getattr(it, "rarity", "normal"))
+               if getattr(it, "rarity", "normal") in RARITY_ORDER else 0)
 
 
 def _recipe_crystal_bonus(warrior, recipe):
@@ -565,15 +576,9 @@ def _roll_wildcard_rarity():
     _main = sys.modules.get("__main__")
     _diff = getattr(_main, "DIFFICULTY", "warrior") if _main else "warrior"
 
-    total = sum(w for _, w in WILDCARD_RARITY_WEIGHTS)
-    r = random.randint(1, total)
-    cum = 0
-    picked = "poor"
-    for rarity, weight in WILDCARD_RARITY_WEIGHTS:
-        cum += weight
-        if r <= cum:
-            picked = rarity
-            break
+    rarities, cumulative = _WILDCARD_TABLE
+    r = random.randint(1, cumulative[-1])
+    picked = rarities[bisect_left(cumulative, r)]
 
     if picked == "rare" and _diff == "noob":
         picked = "uncommon"
@@ -776,8 +781,9 @@ def _all_matching_items(warrior, name):
     had one — annoying busywork with no real purpose. Consumption still
     prefers the lowest-rarity copy first; if that copy happens to be
     equipped, _consume_components unequips it properly before removing it.
+    v0.7.21: the bag side is an index lookup (see inventory_index.py).
     """
-    items = [it for it in warrior.inventory if getattr(it, "name", "") == name]
+    items = _bag(warrior).named(name)
     items += [it for it in warrior.equipment.values()
               if it is not None and getattr(it, "name", "") == name]
     return items
@@ -785,7 +791,9 @@ def _all_matching_items(warrior, name):
 
 def _count_inventory(warrior, name):
     """Count how many items with this name the warrior has — bag AND equipped."""
-    return len(_all_matching_items(warrior, name))
+    return _bag(warrior).count_named(name) + sum(
+        1 for it in warrior.equipment.values()
+        if it is not None and getattr(it, "name", "") == name)
 
 
 def _highest_input_rarity(warrior, recipe):
@@ -813,19 +821,22 @@ def _highest_input_rarity(warrior, recipe):
     # v0.7.19: check mythril_plus first — cured pelts can now sit at this
     # tier after the curing rarity bump, and it's above the standard ladder.
     extended_order = RARITY_ORDER + ["mythril_plus"]
+    # v0.7.21: gather each component's copies once (bag + equipped) and
+    # count per tier, instead of re-scanning for every tier tried.
+    rank = {tier: i for i, tier in enumerate(extended_order)}
+    ranks_by_comp = []
+    for comp_name, needed in recipe["components"].items():
+        if comp_name in CRYSTAL_TYPES:
+            continue
+        ranks = [rank[r] for r in (getattr(it, "rarity", "normal")
+                                   for it in _all_matching_items(warrior, comp_name))
+                 if r in rank]
+        ranks_by_comp.append((ranks, needed))
     for tier in reversed(extended_order):  # mythril_plus down to poor
-        ok = True
-        for comp_name, needed in recipe["components"].items():
-            if comp_name in CRYSTAL_TYPES:
-                continue
-            # Count items of this name at this tier OR HIGHER — bag + equipped
-            higher_tiers = extended_order[extended_order.index(tier):]
-            have = sum(1 for it in _all_matching_items(warrior, comp_name)
-                       if getattr(it, "rarity", "normal") in higher_tiers)
-            if have < needed:
-                ok = False
-                break
-        if ok:
+        # Count items of this name at this tier OR HIGHER — bag + equipped
+        floor = rank[tier]
+        if all(sum(1 for r in ranks if r >= floor) >= needed
+               for ranks, needed in ranks_by_comp):
             return tier
     return None
 
@@ -894,6 +905,31 @@ def _consume_components(warrior, recipe, prefer_rarity):
                 warrior.inventory.remove(item)
 
 
+def _take_components(warrior, items):
+    """Remove these exact component items — unequipping any that are worn."""
+    from equipment import unequip_item
+    for item in items:
+        if any(eq_item is item for eq_item in warrior.equipment.values()):
+            unequip_item(warrior, item)  # reverses stats, moves item into inventory
+        if item in warrior.inventory:
+            warrior.inventory.remove(item)
+
+
+def _craft_from_items(warrior, recipe_name, recipe, items, craft_rarity, cost, crystal_bonus):
+    """
+    v0.7.21: craft `recipe_name` from exactly `items` (no prompts) — the
+    crafting planner's path. Spends `cost`, consumes the items, bags the
+    piece and returns it.
+    """
+    from gold import spend_gold as _spend_gold
+    _spend_gold(warrior, cost)
+    _take_components(warrior, items)
+    crafted = _make_equipment(recipe_name, recipe, rarity=craft_rarity,
+                              crystal_bonus=crystal_bonus)
+    warrior.inventory.append(crafted)
+    return crafted
+
+
 def _pick_components(available, comp_name, needed, extended):
     """
     Let the player choose which copies of a component to consume.
@@ -1171,31 +1207,20 @@ TUSK_UPGRADE_GOLD_BY_RARITY = {
 }
 
 
-def _upgrade_tusk(warrior, item):
-    """
-    v0.7.13: Wires up the previously-orphaned TUSK_RECIPES entry. Consumes
-    one Javelina Tusk (unequipping it first if worn).
+def tusk_upgrade_cost(item):
+    """Gold to sharpen this Javelina Tusk (scales with its rarity)."""
+    return TUSK_UPGRADE_GOLD_BY_RARITY.get(getattr(item, "rarity", "normal"),
+                                           TUSK_RECIPES["Sharpened Tusk"]["gold_cost"])
 
-    v0.7.16 rework:
-      - Gold cost now scales with the INPUT tusk's rarity (see
-        TUSK_UPGRADE_GOLD_BY_RARITY) instead of a flat 15g.
-      - Output rarity bumps ONE tier above the consumed tusk (capped via
-        the EXTRA_RARITY_TIERS registry — a Mythril tusk becomes the
-        item-exclusive "Mythril+" tier instead of just staying Mythril).
-      - Bleed turns / bleed damage are computed live: 50% up from the RAW
-        Javelina Tusk's own stats at the INPUT rarity, rounded up, min 1.
-        So the bleed boost scales with what you fed in, not a fixed table.
-      - ATK bonus still comes from SHARPENED_TUSK_STATS at the OUTPUT
-        rarity (including the "mythril_plus" entry for the extra tier).
+
+def _sharpened_tusk(input_rarity):
+    """
+    (output_rarity, output_label, stat overrides) for sharpening a tusk of
+    `input_rarity` — see _upgrade_tusk for the rules.
     """
     from equipment import (RARITY_ORDER as _FULL_RARITY_ORDER, JAVELINA_TUSK_STATS,
                             SHARPENED_TUSK_STATS, EXTRA_RARITY_TIERS, scale_bleed_stat)
 
-    recipe = TUSK_RECIPES["Sharpened Tusk"]
-    input_rarity = getattr(item, "rarity", "normal")
-    rarity_word = input_rarity.title()
-    cost = TUSK_UPGRADE_GOLD_BY_RARITY.get(input_rarity, recipe["gold_cost"])
-
     # Determine output rarity: normally one tier up, but a registered
     # "+" tier (currently only Javelina Tusk → Mythril+) overrides that
     # when the input matches its trigger rarity.
@@ -1207,7 +1232,6 @@ def _upgrade_tusk(warrior, item):
         idx = _FULL_RARITY_ORDER.index(input_rarity) if input_rarity in _FULL_RARITY_ORDER else 1
         output_rarity = _FULL_RARITY_ORDER[min(idx + 1, len(_FULL_RARITY_ORDER) - 1)]
         output_word = output_rarity.title()
-    bumped = output_rarity != input_rarity
 
     # Bleed stats: 50% up from the RAW tusk's own numbers at input rarity.
     raw = JAVELINA_TUSK_STATS.get(input_rarity, JAVELINA_TUSK_STATS["normal"])
@@ -1223,6 +1247,56 @@ def _upgrade_tusk(warrior, item):
         "bleed_dmg_min": new_bleed_dmg_min,
         "bleed_dmg_max": new_bleed_dmg_max,
     }
+    return output_rarity, output_word, overrides
+
+
+def _sharpen_tusk_item(warrior, item):
+    """
+    Consume `item` (unequipping it if worn) + its upgrade gold and put the
+    Sharpened Tusk in the bag. No prompts — callers check gold first.
+    """
+    from equipment import unequip_item
+    cost = tusk_upgrade_cost(item)
+    output_rarity, _, overrides = _sharpened_tusk(getattr(item, "rarity", "normal"))
+    if any(eq_item is item for eq_item in warrior.equipment.values()):
+        unequip_item(warrior, item)
+    if item in warrior.inventory:
+        warrior.inventory.remove(item)
+    from gold import spend_gold as _spend_gold
+    _spend_gold(warrior, cost)  # v0.7.18: tracks total_gold_spent
+
+    sharpened = _make_component("Sharpened Tusk", output_rarity, overrides=overrides)
+    warrior.inventory.append(sharpened)
+    return sharpened
+
+
+def _upgrade_tusk(warrior, item):
+    """
+    v0.7.13: Wires up the previously-orphaned TUSK_RECIPES entry. Consumes
+    one Javelina Tusk (unequipping it first if worn).
+
+    v0.7.16 rework:
+      - Gold cost now scales with the INPUT tusk's rarity (see
+        TUSK_UPGRADE_GOLD_BY_RARITY) instead of a flat 15g.
+      - Output rarity bumps ONE tier above the consumed tusk (capped via
+        the EXTRA_RARITY_TIERS registry — a Mythril tusk becomes the
+        item-exclusive "Mythril+" tier instead of just staying Mythril).
+      - Bleed turns / bleed damage are computed live: 50% up from the RAW
+        Javelina Tusk's own stats at the INPUT rarity, rounded up, min 1.
+        So the bleed boost scales with what you fed in, not a fixed table.
+      - ATK bonus still comes from SHARPENED_TUSK_STATS at the OUTPUT
+        rarity (including the "mythril_plus" entry for the extra tier).
+    """
+    recipe = TUSK_RECIPES["Sharpened Tusk"]
+    input_rarity = getattr(item, "rarity", "normal")
+    rarity_word = input_rarity.title()
+    cost = tusk_upgrade_cost(item)
+    output_rarity, output_word, overrides = _sharpened_tusk(input_rarity)
+    bumped = output_rarity != input_rarity
+    atk_bonus = overrides["atk_bonus"]
+    new_bleed_turns = overrides["bleed_turns"]
+    new_bleed_dmg_min = overrides["bleed_dmg_min"]
+    new_bleed_dmg_max = overrides["bleed_dmg_max"]
 
     if warrior.gold < cost:
         print(_wrap(f"  You can't afford it. ({cost}g, you have {warrior.gold}g)"))
@@ -1242,16 +1316,8 @@ def _upgrade_tusk(warrior, item):
     if confirm != "y":
         return
 
-    from equipment import unequip_item, equip_item
-    if is_equipped:
-        unequip_item(warrior, item)
-    if item in warrior.inventory:
-        warrior.inventory.remove(item)
-    from gold import spend_gold as _spend_gold
-    _spend_gold(warrior, cost)  # v0.7.18: tracks total_gold_spent
-
-    sharpened = _make_component("Sharpened Tusk", output_rarity, overrides=overrides)
-    warrior.inventory.append(sharpened)
+    from equipment import equip_item
+    sharpened = _sharpen_tusk_item(warrior, item)
 
     print()
     if bumped:
@@ -1347,12 +1413,10 @@ def _sell_components_menu(warrior):
         print()
 
         equipped_items = set(i for i in warrior.equipment.values() if i is not None)
-        candidates = []
-        for item in warrior.inventory:
-            if getattr(item, "name", "") in COMPONENT_TYPES:
-                candidates.append(item)
+        candidates = _bag(warrior).named(*COMPONENT_TYPES)
+        listed = set(map(id, candidates))
         for item in equipped_items:
-            if getattr(item, "name", "") in COMPONENT_TYPES and item not in candidates:
+            if getattr(item, "name", "") in COMPONENT_TYPES and id(item) not in listed:
                 candidates.append(item)
 
         if not candidates:
@@ -1492,52 +1556,43 @@ def _curable_pelts_in_inventory(warrior):
     """Raw (uncured) pelts ready to cure — bag AND currently equipped (a
     player may be wearing one as basic armor; mirrors how recipes already
     look at both bag and equipped slots)."""
-    pelts = [it for it in warrior.inventory if getattr(it, "name", "") in CURABLE_PELTS]
+    pelts = _bag(warrior).named(*CURABLE_PELTS)
     pelts += [it for it in warrior.equipment.values()
               if it is not None and getattr(it, "name", "") in CURABLE_PELTS]
     return pelts
 
 
-def _cure_pelt(warrior, raw_pelt):
-    """Consume one raw pelt + gold, produce its Cured counterpart in the bag.
+def _cured_rarity(cured_name, input_rarity):
+    """(rarity, label) a raw pelt of `input_rarity` cures into."""
+    from equipment import RARITY_ORDER, EXTRA_RARITY_TIERS
+    # --- Rarity bump: one tier up, mythril → mythril+ via EXTRA_RARITY_TIERS ---
+    extra = EXTRA_RARITY_TIERS.get(cured_name)
+    if extra and input_rarity == extra["trigger_rarity"]:
+        return extra["key"], extra["label"]
+    if input_rarity in RARITY_ORDER:
+        idx = RARITY_ORDER.index(input_rarity)
+        output_rarity = RARITY_ORDER[min(idx + 1, len(RARITY_ORDER) - 1)]
+        return output_rarity, output_rarity.title()
+    return input_rarity, input_rarity.title()
 
-    v0.7.19: curing now BUMPS the rarity by one tier — an uncommon raw pelt
-    produces a rare Cured Pelt, etc. A mythril raw pelt produces a Mythril+
-    Cured Pelt (via EXTRA_RARITY_TIERS). This gives better-quality drops a
-    meaningful payoff through the entire crafting chain: raw pelt rarity →
-    cured pelt rarity (bumped) → crafted piece stat scaling.
+
+def _cure_pelt_item(warrior, raw_pelt):
+    """
+    Spend the cure fee, consume `raw_pelt` (unequipping it if worn) and put
+    its Cured counterpart in the bag. No prompts — callers check gold first.
     """
     from shared import Equipment
-    from equipment import unequip_item, RARITY_ORDER, EXTRA_RARITY_TIERS
-    cost = cure_cost(raw_pelt)
-    if warrior.gold < cost:
-        print(_wrap(f"  Not enough gold to cure this (need {cost}g)."))
-        input("\n  Press Enter...")
-        return False
-
+    from equipment import unequip_item
     from gold import spend_gold as _spend_gold
-    _spend_gold(warrior, cost)  # v0.7.18: tracks total_gold_spent
+    _spend_gold(warrior, cure_cost(raw_pelt))  # v0.7.18: tracks total_gold_spent
     is_equipped = any(eq is raw_pelt for eq in warrior.equipment.values())
     if is_equipped:
         unequip_item(warrior, raw_pelt)  # reverses stats, moves it into inventory
     if raw_pelt in warrior.inventory:
         warrior.inventory.remove(raw_pelt)
 
-    # --- Rarity bump: one tier up, mythril → mythril+ via EXTRA_RARITY_TIERS ---
-    input_rarity = getattr(raw_pelt, "rarity", "normal")
     cured_name = f"Cured {raw_pelt.name}"
-    extra = EXTRA_RARITY_TIERS.get(cured_name)
-    if extra and input_rarity == extra["trigger_rarity"]:
-        output_rarity = extra["key"]
-        rarity_label = extra["label"]
-    elif input_rarity in RARITY_ORDER:
-        idx = RARITY_ORDER.index(input_rarity)
-        output_rarity = RARITY_ORDER[min(idx + 1, len(RARITY_ORDER) - 1)]
-        rarity_label = output_rarity.title()
-    else:
-        output_rarity = input_rarity
-        rarity_label = output_rarity.title()
-
+    output_rarity, _ = _cured_rarity(cured_name, getattr(raw_pelt, "rarity", "normal"))
     cured = Equipment(
         name    = cured_name,
         slot    = "material",
@@ -1547,6 +1602,27 @@ def _cure_pelt(warrior, raw_pelt):
         flavour = "Cured and stiffened — ready to reinforce a piece of armor. Won't hold up worn on its own.",
     )
     warrior.inventory.append(cured)
+    return cured
+
+
+def _cure_pelt(warrior, raw_pelt):
+    """Consume one raw pelt + gold, produce its Cured counterpart in the bag.
+
+    v0.7.19: curing now BUMPS the rarity by one tier — an uncommon raw pelt
+    produces a rare Cured Pelt, etc. A mythril raw pelt produces a Mythril+
+    Cured Pelt (via EXTRA_RARITY_TIERS). This gives better-quality drops a
+    meaningful payoff through the entire crafting chain: raw pelt rarity →
+    cured pelt rarity (bumped) → crafted piece stat scaling.
+    """
+    cost = cure_cost(raw_pelt)
+    if warrior.gold < cost:
+        print(_wrap(f"  Not enough gold to cure this (need {cost}g)."))
+        input("\n  Press Enter...")
+        return False
+
+    input_rarity = getattr(raw_pelt, "rarity", "normal")
+    cured = _cure_pelt_item(warrior, raw_pelt)
+    output_rarity, rarity_label = _cured_rarity(cured.name, input_rarity)
     print()
     print(_wrap(
         f"  ✅ Cured the {raw_pelt.name} for {cost}g — you now have a "
@@ -1632,6 +1708,7 @@ def _show_recipe_categories(warrior):
     dire_pieces = dire_wolf_set_active_pieces(warrior)
     print(f"  1) 🐺 Wolf-Hide Set  (Tier 1)   — {wolf_pieces}/4 pieces equipped")
     print(f"  2) 🐗 Dire Wolf Set  (Tier 2)   — {dire_pieces}/4 pieces equipped")
+    print("  3) 📋 Plan a batch — craft a whole set in one step")
     print()
     print("  0) Back to crafter menu")
 
@@ -1682,7 +1759,7 @@ def _render_recipe_set_menu(warrior, set_label, recipes_dict, header_text):
 
         equipped = any(it is not None and getattr(it, "name", "") == name
                        for it in warrior.equipment.values())
-        owned    = any(getattr(it, "name", "") == name for it in warrior.inventory)
+        owned    = _bag(warrior).count_named(name) > 0
         marker = " [EQUIPPED]" if equipped else (" [in bag]" if owned else "")
 
         # v0.7.17: stats now scale with the rarity the player can currently
@@ -1763,6 +1840,152 @@ def _recipe_category_loop(warrior, menu_fn):
         _craft_recipe(warrior, recipe_name, recipe)
 
 
+# ============================================================
+# UI — BATCH PLANNER
+# ============================================================
+# v0.7.21: plan a whole set (or every tusk) in one go. craft_planner
+# works out which copy feeds which piece — raw pelts cured on the way —
+# for the least gold or the best rarity the purse allows.
+
+def _rarity_word(rarity):
+    return rarity.replace("_plus", "+").title()
+
+
+def _batch_presets(warrior):
+    """[(label, recipe names)] for the batch menu — sets minus pieces owned."""
+    owned = {getattr(it, "name", "") for it in warrior.inventory}
+    owned |= {getattr(it, "name", "") for it in warrior.equipment.values() if it is not None}
+    presets = []
+    for label, recipes in (("Wolf-Hide set", WOLF_HIDE_RECIPES),
+                           ("Dire Wolf set", DIRE_WOLF_RECIPES)):
+        todo = [n for n in recipes if n not in owned] or list(recipes)
+        presets.append((f"{label} ({len(todo)} piece{'s' if len(todo) != 1 else ''})", todo))
+    tusks = _count_inventory(warrior, "Javelina Tusk")
+    if tusks:
+        presets.append((f"Sharpen every Javelina Tusk ({tusks})", ["Sharpened Tusk"] * tusks))
+    return presets
+
+
+def _pick_custom_batch():
+    names = list(ALL_RECIPES)
+    print()
+    for i, name in enumerate(names, start=1):
+        print(f"  {i:>2}) {name}")
+    print()
+    print(_wrap("  Enter recipe numbers separated by commas (repeats allowed, e.g. 9,9):"))
+    picked = []
+    for part in input("  > ").split(","):
+        part = part.strip()
+        if part.isdigit() and 1 <= int(part) <= len(names):
+            picked.append(names[int(part) - 1])
+    return picked
+
+
+def _show_batch_plan(warrior, batch):
+    """The one-screen plan: each piece, what feeds it, what it costs."""
+    _clear_screen()
+    print("=" * 52)
+    print(f"  📋 Batch Plan ({batch['goal']})   |   Your Gold: {warrior.gold}g")
+    print("=" * 52)
+    print()
+    if batch["missing"]:
+        print(_wrap(f"  Not enough components — you need: {', '.join(batch['missing'])}"))
+        return
+    for name, units, gold, craft_rarity in batch["steps"]:
+        print(f"  • {_rarity_word(craft_rarity)} {name}  — {gold}g")
+        for comp, source, rarity, as_rarity, cure_gold, _ in units:
+            if cure_gold:
+                print(f"      {_rarity_word(rarity)} {source} → cure ({cure_gold}g) → "
+                      f"{_rarity_word(as_rarity)} {comp}")
+            else:
+                print(f"      {_rarity_word(rarity)} {comp}")
+    print()
+    print(f"  Total: {batch['cost']}g   |   Gold left after: {warrior.gold - batch['cost']}g")
+    if not batch["ok"]:
+        print(_wrap(f"  ⚠️  You're {batch['short']}g short for even the cheapest plan."))
+
+
+def _run_batch(warrior, names):
+    import craft_planner
+    goal = "cheapest"
+    while True:
+        batch = craft_planner.plan(warrior, names, goal)
+        _show_batch_plan(warrior, batch)
+        print()
+        other = "best" if goal == "cheapest" else "cheapest"
+        if batch["ok"]:
+            print("  Y) Craft it all")
+        print(f"  G) Switch to {other} plan")
+        print("  0) Back")
+        print("  M) Main menu")
+        choice = input("  > ").strip().lower()
+        if choice == "0" or choice == "":
+            return
+        if choice == "m":
+            raise _ReturnToCrafterMenu()
+        if choice == "g":
+            goal = other
+        elif choice == "y" and batch["ok"]:
+            break
+
+    made = craft_planner.carry_out(warrior, batch)
+    if made is None:
+        print(_wrap("  Your bag changed since the plan was made — nothing was crafted."))
+        input("\n  Press Enter...")
+        return
+    print()
+    for item in made:
+        print(_wrap(f"  ✅ Crafted: {item.short_label().splitlines()[0]}"))
+    print(_wrap(f"  Spent {batch['cost']}g."))
+
+    from equipment import equip_item
+    wearable = {}                       # one new piece per slot (tusks are socket fodder)
+    for item in made:
+        if item.name not in TUSK_RECIPES:
+            wearable.setdefault(item.slot, item)
+    if wearable:
+        print()
+        equip_now = input("  Equip the new pieces now? (y/n): ").strip().lower()
+        if equip_now == "y":
+            for item in wearable.values():
+                equip_item(warrior, item)
+    input("\n  Press Enter...")
+
+
+def _plan_batch_menu(warrior):
+    """Pick what to make; the planner decides how."""
+    while True:
+        _clear_screen()
+        print("=" * 52)
+        print(f"  📋 Plan a Batch   |   Your Gold: {warrior.gold}g")
+        print("=" * 52)
+        print()
+        print(_wrap("  'Tell me what you want made. I'll work out which hide goes "
+                    "where — and cure any raw ones while I'm at it.'"))
+        print()
+        presets = _batch_presets(warrior)
+        for i, (label, _) in enumerate(presets, start=1):
+            print(f"  {i}) {label}")
+        print(f"  {len(presets) + 1}) Pick recipes yourself")
+        print()
+        print("  0) Back")
+        print("  M) Main menu")
+        choice = input("  > ").strip().lower()
+        if choice == "0" or choice == "":
+            return
+        if choice == "m":
+            raise _ReturnToCrafterMenu()
+        if not choice.isdigit():
+            continue
+        idx = int(choice) - 1
+        if 0 <= idx < len(presets):
+            _run_batch(warrior, presets[idx][1])
+        elif idx == len(presets):
+            names = _pick_custom_batch()
+            if names:
+                _run_batch(warrior, names)
+
+
 def _recipe_loop(warrior):
     """v0.7.13: Top-level recipe menu — pick Wolf-Hide or Dire Wolf tab,
     then browse just that set. Replaces the old both-sets-on-one-screen view."""
@@ -1776,6 +1999,8 @@ def _recipe_loop(warrior):
             _recipe_category_loop(warrior, _show_wolf_hide_recipes_menu)
         elif raw == "2":
             _recipe_category_loop(warrior, _show_dire_wolf_recipes_menu)
+        elif raw == "3":
+            _plan_batch_menu(warrior)
 
 
 # ============================================================
@@ -1818,6 +2043,33 @@ def _previous_set_bonus_state(warrior, attr_name):
     })
 
 
+# v0.7.21: the per-set stat curves, as data — the apply_* functions below
+# and the loadout optimizer (loadout.py) both read them. Cumulative:
+# each threshold's stats stack on the ones below it.
+SET_BONUS_STATS = {
+    "wolf_hide": [
+        (2, {"max_hp": 5}),
+        (3, {"max_ap": 1}),
+        (4, {"defence": 2, "atk_min": 2, "atk_max": 2}),
+    ],
+    "dire_wolf": [
+        (2, {"max_hp": 8}),
+        (3, {"max_ap": 2}),
+        (4, {"defence": 3, "atk_min": 3, "atk_max": 3}),
+    ],
+}
+
+
+def set_bonus_for(set_label, pieces):
+    """The stat bonus {max_hp, max_ap, defence, atk_min, atk_max} for `pieces` equipped."""
+    new = {"max_hp": 0, "max_ap": 0, "defence": 0, "atk_min": 0, "atk_max": 0}
+    for threshold, stats in SET_BONUS_STATS[set_label]:
+        if pieces >= threshold:
+            for field, value in stats.items():
+                new[field] += value
+    return new
+
+
 def apply_wolf_set_bonus(warrior):
     """
     Recalculate the Wolf-Hide set bonus on the warrior. Removes the
@@ -1835,15 +2087,7 @@ def apply_wolf_set_bonus(warrior):
     pieces = wolf_set_active_pieces(warrior)
 
     # Compute NEW bonus
-    new = {"max_hp": 0, "max_ap": 0, "defence": 0, "atk_min": 0, "atk_max": 0}
-    if pieces >= 2:
-        new["max_hp"] += 5
-    if pieces >= 3:
-        new["max_ap"] += 1
-    if pieces >= 4:
-        new["defence"] += 2
-        new["atk_min"] += 2
-        new["atk_max"] += 2
+    new = set_bonus_for("wolf_hide", pieces)
 
     # Remove OLD bonus
     old = _previous_set_bonus_state(warrior, "_wolf_hide_bonus_applied")
@@ -1893,15 +2137,7 @@ def apply_dire_wolf_set_bonus(warrior):
     pieces = dire_wolf_set_active_pieces(warrior)
 
     # Compute NEW bonus
-    new = {"max_hp": 0, "max_ap": 0, "defence": 0, "atk_min": 0, "atk_max": 0}
-    if pieces >= 2:
-        new["max_hp"] += 8
-    if pieces >= 3:
-        new["max_ap"] += 2
-    if pieces >= 4:
-        new["defence"] += 3
-        new["atk_min"] += 3
-        new["atk_max"] += 3
+    new = set_bonus_for("dire_wolf", pieces)
 
     # Remove OLD bonus
     old = _previous_set_bonus_state(warrior, "_dire_wolf_bonus_applied")
@@ -2283,8 +2519,7 @@ def migrate_legacy_sockets(item):
 
 def _socketable_items_in_inventory(warrior):
     """Return list of inventory items that can be inserted into a weapon socket."""
-    return [it for it in warrior.inventory
-            if getattr(it, "name", "") in SOCKETABLE_INTO_WEAPON]
+    return _bag(warrior).named(*SOCKETABLE_INTO_WEAPON)
 
 
 def _socket_source_candidates(warrior, name_set):
@@ -2296,8 +2531,7 @@ def _socket_source_candidates(warrior, name_set):
     menu auto-unequips it first instead of making the player do a separate
     unequip round-trip through the inventory menu.
     """
-    out = [(it, False) for it in warrior.inventory
-           if getattr(it, "name", "") in name_set]
+    out = [(it, False) for it in _bag(warrior).named(*name_set)]
     acc = warrior.equipment.get("accessory")
     if acc is not None and getattr(acc, "name", "") in name_set:
         out.append((acc, True))
@@ -2334,9 +2568,7 @@ def _weapons_with_sockets_in_inventory(warrior):
         if equipped.socket_count() > 0:
             candidates.append((f"{equipped.short_label()} [equipped]", equipped))
     # Inventory weapons
-    for it in warrior.inventory:
-        if getattr(it, "slot", "") != "weapon":
-            continue
+    for it in _bag(warrior).in_slot("weapon"):
         if it.socket_count() > 0:
             candidates.append((f"{it.short_label()} [in bag]", it))
     return candidates
@@ -2501,9 +2733,7 @@ def _armor_with_sockets_in_inventory(warrior):
     if equipped is not None and getattr(equipped, "slot", None) == "armor":
         if equipped.socket_count() > 0:
             candidates.append((f"{equipped.short_label()} [equipped]", equipped))
-    for it in warrior.inventory:
-        if getattr(it, "slot", "") != "armor":
-            continue
+    for it in _bag(warrior).in_slot("armor"):
         if it.socket_count() > 0:
             candidates.append((f"{it.short_label()} [in bag]", it))
     return candidates
@@ -2511,8 +2741,7 @@ def _armor_with_sockets_in_inventory(warrior):
 
 def _socketable_armor_items_in_inventory(warrior):
     """Cured pelts in the bag, ready to slot into an armor piece."""
-    return [it for it in warrior.inventory
-            if getattr(it, "name", "") in SOCKETABLE_INTO_ARMOR]
+    return _bag(warrior).named(*SOCKETABLE_INTO_ARMOR)
 
 
 def _apply_equipped_armor_socket_delta(hero, item, def_delta, hp_delta):
@@ -2771,6 +3000,80 @@ def _armor_socket_loop(warrior):
             _show_socket_menu_for_armor(warrior, armor)
 
 
+# ============================================================
+# UI — SOCKET PLANNER
+# ============================================================
+# v0.7.21: one screen that lays out every socketable across the worn
+# weapon + chest armor for a chosen objective. socket_planner picks the
+# layout; applying it is a single charge for all the moves.
+
+def _socket_row(items, count):
+    labels = [it.short_label().splitlines()[0] for it in items]
+    return ", ".join(labels + ["empty"] * (count - len(items))) or "—"
+
+
+def _show_socket_plan(warrior, socket_plan):
+    _clear_screen()
+    print("=" * 52)
+    print(f"  📋 Socket Plan ({socket_plan['objective']})   |   Your Gold: {warrior.gold}g")
+    print("=" * 52)
+    print()
+    for (kind, host), items, was in zip(socket_plan["hosts"], socket_plan["layout"],
+                                        socket_plan["current"]):
+        tag = "Weapon" if kind == "weapon" else "Armor"
+        print(_wrap(f"  {tag}: {host.short_label().splitlines()[0]}"))
+        print(_wrap(f"      now:  {_socket_row(was, host.socket_count())}"))
+        if [id(it) for it in items] != [id(it) for it in was]:
+            print(_wrap(f"      plan: {_socket_row(items, host.socket_count())}"))
+    pulled = [(it, where) for it, where, _ in socket_plan["moves"]
+              if where != "bag" and all(where[0] is not h for _, h in socket_plan["hosts"])]
+    if pulled:
+        print()
+        for it, (holder, _) in pulled:
+            print(_wrap(f"  • Pulls {it.short_label().splitlines()[0]} out of your {holder.name}"))
+    print()
+    print(f"  Score: {socket_plan['current_value']:.1f} → {socket_plan['value']:.1f}"
+          f"   |   Cost: {socket_plan['cost']}g")
+
+
+def _socket_plan_menu(warrior):
+    import socket_planner
+    objectives = list(socket_planner.OBJECTIVES)
+    objective = objectives[0]
+    while True:
+        socket_plan = socket_planner.plan(warrior, objective)
+        if not socket_plan["hosts"]:
+            _clear_screen()
+            print(_wrap("  Wear a socketed weapon or chest armor first — the plan only "
+                        "fills gear you have on."))
+            input("\n  Press Enter...")
+            return
+        _show_socket_plan(warrior, socket_plan)
+        print()
+        changed = socket_plan["changes"] > 0
+        if changed:
+            print("  Y) Socket it all")
+        else:
+            print(_wrap("  Your sockets are already the best you can afford for this."))
+        nxt = objectives[(objectives.index(objective) + 1) % len(objectives)]
+        print(f"  O) Plan for {nxt} instead")
+        print("  0) Back")
+        print("  M) Main menu")
+        choice = input("  > ").strip().lower()
+        if choice == "0" or choice == "":
+            return
+        if choice == "m":
+            raise _ReturnToCrafterMenu()
+        if choice == "o":
+            objective = nxt
+        elif choice == "y" and changed:
+            if socket_planner.apply_plan(warrior, socket_plan):
+                print(_wrap(f"  ✅ Sockets rearranged for {objective}. Spent {socket_plan['cost']}g."))
+            else:
+                print(_wrap("  Your gear changed since the plan was made — nothing was moved."))
+            input("\n  Press Enter...")
+
+
 def _socket_loop(warrior):
     """
     v0.6.20: Front-menu for socketing. Player picks Weapon or Armor;
@@ -2787,6 +3090,7 @@ def _socket_loop(warrior):
         print()
         print("  1) Weapon")
         print("  2) Armor")
+        print("  3) 📋 Plan sockets (best for burst / sustain / resistance)")
         print()
         print("  0) Back")
         print("  M) Main menu")
@@ -2800,6 +3104,8 @@ def _socket_loop(warrior):
             _weapon_socket_loop(warrior)
         elif choice == "2":
             _armor_socket_loop(warrior)
+        elif choice == "3":
+            _socket_plan_menu(warrior)
 
 
 def _weapon_socket_loop(warrior):
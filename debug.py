@@ -1065,7 +1065,7 @@ def _debug_potion_menu(warrior):
 
 
 
-def monster_select_menu():
+def monster_select_menu(warrior=None):
     clear_screen()
     print("===== MONSTER SELECT (DEBUG) =====")
     print("Choose a monster to fight:")
@@ -1151,6 +1151,11 @@ def monster_select_menu():
     apply_level_scaling_debug_any(monster, level=lvl)
 
     print(f"✅ Spawned: {monster.display_name} (Level {monster.level})")
+    # v0.7.21: odds against the hero who'd fight it
+    from win_odds import odds_line
+    odds = odds_line(warrior, monster)
+    if odds:
+        print(odds)
     input("\nPress Enter")
     return monster
 
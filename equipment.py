@@ -124,7 +124,7 @@ def get_off_hand_only_atk(hero):
     return base_min + off.atk_min, base_max + off.atk_max
 
 
-def equip_item(hero, item):
+def equip_item(hero, item, slot=None):
     """
     Moves an item from inventory into the correct equipment slot.
     If something is already in that slot, swaps it back to inventory.
@@ -136,11 +136,21 @@ def equip_item(hero, item):
     v0.6.19: Returns True on successful equip, False on any cancel/block
     path. Callers handing in a not-yet-bagged item MUST check the return
     and bag the item themselves on False, or the item is silently lost.
+
+    v0.7.21: `slot` names the exact equipment slot ("finger_2", "off_hand",
+    ...) for callers that have already decided (the loadout optimizer) —
+    no routing, no prompts. The caller clears the slot(s) first; a
+    two-handed weapon still needs both hands empty.
     """
-    slot = item.slot
+    target, slot = slot, item.slot
+
+    if target is not None:
+        slot = target
+        if getattr(item, "two_handed", False) and hero.equipment.get("off_hand") is not None:
+            return False
 
     # --- Ring routing: pick which finger ---
-    if slot == "ring":
+    elif slot == "ring":
         f1 = hero.equipment.get("finger_1")
         f2 = hero.equipment.get("finger_2")
         if f1 is None:
@@ -531,6 +541,35 @@ def unequip_item(hero, item):
 
     print(f"\n🔄 Unequipped: {item.name} — returned to inventory")
 
+def _auto_equip_best(hero):
+    """Show what best_loadout() would change, and wear it on a yes."""
+    import loadout
+    result = loadout.best_loadout(hero)
+    slots = result["slots"]
+    changes = [s for s in loadout.ALL_SLOTS if hero.equipment.get(s) is not slots.get(s)]
+    print()
+    if not changes:
+        print(wrap(f"  You're already wearing the best loadout for round {result['round']}."))
+        return
+    print(wrap(f"  Best loadout for round {result['round']}:"))
+    for slot in changes:
+        old, new = hero.equipment.get(slot), slots.get(slot)
+        old_label = old.short_label().splitlines()[0] if old else "(empty)"
+        new_label = new.short_label().splitlines()[0] if new else "(empty)"
+        print(f"  {slot.replace('_', ' ').title():<10} {old_label}  →  {new_label}")
+    stats = result["stats"]
+    print(wrap(
+        f"  ATK {stats['atk_min']}-{stats['atk_max']}  DEF {stats['defence']}  "
+        f"Max HP {stats['max_hp']}  Max AP {stats['max_ap']}"
+    ))
+    print(wrap(
+        f"  Estimated edge vs the round's opponents: "
+        f"{result['current'] * 100:.0f}% → {result['score'] * 100:.0f}%"
+    ))
+    if input("  Equip it? (y/n): ").strip().lower() == "y":
+        loadout.equip_loadout(hero, slots)
+
+
 def inventory_menu(hero):
     """
     Shows the player's equipped gear and unequipped inventory.
@@ -576,6 +615,7 @@ def inventory_menu(hero):
 
         print("\n  i<number> — inspect item (e.g. i1)")
         print("  <slot>    — unequip slot (main / off / armor / helm / cape / accessory / trinket / finger1 / finger2)")
+        print("  best      — auto-equip the best loadout for the next fight")
         print("  0         — back")
 
         choice = input("\nEnter item number to equip, slot to unequip, or i# to inspect: ").strip().lower()
@@ -583,6 +623,12 @@ def inventory_menu(hero):
         if choice == "0":
             return
 
+        # v0.7.21: one-step best loadout (see loadout.py)
+        if choice == "best":
+            _auto_equip_best(hero)
+            input("\nPress Enter...")
+            continue
+
         # Map user-facing slot aliases to internal equipment dict keys
         SLOT_ALIASES = {
             # v0.6.18: main_hand / off_hand are the canonical slot names
@@ -670,45 +716,62 @@ def inventory_menu(hero):
 
 RARITY_ORDER = ["poor", "normal", "uncommon", "rare", "epic", "legendary", "mythril"]
 
-def roll_rarity(monster_level=1, round_num=0):
-    """Returns a rarity string based on monster level and round.
-    On Champion difficulty, poor drops are removed; normal/uncommon/rare only
-    (50%/30%/20%). rare/epic/legendary/mythril otherwise require debug or boss drops."""
-    if round_num == 1:
+def _rarity_cuts(champion, first_round, level_bucket):
+    """((cut, rarity), ...) over a 1-100 roll: the first cut >= the roll wins."""
+    # Champion difficulty: no poor drops; normal/uncommon/rare only
+    # Base 50% normal, 30% uncommon, 20% rare  — v0.7.14 (was 60/30/10)
+    # v0.7.15: higher variants (Hardened/Veteran/Elite) shift +10% into rare
+    # per level above 1, taken out of normal. Uncommon stays flat at 30%.
+    if champion:
+        if level_bucket == 3:
+            n_cut, u_cut = 30, 60    # 30% normal / 30% uncommon / 40% rare
+        elif level_bucket == 2:
+            n_cut, u_cut = 40, 70    # 40% normal / 30% uncommon / 30% rare
+        else:
+            n_cut, u_cut = 50, 80    # 50% normal / 30% uncommon / 20% rare
+        return ((n_cut, "normal"), (u_cut, "uncommon"), (100, "rare"))
+
+    if first_round:
         thresholds = (30, 80)   # <=30 poor, <=80 normal, else uncommon
-    elif monster_level >= 3:
+    elif level_bucket == 3:
         thresholds = (15, 65)
-    elif monster_level == 2:
+    elif level_bucket == 2:
         thresholds = (40, 85)
     else:
         thresholds = (65, 90)
+    return ((thresholds[0], "poor"), (thresholds[1], "normal"), (100, "uncommon"))
 
-    # Champion difficulty: no poor drops; normal/uncommon/rare only
-    # Base 50% normal, 30% uncommon, 20% rare  — v0.7.14 (was 60/30/10)
-    # v0.7.15: higher variants (Hardened/Veteran/Elite) shift +10% into rare
-    # per level above 1, taken out of normal. Uncommon stays flat at 30%.
+
+# v0.7.21: every cut table built once at import, keyed by
+# (champion, round 1, level bucket 1-3). Same randint(1, 100) per drop as
+# before; samplers.py reads this table for its alias draws.
+RARITY_CUTS = {
+    (champion, first_round, level_bucket): _rarity_cuts(champion, first_round, level_bucket)
+    for champion in (False, True)
+    for first_round in (False, True)
+    for level_bucket in (1, 2, 3)
+}
+
+
+def rarity_key(monster_level=1, round_num=0, difficulty="warrior"):
+    """The RARITY_CUTS key for a drop."""
+    level_bucket = 3 if monster_level >= 3 else 2 if monster_level == 2 else 1
+    return (difficulty == "champion", round_num == 1, level_bucket)
+
+
+def roll_rarity(monster_level=1, round_num=0):
+    """Returns a rarity string based on monster level and round.
+    On Champion difficulty, poor drops are removed; normal/uncommon/rare only
+    (50%/30%/20%). rare/epic/legendary/mythril otherwise require debug or boss drops."""
     import sys
     _main = sys.modules.get("__main__")
     _diff = getattr(_main, "DIFFICULTY", "warrior") if _main else "warrior"
-    if _diff == "champion":
-        if monster_level >= 3:
-            n_cut, u_cut = 30, 60    # 30% normal / 30% uncommon / 40% rare
-        elif monster_level == 2:
-            n_cut, u_cut = 40, 70    # 40% normal / 30% uncommon / 30% rare
-        else:
-            n_cut, u_cut = 50, 80    # 50% normal / 30% uncommon / 20% rare
-        r = random.randint(1, 100)
-        if r <= n_cut:   return "normal"
-        elif r <= u_cut: return "uncommon"
-        else:            return "rare"
-    
+
     r = random.randint(1, 100)
-    if r <= thresholds[0]:
-        return "poor"
-    elif r <= thresholds[1]:
-        return "normal"
-    else:
-        return "uncommon"
+    for cut, rarity in RARITY_CUTS[rarity_key(monster_level, round_num, _diff)]:
+        if r <= cut:
+            return rarity
+    return rarity
 
 
 # Stat tables per rarity for each sac.
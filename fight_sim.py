@@ -0,0 +1,505 @@
+"""
+fight_sim.py — The arena fight loop, without the prompts
+--------------------------------------------------------
+battle_inner is the fight as the player sees it: menus, screens, a prompt
+every turn. run(hero, enemy, policy) plays the same fight headless — the
+turn order, status skips, DoT ticks, enemy AI and special moves all come
+from the real combat / monster functions, only the player's menu choice
+is replaced by a policy:
+
+    "attack"     basic attack every turn (weapon, else accessory)
+    "best"       weapon or accessory attack, whichever hits harder on
+                 average against this enemy
+
+Used two ways:
+  - on scratch copies inside sandbox() for win_odds' short simulations —
+    silent, its own dice (the run's random state is put back), and the
+    combat log / battle stats restored afterwards;
+  - on the real hero + enemy inside quiet() (auto_resolve), with the run's
+    own dice, where what it logged is the fight's log.
+
+For balance comparisons, patched() applies a variant (tables, monster
+stats) for the duration, and sandbox(seed, antithetic=True) replays the
+mirror image of seed's dice — same seed, same stream across variants
+(common random numbers), its mirror for the antithetic twin (jtwh_ab).
+
+Boss fights (Fallen Warrior, Young Chimera, Patronus) run their own
+scripted flows around battle_inner and aren't covered: supported() is
+False for them.
+
+The player's turn skips the menu-only detours (First Aid for paralyze /
+blind, skills, potions, trinkets) — a policy only ever attacks.
+"""
+
+import contextlib
+import copy
+import functools
+import io
+import random
+
+
+BOSS_FLOWS = ("Fallen Warrior", "Young Chimera", "Patronus")
+MAX_TURNS = 80          # a stalemate guard; real arena fights end long before
+POLICIES = ("attack", "best")
+
+
+def _combat():
+    import combat
+    return combat
+
+
+def supported(enemy):
+    return getattr(enemy, "name", "") not in BOSS_FLOWS
+
+
+# ============================================================
+# ISOLATION
+# ============================================================
+
+class _Sink(io.StringIO):
+    def isatty(self):
+        return False
+
+
+def _no_input(prompt=""):
+    return ""
+
+
+def _no_sleep(seconds=0):
+    pass
+
+
+@contextlib.contextmanager
+def quiet():
+    """stdout swallowed (HP bars drawn plain — nobody sees them), input()
+    answered blank and no animation pauses, for a fight nobody is watching."""
+    import builtins
+    import time
+    import ui_bars
+    rich = ui_bars._HAS_RICH
+    ui_bars._HAS_RICH = False
+    real_input, real_sleep = builtins.input, time.sleep
+    builtins.input, time.sleep = _no_input, _no_sleep
+    try:
+        with contextlib.redirect_stdout(_Sink()):
+            yield
+    finally:
+        builtins.input, time.sleep = real_input, real_sleep
+        ui_bars._HAS_RICH = rich
+
+
+class _Mirrored(random.Random):
+    """The same Mersenne Twister stream with every draw reflected —
+    random() u -> 1 - u, randint / choice / shuffle k -> n - 1 - k — so a
+    run on it is the antithetic twin of a run on the plain stream."""
+
+    def random(self):
+        u = super().random()
+        return 1.0 - u if u else 0.0
+
+    def _randbelow(self, n):
+        return n - 1 - super()._randbelow(n)
+
+
+@contextlib.contextmanager
+def _mirrored(seed):
+    """The random module's functions drawn from a _Mirrored(seed) for the duration."""
+    twin = _Mirrored(seed)
+    saved = {name: fn for name, fn in vars(random).items() if getattr(fn, "__self__", None) is random._inst}
+    for name in saved:
+        setattr(random, name, getattr(twin, name))
+    try:
+        yield
+    finally:
+        for name, fn in saved.items():
+            setattr(random, name, fn)
+
+
+@contextlib.contextmanager
+def sandbox(seed=None, silent=True, antithetic=False):
+    """
+    Run throwaway fights: quiet(), the random module reseeded with `seed`
+    and restored after, and the combat log + battle/run stats put back the
+    way they were. silent=False leaves stdout / input() to the caller (a
+    tool driving the real prompts). antithetic=True draws from the
+    mirror image of seed's stream (see _Mirrored).
+    """
+    state = random.getstate()           # before any first-time import rolls
+    import combat_log
+    saved_log = list(combat_log.COMBAT_LOG)
+    saved_battle = dict(combat_log._battle_stats)
+    saved_run = dict(combat_log._run_stats)
+    random.seed(seed)
+    try:
+        with _mirrored(seed) if antithetic else contextlib.nullcontext():
+            with quiet() if silent else contextlib.nullcontext():
+                yield
+    finally:
+        random.setstate(state)
+        combat_log.COMBAT_LOG[:] = saved_log
+        combat_log._battle_stats.clear()
+        combat_log._battle_stats.update(saved_battle)
+        combat_log._run_stats.clear()
+        combat_log._run_stats.update(saved_run)
+
+
+_DIFFICULTY_TABLES = ("DIFFICULTY_MONSTER_MULT", "DIFFICULTY_BOSS_MULT", "DIFFICULTY_GOLD_MULT",
+                      "DIFFICULTY_SCORE_MULT", "DIFFICULTY_XP_MULT")
+
+
+@contextlib.contextmanager
+def difficulty(name):
+    """
+    The run's difficulty set to `name` everywhere the game reads it —
+    __main__.DIFFICULTY (monster scaling, gold, loot, score) and
+    combat.DIFFICULTY. When the game isn't __main__ (a tool, the harness),
+    combat's multiplier tables are put on __main__ for the duration too.
+    """
+    import sys
+    combat = _combat()
+    main = sys.modules["__main__"]
+    names = ("DIFFICULTY",) + _DIFFICULTY_TABLES
+    saved = {n: getattr(main, n) for n in names if hasattr(main, n)}
+    saved_combat = combat.DIFFICULTY
+    for n in _DIFFICULTY_TABLES:
+        if n not in saved:
+            setattr(main, n, getattr(combat, n))
+    main.DIFFICULTY = combat.DIFFICULTY = name
+    try:
+        yield
+    finally:
+        for n in names:
+            if n in saved:
+                setattr(main, n, saved[n])
+            elif hasattr(main, n):
+                delattr(main, n)
+        combat.DIFFICULTY = saved_combat
+
+
+@contextlib.contextmanager
+def patched(patch):
+    """
+    A balance variant for the duration: `patch` maps dotted targets to
+    the values to try, all put back after.
+
+        "merchant.POTION_PRICES"                module attribute
+        "combat.DIFFICULTY_BOSS_MULT.champion"  one entry of a table
+        "monsters.Wolf_Pup_Rider.defence"       a monster stat, on every
+                                                instance built meanwhile
+
+    A monster stat that is a Monster() argument (hp, min_atk, defence, ...)
+    is passed in as that argument, so max_hp and the psychic-debuff bases
+    follow it; anything else is set once the monster's __init__ is done.
+    """
+    import importlib
+    from shared import Monster
+    undo = []
+    try:
+        for target, value in (patch or {}).items():
+            module, *path = target.split(".")
+            if not path:
+                raise KeyError(f"patch target {target!r} is not module.name")
+            obj = importlib.import_module(module)
+            for part in path[:-1]:
+                obj = obj[_table_key(obj, part)] if isinstance(obj, dict) else getattr(obj, part)
+            name = path[-1]
+            if isinstance(obj, dict):
+                undo.append(_patch_entry(obj, _table_key(obj, name), value))
+            elif isinstance(obj, type) and issubclass(obj, Monster):
+                undo.append(_patch_monster(obj, name, value))
+            else:
+                undo.append(functools.partial(setattr, obj, name, getattr(obj, name)))
+                setattr(obj, name, value)
+        yield
+    finally:
+        while undo:
+            undo.pop()()
+
+
+def _table_key(table, part):
+    """Path parts are strings; GOLD_CONFIG and friends are keyed by round number."""
+    if part not in table and part.isdigit() and int(part) in table:
+        return int(part)
+    return part
+
+
+def _patch_entry(table, key, value):
+    if key in table:
+        undo = functools.partial(table.__setitem__, key, table[key])
+    else:
+        undo = functools.partial(table.pop, key, None)
+    table[key] = value
+    return undo
+
+
+def _patch_monster(cls, name, value):
+    import inspect
+    from shared import Monster
+    params = inspect.signature(Monster.__init__).parameters
+    owner = Monster if name in params else cls
+    had = "__init__" in vars(owner)
+    previous = vars(owner).get("__init__")
+    wrapped = owner.__init__
+
+    if owner is Monster:
+        @functools.wraps(wrapped)       # signature() sees Monster's own through stacked patches
+        def __init__(self, *args, **kwargs):
+            if isinstance(self, cls):
+                bound = inspect.signature(wrapped).bind(self, *args, **kwargs)
+                bound.arguments[name] = value
+                args, kwargs = bound.args[1:], bound.kwargs
+            wrapped(self, *args, **kwargs)
+    else:
+        @functools.wraps(wrapped)
+        def __init__(self, *args, **kwargs):
+            wrapped(self, *args, **kwargs)
+            setattr(self, name, value)
+
+    owner.__init__ = __init__
+    if had:
+        return functools.partial(setattr, owner, "__init__", previous)
+    return functools.partial(delattr, owner, "__init__")
+
+
+def scratch(hero, enemy):
+    """Deep copies of the pair to fight on. The bag, essence and score
+    history never change mid-fight, so the copies share them."""
+    memo = {}
+    for attr in ("inventory", "monster_essence", "per_fight_scores", "fate_titles", "endings"):
+        value = getattr(hero, attr, None)
+        if value is not None:
+            memo[id(value)] = value
+    return copy.deepcopy((hero, enemy), memo)
+
+
+# ============================================================
+# POLICIES
+# ============================================================
+
+def _use_accessory(hero, enemy, policy):
+    has_weapon = hero.get_weapon() is not None
+    has_accessory = hero.equipment.get("accessory") is not None
+    if not has_accessory:
+        return False
+    if not has_weapon or policy != "best":
+        return not has_weapon
+    import loadout
+    acc = hero.equipment["accessory"]
+    weapon = hero.get_weapon()
+    lo, hi, d = hero.min_atk, hero.max_atk, getattr(enemy, "defence", 0)
+    plain = loadout._expected_taken(lo, hi, d)
+    with_weapon = loadout._expected_taken(lo + weapon.atk_min, hi + weapon.atk_min, d)
+    with_weapon += loadout._proc_damage(weapon)
+    return plain + loadout._element_damage(acc) > with_weapon
+
+
+# ============================================================
+# TURNS (mirror battle_inner's common path)
+# ============================================================
+
+def battle_start(hero, enemy):
+    """The stat changes battle_inner makes before the first turn."""
+    import math
+    combat = _combat()
+    hero.bonus_action_used = False
+    hero.berserk_used_this_fight = False
+    hero.death_defier_used_this_fight = False
+    if "charismatic_speaker" in getattr(hero, "titles", set()):
+        bonus = max(1, math.ceil(hero.max_atk * 0.15))
+        hero.min_atk += bonus
+        hero.max_atk += bonus
+        hero.charismatic_speaker_bonus = bonus
+    if hasattr(enemy, "flayed_charges"):
+        enemy.flayed_base_min_atk = enemy.min_atk
+        enemy.flayed_base_max_atk = enemy.max_atk
+        enemy.min_atk = enemy.flayed_base_min_atk + enemy.flayed_charges
+        enemy.max_atk = enemy.flayed_base_max_atk + enemy.flayed_charges
+        combat._flayed_apply_player_debuff(enemy, hero, enemy.flayed_charges, announce=False)
+
+
+def _hero_turn(hero, enemy, turn, policy):
+    """One player turn: "acted", "lost" (a turn stop — battle_inner skips
+    straight to the enemy, no DoT tick) or "dead" (a DoT finished them)."""
+    combat = _combat()
+    combat.roll_fatigue_save(hero, turn, enemy, is_player=True)
+
+    if getattr(hero, "blind_type", "") == "goblin_dust" and hero.blind_turns == 3:
+        if not getattr(hero, "last_turn_skipped", False):
+            hero.blind_turns -= 1
+            hero.last_turn_skipped = True
+            return "lost"
+        hero.is_blinded = False
+        hero.blind_turns = 0
+        hero.last_turn_skipped = False
+    elif combat.resolve_player_turn_stop(hero):
+        if not getattr(hero, "last_turn_skipped", False) or enemy.name == "Young Chimera":
+            hero.last_turn_skipped = True
+            return "lost"
+        hero.is_blinded = False                 # the Arena intervenes
+        hero.is_paralyzed = False
+        hero.paralyzed = False
+        hero.last_turn_skipped = False
+    else:
+        hero.last_turn_skipped = False
+
+    dot, parts, _ = combat.collect_dot_ticks(hero)
+    if dot > 0:
+        hero.hp = max(0, hero.hp - dot)
+        if hero.hp <= 0:
+            combat.try_death_defier(hero, "dot", enemy=enemy)
+        breakdown = ", ".join(f"{n} {v}" for n, v in parts)
+        combat.log(f"  [DOT] {hero.name} takes {dot} damage ({breakdown}). HP now: {hero.hp}/{hero.max_hp}")
+        combat.log_dot(hero.name, dot, is_player_target=True)
+        if not hero.is_alive():
+            return "dead"
+
+    if "combat_medic" in getattr(hero, "titles", set()):
+        hero.hp = min(hero.max_hp, hero.hp + max(1, int(hero.max_hp * 0.10)))
+
+    reduction = 1.0
+    if hero.is_blinded and getattr(hero, "blind_type", "") == "goblin_dust":
+        reduction = {2: 0.50, 1: 0.75}.get(hero.blind_turns, 1.0)
+    atk = combat.player_basic_attack(hero, enemy, multiplier=reduction,
+                                     use_accessory=_use_accessory(hero, enemy, policy))
+    if atk:
+        combat.log_attack(hero.name, enemy.display_name, atk["roll"], atk["actual"], atk["blocked"],
+                          bonus_parts=atk.get("bonus_parts"), effect_tag=atk.get("elem_tag", ""),
+                          is_player=True, is_special=False)
+        if "armor_piercer" in getattr(hero, "titles", set()) and getattr(enemy, "defence", 0) > 0:
+            enemy.defence = max(0, enemy.defence - 1)
+    return "acted"
+
+
+def _enemy_basic(enemy, hero, resolve_special=False):
+    combat = _combat()
+    combat.log(f"  [ENEMY] {enemy.display_name} attacks")
+    dealt = combat.enemy_attack(enemy, hero, resolve_special=resolve_special)
+    if dealt:
+        roll = dealt + max(0, getattr(hero, "defence", 0))
+        combat.log_attack(enemy.display_name, hero.name, roll, dealt, roll - dealt, is_player=False)
+
+
+def _enemy_special(enemy, hero, verb="uses"):
+    combat = _combat()
+    name = combat.SPECIAL_MOVE_NAMES.get(getattr(enemy.special_move, "__name__", ""), "Special Move")
+    combat.log(f"  [ENEMY] {enemy.display_name} {verb} {name}")
+    dealt = enemy.special_move(enemy, hero)
+    combat._stone_absorb_charge(hero)
+    if dealt:
+        combat.log_attack(enemy.display_name, hero.name, dealt, dealt, 0,
+                          effect_tag=f"[{name}]", is_player=False)
+    if hero.hp <= 0:
+        combat.try_death_defier(hero, f"{enemy.name} special", enemy=enemy)
+
+
+def _enemy_strike(enemy, hero, turn):
+    """The enemy's action proper (special or basic), as battle_inner picks
+    and logs it."""
+    combat = _combat()
+    if enemy.name in ("Flayed One", "Drowned One"):
+        _enemy_basic(enemy, hero)
+        if hero.is_alive() and combat.monster_ai_check(enemy, turn):
+            _enemy_special(enemy, hero, verb="follows with")
+        return
+    if combat.monster_ai_check(enemy, turn):
+        _enemy_special(enemy, hero)
+    else:
+        _enemy_basic(enemy, hero)
+
+
+def _enemy_turn(hero, enemy, turn):
+    """One enemy turn. False when it lost its action (paralyzed / fully
+    blinded) — battle_inner skips the end-of-turn updates then."""
+    combat = _combat()
+    combat.roll_fatigue_save(enemy, turn, enemy, is_player=False)
+    dot, parts, _ = combat.collect_dot_ticks(enemy)
+    if dot > 0:
+        enemy.hp = max(0, enemy.hp - dot)
+        breakdown = ", ".join(f"{n} {v}" for n, v in parts)
+        combat.log(f"  [DOT] {enemy.display_name} takes {dot} damage ({breakdown}). HP now: {enemy.hp}/{enemy.max_hp}")
+        combat.log_dot(enemy.display_name, dot, is_player_target=False)
+        if not enemy.is_alive():
+            return True
+
+    hero._stone_charged_this_turn = False
+    combat._tick_defence_break(enemy)
+    blind = getattr(enemy, "blind_turns", 0)
+    if getattr(enemy, "skip_turns", 0) > 0:
+        enemy.skip_turns -= 1
+        combat.update_defence_warp_after_enemy_turn(hero)
+        return False
+    if blind == 3:
+        enemy.blind_turns -= 1
+        combat.update_defence_warp_after_enemy_turn(hero)
+        return False
+    if blind > 0:
+        reduction = 0.50 if blind == 2 else 0.75
+        lo, hi = enemy.min_atk, enemy.max_atk
+        enemy.max_atk = max(1, int(hi * reduction))
+        enemy.min_atk = max(1, int(lo * reduction))
+        _enemy_strike(enemy, hero, turn)
+        enemy.min_atk, enemy.max_atk = lo, hi
+        enemy.blind_turns -= 1
+    else:
+        boost = 0
+        drown = getattr(hero, "drown_stacks", 0)
+        if drown > 0 and hero.ap < 1 + drown:
+            boost = 2
+            enemy.min_atk += boost
+            enemy.max_atk += boost
+        _enemy_strike(enemy, hero, turn)
+        if boost:
+            enemy.min_atk -= boost
+            enemy.max_atk -= boost
+    if hero.is_alive():
+        combat.update_defence_warp_after_enemy_turn(hero)
+    return True
+
+
+def _after_turn(hero):
+    from hero import check_berserk_trigger, compute_adrenaline_bonus
+    check_berserk_trigger(hero)
+    hero.current_bonus_damage = compute_adrenaline_bonus(hero)
+    hero.total_special = hero.current_bonus_damage
+
+
+def run(hero, enemy, policy="attack", max_turns=MAX_TURNS, setup=True):
+    """
+    Fight it out on these objects. Returns (won, hero turns taken, turn
+    count): won is True / False, or None if max_turns ran out first; the
+    turn count is battle_inner's own turn_count where the fight stopped.
+    setup=False when battle_inner has already done its battle-start work.
+    """
+    combat = _combat()
+    if policy not in POLICIES:
+        raise KeyError(f"unknown policy {policy!r}")
+    if setup:
+        battle_start(hero, enemy)
+        combat.reset_battle_stats()
+    hero_first = random.choice([True, False])
+    turn = 1
+    if not hero_first:
+        _enemy_basic(enemy, hero, resolve_special=True)
+        _after_turn(hero)
+        combat.update_defence_warp_after_enemy_turn(hero)
+        turn = 2
+    taken = 0
+    while hero.is_alive() and enemy.is_alive() and taken < max_turns:
+        taken += 1
+        done = _hero_turn(hero, enemy, turn, policy)
+        if done == "dead":
+            break
+        if done == "acted":
+            if not enemy.is_alive():
+                break                   # the kill returns before the end-of-turn tick
+            combat.tick_war_cry(hero)
+            turn += 1
+            enemy.turns_survived = turn
+            _after_turn(hero)
+        if _enemy_turn(hero, enemy, turn):
+            _after_turn(hero)
+    if not hero.is_alive():
+        return False, taken, turn
+    if not enemy.is_alive():
+        return True, taken, turn
+    return None, taken, turn
@@ -24,6 +24,7 @@ from titles import (
     check_true_jack_of_all_trades,
 )
 from combat_log import log
+from inventory_index import InventoryList
 
 # Direct imports from combat/ui (loaded after hero, so use lazy import pattern)
 def _lazy_combat():
@@ -206,7 +207,7 @@ class Hero(Creator):
         # ------------------------------------------------------------------
         # INVENTORY & EQUIPMENT
         # ------------------------------------------------------------------
-        self.inventory = []
+        self.inventory = InventoryList()   # v0.7.21: indexed bag — see inventory_index.py
         self.equipment = {
             "main_hand":    None,   # v0.6.16: was "weapon" — now holds weapon OR shield
             "off_hand":    None,   # v0.6.16: second hand slot for shields / off-hand
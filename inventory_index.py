@@ -0,0 +1,210 @@
+"""
+inventory_index.py — The hero's bag, indexed by item name, slot and rarity
+--------------------------------------------------------------------------
+warrior.inventory is an InventoryList: still a plain list to everything
+that appends, removes, iterates or numbers it (menus, saves, snapshots),
+but it also files every item under its name, slot and rarity. The crafter
+and merchant queries — "every Wolf Pelt", "weapons in the bag", "is this
+item still in the bag?" — become a dict lookup plus the matches instead of
+a scan of the whole bag, which matters for late-game grind bags of
+hundreds of items redrawn on every menu.
+
+The index is built on the first query and kept in step by append / remove
+/ pop / extend (the operations the game uses). Anything that reorders or
+overwrites slots (insert, sort, item assignment, ...) just drops it, and
+the next query rebuilds. Queries return items in bag order, exactly as a
+scan of the list would.
+
+Items are filed by the name / slot / rarity they have when they go in.
+The game never re-tiers or renames an item in place (crafting, curing and
+sharpening all make a new item), but anything that does must call
+reindex() afterwards.
+
+    bag = inventory_index.bag(warrior)      # converts a plain list if needed
+    bag.named("Wolf Pelt", "Dire Wolf Pelt")
+    bag.in_slot("weapon")
+    bag.of_rarity("epic")
+    bag.count_named("Wolf Pelt")
+    item in bag                              # identity, O(1)
+"""
+
+import heapq
+
+
+FIELDS = (
+    ("name",   ""),
+    ("slot",   ""),
+    ("rarity", "normal"),
+)
+
+
+class InventoryList(list):
+    """list of items plus a lazily built (name, slot, rarity) index."""
+
+    def __init__(self, items=()):
+        super().__init__(items)
+        self._index = None      # field -> {key: [(seq, item), ...]} in bag order
+        self._ids = None        # id(item) -> copies in the bag
+        self._seq = 0
+
+    # --- pickle / copy.deepcopy: the index is rebuilt on demand ---
+    def __reduce_ex__(self, protocol):
+        return (type(self), (list(self),))
+
+    # ============================================================
+    # INDEX
+    # ============================================================
+
+    def reindex(self):
+        """Rebuild the index from the list (after renaming an item in place)."""
+        index = {field: {} for field, _ in FIELDS}
+        ids = {}
+        for seq, item in enumerate(self):
+            self._file(index, ids, seq, item)
+        self._index, self._ids, self._seq = index, ids, len(self)
+        return index
+
+    def _built(self):
+        return self._index if self._index is not None else self.reindex()
+
+    @staticmethod
+    def _file(index, ids, seq, item):
+        for field, default in FIELDS:
+            key = getattr(item, field, default)
+            index[field].setdefault(key, []).append((seq, item))
+        ids[id(item)] = ids.get(id(item), 0) + 1
+
+    def _unfile(self, item):
+        for field, default in FIELDS:
+            bucket = self._index[field].get(getattr(item, field, default))
+            for i, (_, it) in enumerate(bucket or ()):
+                if it is item:
+                    del bucket[i]
+                    break
+            else:
+                self._drop_index()          # filed under another key — rebuild
+                return
+        left = self._ids.get(id(item), 0) - 1
+        if left > 0:
+            self._ids[id(item)] = left
+        else:
+            self._ids.pop(id(item), None)
+
+    def _drop_index(self):
+        self._index = self._ids = None
+
+    # ============================================================
+    # LIST OPERATIONS THAT KEEP THE INDEX
+    # ============================================================
+
+    def append(self, item):
+        super().append(item)
+        if self._index is not None:
+            self._file(self._index, self._ids, self._seq, item)
+            self._seq += 1
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def remove(self, item):
+        at = self.index(item)
+        removed = self[at]
+        super().__delitem__(at)
+        if self._index is not None:
+            self._unfile(removed)
+
+    def pop(self, at=-1):
+        item = super().pop(at)
+        if self._index is not None:
+            if at == -1:
+                self._unfile(item)
+            else:
+                self._drop_index()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._drop_index()
+
+    def __contains__(self, item):
+        if self._ids is None:
+            self._built()
+        if id(item) in self._ids:
+            return True
+        # Not this object — fall back to == for anything that defines it.
+        return type(item).__eq__ is not object.__eq__ and super().__contains__(item)
+
+    # --- operations that reorder or overwrite: rebuild on the next query ---
+    def insert(self, at, item):
+        super().insert(at, item)
+        self._drop_index()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._drop_index()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._drop_index()
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._drop_index()
+        return result
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._drop_index()
+
+    def reverse(self):
+        super().reverse()
+        self._drop_index()
+
+    # ============================================================
+    # QUERIES
+    # ============================================================
+
+    def _select(self, field, keys):
+        buckets = self._built()[field]
+        found = [buckets[k] for k in dict.fromkeys(keys) if buckets.get(k)]
+        if not found:
+            return []
+        if len(found) == 1:
+            return [item for _, item in found[0]]
+        return [item for _, item in heapq.merge(*found, key=lambda entry: entry[0])]
+
+    def named(self, *names):
+        """Items with any of these names, in bag order."""
+        return self._select("name", names)
+
+    def in_slot(self, *slots):
+        """Items whose slot is any of these ("weapon", "armor", ...), in bag order."""
+        return self._select("slot", slots)
+
+    def of_rarity(self, *rarities):
+        """Items of any of these rarities, in bag order."""
+        return self._select("rarity", rarities)
+
+    def count_named(self, *names):
+        buckets = self._built()["name"]
+        return sum(len(buckets.get(n, ())) for n in dict.fromkeys(names))
+
+    def names(self):
+        """{name: copies in the bag}."""
+        return {name: len(b) for name, b in self._built()["name"].items() if b}
+
+
+def bag(warrior):
+    """
+    warrior.inventory as an InventoryList — swapping one in (same items,
+    same order) if it's still a plain list, e.g. from an old snapshot.
+    """
+    inv = warrior.inventory
+    if not isinstance(inv, InventoryList):
+        inv = warrior.inventory = InventoryList(inv)
+    return inv
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+jtwh_ab.py — A/B balance comparisons with variance reduction
+============================================================
+Is Wolf Pup Rider at DEF 5 meaningfully harder than at DEF 4? Sampled
+independently, a few points of win rate hide under the noise of two
+separate batches. compare() plays both variants of the same arena fight
+and reports the win-rate delta (B - A) with a confidence interval:
+
+    python jtwh_ab.py --monster Wolf_Pup_Rider \\
+        --a monsters.Wolf_Pup_Rider.defence=5 --b monsters.Wolf_Pup_Rider.defence=4
+    python jtwh_ab.py --a combat.DIFFICULTY_MONSTER_MULT.champion=1.2 \\
+        --b combat.DIFFICULTY_MONSTER_MULT.champion=1.1 --difficulty champion
+    python jtwh_ab.py ... --mode crn --pairs 5000 --jobs 4
+
+A patch is fight_sim.patched()'s dict — module attributes, table entries
+or monster stats by dotted name. Modes:
+
+  * independent  A on seed s, B on its own seed — the baseline
+  * crn          common random numbers: A and B both replay seed s's
+                 stream, so the dice only differ once the variants make
+                 the fights diverge and the delta is measured pair by pair
+  * antithetic   crn, plus each pair replayed on the mirror of the stream
+                 (fight_sim.sandbox(antithetic=True)) and averaged — a
+                 lucky fight is offset by its unlucky twin
+
+A sample is one arena fight: the hero a survivor run has grown into by
+that round (jtwh_economy.grown_hero, under the variant — a patch that
+touches earlier rounds changes the hero too), at full HP, with fight_sim's
+"best" policy, against select_arena_enemy() or --monster — tiered,
+leveled and scaled for the round the way the arena fields it. Pairs where
+either side's hero was walled before the round are dropped. Next to the
+interval, the report gives the fights independent sampling would need for
+the same width — what the pairing saved.
+"""
+
+import argparse
+import ast
+import math
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import fight_sim
+import jtwh_economy
+
+
+MODES = ("independent", "crn", "antithetic")
+DIFFICULTIES = ("noob", "warrior", "champion")
+DEFAULT_PAIRS = 1000
+CHUNK = 100                 # pairs per worker task
+CONFIDENCE = 0.95
+POLICY = "best"
+
+
+# ============================================================
+# ONE FIGHT
+# ============================================================
+
+def monster_tier(monster):
+    """The encounter tier whose pool holds `monster` (a monsters class name)."""
+    import monsters
+    cls = getattr(monsters, monster)
+    return next(t for t, pool in monsters._ENCOUNTER_TABLES["pools"].items() if cls in pool)
+
+
+def monster_round(monster):
+    """The round most likely to draw `monster`."""
+    import monsters
+    tier = monster_tier(monster)
+    return max(monsters.ROUND_TIER_WEIGHTS, key=lambda r: monsters.ROUND_TIER_WEIGHTS[r].get(tier, 0))
+
+
+def arena_monster(monster, round_num):
+    """`monster` as the arena fields it in round_num: tier, level and title
+    set and scaled the way random_encounter_by_tier does, then difficulty."""
+    import monsters
+    enemy = getattr(monsters, monster)()
+    enemy.tier = monster_tier(monster)
+    enemy.level = monsters.monster_level_for_round(enemy.tier, round_num)
+    enemy.variant_title = monsters.title_for_level(enemy.level)
+    monsters.apply_level_scaling(enemy, enemy.tier)
+    return monsters.apply_difficulty_scaling(enemy)
+
+
+def fight(seed, patch, difficulty="warrior", round_num=None, monster=None, antithetic=False):
+    """
+    One arena fight under `patch` on seed's stream (its mirror if
+    antithetic). True / False, or None if the hero was walled before the
+    round. round_num defaults to --monster's round, else 1 + seed % 4.
+    """
+    import monsters
+    if round_num is None:
+        round_num = monster_round(monster) if monster else 1 + seed % jtwh_economy.SHOP_ROUND
+    with fight_sim.sandbox(seed, antithetic=antithetic), fight_sim.difficulty(difficulty), \
+            fight_sim.patched(patch):
+        warrior = jtwh_economy.grown_hero(round_num, difficulty)
+        if warrior is None:
+            return None
+        if monster:
+            enemy = arena_monster(monster, round_num)
+        else:
+            enemy = monsters.select_arena_enemy(round_num)
+        warrior.hp = max(warrior.hp, warrior.max_hp)
+        won, _, _ = fight_sim.run(warrior, enemy, POLICY)
+    return bool(won)
+
+
+def pair(seed, patch_a, patch_b, mode="antithetic", offset=0, **scenario):
+    """(A's win share, B's win share) for one pair, or None if dropped.
+    independent mode plays B on seed + offset."""
+    streams = (False, True) if mode == "antithetic" else (False,)
+    a, b = [], []
+    for mirrored in streams:
+        a.append(fight(seed, patch_a, antithetic=mirrored, **scenario))
+        b.append(fight(seed + offset if mode == "independent" else seed, patch_b,
+                       antithetic=mirrored, **scenario))
+    if None in a or None in b:
+        return None
+    return sum(a) / len(a), sum(b) / len(b)
+
+
+def _run_chunk(args):
+    seeds, patch_a, patch_b, mode, offset, scenario = args
+    return [pair(s, patch_a, patch_b, mode, offset, **scenario) for s in seeds]
+
+
+# ============================================================
+# COMPARE
+# ============================================================
+
+def compare(patch_a, patch_b, pairs=DEFAULT_PAIRS, mode="antithetic", difficulty="warrior",
+            round_num=None, monster=None, seed=1, confidence=CONFIDENCE, jobs=1):
+    """
+    Win rate under patch_b minus under patch_a. Returns {"a", "b", "delta",
+    "ci" (lo, hi), "se", "pairs" (kept), "dropped", "fights", "mode",
+    "independent_fights"} — the last the fights two independent batches
+    would need for an interval this wide.
+    """
+    if mode not in MODES:
+        raise KeyError(f"unknown mode {mode!r}")
+    scenario = {"difficulty": difficulty, "round_num": round_num, "monster": monster}
+    tasks = [(list(range(s, min(seed + pairs, s + CHUNK))), patch_a, patch_b, mode, pairs, scenario)
+             for s in range(seed, seed + pairs, CHUNK)]
+    if jobs <= 1 or len(tasks) == 1:
+        chunks = [_run_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunks = list(pool.map(_run_chunk, tasks))
+    kept = [p for chunk in chunks for p in chunk if p is not None]
+    n = len(kept)
+    a = statistics.fmean(p[0] for p in kept) if n else 0.0
+    b = statistics.fmean(p[1] for p in kept) if n else 0.0
+    diffs = [pb - pa for pa, pb in kept]
+    se = statistics.stdev(diffs) / math.sqrt(n) if n > 1 else float("inf")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    # two independent batches of m fights each: se^2 = (pa(1-pa) + pb(1-pb)) / m
+    spread = a * (1 - a) + b * (1 - b)
+    independent = 2 * math.ceil(spread / (se * se)) if 0 < se < float("inf") else None
+    return {"a": a, "b": b, "delta": b - a, "ci": (b - a - z * se, b - a + z * se), "se": se,
+            "pairs": n, "dropped": pairs - n, "fights": n * 2 * (2 if mode == "antithetic" else 1),
+            "mode": mode, "confidence": confidence, "independent_fights": independent}
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def _pct(x):
+    return f"{100 * x:+.2f}%" if x < 0 or x > 0 else "0.00%"
+
+
+def render(result, patch_a, patch_b, seconds):
+    lo, hi = result["ci"]
+    print(f"{result['mode']} · {result['pairs']} pairs ({result['dropped']} dropped, walled) · "
+          f"{result['fights']} fights in {seconds:.1f}s")
+    print(f"  A  {100 * result['a']:6.2f}%   {patch_a}")
+    print(f"  B  {100 * result['b']:6.2f}%   {patch_b}")
+    print(f"  B - A  {_pct(result['delta'])}   {100 * result['confidence']:.0f}% CI "
+          f"[{_pct(lo)}, {_pct(hi)}]")
+    if result["independent_fights"] and result["mode"] != "independent":
+        ratio = result["independent_fights"] / max(1, result["fights"])
+        print(f"  independent sampling needs ~{result['independent_fights']} fights for this "
+              f"interval ({ratio:.1f}×)")
+
+
+def _parse_patch(text):
+    target, _, value = text.partition("=")
+    if not target or not value:
+        raise argparse.ArgumentTypeError(f"expected module.name=VALUE, got {text!r}")
+    try:
+        return target.strip(), ast.literal_eval(value.strip())
+    except (ValueError, SyntaxError):
+        return target.strip(), value.strip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two balance variants on paired arena fights.")
+    parser.add_argument("--a", action="append", type=_parse_patch, default=[],
+                        help="module.name=VALUE for variant A (repeatable)")
+    parser.add_argument("--b", action="append", type=_parse_patch, default=[],
+                        help="module.name=VALUE for variant B (repeatable)")
+    parser.add_argument("--mode", choices=MODES, default="antithetic")
+    parser.add_argument("--pairs", type=int, default=DEFAULT_PAIRS)
+    parser.add_argument("--difficulty", choices=DIFFICULTIES, default="warrior")
+    parser.add_argument("--monster", help="fight this monsters class (e.g. Wolf_Pup_Rider)")
+    parser.add_argument("--round", type=int, dest="round_num", help="default: the monster's round, else 1-4")
+    parser.add_argument("--confidence", type=float, default=CONFIDENCE)
+    parser.add_argument("--seed", type=int, default=1, help="first seed")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    patch_a, patch_b = dict(args.a), dict(args.b)
+    t0 = time.perf_counter()
+    result = compare(patch_a, patch_b, args.pairs, args.mode, args.difficulty, args.round_num,
+                     args.monster, args.seed, args.confidence, args.jobs)
+    render(result, patch_a, patch_b, time.perf_counter() - t0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
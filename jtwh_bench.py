@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+jtwh_bench.py  —  Hot-path microbenchmarks for Journey To Winter Haven
+======================================================================
+
+Times the functions every combat turn leans on, in isolation, plus a full
+battle() against every monster. Each benchmark is warmed up, calibrated to
+a useful number of calls per sample, then sampled several times; the
+median per-call time is what gets stored and compared.
+
+BENCHMARKS:
+
+  player_basic_attack     combat.player_basic_attack, geared hero vs Imp
+  enemy_attack            combat.enemy_attack (specials resolved)
+  collect_dot_ticks       poison + dots + burns + acid on a socketed hero
+  monster_deal_damage     combat.monster_deal_damage, defence + true parts
+  apply_defence           shared.Creator.apply_defence (block branches)
+  make_loot               equipment.make_loot, rolled rarity, every monster
+  roll_rarity             equipment.roll_rarity
+  select_arena_enemy      monsters.select_arena_enemy, round 3
+  sample_encounters       samplers.encounters, 1000 round-3 classes
+  hp_line                 ui_bars.hp_line
+  wrap/cold               shared.wrap on a long paragraph, cache cleared
+                          every call (text_bundle lookup + textwrap)
+  wrap/cached             the same paragraph again: the lru_cache hit
+  record_fight_score      score.record_fight_score
+  merchant_stock          merchant.generate_merchant_stock
+  battle/<Monster>        one full combat.battle(), fresh hero, all monsters
+                          and bosses (auto-player, output silenced)
+
+--------------------------------------------------------------------
+USAGE
+--------------------------------------------------------------------
+    python jtwh_bench.py                         # run, print a table
+    python jtwh_bench.py --save                  # ... and write the baseline
+    python jtwh_bench.py --compare               # ... vs the baseline; exit 1
+                                                 #     on a regression
+    python jtwh_bench.py --compare --threshold 0.10
+    python jtwh_bench.py --only wrap --only hp_line
+    python jtwh_bench.py --no-battles            # micro only (seconds)
+    python jtwh_bench.py --quick                 # fewer samples, for CI
+
+The baseline (bench_baseline.json by default, --baseline PATH to change)
+is per machine — record it on the box you compare on. A benchmark counts
+as a regression when its median is more than --threshold (default 0.25,
+i.e. 25%) slower than the baseline AND slower by more than the noise
+floor (the baseline's own min-to-median spread). Benchmarks that exist
+on only one side are listed but never fail the compare.
+
+The game is driven through jtwh_test.py's environment (auto-player, no
+sleeps, silenced stdout), and every benchmark reseeds random, so two
+runs do the same work.
+"""
+
+from __future__ import annotations
+
+import argparse
+import builtins
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import jtwh_test as _harness
+
+
+BASELINE_FILE = _harness.GAME_DIR / "bench_baseline.json"
+BASELINE_VERSION = 1
+
+TARGET_SAMPLE_S = 0.02     # calibrate calls-per-sample to at least this
+WARMUP_S = 0.05            # untimed calls before sampling
+REPEATS = 7                # samples per micro benchmark
+BATTLES = 5                # samples (one battle each) per monster
+THRESHOLD = 0.25
+
+_B, _G, _Y, _R, _0 = _harness._B, _harness._G, _harness._Y, _harness._R, _harness._0
+
+
+# ======================================================================
+#  Timing
+# ======================================================================
+
+def _time_calls(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def _calibrate(fn):
+    """Calls per sample so one sample takes >= TARGET_SAMPLE_S (timeit-style)."""
+    number = 1
+    while True:
+        elapsed = _time_calls(fn, number)
+        if elapsed >= TARGET_SAMPLE_S or number >= 1 << 20:
+            return number
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(TARGET_SAMPLE_S / elapsed) + 1))
+
+
+def _warm(fn):
+    deadline = time.perf_counter() + WARMUP_S
+    while time.perf_counter() < deadline:
+        fn()
+
+
+def _summary(per_call, number):
+    """Per-call seconds (one per sample) -> the stored result dict (µs)."""
+    per_call = sorted(per_call)
+    p90 = per_call[min(len(per_call) - 1, int(round(0.9 * (len(per_call) - 1))))]
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "min_us":    per_call[0] * 1e6,
+        "p90_us":    p90 * 1e6,
+        "samples":   len(per_call),
+        "number":    number,
+    }
+
+
+def run_micro(fn, repeats=REPEATS):
+    _warm(fn)
+    number = _calibrate(fn)
+    return _summary([_time_calls(fn, number) / number for _ in range(repeats)], number)
+
+
+# ======================================================================
+#  Fixtures
+# ======================================================================
+
+def _geared_warrior(env):
+    """A fresh hero wearing one rare drop per slot, sockets filled where possible."""
+    equipment, monsters = env["equipment"], env["monsters"]
+    w = _harness._fresh_warrior(env)
+    names = sorted({getattr(c(), "name", None)
+                    for c, _ in getattr(monsters, "MONSTER_TYPES", [])} - {None})
+    drops = [equipment.make_loot(n, forced_rarity="rare") for n in names]
+    drops = [d for d in drops if d is not None]
+    fillers = [d for d in drops if not getattr(d, "sockets", None)]
+    for item in drops:
+        if getattr(item, "sockets", None) and fillers:
+            item.sockets[0] = fillers.pop()
+        equipment.equip_item(w, item)
+    w.hp = w.max_hp
+    return w
+
+
+def _monster(env, name="Imp"):
+    monsters = env["monsters"]
+    cls = getattr(monsters, name, None) or monsters.MONSTER_TYPES[0][0]
+    return _harness._make_monster(cls, False, monsters)
+
+
+def _micro_benchmarks(env):
+    """name -> zero-arg callable. Built once, each reseeded before timing."""
+    import merchant
+    import samplers
+    import score
+    import shared
+    import ui_bars
+    combat, equipment = env["combat"], env["equipment"]
+
+    hero = _geared_warrior(env)
+    enemy = _monster(env)
+    hero_hp, enemy_hp = hero.max_hp, enemy.max_hp
+
+    def player_basic_attack():
+        enemy.hp = enemy_hp
+        combat.player_basic_attack(hero, enemy)
+
+    def enemy_attack():
+        hero.hp = hero_hp
+        combat.enemy_attack(enemy, hero)
+
+    def collect_dot_ticks():
+        hero.poison_active, hero.poison_turns, hero.poison_amount = True, 3, 2
+        hero.poison_dots = [{"dmg": 2, "turns_left": 2}]
+        hero.burns = [{"bonus": 1, "turns_left": 3}, {"bonus": 2, "turns_left": 1}]
+        hero.acid_stacks = [{"turns_left": 2}]
+        combat.collect_dot_ticks(hero, is_player=True)
+
+    def monster_deal_damage():
+        hero.hp = hero_hp
+        combat.monster_deal_damage(enemy, hero, 9, extra_parts=[("Bleed", 2)], tag="bench")
+
+    rolls = [1, 3, 6, 12, 40]
+
+    def apply_defence():
+        for dmg in rolls:
+            hero.apply_defence(dmg, attacker=enemy)
+
+    loot_names = sorted({getattr(c(), "name", None)
+                         for c, _ in env["monsters"].MONSTER_TYPES} - {None})
+
+    def make_loot():
+        for name in loot_names:
+            equipment.make_loot(name, monster_level=2, round_num=3)
+
+    def roll_rarity():
+        equipment.roll_rarity(monster_level=2, round_num=3)
+
+    def select_arena_enemy():
+        env["monsters"].select_arena_enemy(3)
+
+    def sample_encounters():
+        samplers.encounters(3, 1000)
+
+    def hp_line():
+        ui_bars.hp_line("Saeculum", 37, 120, icon="❤️")
+
+    paragraph = ("The arena sand is still dark where the last challenger fell. "
+                 "Somewhere above, the crowd has already started chanting a name "
+                 "that isn't yours, and the gate on the far side groans open. ") * 3
+
+    def wrap_cold():
+        shared._wrap_cached.cache_clear()        # every call misses: bundle lookup + textwrap
+        shared.wrap(paragraph)
+
+    def wrap_cached():
+        shared.wrap(paragraph)
+
+    def record_fight_score():
+        hero.per_fight_scores = []
+        score.record_fight_score(hero, enemy, 4)
+
+    def merchant_stock():
+        merchant.generate_merchant_stock()
+
+    return {
+        "player_basic_attack": player_basic_attack,
+        "enemy_attack":        enemy_attack,
+        "collect_dot_ticks":   collect_dot_ticks,
+        "monster_deal_damage": monster_deal_damage,
+        "apply_defence":       apply_defence,
+        "make_loot":           make_loot,
+        "roll_rarity":         roll_rarity,
+        "select_arena_enemy":  select_arena_enemy,
+        "sample_encounters":   sample_encounters,
+        "hp_line":             hp_line,
+        "wrap/cold":           wrap_cold,
+        "wrap/cached":         wrap_cached,
+        "record_fight_score":  record_fight_score,
+        "merchant_stock":      merchant_stock,
+    }
+
+
+def run_battles(env, cls, is_boss, samples=BATTLES):
+    """Time `samples` full battles against one monster class (fresh hero each)."""
+    combat, monsters, player = env["combat"], env["monsters"], env["player"]
+
+    def fight_input(prompt=""):
+        # The turn menu is the same prompt every turn; the auto-player would
+        # read that as a stuck menu and start escalating. Just attack.
+        if "your move" in (prompt or "").lower():
+            player._last = None
+        return player(prompt)
+
+    per_call, stuck = [], 0
+    builtins.input = fight_input
+    try:
+        for i in range(samples + 1):        # the first one is the warm-up
+            random.seed(1009 * i + 17)
+            player.reset()
+            player.choice = "1"
+            w = _harness._fresh_warrior(env)
+            enemy = _harness._make_monster(cls, is_boss, monsters)
+            # Stop at the first prompt after someone drops: the post-fight
+            # menus (level-up, loot, rest) aren't the battle and only add noise.
+            player.watch = lambda: w.hp <= 0 or enemy.hp <= 0
+            start = time.perf_counter()
+            try:
+                combat.battle(w, enemy)
+            except (_harness._Reached, SystemExit):
+                pass
+            except _harness._MenuStuck:
+                stuck += 1
+            elapsed = time.perf_counter() - start
+            if i:
+                per_call.append(elapsed)
+    finally:
+        builtins.input = player
+        player.reset()
+    result = _summary(per_call, 1)
+    if stuck:
+        result["stuck"] = stuck
+    return result
+
+
+# ======================================================================
+#  Run / baseline / compare
+# ======================================================================
+
+def _selected(name, only):
+    return not only or any(o in name for o in only)
+
+
+def run(only=None, battles=True, repeats=REPEATS, battle_samples=BATTLES, verbose=False):
+    """Run every selected benchmark. Returns {name: result dict}."""
+    env = _harness.setup_environment(verbose=verbose)
+    results = {}
+    with _harness._silence(verbose):
+        try:
+            micro = _micro_benchmarks(env)
+            for name, fn in micro.items():
+                if _selected(name, only):
+                    random.seed(name)
+                    results[name] = run_micro(fn, repeats)
+            if battles:
+                regulars, bosses = _harness._discover_monsters(env["monsters"], True)
+                for cls, is_boss in [(c, False) for c in regulars] + [(c, True) for c in bosses]:
+                    name = f"battle/{cls.__name__}"
+                    if _selected(name, only):
+                        results[name] = run_battles(env, cls, is_boss, battle_samples)
+        finally:
+            sys.stdout.flush()              # don't let buffered game text leak out
+    return results
+
+
+def baseline_doc(results):
+    return {
+        "version":  BASELINE_VERSION,
+        "created":  time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python":   platform.python_version(),
+        "machine":  f"{platform.system()} {platform.machine()}",
+        "results":  results,
+    }
+
+
+def save_baseline(results, path=BASELINE_FILE):
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(baseline_doc(results), indent=2, sort_keys=True) + "\n",
+                   encoding="utf-8")
+    tmp.replace(path)
+
+
+def load_baseline(path=BASELINE_FILE):
+    doc = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(doc, dict) or doc.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path}: not a version {BASELINE_VERSION} baseline")
+    return doc
+
+
+def compare(results, baseline, threshold=THRESHOLD):
+    """
+    -> list of (name, base_us, now_us, ratio, status) where status is
+    "ok", "faster", "REGRESSION", "new" or "missing".
+    """
+    base = baseline.get("results", {})
+    rows = []
+    for name in sorted(set(base) | set(results)):
+        b, n = base.get(name), results.get(name)
+        if b is None:
+            rows.append((name, None, n["median_us"], None, "new"))
+            continue
+        if n is None:
+            rows.append((name, b["median_us"], None, None, "missing"))
+            continue
+        b_med, n_med = b["median_us"], n["median_us"]
+        ratio = n_med / b_med if b_med > 0 else 1.0
+        noise = b_med - b.get("min_us", b_med)
+        if ratio > 1.0 + threshold and n_med - b_med > noise:
+            status = "REGRESSION"
+        elif ratio < 1.0 - threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, b_med, n_med, ratio, status))
+    return rows
+
+
+def _fmt_us(us):
+    if us is None:
+        return "-"
+    if us >= 1e6:
+        return f"{us / 1e6:.2f} s"
+    if us >= 1e3:
+        return f"{us / 1e3:.2f} ms"
+    return f"{us:.2f} µs"
+
+
+def print_results(results):
+    width = max([len(n) for n in results] + [10])
+    print(f"  {'benchmark':<{width}}  {'median':>10}  {'min':>10}  {'p90':>10}  calls")
+    for name, r in results.items():
+        extra = f"  {_Y}({r['stuck']} stuck){_0}" if r.get("stuck") else ""
+        print(f"  {name:<{width}}  {_fmt_us(r['median_us']):>10}  {_fmt_us(r['min_us']):>10}  "
+              f"{_fmt_us(r['p90_us']):>10}  {r['samples']}x{r['number']}{extra}")
+
+
+def print_compare(rows, threshold):
+    width = max([len(r[0]) for r in rows] + [10])
+    print(f"  {'benchmark':<{width}}  {'baseline':>10}  {'now':>10}  {'change':>8}")
+    colors = {"REGRESSION": _R, "faster": _G, "new": _Y, "missing": _Y}
+    for name, b, n, ratio, status in rows:
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else ""
+        tag = f"{colors.get(status, '')}{status}{_0}" if status != "ok" else ""
+        print(f"  {name:<{width}}  {_fmt_us(b):>10}  {_fmt_us(n):>10}  {change:>8}  {tag}".rstrip())
+    bad = [r for r in rows if r[4] == "REGRESSION"]
+    if bad:
+        print(f"\n{_R}{len(bad)} regression(s) beyond {threshold:.0%}.{_0}")
+    else:
+        print(f"\n{_G}No regressions beyond {threshold:.0%}.{_0}")
+    return not bad
+
+
+# ======================================================================
+#  CLI
+# ======================================================================
+
+def main(argv=None):
+    p = argparse.ArgumentParser(
+        description="Hot-path microbenchmarks for Journey To Winter Haven.")
+    p.add_argument("--only", action="append", metavar="NAME",
+                   help="run benchmarks whose name contains NAME (repeatable)")
+    p.add_argument("--no-battles", action="store_true", help="skip the full battle() runs")
+    p.add_argument("--quick", action="store_true", help="fewer samples (noisier)")
+    p.add_argument("--repeat", type=int, default=None,
+                   help=f"samples per micro benchmark (default {REPEATS})")
+    p.add_argument("--battles", type=int, default=None,
+                   help=f"battles timed per monster (default {BATTLES})")
+    p.add_argument("--baseline", default=str(BASELINE_FILE), help="baseline JSON path")
+    p.add_argument("--save", action="store_true", help="write the results as the baseline")
+    p.add_argument("--compare", action="store_true", help="compare against the baseline")
+    p.add_argument("--threshold", type=float, default=THRESHOLD,
+                   help=f"allowed slowdown before flagging (default {THRESHOLD})")
+    p.add_argument("--verbose", action="store_true", help="let the game print")
+    args = p.parse_args(argv)
+
+    repeats = args.repeat or (3 if args.quick else REPEATS)
+    battle_samples = args.battles or (2 if args.quick else BATTLES)
+
+    baseline = None
+    if args.compare:
+        try:
+            baseline = load_baseline(args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"{_R}Can't read baseline: {e}{_0}")
+            return 2
+
+    print(f"{_B}Journey To Winter Haven — hot-path benchmarks{_0}")
+    print(f"python {platform.python_version()} on {platform.system()} {platform.machine()}\n")
+    results = run(args.only, not args.no_battles, repeats, battle_samples, args.verbose)
+    print_results(results)
+
+    ok = True
+    if baseline is not None:
+        print(f"\n{_B}== vs baseline ({baseline.get('created', '?')}) =={_0}")
+        if args.only or args.no_battles:    # don't report what wasn't run as missing
+            baseline["results"] = {k: v for k, v in baseline.get("results", {}).items()
+                                   if _selected(k, args.only)
+                                   and not (args.no_battles and k.startswith("battle/"))}
+        ok = print_compare(compare(results, baseline, args.threshold), args.threshold)
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
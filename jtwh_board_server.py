@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+jtwh_board_server.py  —  Local stand-in for the Supabase global leaderboard
+============================================================================
+
+leaderboard.py talks to Supabase's REST API (PostgREST). This serves the
+same small dialect from a SQLite file, so the global board can be tested,
+demoed and capacity-planned without a live project:
+
+    POST /rest/v1/scores            JSON object or array of rows
+                                    Prefer: return=minimal        -> 201, empty
+                                    Prefer: return=representation -> 201, rows
+    GET  /rest/v1/scores?difficulty=eq.warrior&order=score.desc&limit=25
+                        &select=player_name,score,...
+         filters:  col=eq.|neq.|gt.|gte.|lt.|lte.VALUE   (repeatable)
+         order:    col[.asc|.desc][,col...]
+         limit / offset / select
+
+Unknown columns, bad operators, malformed JSON and rows the database
+rejects (a null player_name, a nested value) answer 400 like PostgREST
+does (so the client's "rejected, don't retry" path is exercised); a wrong
+apikey answers 401 when the server was started with --key.
+
+--------------------------------------------------------------------
+USAGE
+--------------------------------------------------------------------
+    python jtwh_board_server.py serve                     # :54321, board.db
+    python jtwh_board_server.py serve --port 8080 --db /tmp/board.db --key dev
+
+    # point the game at it (.env next to the game files):
+    #   SUPABASE_URL=http://127.0.0.1:54321
+    #   SUPABASE_ANON_KEY=dev
+
+    python jtwh_board_server.py load                      # spins up its own server
+    python jtwh_board_server.py load --url http://127.0.0.1:54321 --clients 32 \\
+        --requests 200 --post-ratio 0.2
+
+`load` runs N concurrent clients (each over its own keep-alive connection,
+the way the game talks to the board) doing a mix of score submissions and
+top-25 fetches, then prints p50 / p99 / max latency and throughput per
+operation. Exit code is non-zero if any request failed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+GAME_DIR = Path(__file__).resolve().parent
+if str(GAME_DIR) not in sys.path:
+    sys.path.insert(0, str(GAME_DIR))
+
+DEFAULT_PORT = 54321
+DEFAULT_DB = str(GAME_DIR / "board.db")
+
+# The columns leaderboard._global_payload sends, plus the server-side ones.
+COLUMNS = {
+    "id": "INTEGER", "player_name": "TEXT", "sex": "TEXT", "score": "INTEGER",
+    "rank": "TEXT", "difficulty": "TEXT", "outcome": "TEXT", "level": "INTEGER",
+    "hp": "INTEGER", "max_hp": "INTEGER", "atk_min": "INTEGER", "atk_max": "INTEGER",
+    "defence": "INTEGER", "max_ap": "INTEGER", "gold": "INTEGER",
+    "debug_run": "BOOLEAN", "submitted_at": "TEXT",
+}
+_WRITABLE = set(COLUMNS) - {"id", "submitted_at"}
+_OPS = {"eq": "=", "neq": "!=", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name  TEXT    NOT NULL DEFAULT 'Unknown',
+    sex          TEXT    DEFAULT 'male',
+    score        INTEGER NOT NULL DEFAULT 0,
+    rank         TEXT,
+    difficulty   TEXT    NOT NULL DEFAULT 'warrior',
+    outcome      TEXT,
+    level        INTEGER, hp INTEGER, max_hp INTEGER, atk_min INTEGER,
+    atk_max      INTEGER, defence INTEGER, max_ap INTEGER, gold INTEGER,
+    debug_run    BOOLEAN DEFAULT 0,
+    submitted_at TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_board ON scores (difficulty, score DESC);
+"""
+
+
+class BadRequest(Exception):
+    """A request PostgREST would answer 400 to."""
+
+
+# ======================================================================
+#  Storage
+# ======================================================================
+
+class Board:
+    """SQLite-backed scores table; one connection per server thread."""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10.0, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA busy_timeout = 10000")
+            self._local.conn = conn
+        return conn
+
+    def insert(self, rows):
+        if not rows:                # "IN ()" is a syntax error; nothing to store anyway
+            return []
+        now = datetime.now(timezone.utc).isoformat()
+        conn = self._conn()
+        ids = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row in rows:
+                if not isinstance(row, dict):
+                    raise BadRequest("each row must be a JSON object")
+                unknown = set(row) - _WRITABLE
+                if unknown:
+                    raise BadRequest(f"Could not find the '{sorted(unknown)[0]}' "
+                                     f"column of 'scores'")
+                cols = list(row) + ["submitted_at"]
+                vals = [row[c] for c in row] + [now]
+                cur = conn.execute(
+                    f"INSERT INTO scores ({', '.join(cols)}) "
+                    f"VALUES ({', '.join('?' * len(cols))})", vals)
+                ids.append(cur.lastrowid)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        marks = ", ".join("?" * len(ids))
+        return [self._row(r) for r in
+                conn.execute(f"SELECT * FROM scores WHERE id IN ({marks})", ids)]
+
+    def select(self, query):
+        """query: list of (key, value) pairs straight from the URL."""
+        where, params, order, limit, offset = [], [], [], None, None
+        cols = "*"
+        for key, value in query:
+            if key == "select":
+                wanted = [c.strip() for c in value.split(",") if c.strip()]
+                if wanted != ["*"]:
+                    self._check_columns(wanted)
+                    cols = ", ".join(wanted)
+            elif key == "order":
+                for part in value.split(","):
+                    name, _, direction = part.partition(".")
+                    self._check_columns([name])
+                    direction = direction.split(".")[0] or "asc"
+                    if direction not in ("asc", "desc"):
+                        raise BadRequest(f"bad order direction '{direction}'")
+                    order.append(f"{name} {direction.upper()}")
+            elif key in ("limit", "offset"):
+                try:
+                    n = int(value)
+                except ValueError:
+                    raise BadRequest(f"{key} must be an integer") from None
+                if key == "limit":
+                    limit = n
+                else:
+                    offset = n
+            else:
+                self._check_columns([key])
+                op, _, operand = value.partition(".")
+                if op not in _OPS:
+                    raise BadRequest(f"unknown operator '{op}'")
+                where.append(f"{key} {_OPS[op]} ?")
+                params.append(self._coerce(key, operand))
+
+        sql = f"SELECT {cols} FROM scores"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if order:
+            sql += " ORDER BY " + ", ".join(order)
+        if limit is not None or offset is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit if limit is not None else -1, offset or 0]
+        return [self._row(r) for r in self._conn().execute(sql, params)]
+
+    @staticmethod
+    def _check_columns(names):
+        for name in names:
+            if name not in COLUMNS:
+                raise BadRequest(f"column scores.{name} does not exist")
+
+    @staticmethod
+    def _coerce(column, text):
+        kind = COLUMNS[column]
+        if kind == "INTEGER":
+            try:
+                return int(text)
+            except ValueError:
+                raise BadRequest(f"invalid input syntax for integer: \"{text}\"") from None
+        if kind == "BOOLEAN":
+            return 1 if text.lower() in ("true", "t", "1") else 0
+        return text
+
+    @staticmethod
+    def _row(row):
+        d = dict(row)
+        if "debug_run" in d:
+            d["debug_run"] = bool(d["debug_run"])
+        return d
+
+
+# ======================================================================
+#  HTTP
+# ======================================================================
+
+def make_handler(board, key=None):
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"          # keep-alive, like Supabase
+        # headers and body go out as two writes; with Nagle on, every
+        # response with a body would sit out a ~40 ms delayed ACK
+        disable_nagle_algorithm = True
+
+        def _send(self, status, payload=None):
+            body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self):
+            parts = urlsplit(self.path)
+            if parts.path.rstrip("/") != "/rest/v1/scores":
+                self._send(404, {"message": f"relation {parts.path} does not exist"})
+                return None
+            if key is not None and self.headers.get("apikey") != key:
+                self._send(401, {"message": "Invalid API key"})
+                return None
+            return parse_qsl(parts.query, keep_blank_values=True)
+
+        def do_GET(self):
+            query = self._route()
+            if query is None:
+                return
+            try:
+                self._send(200, board.select(query))
+            except BadRequest as e:
+                self._send(400, {"message": str(e)})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length)
+            if self._route() is None:
+                return
+            try:
+                data = json.loads(raw.decode("utf-8") or "null")
+            except ValueError:
+                self._send(400, {"message": "malformed JSON"})
+                return
+            rows = data if isinstance(data, list) else [data]
+            try:
+                inserted = board.insert(rows)
+            except (BadRequest, sqlite3.Error) as e:     # e.g. a null player_name, a nested value
+                self._send(400, {"message": str(e)})
+                return
+            if "return=representation" in (self.headers.get("Prefer") or ""):
+                self._send(201, inserted)
+            else:
+                self._send(201)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+class _HTTPServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128     # the default 5 drops SYNs under load (1 s retries)
+
+
+class BoardServer:
+    """The stand-in on a background thread. `url` is ready once started."""
+
+    def __init__(self, db=DEFAULT_DB, host="127.0.0.1", port=0, key=None):
+        self.board = Board(db)
+        self.httpd = _HTTPServer((host, port), make_handler(self.board, key))
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ======================================================================
+#  Load generator
+# ======================================================================
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = math.ceil(pct / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, k))]
+
+
+def _random_payload(rng):
+    difficulty = rng.choice(["noob", "warrior", "champion", "debug"])
+    return {
+        "player_name": f"Load{rng.randint(1, 9999)}", "sex": rng.choice(["male", "female"]),
+        "score": rng.randint(0, 6000), "rank": rng.choice("SABCD"),
+        "difficulty": difficulty, "outcome": "defeat", "level": rng.randint(1, 10),
+        "hp": 0, "max_hp": 60, "atk_min": 4, "atk_max": 9, "defence": 3,
+        "max_ap": 3, "gold": rng.randint(0, 500), "debug_run": difficulty == "debug",
+    }
+
+
+def run_load(url, clients=16, requests=100, post_ratio=0.2, key="dev", seed=1):
+    """
+    `clients` threads x `requests` each, a `post_ratio` share of them score
+    submissions and the rest top-25 fetches. Returns {op: stats dict}.
+    """
+    import board_fetch
+
+    pool = board_fetch.ConnectionPool(timeout=30)
+    headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+    timings = {"submit": [], "fetch": []}
+    errors = {"submit": 0, "fetch": 0}
+    lock = threading.Lock()
+    start_gate = threading.Event()
+
+    def client(n):
+        rng = random.Random(seed * 7919 + n)
+        mine = {"submit": [], "fetch": []}
+        bad = {"submit": 0, "fetch": 0}
+        start_gate.wait()
+        for _ in range(requests):
+            if rng.random() < post_ratio:
+                op = "submit"
+                body = json.dumps(_random_payload(rng)).encode("utf-8")
+                args = ("POST", f"{url}/rest/v1/scores", body,
+                        dict(headers, **{"Content-Type": "application/json",
+                                         "Prefer": "return=minimal"}))
+                ok = (201,)
+            else:
+                op = "fetch"
+                diff = rng.choice(["noob", "warrior", "champion", "debug"])
+                args = ("GET", f"{url}/rest/v1/scores?difficulty=eq.{diff}"
+                               f"&order=score.desc&limit=25"
+                               f"&select=player_name,sex,score,rank,outcome,level,"
+                               f"difficulty,debug_run,submitted_at", None, headers)
+                ok = (200,)
+            t0 = time.perf_counter()
+            try:
+                status, _ = pool.request(*args)
+            except Exception:
+                status = None
+            mine[op].append((time.perf_counter() - t0) * 1000)
+            if status not in ok:
+                bad[op] += 1
+        pool.close()
+        with lock:
+            for op in timings:
+                timings[op] += mine[op]
+                errors[op] += bad[op]
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for t in threads:
+        t.start()
+    t0 = time.perf_counter()
+    start_gate.set()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    stats = {}
+    for op, values in timings.items():
+        values.sort()
+        stats[op] = {
+            "count":  len(values),
+            "errors": errors[op],
+            "p50_ms": round(percentile(values, 50), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "max_ms": round(values[-1], 2) if values else 0.0,
+            "per_s":  round(len(values) / wall, 1) if wall else 0.0,
+        }
+    stats["wall_s"] = round(wall, 3)
+    return stats
+
+
+def _print_stats(stats, clients):
+    print(f"{clients} clients, {stats['wall_s']} s wall")
+    print(f"  {'op':<8}{'count':>7}{'errors':>8}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'req/s':>9}")
+    for op in ("submit", "fetch"):
+        s = stats[op]
+        print(f"  {op:<8}{s['count']:>7}{s['errors']:>8}{s['p50_ms']:>9}"
+              f"{s['p99_ms']:>9}{s['max_ms']:>9}{s['per_s']:>9}")
+
+
+# ======================================================================
+#  CLI
+# ======================================================================
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Local stand-in for the global leaderboard.")
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    s = sub.add_parser("serve", help="run the stand-in server")
+    s.add_argument("--host", default="127.0.0.1")
+    s.add_argument("--port", type=int, default=DEFAULT_PORT)
+    s.add_argument("--db", default=DEFAULT_DB)
+    s.add_argument("--key", default=None, help="require this apikey header")
+
+    lg = sub.add_parser("load", help="measure submit / fetch latency under load")
+    lg.add_argument("--url", default=None,
+                    help="board to hit (default: a throwaway local server)")
+    lg.add_argument("--key", default="dev")
+    lg.add_argument("--clients", type=int, default=16)
+    lg.add_argument("--requests", type=int, default=100, help="per client")
+    lg.add_argument("--post-ratio", type=float, default=0.2)
+    lg.add_argument("--json", action="store_true", help="print stats as JSON")
+    args = p.parse_args(argv)
+
+    if args.cmd == "serve":
+        server = BoardServer(args.db, args.host, args.port, args.key)
+        print(f"Leaderboard stand-in on {server.url}  (db: {args.db})")
+        print(f"  .env:  SUPABASE_URL={server.url}")
+        print(f"         SUPABASE_ANON_KEY={args.key or 'anything'}")
+        try:
+            server.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.httpd.server_close()
+        return 0
+
+    if args.url:
+        stats = run_load(args.url, args.clients, args.requests, args.post_ratio, args.key)
+    else:
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            with BoardServer(os.path.join(tmp, "load.db"), key=args.key) as server:
+                stats = run_load(server.url, args.clients, args.requests,
+                                 args.post_ratio, args.key)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        _print_stats(stats, args.clients)
+    return 1 if stats["submit"]["errors"] or stats["fetch"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+jtwh_economy.py — Gold economy: what a run has to spend at the merchant
+=======================================================================
+Plays the arena's first four rounds headless, many times over, and stops
+at the quarters interlude — the first time the merchant and crafter open.
+Per difficulty it reports:
+
+  * how often a run gets there, and where the rest were walled
+  * gold in hand after the bookie (mean ± 95% CI, percentiles), and with
+    the banked drops sold back
+  * where the gold came from: start purse, monster drops, fight payouts,
+    the bookie's d20
+  * what that buys: the share of runs that can afford at least one of each
+    listing category, and how many items cheapest-first
+  * the spending titles: Penny Pincher forced (nothing on the shelves is
+    affordable), Big Spender reachable (some basket lands on exactly 0 —
+    subset-sum over the stock) and how often a greedy shopper lands on it
+
+    python jtwh_economy.py                        # all difficulties
+    python jtwh_economy.py --runs 2000 --jobs 8
+    python jtwh_economy.py --difficulty champion --fresh
+
+Each trajectory is the real code path — select_arena_enemy, fight_sim's
+headless fight, award_gold, make_loot, animate_xp_results' level-ups,
+calculate_gold_reward, bookie_encounter, generate_merchant_stock /
+generate_crafter_stock — seeded per run inside fight_sim.sandbox(). Where
+the game asks the player, the model answers:
+
+  * fights: fight_sim's "best" policy. A policy never drinks a potion or
+    uses a skill, so a lost fight is replayed with fresh dice (up to
+    RETRIES) — what's reported is the purse of runs that reach the
+    merchant. How many fights were won on the first try is reported
+    alongside, and runs that lose RETRIES times in a row count as walled.
+  * stat points: round-robin HP / ATK / DEF under level_up_menu's
+    per-level cap; skill points are left unspent.
+  * loot: worn when loadout.best_loadout says so for the next round; the
+    rest is banked and counted at its sell-back value.
+  * healing: each fight starts at full HP — what the potions and Heal a
+    player uses would buy, not charged to the purse.
+
+Summaries are cached in economy_cache.json keyed by a hash of every
+pricing / payout table (gold, merchant, crafter) plus difficulty, runs,
+seed and MODEL — rerunning is free until a price changes. Trajectories are
+independent, so they fan out over a process pool (--jobs).
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import fight_sim
+
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(GAME_DIR, "economy_cache.json")
+DIFFICULTIES = ("noob", "warrior", "champion")
+DEFAULT_RUNS = 400          # per difficulty
+SHOP_ROUND = 4              # arena_quarters_interlude opens after this round
+POLICY = "best"
+RETRIES = 20                # fresh-dice replays of a lost fight before the run is walled
+MODEL = 1                   # bump when the trajectory model changes — invalidates the cache
+PERCENTILES = (10, 25, 50, 75, 90)
+BOOKIE_RESULTS = ("stolen", "caught", "intimidated")
+
+
+# ============================================================
+# PRICING TABLES
+# ============================================================
+
+def pricing_tables():
+    """Every table that decides what a run earns or what the shelves cost."""
+    import combat
+    import crafter
+    import gold
+    import merchant
+    return {
+        "gold": {
+            "GOLD_CONFIG": gold.GOLD_CONFIG,
+            "BERSERK_BONUS": gold.BERSERK_BONUS,
+            "DEATH_DEFIER_BONUS": gold.DEATH_DEFIER_BONUS,
+            "CLOSE_MATCH_HP_PCT": gold.CLOSE_MATCH_HP_PCT,
+            "BOOKIE": (gold.BOOKIE_CATCH_MIN, gold.BOOKIE_INTIMIDATE_MIN,
+                       gold.BOOKIE_SKIM_PCT, gold.BOOKIE_BONUS_PCT),
+            "DIFFICULTY_GOLD_MULT": combat.DIFFICULTY_GOLD_MULT,
+        },
+        "merchant": {
+            "EQUIPMENT_RARITY_BASE_PRICES": merchant.EQUIPMENT_RARITY_BASE_PRICES,
+            "EQUIPMENT_TIER_MULTIPLIERS": merchant.EQUIPMENT_TIER_MULTIPLIERS,
+            "POTION_PRICES": merchant.POTION_PRICES,
+            "POTION_STOCK_COUNT": merchant.POTION_STOCK_COUNT,
+            "MERCHANT_ARMORS": merchant.MERCHANT_ARMORS,
+            "MERCHANT_SHIELDS": merchant.MERCHANT_SHIELDS,
+            "MERCHANT_RINGS": merchant.MERCHANT_RINGS,
+            "BERSERK_TRINKET_TABLE": merchant.BERSERK_TRINKET_TABLE,
+            "BERSERK_TRINKET_APPEAR_CHANCE": merchant.BERSERK_TRINKET_APPEAR_CHANCE,
+            "MERCHANT_VARIANT_CHANCE": merchant.MERCHANT_VARIANT_CHANCE,
+            "SELL_BACK_RATE": merchant.SELL_BACK_RATE,
+        },
+        "crafter": {
+            "COMPONENT_PRICES": crafter.COMPONENT_PRICES,
+            "COMPONENT_SELL_BACK_RATE": crafter.COMPONENT_SELL_BACK_RATE,
+            "COMPONENT_STOCK_PER_VARIANT": crafter.COMPONENT_STOCK_PER_VARIANT,
+            "CRAFTER_ITEM_APPEAR_CHANCE": crafter.CRAFTER_ITEM_APPEAR_CHANCE,
+            "WILDCARD_RARITY_WEIGHTS": crafter.WILDCARD_RARITY_WEIGHTS,
+            "CHAMPION_EPIC_CHANCE": crafter.CHAMPION_EPIC_CHANCE,
+        },
+    }
+
+
+def tables_hash(tables=None):
+    # repr, not json: GOLD_CONFIG mixes int and str keys, and tuples must
+    # hash differently from lists
+    text = repr(pricing_tables() if tables is None else tables)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# ============================================================
+# ONE TRAJECTORY
+# ============================================================
+
+def _spend_stat_points(hero):
+    """level_up_menu's effects, points dealt round-robin HP / ATK / DEF."""
+    cap = min(2, hero.stat_points)
+    spent = hero.spent_stats_this_level
+    while hero.stat_points > 0:
+        open_stats = [s for s in ("hp", "atk", "def") if spent[s] < cap]
+        if not open_stats:
+            break
+        stat = min(open_stats, key=lambda s: spent[s])
+        if stat == "hp":
+            hero.max_hp += 5
+            hero.hp += 5
+            hero.max_overheal = int(hero.max_hp * 1.10)
+        elif stat == "atk":
+            hero.min_atk += 1
+            hero.max_atk += 1
+        else:
+            hero.defence += 1
+            hero.base_defence = getattr(hero, "base_defence", 0) + 1
+        hero.stat_points -= 1
+        spent[stat] += 1
+
+
+def _fight(hero, enemy):
+    """(hero, enemy, turn_count, tries) of the first won replay, or None."""
+    hero.hp = max(hero.hp, hero.max_hp)     # what the potions + Heal would have bought
+    for tries in range(1, RETRIES + 1):
+        h, e = fight_sim.scratch(hero, enemy)
+        won, _, turn_count = fight_sim.run(h, e, POLICY)
+        if won:
+            return h, e, turn_count, tries
+    return None
+
+
+def _listings(stock, crafter_stock):
+    """[(category, price, count), ...] — everything for sale at the interlude."""
+    out = []
+    for group in stock["weapon_groups"]:
+        for v in group["variants"]:
+            out.append((f"weapon ({v['rarity']})", v["price"], 1))
+    for key in ("armors", "shields", "rings", "trinkets"):
+        for entry in stock[key]:
+            out.append((key[:-1], entry["price"], 1))
+    for p in stock["potions"].values():
+        out.append(("potion", p["price"], p["stock"]))
+    for listings in crafter_stock["components"].values():
+        for entry in listings:
+            out.append(("component", entry["price"], entry["stock"]))
+    return out
+
+
+def _sell_value(items):
+    import crafter
+    import merchant
+    total = 0
+    for item in items:
+        if merchant._is_resale_blocked(item):
+            continue
+        if merchant._is_crafting_component(item):
+            total += crafter._component_sell_price(item)
+        else:
+            total += merchant._sell_price(item)
+    return total
+
+
+def _exact_spend(gold, listings):
+    """Can some basket of the listings cost exactly `gold`? (bitset subset-sum)"""
+    mask = (1 << (gold + 1)) - 1
+    reachable = 1
+    for _, price, count in listings:
+        for _ in range(count):
+            reachable = (reachable | (reachable << price)) & mask
+    return bool(reachable >> gold & 1)
+
+
+def _greedy_left(gold, prices):
+    for price in prices:
+        if price <= gold:
+            gold -= price
+    return gold
+
+
+def shop(gold, listings):
+    """What `gold` buys from `listings` — the per-run numbers summarize() pools."""
+    units = sorted(price for _, price, count in listings for _ in range(count))
+    bought = 0
+    left = gold
+    for price in units:
+        if price > left:
+            break
+        left -= price
+        bought += 1
+    return {
+        "afford": sorted({cat for cat, price, _ in listings if price <= gold}),
+        "items": bought,
+        "penny_forced": not units or units[0] > gold,
+        "big_reachable": _exact_spend(gold, listings),
+        "big_greedy": _greedy_left(gold, reversed(units)) == 0,
+        "big_cheapest": left == 0,
+    }
+
+
+def arena_round(warrior, round_num, last_round=SHOP_ROUND):
+    """
+    Draw and fight round `round_num`, then battle_inner's win block in order
+    (gold, essence, fight score, loot, XP, rest, payout). Returns (warrior,
+    enemy, payout, tries) — the hero is the winning replay's copy — or None
+    if every replay was lost.
+    """
+    import combat
+    import combat_log
+    import loadout
+    import monsters
+    from equipment import make_loot
+    from gold import award_gold, award_pending_gold, calculate_gold_reward
+    from score import record_fight_score
+    from ui import animate_xp_results
+
+    fought = _fight(warrior, monsters.select_arena_enemy(round_num))
+    if fought is None:
+        return None
+    warrior, enemy, turn_count, tries = fought
+    if hasattr(warrior, "original_defence"):
+        warrior.defence = warrior.original_defence
+        del warrior.original_defence
+    award_gold(warrior, enemy.gold)
+    warrior.monster_essence.extend(enemy.essence)
+    record_fight_score(warrior, enemy, turn_count)
+    warrior.fatigue_def_loss = 0
+    warrior.fatigue_save_tier = 0
+    loot = make_loot(enemy.name, monster_level=getattr(enemy, "level", 1), round_num=round_num)
+    if loot:
+        warrior.inventory.append(loot)
+        if round_num < last_round:
+            best = loadout.best_loadout(warrior, round_num + 1)
+            loadout.equip_loadout(warrior, best["slots"])
+    animate_xp_results(warrior, combat._xp_with_difficulty_mult(enemy.xp),
+                       duration=0, spend_points_fn=_spend_stat_points)
+    combat_log.log_battle_summary(warrior.name, enemy.display_name, "VICTORY", turn_count)
+    if round_num < last_round:          # skip_rest from rounds_to_win - 1
+        warrior.hp = min(warrior.max_overheal, warrior.hp + max(1, round(warrior.max_hp * 0.10)))
+        warrior.ap = min(warrior.max_ap, warrior.ap + 1)
+    combat.reset_between_rounds(warrior)
+    payout = calculate_gold_reward(enemy, turn_count, warrior)
+    award_pending_gold(warrior, payout)
+    return warrior, enemy, payout, tries
+
+
+def grown_hero(round_num, difficulty):
+    """A fresh Warrior played through rounds 1 .. round_num - 1 on the
+    current dice, ready for round_num — or None if it was walled first."""
+    import hero as hero_mod
+    warrior = hero_mod.Warrior()
+    warrior.difficulty = difficulty
+    for r in range(1, round_num):
+        won = arena_round(warrior, r)
+        if won is None:
+            return None
+        warrior = won[0]
+    return warrior
+
+
+def trajectory(seed, difficulty):
+    """One run from a fresh Warrior to the quarters interlude, seeded."""
+    import crafter
+    import hero as hero_mod
+    import merchant
+    from gold import bookie_encounter
+
+    with fight_sim.sandbox(seed), fight_sim.difficulty(difficulty):
+        warrior = hero_mod.Warrior()
+        warrior.difficulty = difficulty
+        start = warrior.gold
+        drops = first_try = 0
+        for round_num in range(1, SHOP_ROUND + 1):
+            won = arena_round(warrior, round_num)
+            if won is None:
+                return {"walled": round_num}
+            warrior, enemy, _, tries = won
+            drops += enemy.gold
+            first_try += tries == 1
+
+        pending = warrior.pending_bookie_gold
+        bookie_encounter(warrior)
+        listings = _listings(merchant.generate_merchant_stock(), crafter.generate_crafter_stock())
+        result = {
+            "gold": warrior.gold,
+            "start": start,
+            "drops": drops,
+            "pending": pending,
+            "bookie": warrior.bookie_result,
+            "sell": _sell_value(warrior.inventory),
+            "first_try": first_try,
+            "level": warrior.level,
+        }
+        result.update(shop(warrior.gold, listings))
+        return result
+
+
+def _run_chunk(args):
+    difficulty, seeds = args
+    return [trajectory(seed, difficulty) for seed in seeds]
+
+
+def simulate(difficulty, runs, seed=1, jobs=1):
+    """Trajectories for seeds seed .. seed+runs-1, fanned out over `jobs` processes."""
+    seeds = list(range(seed, seed + runs))
+    jobs = max(1, min(jobs, runs))
+    if jobs == 1:
+        return _run_chunk((difficulty, seeds))
+    size = math.ceil(len(seeds) / (jobs * 4))
+    chunks = [(difficulty, seeds[i:i + size]) for i in range(0, len(seeds), size)]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [r for part in pool.map(_run_chunk, chunks) for r in part]
+
+
+# ============================================================
+# SUMMARY
+# ============================================================
+
+def _percentile(values, pct):
+    """Nearest-rank percentile of sorted `values`."""
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def _spread(values):
+    values = sorted(values)
+    n = len(values)
+    if not n:
+        return None
+    mean = sum(values) / n
+    sd = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+    out = {"mean": mean, "ci": 1.96 * sd / math.sqrt(n), "min": values[0], "max": values[-1]}
+    out.update({f"p{p}": _percentile(values, p) for p in PERCENTILES})
+    return out
+
+
+def summarize(results):
+    runs = len(results)
+    reached = [r for r in results if "gold" in r]
+    n = len(reached) or 1
+    walled = Counter(r["walled"] for r in results if "walled" in r)
+    categories = Counter(cat for r in reached for cat in r["afford"])
+    return {
+        "runs": runs,
+        "reached": len(reached),
+        "walled": {str(k): walled[k] for k in sorted(walled)},
+        "first_try": sum(r["first_try"] for r in reached) / (n * SHOP_ROUND),
+        "level": sum(r["level"] for r in reached) / n,
+        "gold": _spread([r["gold"] for r in reached]),
+        "with_sell": _spread([r["gold"] + r["sell"] for r in reached]),
+        "sources": {
+            "start": sum(r["start"] for r in reached) / n,
+            "drops": sum(r["drops"] for r in reached) / n,
+            "payouts": sum(r["pending"] for r in reached) / n,
+            "bookie_net": sum(r["gold"] - r["start"] - r["drops"] for r in reached) / n,
+        },
+        "bookie": {k: sum(r["bookie"] == k for r in reached) / n for k in BOOKIE_RESULTS},
+        "afford": {cat: categories[cat] / n for cat in sorted(categories)},
+        "items": sum(r["items"] for r in reached) / n,
+        "titles": {
+            "penny_forced": sum(r["penny_forced"] for r in reached) / n,
+            "big_reachable": sum(r["big_reachable"] for r in reached) / n,
+            "big_greedy": sum(r["big_greedy"] for r in reached) / n,
+            "big_cheapest": sum(r["big_cheapest"] for r in reached) / n,
+        },
+    }
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+def cache_key(difficulty, runs, seed, digest=None):
+    return f"{digest or tables_hash()}:{difficulty}:{runs}:{seed}:m{MODEL}"
+
+
+def _load_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(path, cache):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def economy(difficulty, runs=DEFAULT_RUNS, seed=1, jobs=1, cache_path=CACHE_PATH, fresh=False):
+    """summarize(simulate(...)), from the cache when the pricing tables haven't
+    changed. The summary carries "cached": True/False and "seconds"."""
+    key = cache_key(difficulty, runs, seed)
+    cache = _load_cache(cache_path) if cache_path else {}
+    if not fresh and key in cache:
+        return dict(cache[key], cached=True)
+    t0 = time.perf_counter()
+    summary = summarize(simulate(difficulty, runs, seed, jobs))
+    summary["seconds"] = time.perf_counter() - t0
+    if cache_path:
+        cache[key] = summary
+        _save_cache(cache_path, cache)
+    return dict(summary, cached=False)
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def _pct(x):
+    return f"{100 * x:.1f}%"
+
+
+def render(difficulty, s):
+    source = "cached" if s["cached"] else f"{s['seconds']:.1f}s"
+    print(f"\n── {difficulty.title()} · {s['runs']} runs ({source}) " + "─" * 30)
+    walled = " · ".join(f"round {k} {_pct(v / s['runs'])}" for k, v in s["walled"].items())
+    print(f"  reached the merchant  {_pct(s['reached'] / s['runs'])}"
+          + (f"   walled: {walled}" if walled else ""))
+    if not s["reached"]:
+        return
+    print(f"  fights won 1st try    {_pct(s['first_try'])}   level at shop {s['level']:.2f}")
+    for label, key in (("gold at the merchant", "gold"), ("+ drops sold back", "with_sell")):
+        g = s[key]
+        pcts = " · ".join(f"p{p} {g[f'p{p}']}" for p in PERCENTILES)
+        print(f"  {label:<21} mean {g['mean']:.1f} ±{g['ci']:.1f}   {pcts}   (min {g['min']}, max {g['max']})")
+    src = s["sources"]
+    print(f"  where it came from    start {src['start']:.1f} · drops {src['drops']:.1f}"
+          f" · payouts {src['payouts']:.1f} → bookie paid {src['bookie_net']:.1f}")
+    print("  bookie d20            " + " · ".join(f"{k} {_pct(v)}" for k, v in s["bookie"].items()))
+    print("  can afford ≥1         " + " · ".join(f"{k} {_pct(v)}" for k, v in s["afford"].items()))
+    print(f"  items, cheapest first {s['items']:.1f}")
+    t = s["titles"]
+    print(f"  Penny Pincher forced  {_pct(t['penny_forced'])}")
+    print(f"  Big Spender           reachable {_pct(t['big_reachable'])}"
+          f" · priciest-first shopper {_pct(t['big_greedy'])}"
+          f" · cheapest-first shopper {_pct(t['big_cheapest'])}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate arena runs to the merchant and report the gold economy.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="trajectories per difficulty")
+    parser.add_argument("--seed", type=int, default=1, help="first seed")
+    parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES,
+                        help="repeatable (default: all)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--cache", default=CACHE_PATH, help="summary cache file")
+    parser.add_argument("--fresh", action="store_true", help="ignore (and overwrite) cached summaries")
+    args = parser.parse_args(argv)
+
+    print(f"pricing tables {tables_hash()[:12]} · model {MODEL} · policy {POLICY} · retries {RETRIES}")
+    for difficulty in args.difficulty or DIFFICULTIES:
+        render(difficulty, economy(difficulty, args.runs, args.seed, args.jobs, args.cache, args.fresh))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+jtwh_golden.py — Golden-run corpus: record many runs, replay them on a new build
+================================================================================
+One replay (replay.py) tells you whether a single session still plays out
+the same. This runs the whole corpus at once — hundreds of scripted runs
+replayed in parallel against the current build, each compared event by
+event (HP, damage, statuses, loot, fight scores — see replay.EventLog)
+with the log stored when it was recorded. The first divergence of every
+run that drifted is reported, so a balance or logic change (the Champion
+multiplier desync in the CHANGELOG, say) shows up in seconds instead of
+in a playtest.
+
+    python jtwh_golden.py record               # bless: 200 runs -> golden_runs/
+    python jtwh_golden.py record --runs 50 --dir /tmp/corpus
+    python jtwh_golden.py check                # replay the corpus on this build
+    python jtwh_golden.py check --jobs 8 --show 20
+
+Workflow: record on a known-good build, change the code, check. Runs that
+diverge because of a change you *meant* to make are expected — re-record
+the corpus once the change is accepted.
+
+Runs are played by ScriptedPlayer, a screen-reading policy (fight, drink a
+potion when low, shop and wander the menus a little, keep going) that
+gets a fresh hero through several arena rounds. Each run is seeded with
+its number, which also picks the difficulty, so the corpus covers Noob,
+Warrior and Champion evenly.
+
+Every record and every replay runs in its own process: the game keeps
+state in module globals, and only a fresh interpreter gives an exact
+re-run (see replay.py). Exit code: 0 all match, 1 any divergence.
+"""
+
+import argparse
+import collections
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(GAME_DIR, "golden_runs")
+DEFAULT_RUNS = 200
+INPUT_CAP = 2000            # a scripted run never needs more answers than this
+RUN_TIMEOUT_S = 120
+
+
+# ============================================================
+# SCRIPTED PLAYER
+# ============================================================
+
+class _Screen:
+    """sys.stdout stand-in that keeps what was printed since the last prompt."""
+    encoding = "utf-8"
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, s):
+        self._parts.append(s)
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+    def take(self):
+        text = "".join(self._parts)
+        self._parts = []
+        return text[-3000:]
+
+
+class ScriptedPlayer:
+    """
+    Answers prompts from what is on screen. Deterministic for a given
+    screen sequence, so the seed alone decides where a run goes.
+    """
+
+    PREFER = ["attack", "spend stat points", "spend points", "rest until",
+              "continue to next", "continue", "done", "go back", "back",
+              "leave", "exit", "skip"]
+    ESCAPES = ["0", "2", "3", "4", "5", "9", "n", "q", ""]
+    POTIONS = ("potion", "super potion", "elixir")
+    OPTION = re.compile(r"^\s*(\d+)\)\s*(.+)$", re.M)
+    HP = re.compile(r"turn  \(HP:(\d+)/(\d+)\)")
+
+    def __init__(self, screen, difficulty="1", cap=INPUT_CAP):
+        self.screen = screen
+        self.difficulty = difficulty
+        self.cap = cap
+        self.answered = 0
+        self.potions_tried = 0
+        self.seen = collections.Counter()
+
+    def __call__(self, prompt=""):
+        import replay
+        self.answered += 1
+        if self.answered > self.cap:
+            raise replay.ReplayEnd()
+        screen = self.screen.take()
+        # Same screen (numbers aside) + same prompt again -> we're looping.
+        key = (re.sub(r"\d+", "#", screen[-400:]), prompt)
+        self.seen[key] += 1
+        return self.answer((prompt or "").lower(), screen, self.seen[key])
+
+    def answer(self, p, screen, n):
+        low = screen.lower()
+        if "select difficulty" in p:
+            return self.difficulty
+        if "your move" in p:
+            hp = self.HP.findall(screen)
+            if hp and int(hp[-1][0]) * 100 < 40 * int(hp[-1][1]) and self.potions_tried < 6:
+                self.potions_tried += 1
+                return "3"
+            return "1"
+        options = self.OPTION.findall(screen)
+        if "potion bag" in low:
+            for num, label in options:
+                if label.lower().startswith(self.POTIONS):
+                    return num
+            for num, label in options:
+                if "back" in label.lower():
+                    return num
+        if "y/n" in p:
+            return "n" if n <= 2 else "y"
+        if "press enter" in p or "continue" in p:
+            return ""
+        if "name" in p and "?" in p and "tournament" not in p:
+            return "Tester"
+        if "item number" in p or "inspect" in p:
+            return "0"
+        if "q) quit" in low:
+            return "q"
+        if n >= 3 and (re.search(r"^\s*0\)", screen, re.M) or "0 to go back" in low):
+            return "0"
+        if options:
+            for word in (self.PREFER if n <= 3 else []):
+                for num, label in options:
+                    if word in label.lower():
+                        return num
+            return options[(n - 1) % len(options)][0]
+        if n <= 2:
+            return "1"
+        return self.ESCAPES[(n - 3) % len(self.ESCAPES)]
+
+
+def record_run(seed, path):
+    """Play and record one scripted run in this process (call once per process)."""
+    import replay
+    screen = _Screen()
+    player = ScriptedPlayer(screen, difficulty=str(seed % 3 + 1))
+    main = replay._game_main()
+    with replay._sandbox({"lessons": None}, player, render=True):
+        sys.stdout = screen
+        sys.modules["__main__"] = main
+        rec = replay.start_recording(path, seed=seed)
+        try:
+            main.play()
+        except (replay.ReplayEnd, SystemExit):
+            pass
+        replay.finish_recording()
+    return rec
+
+
+# ============================================================
+# CORPUS
+# ============================================================
+
+_RUN_FILE = re.compile(r"run_\d{5,}\.rec\Z")     # what _run_path() names
+
+
+def _run_path(directory, seed):
+    return os.path.join(directory, f"run_{seed:05d}.rec")
+
+
+def _spawn(cmd):
+    try:
+        res = subprocess.run(cmd, cwd=GAME_DIR, capture_output=True, text=True,
+                             timeout=RUN_TIMEOUT_S)
+    except subprocess.TimeoutExpired:
+        return None, "timed out"
+    return res, None
+
+
+def _record_one(seed, path):
+    res, err = _spawn([sys.executable, os.path.abspath(__file__), "_record", str(seed), path])
+    if err or res.returncode != 0 or not os.path.exists(path):
+        detail = err or (res.stderr or res.stdout).strip()[-300:]
+        return seed, f"recording failed: {detail}"
+    return seed, None
+
+
+def _check_one(path):
+    res, err = _spawn([sys.executable, os.path.join(GAME_DIR, "replay.py"), "--json", path])
+    if err:
+        return {"file": path, "ended": "timeout", "match": False, "error": err}
+    try:
+        return json.loads(res.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"file": path, "ended": "crash", "match": False,
+                "error": (res.stderr or res.stdout).strip()[-300:]}
+
+
+def _pool(jobs):
+    return ThreadPoolExecutor(max_workers=max(1, jobs))
+
+
+def record_corpus(directory, runs, jobs, first_seed=1):
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):              # a corpus is one build's runs
+        if _RUN_FILE.match(name):                   # ...anything else isn't ours
+            os.remove(os.path.join(directory, name))
+    failures = []
+    with _pool(jobs) as pool:
+        futures = [pool.submit(_record_one, seed, _run_path(directory, seed))
+                   for seed in range(first_seed, first_seed + runs)]
+        for fut in as_completed(futures):
+            seed, error = fut.result()
+            if error:
+                failures.append((seed, error))
+    return sorted(failures)
+
+
+def check_corpus(directory, jobs):
+    paths = sorted(os.path.join(directory, n) for n in os.listdir(directory)
+                   if _RUN_FILE.match(n))
+    with _pool(jobs) as pool:
+        results = list(pool.map(_check_one, paths))
+    return results
+
+
+def describe(result):
+    """One line saying where (and how) a run diverged."""
+    import replay
+    if result.get("event_diff"):
+        return replay.describe_event_difference(result["event_diff"])
+    if result.get("diverged"):
+        field, want, got = result["diverged"]
+        return f"final state: {field}: recorded {want!r}, replay {got!r}"
+    if result.get("error"):
+        return f"{result.get('ended')}: {result['error'].strip().splitlines()[-1]}"
+    return str(result.get("ended"))
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record / check the golden-run corpus.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="(re)record the corpus on this build")
+    rec.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    rec.add_argument("--first-seed", type=int, default=1)
+    chk = sub.add_parser("check", help="replay the corpus on this build")
+    chk.add_argument("--show", type=int, default=10, help="divergences to print (default 10)")
+    for p in (rec, chk):
+        p.add_argument("--dir", default=CORPUS_DIR)
+        p.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    one = sub.add_parser("_record")                 # internal: one run, this process
+    one.add_argument("seed", type=int)
+    one.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "_record":
+        record_run(args.seed, args.path)
+        return 0
+
+    start = time.perf_counter()
+    if args.command == "record":
+        failures = record_corpus(args.dir, args.runs, args.jobs, args.first_seed)
+        for seed, error in failures:
+            print(f"  seed {seed}: {error}")
+        print(f"Recorded {args.runs - len(failures)}/{args.runs} runs into {args.dir} "
+              f"in {time.perf_counter() - start:.1f}s")
+        return 1 if failures else 0
+
+    if not os.path.isdir(args.dir):
+        print(f"No corpus at {args.dir} — run `python jtwh_golden.py record` first.")
+        return 2
+    results = check_corpus(args.dir, args.jobs)
+    bad = [r for r in results if not r.get("match")]
+    for r in bad[:args.show]:
+        print(f"  {os.path.basename(r['file'])}: {describe(r)}")
+    if len(bad) > args.show:
+        print(f"  ... and {len(bad) - args.show} more")
+    builds = sorted({r.get("build") for r in results if r.get("build")})
+    print(f"{len(results) - len(bad)}/{len(results)} runs match "
+          f"(recorded on build {', '.join(builds) or '?'}) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if bad or not results else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+jtwh_ladder.py — Score-ladder calibration from simulated complete runs
+======================================================================
+score.RANK_THRESHOLDS are set by hand (SS went 9,000 -> 9,500 after one
+Champion run). This plays complete runs per difficulty × path — the five
+arena rounds, the moral choice, and Young Chimera (guardian) or Patronus
+(dark) — scores each one through record_fight_score / show_run_score, and
+reports:
+
+  * the final-score distribution per cell (p10 … p99) and its outcome mix
+  * how often each rank is hit with the current thresholds
+  * recommended thresholds: the score at which each rank is reached by
+    TARGET_SHARES of the pooled runs (override with --target S+=0.05) —
+    all of them, or only those with an --outcome (a boss kill, say)
+
+    python jtwh_ladder.py                              # all cells, DEFAULT_RUNS each
+    python jtwh_ladder.py --runs 2000 --jobs 8
+    python jtwh_ladder.py --difficulty champion --path dark --target SS=0.02
+    python jtwh_ladder.py --outcome chimera_victory --outcome patronus_victory
+
+How a run is played:
+  * rounds 1-4: jtwh_economy.arena_round — fight_sim's headless fight with
+    fresh-dice replays of a loss, then battle_inner's win block (gold,
+    fight score, loot, XP, rest, payout)
+  * from the quarters interlude on it is the game itself — interlude,
+    round-5 Fallen Warrior, moral choice, path boss, score screen — with
+    a jtwh_golden ScriptedPlayer at the prompts (attacks, drinks a potion
+    when low, shops a little) that takes the path under test. A lost
+    Fallen Warrior fight is replayed up to jtwh_economy.RETRIES times too.
+  * runs walled before the boss path are scored as that defeat; a run the
+    game crashes on is counted (and the error shown), not scored
+  * everything runs inside replay's sandbox (temp save / leaderboard
+    files, no network) and fight_sim.sandbox (the caller's dice and
+    combat log put back)
+
+The scripted player hardly uses skills and crafts nothing, so it is a
+floor, not a typical player: read the top of the ladder off the boss-
+victory runs (--outcome) rather than the pooled mix.
+
+Scores stream into QuantileSketches per cell and per outcome — KLL
+sketches, so memory stays O(k log n) however many runs are played, and
+the sketches worker processes send back merge within the same error
+bound. Ranks / outcomes are counted as they arrive.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fight_sim
+import jtwh_economy
+import jtwh_golden
+
+
+DIFFICULTIES = ("noob", "warrior", "champion")
+PATHS = ("guardian", "dark")
+PATH_CHOICE = {"guardian": "1", "dark": "2"}    # fallen_warrior_moral_choice's menu
+FINAL_ROUND = 5
+OUTCOMES = ("chimera_victory", "patronus_victory", "intervention", "defeat")
+DEFAULT_RUNS = 200          # per difficulty × path
+CHUNK = 25                  # runs per worker task
+SKETCH_K = 200
+PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+ROUND_TO = 50               # recommended thresholds are rounded to this
+# Share of all runs (every cell pooled, equally weighted) that should reach
+# at least each rank.
+TARGET_SHARES = {
+    "SS": 0.01,
+    "S+": 0.05,
+    "S":  0.15,
+    "A":  0.30,
+    "B":  0.55,
+    "C":  0.80,
+    "D":  0.95,
+}
+
+
+# ============================================================
+# QUANTILE SKETCH
+# ============================================================
+
+class QuantileSketch:
+    """
+    KLL quantile sketch: levels of stored values, an item on level h
+    standing for 2**h originals. A full level is sorted and every other
+    item (random offset) promoted, so rank error stays ~1/k with
+    O(k log n) items kept. Mergeable: merge() then compact.
+    """
+
+    def __init__(self, k=SKETCH_K, seed=0):
+        self.k = k
+        self.levels = [[]]
+        self.n = 0
+        self.min = self.max = None
+        self._rng = random.Random(seed)     # never the run's dice
+
+    def __len__(self):
+        return self.n
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compact(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                items = sorted(self.levels[h])
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[h + 1].extend(items[self._rng.randint(0, 1)::2])
+                self.levels[h] = keep
+            h += 1
+
+    def update(self, x):
+        self.levels[0].append(x)
+        self.n += 1
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compact()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for h, items in enumerate(other.levels):
+            self.levels[h].extend(items)
+        self.n += other.n
+        for x in (other.min, other.max):
+            if x is not None:
+                self.update_bounds(x)
+        self._compact()
+        return self
+
+    def update_bounds(self, x):
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+    def _weighted(self):
+        return sorted((x, 1 << h) for h, items in enumerate(self.levels) for x in items)
+
+    def quantile(self, q):
+        """The value with a q share of the stream at or below it."""
+        if not self.n:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        pairs = self._weighted()
+        total = sum(w for _, w in pairs)
+        target = q * total
+        seen = 0
+        for x, w in pairs:
+            seen += w
+            if seen >= target:
+                return x
+        return self.max
+
+    def share_at_least(self, x):
+        """Estimated share of the stream >= x."""
+        pairs = self._weighted()
+        total = sum(w for _, w in pairs)
+        return sum(w for v, w in pairs if v >= x) / total if total else 0.0
+
+    def stored(self):
+        return sum(len(items) for items in self.levels)
+
+
+# ============================================================
+# ONE COMPLETE RUN
+# ============================================================
+
+class PathPlayer(jtwh_golden.ScriptedPlayer):
+    """The golden-run player, taking `path` at the moral choice."""
+
+    def __init__(self, screen, path):
+        super().__init__(screen)
+        self.choice = PATH_CHOICE[path]
+
+    def answer(self, p, screen, n):
+        if "crush the essence" in screen.lower():
+            return self.choice
+        return super().answer(p, screen, n)
+
+
+def _scored_defeat(warrior, walled):
+    import score
+    final = score.show_run_score(warrior, outcome="defeat")
+    return {"score": final, "outcome": "defeat", "rank": score._rank_for_score(final)[0],
+            "walled": walled, "level": warrior.level}
+
+
+def _final_round(warrior, main):
+    """Round 5 onward through the real battle(); the boss path ends the run."""
+    import combat
+    import combat_log
+    import leaderboard_db
+    import monsters
+    import replay
+    import snapshot
+
+    snapshot.mark_scene("arena_round", round_num=FINAL_ROUND, rounds_to_win=FINAL_ROUND)
+    warrior.death_defier_used = False
+    enemy = monsters.select_arena_enemy(FINAL_ROUND)
+    ended = (SystemExit, replay.ReplayEnd, main.PlayAgainException)
+    for _ in range(jtwh_economy.RETRIES):
+        saved_run = dict(combat_log._run_stats)
+        hero, foe = fight_sim.scratch(warrior, enemy)
+        try:
+            result = combat.battle(hero, foe, skip_rest=True, round_num=FINAL_ROUND)
+        except ended:
+            result = "win"          # the ending's play-again prompt closed the run
+        if result == "win":
+            entries = leaderboard_db.top(1)
+            if not entries:         # the scripted player got stuck before the score screen
+                return {"stuck": True}
+            e = entries[0]
+            return {"score": e["score"], "outcome": e["outcome"], "rank": e["rank"],
+                    "walled": None, "level": e["level"]}
+        combat_log._run_stats.clear()
+        combat_log._run_stats.update(saved_run)
+    return _scored_defeat(warrior, FINAL_ROUND)
+
+
+def complete_run(seed, difficulty, path):
+    """
+    Play one seeded run to its end. Returns {"score", "outcome", "rank",
+    "walled" (round, or None), "level"}, {"stuck": True} when the scripted
+    player looped, or {"crash": "Error: ..."} when the game raised.
+    """
+    import hero as hero_mod
+    import replay
+    import snapshot
+    import story
+
+    screen = jtwh_golden._Screen()
+    player = PathPlayer(screen, path)
+    main = replay._game_main()
+    real_main, real_stdout = sys.modules["__main__"], sys.stdout
+    session = dict(snapshot.SESSION)
+    try:
+        with replay._sandbox({"lessons": None}, player, render=True):
+            sys.stdout = screen
+            sys.modules["__main__"] = main
+            with fight_sim.sandbox(seed, silent=False), fight_sim.difficulty(difficulty):
+                warrior = hero_mod.Warrior()
+                warrior.difficulty = difficulty
+                warrior.level_cap = main.ARENA_LEVEL_CAP
+                for round_num in range(1, FINAL_ROUND):
+                    won = jtwh_economy.arena_round(warrior, round_num, last_round=FINAL_ROUND - 1)
+                    if won is None:
+                        return _scored_defeat(warrior, round_num)
+                    warrior = won[0]
+                # a fresh interlude — no shop stock carried over (arena_battle does the same)
+                snapshot.mark_scene("arena_quarters", round_num=FINAL_ROUND,
+                                    merchant_stock=None, crafter_stock=None)
+                try:
+                    story.arena_quarters_interlude(warrior)
+                except replay.ReplayEnd:
+                    return {"stuck": True}
+                return _final_round(warrior, main)
+    except Exception as e:
+        return {"crash": f"{type(e).__name__}: {e}"}
+    finally:
+        sys.stdout = real_stdout
+        sys.modules["__main__"] = real_main
+        snapshot.SESSION.clear()
+        snapshot.SESSION.update(session)
+
+
+# ============================================================
+# BATCHES
+# ============================================================
+
+def _new_cell():
+    return {"sketch": QuantileSketch(), "by_outcome": {}, "ranks": Counter(), "outcomes": Counter(),
+            "walled": Counter(), "crashes": Counter(), "stuck": 0, "runs": 0}
+
+
+def _add(cell, result):
+    cell["runs"] += 1
+    if result.get("stuck"):
+        cell["stuck"] += 1
+        return
+    if "crash" in result:
+        cell["crashes"][result["crash"]] += 1
+        return
+    cell["sketch"].update(result["score"])
+    cell["by_outcome"].setdefault(result["outcome"], QuantileSketch()).update(result["score"])
+    cell["ranks"][result["rank"]] += 1
+    cell["outcomes"][result["outcome"]] += 1
+    if result["walled"]:
+        cell["walled"][result["walled"]] += 1
+
+
+def _merge(into, part):
+    into["sketch"].merge(part["sketch"])
+    for outcome, sketch in part["by_outcome"].items():
+        into["by_outcome"].setdefault(outcome, QuantileSketch()).merge(sketch)
+    for key in ("ranks", "outcomes", "walled", "crashes"):
+        into[key].update(part[key])
+    into["stuck"] += part["stuck"]
+    into["runs"] += part["runs"]
+
+
+def _run_chunk(args):
+    difficulty, path, seeds = args
+    cell = _new_cell()
+    for seed in seeds:
+        _add(cell, complete_run(seed, difficulty, path))
+    return difficulty, path, cell
+
+
+def simulate(difficulties=DIFFICULTIES, paths=PATHS, runs=DEFAULT_RUNS, seed=1, jobs=1):
+    """{(difficulty, path): cell}, chunks fanned out over `jobs` processes
+    and merged into each cell's sketch as they finish."""
+    cells = {(d, p): _new_cell() for d in difficulties for p in paths}
+    tasks = [(d, p, list(range(s, min(seed + runs, s + CHUNK))))
+             for d, p in cells for s in range(seed, seed + runs, CHUNK)]
+    if jobs <= 1:
+        for task in tasks:
+            d, p, part = _run_chunk(task)
+            _merge(cells[(d, p)], part)
+        return cells
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for fut in as_completed([pool.submit(_run_chunk, t) for t in tasks]):
+            d, p, part = fut.result()
+            _merge(cells[(d, p)], part)
+    return cells
+
+
+# ============================================================
+# CALIBRATION
+# ============================================================
+
+def pooled(cells, outcomes=None):
+    """One sketch over every cell (or only runs that ended in `outcomes`)."""
+    out = QuantileSketch()
+    for cell in cells.values():
+        if outcomes is None:
+            out.merge(cell["sketch"])
+            continue
+        for outcome in outcomes:
+            if outcome in cell["by_outcome"]:
+                out.merge(cell["by_outcome"][outcome])
+    return out
+
+
+def recommend(sketch, targets=None):
+    """[(rank, current threshold, share now, target share, recommended)], SS first."""
+    import score
+    targets = TARGET_SHARES if targets is None else targets
+    rows = []
+    for rank, threshold in score.RANK_THRESHOLDS:
+        if rank not in targets:
+            continue
+        value = sketch.quantile(1 - targets[rank])
+        suggested = None if value is None else max(ROUND_TO, int(round(value / ROUND_TO)) * ROUND_TO)
+        rows.append((rank, threshold, sketch.share_at_least(threshold), targets[rank], suggested))
+    # thresholds must stay strictly decreasing down the ladder
+    for i in range(1, len(rows)):
+        if rows[i][4] is not None and rows[i - 1][4] is not None and rows[i][4] >= rows[i - 1][4]:
+            rows[i] = rows[i][:4] + (rows[i - 1][4] - ROUND_TO,)
+    return rows
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def _pct(x):
+    return f"{100 * x:.1f}%"
+
+
+def render(cells, targets, seconds, outcomes=None):
+    import score
+    ladder = [rank for rank, _ in score.RANK_THRESHOLDS]
+    print(f"{sum(c['runs'] for c in cells.values())} runs in {seconds:.1f}s")
+    for (difficulty, path), cell in cells.items():
+        s = cell["sketch"]
+        print(f"\n── {difficulty.title()} · {path} · {cell['runs']} runs " + "─" * 30)
+        if not len(s):
+            print(f"  no scored runs ({cell['stuck']} stuck)")
+            continue
+        pcts = " · ".join(f"p{p} {s.quantile(p / 100)}" for p in PERCENTILES)
+        print(f"  score       {pcts}   (min {s.min}, max {s.max})")
+        print("  outcome     " + " · ".join(f"{k} {_pct(v / len(s))}" for k, v in cell["outcomes"].most_common()))
+        print("  rank        " + " · ".join(f"{r} {_pct(cell['ranks'][r] / len(s))}"
+                                        for r in ladder if cell["ranks"][r]))
+        if cell["walled"] or cell["stuck"]:
+            walled = " · ".join(f"round {k} {v}" for k, v in sorted(cell["walled"].items()))
+            print(f"  walled      {walled or '-'}   stuck {cell['stuck']}")
+        for error, count in cell["crashes"].most_common():
+            print(f"  ⚠️  crashed ×{count}: {error}")
+
+    sketch = pooled(cells, outcomes)
+    which = " / ".join(outcomes) if outcomes else "all outcomes"
+    print(f"\n── Ladder · {len(sketch)} runs pooled, {which} (sketch keeps {sketch.stored()}) " + "─" * 8)
+    if not len(sketch):
+        return
+    print(f"  {'rank':<5}{'now':>8}{'reached':>10}{'target':>9}{'suggest':>10}")
+    for rank, threshold, share, target, suggested in recommend(sketch, targets):
+        print(f"  {rank:<5}{threshold:>8}{_pct(share):>10}{_pct(target):>9}{suggested if suggested is not None else '-':>10}")
+
+
+def _parse_target(text):
+    rank, _, share = text.partition("=")
+    try:
+        return rank.strip().upper(), float(share)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected RANK=SHARE, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate complete runs and calibrate the rank thresholds.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="runs per difficulty × path")
+    parser.add_argument("--seed", type=int, default=1, help="first seed")
+    parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES, help="repeatable (default: all)")
+    parser.add_argument("--path", action="append", choices=PATHS, help="repeatable (default: both)")
+    parser.add_argument("--target", action="append", type=_parse_target, default=[],
+                        help="RANK=SHARE, share of runs that should reach RANK (repeatable)")
+    parser.add_argument("--outcome", action="append", choices=OUTCOMES,
+                        help="calibrate on runs that ended this way only (repeatable)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    targets = dict(TARGET_SHARES, **dict(args.target))
+    t0 = time.perf_counter()
+    cells = simulate(tuple(args.difficulty or DIFFICULTIES), tuple(args.path or PATHS),
+                     args.runs, args.seed, args.jobs)
+    render(cells, targets, time.perf_counter() - t0, args.outcome)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
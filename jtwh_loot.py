@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+jtwh_loot.py — Drop-rate analytics: the loot rolls, sampled in bulk
+===================================================================
+Checks the drop design against the tables the game actually rolls on —
+Champion's "no poor, +10% rare per variant level", socket counts by
+rarity, weapon tiers, the merchant's variant rolls and the crafter's
+wildcard — by drawing a million-plus samples per table and reporting, per
+difficulty × round × monster level:
+
+  * rarity histograms (share with a 95% Wilson interval)
+  * per monster: the drop, its slot / weapon tier, expected sockets and
+    every stat that moves with rarity (mean ± 95% CI, min–max)
+  * merchant weapon variants and crafter wildcard rarities per difficulty
+  * design checks (PASS / FAIL) — exit code 1 if any fail
+
+    python jtwh_loot.py                          # all difficulties, rounds 1-4
+    python jtwh_loot.py --samples 10000000       # per table
+    python jtwh_loot.py --difficulty champion --round 3
+    python jtwh_loot.py --monster "goblin warrior"
+
+Rarity rolls come from equipment.RARITY_CUTS / samplers.weights(), the same
+tables roll_rarity and _roll_wildcard_rarity read; the sampled shares are
+checked against the live roll_rarity (fed every d100 face). Merchant
+variants use merchant.MERCHANT_VARIANT_CHANCE. make_loot is a pure
+function of the rarity it gets, so each drop's sockets and stats are
+looked up once per rarity and weighted by the sampled counts.
+
+With NumPy installed the draws are vectorised (uniforms bisected into the
+cumulative odds, in chunks). NumPy is optional (requirements.txt lists it
+with the dev tools): without it the draws go through samplers' alias
+tables at roughly 0.4 µs each — about 6 s for the default run (14 tables
+x 1M) and about a minute at --samples 10000000.
+"""
+
+import argparse
+import itertools
+import math
+import random
+import sys
+import time
+from collections import Counter
+
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    np = None
+    _HAS_NUMPY = False
+
+
+DEFAULT_SAMPLES = 1_000_000     # draws per table
+CHUNK = 1 << 20                 # draws held in memory at once
+Z95 = 1.96
+Z_CHECK = 4.0                   # sample-vs-table agreement, over many cells
+DIFFICULTIES = ("noob", "warrior", "champion")
+ROUNDS = (1, 2, 3, 4)           # round 5 is the Fallen boss — no drop table
+
+
+# ============================================================
+# SAMPLING
+# ============================================================
+
+class Sampler:
+    """Counts n draws from [(outcome, weight), ...] — NumPy when present."""
+
+    def __init__(self, seed=1, use_numpy=_HAS_NUMPY):
+        self.use_numpy = use_numpy
+        self.rng = np.random.default_rng(seed) if use_numpy else random.Random(seed)
+        self.drawn = 0
+
+    def counts(self, pairs, n):
+        import samplers
+        pairs = [(o, w) for o, w in pairs if w > 0]
+        outcomes = [o for o, _ in pairs]
+        self.drawn += n
+        if self.use_numpy:
+            p = np.array([w for _, w in pairs], dtype=float)
+            cumulative = np.cumsum(p / p.sum())
+            tally = np.zeros(len(outcomes), dtype=np.int64)
+            left = n
+            while left:
+                k = min(CHUNK, left)
+                idx = np.searchsorted(cumulative, self.rng.random(k), side="right")
+                tally += np.bincount(np.minimum(idx, len(outcomes) - 1), minlength=len(outcomes))
+                left -= k
+            return dict(zip(outcomes, (int(c) for c in tally)))
+        table = samplers.AliasTable(pairs)
+        tally = Counter()
+        left = n
+        while left:
+            k = min(CHUNK, left)
+            tally.update(table.sample_n(k, self.rng))
+            left -= k
+        return {o: tally.get(o, 0) for o in outcomes}
+
+
+def share_ci(k, n, z=Z95):
+    """(share, low, high) — Wilson score interval."""
+    p = k / n
+    centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return p, max(0.0, centre - half), min(1.0, centre + half)
+
+
+def mean_ci(counts, value, z=Z95):
+    """(mean, ± half-width, min, max) of value(outcome) over the sampled counts."""
+    n = sum(counts.values())
+    seen = [(value(o), c) for o, c in counts.items() if c]
+    mean = sum(v * c for v, c in seen) / n
+    var = sum(c * (v - mean) ** 2 for v, c in seen) / max(1, n - 1)
+    return mean, z * math.sqrt(var / n), min(v for v, _ in seen), max(v for v, _ in seen)
+
+
+# ============================================================
+# SOURCE TABLES
+# ============================================================
+
+def drop_table():
+    """[(monster name, tier, {rarity: item}), ...] for every arena monster with a drop."""
+    import equipment
+    import monsters
+    drops = []
+    for cls, weight in monsters.MONSTER_TYPES:
+        name = cls().name
+        items = {r: equipment.make_loot(name, forced_rarity=r) for r in equipment.RARITY_ORDER}
+        if items["normal"] is not None:
+            drops.append((name, monsters.weight_to_tier(weight), items))
+    return drops
+
+
+def moving_stats(items):
+    """The numeric fields that change with rarity (name order as on the item)."""
+    fields = [k for k, v in vars(items["normal"]).items()
+              if isinstance(v, (int, float)) and not isinstance(v, bool) and k != "tier"]
+    return [k for k in fields if len({getattr(it, k, 0) for it in items.values()}) > 1]
+
+
+def live_rarity(level, round_num, difficulty):
+    """equipment.roll_rarity's exact odds: the live function, fed every d100 face."""
+    import types
+    import equipment
+    import fight_sim
+    faces = iter(range(1, 101))
+    real = equipment.random
+    equipment.random = types.SimpleNamespace(randint=lambda a, b: next(faces))
+    try:
+        with fight_sim.difficulty(difficulty):
+            return Counter(equipment.roll_rarity(level, round_num) for _ in range(100))
+    finally:
+        equipment.random = real
+
+
+def merchant_variant_weights(difficulty):
+    """[(variants on offer for one weapon type, probability), ...]."""
+    import merchant
+    chances = [("uncommon", merchant.MERCHANT_VARIANT_CHANCE["uncommon"]),
+               ("rare", 0.0 if difficulty == "noob" else merchant.MERCHANT_VARIANT_CHANCE["rare"]),
+               ("epic", merchant.MERCHANT_VARIANT_CHANCE["epic"] if difficulty == "champion" else 0.0)]
+    pairs = []
+    for hits in itertools.product((True, False), repeat=len(chances)):
+        p = 1.0
+        for hit, (_, chance) in zip(hits, chances):
+            p *= chance if hit else 1 - chance
+        pairs.append((("normal",) + tuple(r for hit, (r, _) in zip(hits, chances) if hit), p))
+    return pairs
+
+
+# ============================================================
+# ANALYSIS
+# ============================================================
+
+def analyze(samples=DEFAULT_SAMPLES, seed=1, difficulties=DIFFICULTIES, rounds=ROUNDS,
+            use_numpy=_HAS_NUMPY):
+    """Sample every table the report needs; returns the report dict render() prints."""
+    import equipment
+    import monsters
+    import samplers
+    from shared import Equipment
+
+    sampler = Sampler(seed, use_numpy)
+    start = time.perf_counter()
+    rarity = {}                                 # RARITY_CUTS key -> counts
+
+    def rarity_counts(level, round_num, difficulty):
+        key = equipment.rarity_key(level, round_num, difficulty)
+        if key not in rarity:
+            rarity[key] = sampler.counts(samplers.weights("rarity", level, round_num, difficulty), samples)
+        return key, rarity[key]
+
+    drops = drop_table()
+    cells = []
+    for difficulty in difficulties:
+        for round_num in rounds:
+            tiers = [t for t, w in samplers.weights("tier", round_num) if w > 0 and t != 4]
+            levels, rows = {}, []
+            for name, tier, items in drops:
+                if tier not in tiers:
+                    continue
+                level = monsters.monster_level_for_round(tier, round_num)
+                key, counts = rarity_counts(level, round_num, difficulty)
+                levels.setdefault(level, counts)
+                item = items["normal"]
+                rows.append({
+                    "monster": name, "tier": tier, "level": level, "key": key,
+                    "item": item.name, "slot": item.slot,
+                    "weapon_tier": getattr(item, "tier", None) if item.slot == "weapon" else None,
+                    "sockets": mean_ci(counts, lambda r, items=items: items[r].socket_count()),
+                    "stats": {f: mean_ci(counts, lambda r, items=items, f=f: getattr(items[r], f, 0))
+                              for f in moving_stats(items)},
+                })
+            cells.append({"difficulty": difficulty, "round": round_num,
+                          "levels": dict(sorted(levels.items())), "drops": rows})
+
+    weapon_sockets = Equipment._SOCKET_COUNTS_WEAPON
+    shops = {}
+    for difficulty in difficulties:
+        counts = sampler.counts(merchant_variant_weights(difficulty), samples)
+        shops[difficulty] = {
+            "variants": {r: sum(c for v, c in counts.items() if r in v)
+                         for r in ("uncommon", "rare", "epic")},
+            "listings": mean_ci(counts, lambda v: 3 * len(v)),
+            "sockets": mean_ci(counts, lambda v: sum(weapon_sockets.get(r, 0) for r in v)),
+            "wildcard": sampler.counts(samplers.weights("wildcard", difficulty), samples),
+        }
+
+    # Champion's per-level steps, whatever rounds were asked for.
+    champion = {lvl: rarity_counts(lvl, 3, "champion")[1] for lvl in (1, 2, 3)}
+    report = {"samples": samples, "seed": seed, "numpy": sampler.use_numpy,
+              "rarity": rarity, "cells": cells, "shops": shops}
+    report["checks"] = _design_checks(report, champion)
+    report["drawn"] = sampler.drawn
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def _design_checks(report, champion):
+    import equipment
+    n = report["samples"]
+    checks = []
+
+    poor = sum(c.get("poor", 0) for key, c in report["rarity"].items() if key[0])
+    checks.append(("Champion drops no poor", poor == 0, f"{poor} poor drawn"))
+
+    for lo, hi in ((1, 2), (2, 3)):
+        # the rule is checked on roll_rarity's exact odds; the samples only
+        # have to agree with that (at Z_CHECK, not a 95% interval that a
+        # correct table misses one run in twenty)
+        exact = (live_rarity(hi, 3, "champion")["rare"] - live_rarity(lo, 3, "champion")["rare"]) / 100
+        p1, p2 = champion[lo].get("rare", 0) / n, champion[hi].get("rare", 0) / n
+        se = math.sqrt((p1 * (1 - p1) + p2 * (1 - p2)) / n)
+        step = p2 - p1
+        ok = abs(exact - 0.10) < 1e-9 and abs(step - exact) <= Z_CHECK * se
+        checks.append((f"Champion rare +10 pts L{lo}→L{hi}", ok,
+                       f"exact {exact:+.0%}, sampled {step:+.2%} ± {Z_CHECK * se:.2%}"))
+
+    noob = report["shops"].get("noob")
+    if noob:
+        rare = noob["variants"]["rare"] + noob["wildcard"].get("rare", 0)
+        checks.append(("Noob merchant / crafter never rare", rare == 0, f"{rare} rare drawn"))
+
+    worst = (0.0, None)
+    for key, counts in report["rarity"].items():
+        exact = live_rarity(key[2], 1 if key[1] else 2, "champion" if key[0] else "warrior")
+        total = sum(exact.values())
+        for r, w in exact.items():
+            p = w / total
+            if 0 < p < 1:
+                z = abs(counts.get(r, 0) / n - p) / math.sqrt(p * (1 - p) / n)
+                worst = max(worst, (z, f"{equipment.RARITY_CUTS[key]} {r}"), key=lambda t: t[0])
+    checks.append(("Sampled shares match roll_rarity", worst[0] < Z_CHECK,
+                   f"worst |z| = {worst[0]:.2f}"))
+    return checks
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def _share(k, n):
+    p, lo, hi = share_ci(k, n)
+    return f"{p:6.2%} [{lo:.2%}–{hi:.2%}]"
+
+
+def _mean(stat):
+    mean, half, lo, hi = stat
+    return f"{mean:.3f}±{half:.3f} ({lo:g}–{hi:g})"
+
+
+def render(report, monster=None):
+    import equipment
+    n = report["samples"]
+    order = {r: i for i, r in enumerate(equipment.RARITY_ORDER)}
+    want = monster.lower() if monster else None
+    for cell in report["cells"]:
+        print(f"\n── {cell['difficulty'].title()} · round {cell['round']} " + "─" * 40)
+        for level, counts in cell["levels"].items():
+            hist = "  ".join(f"{r} {_share(c, n)}" for r, c in sorted(counts.items(), key=lambda t: order[t[0]]))
+            print(f"  L{level}  {hist}")
+        for row in cell["drops"]:
+            if want and want not in (row["monster"].lower(), row["item"].lower()):
+                continue
+            kind = f"T{row['weapon_tier']} weapon" if row["weapon_tier"] else row["slot"]
+            print(f"    {row['item']:<20} {row['monster']:<16} L{row['level']} {kind:<10} "
+                  f"sockets {_mean(row['sockets'])}")
+            for field, stat in row["stats"].items():
+                print(f"        {field:<18} {_mean(stat)}")
+
+    print("\n── Merchant weapons (per weapon type) / crafter wildcard " + "─" * 20)
+    for difficulty, shop in report["shops"].items():
+        shares = "  ".join(f"{r} {_share(c, n)}" for r, c in shop["variants"].items())
+        print(f"  {difficulty:<9} {shares}")
+        print(f"  {'':<9} listings/visit {_mean(shop['listings'])}   sockets/type {_mean(shop['sockets'])}")
+        wild = "  ".join(f"{r} {_share(c, n)}" for r, c in sorted(shop["wildcard"].items(), key=lambda t: order[t[0]]))
+        print(f"  {'':<9} wildcard  {wild}")
+
+    print("\n── Design checks " + "─" * 40)
+    for label, ok, detail in report["checks"]:
+        print(f"  {'PASS' if ok else 'FAIL'}  {label}  {detail}")
+    print(f"\n{report['drawn']:,} draws in {report['seconds']:.1f}s "
+          f"({'NumPy' if report['numpy'] else 'pure Python; pip install numpy to vectorise'}, seed {report['seed']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sample the loot tables in bulk and report drop rates.")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="draws per table")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES,
+                        help="repeatable (default: all)")
+    parser.add_argument("--round", action="append", type=int, choices=ROUNDS,
+                        help="repeatable (default: 1-4)")
+    parser.add_argument("--monster", help="only this monster's (or item's) drop lines")
+    parser.add_argument("--no-numpy", action="store_true", help="force the pure-Python sampler")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.samples, args.seed,
+                     tuple(args.difficulty or DIFFICULTIES), tuple(args.round or ROUNDS),
+                     use_numpy=_HAS_NUMPY and not args.no_numpy)
+    render(report, args.monster)
+    return 0 if all(ok for _, ok, _ in report["checks"]) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
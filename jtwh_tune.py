@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+jtwh_tune.py — Difficulty multiplier tuner (sequential tests, early stop)
+=========================================================================
+DIFFICULTY_MONSTER_MULT and DIFFICULTY_BOSS_MULT (combat.py) scale every
+arena monster / path boss per difficulty tier, and have been set by hand
+(champion's boss value went 1.30 -> 1.50 after play-testing). This
+searches each one, per tier, for the multiplier that gives a target win
+rate:
+
+  * monster: one arena fight, rounds 1-4 in turn — the hero a survivor
+    run has grown into by that round (jtwh_economy.arena_round under the
+    shipped tables), at full HP, against select_arena_enemy() scaled by
+    the candidate, fought once with fight_sim's "best" policy
+  * boss: a complete run through the game (jtwh_ladder.complete_run —
+    the scripted player, guardian and dark paths in turn) with the
+    candidate boss multiplier; a win is a Young Chimera / Patronus kill.
+    Runs walled before the path boss, stuck or crashed aren't samples.
+
+    python jtwh_tune.py                            # both tables, all tiers
+    python jtwh_tune.py --kind monster --jobs 3
+    python jtwh_tune.py --target monster:champion=0.65 --delta 0.03
+
+The search is a bisection on the multiplier (win rate falls as it
+rises). Each candidate is judged by a Wald sequential probability ratio
+test — target + delta against target - delta, error rates alpha / beta —
+that stops the moment the fights seen so far decide it: a candidate far
+off the target is settled in a few dozen fights instead of the fixed
+sample the same test needs (fixed_n(), reported alongside). A candidate
+still undecided after fixed_n() fights is within ~delta of the target,
+and the search stops there.
+
+Candidates share their dice: sample i is always seed + i, so neighbouring
+multipliers meet the same heroes and enemies and the bisection doesn't
+chase noise. Tiers are independent and fan out over a process pool
+(--jobs). Everything runs inside fight_sim.sandbox — the caller's dice,
+combat log and multiplier tables are put back.
+
+The scripted player is a floor (it hardly uses skills and never crafts),
+so the boss targets are for that player — compare tables against each
+other rather than reading the numbers as a typical run.
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import fight_sim
+import jtwh_economy
+
+
+DIFFICULTIES = ("noob", "warrior", "champion")
+KINDS = ("monster", "boss")
+TABLES = {"monster": "DIFFICULTY_MONSTER_MULT", "boss": "DIFFICULTY_BOSS_MULT"}
+# Win rate each multiplier is tuned to, per kind and tier.
+TARGETS = {
+    "monster": {"noob": 0.90, "warrior": 0.80, "champion": 0.70},
+    "boss":    {"noob": 0.50, "warrior": 0.30, "champion": 0.20},
+}
+DELTA = {"monster": 0.05, "boss": 0.10}     # indifference half-width around the target
+ALPHA = 0.05                # P(call it too easy | win rate is target - delta)
+BETA = 0.05                 # P(call it too hard | win rate is target + delta)
+BOUNDS = (0.30, 3.00)       # multipliers searched
+STEP = 0.02                 # bisection stops when the bracket is this narrow
+MAX_SKIPS = 4               # unusable draws allowed per counted fight before giving up
+POLICY = "best"
+
+
+# ============================================================
+# SEQUENTIAL TEST
+# ============================================================
+
+def fixed_n(target, delta, alpha=ALPHA, beta=BETA):
+    """Fights a fixed-size test needs for the same decision (normal approx.)."""
+    z = NormalDist().inv_cdf(1 - alpha) + NormalDist().inv_cdf(1 - beta)
+    return math.ceil(z * z * target * (1 - target) / (delta * delta))
+
+
+def sprt(sample, target, delta, alpha=ALPHA, beta=BETA, seed=1, max_n=None):
+    """
+    Wald's SPRT on a win rate. sample(seed) returns True / False, or None
+    for a draw that doesn't count. Returns {"verdict", "n", "wins",
+    "skipped"}: "easy" (win rate >= target + delta), "hard" (<= target -
+    delta), or "near" when max_n fights (default fixed_n()) left it open.
+    """
+    hi = min(target + delta, 1 - 1e-9)
+    lo = max(target - delta, 1e-9)
+    win_step, loss_step = math.log(hi / lo), math.log((1 - hi) / (1 - lo))
+    upper, lower = math.log((1 - beta) / alpha), math.log(beta / (1 - alpha))
+    max_n = fixed_n(target, delta, alpha, beta) if max_n is None else max_n
+    llr = 0.0
+    n = wins = skipped = 0
+    verdict = "near"
+    while n < max_n:
+        won = sample(seed + n + skipped)
+        if won is None:
+            skipped += 1
+            if skipped > MAX_SKIPS * (n + 1):
+                verdict = "unusable"
+                break
+            continue
+        n += 1
+        wins += bool(won)
+        llr += win_step if won else loss_step
+        if llr >= upper:
+            verdict = "easy"
+            break
+        if llr <= lower:
+            verdict = "hard"
+            break
+    return {"verdict": verdict, "n": n, "wins": wins, "skipped": skipped}
+
+
+def search(sample, target, delta, start, alpha=ALPHA, beta=BETA, seed=1, bounds=BOUNDS):
+    """
+    Bisect the multiplier; sample(seed, mult) is one fight. Returns
+    {"mult", "bracket", "steps", "fights", "fixed"} — mult the last
+    candidate judged near (or, once the bracket closes, the last one judged
+    easy — never one judged hard), bracket the final (lo, hi), the steps
+    one dict per candidate, fights every counted fight, fixed what
+    fixed_n() fights per candidate would have cost.
+    """
+    lo, hi = bounds
+    mult = min(max(round(start, 2), lo), hi)
+    steps = []
+    best = None
+    while True:
+        result = sprt(lambda s, m=mult: sample(s, m), target, delta, alpha, beta, seed)
+        steps.append(dict(result, mult=mult))
+        if result["verdict"] in ("near", "unusable"):
+            best = mult
+            break
+        if result["verdict"] == "easy":
+            lo = best = mult
+        else:
+            hi = mult
+        nxt = round((lo + hi) / 2, 2)
+        if hi - lo <= STEP or nxt in (lo, hi):
+            break
+        mult = nxt
+    if best is None:            # every candidate was hard: the lower search bound
+        best = lo
+    return {"mult": best, "bracket": (lo, hi), "steps": steps,
+            "fights": sum(s["n"] for s in steps),
+            "fixed": fixed_n(target, delta, alpha, beta) * len(steps)}
+
+
+# ============================================================
+# SAMPLES
+# ============================================================
+
+def _grown(seed, round_num, difficulty, cache):
+    """(hero at the start of round_num, dice state) for this seed, or None
+    if the run was walled first — grown once, shared by every candidate."""
+    key = (seed, round_num)
+    if key not in cache:
+        warrior = jtwh_economy.grown_hero(round_num, difficulty)
+        cache[key] = None if warrior is None else (warrior, random.getstate())
+    return cache[key]
+
+
+def monster_fight(seed, difficulty, mult, cache=None):
+    """One arena fight (round 1 + seed % 4) with the candidate monster multiplier."""
+    import monsters
+    cache = {} if cache is None else cache
+    round_num = 1 + seed % jtwh_economy.SHOP_ROUND
+    with fight_sim.sandbox(seed), fight_sim.difficulty(difficulty):
+        grown = _grown(seed, round_num, difficulty, cache)
+        if grown is None:
+            return None
+        warrior, state = grown
+        random.setstate(state)
+        main = sys.modules["__main__"]
+        main.DIFFICULTY_MONSTER_MULT = dict(main.DIFFICULTY_MONSTER_MULT, **{difficulty: mult})
+        hero, enemy = fight_sim.scratch(warrior, monsters.select_arena_enemy(round_num))
+        hero.hp = max(hero.hp, hero.max_hp)
+        won, _, _ = fight_sim.run(hero, enemy, POLICY)
+    return bool(won)
+
+
+def boss_fight(seed, difficulty, mult):
+    """One complete run (path by seed parity) with the candidate boss multiplier."""
+    import combat
+    import jtwh_ladder
+    import replay
+    replay._game_main()         # its import re-injects combat's tables — before the patch
+    saved = combat.DIFFICULTY_BOSS_MULT
+    combat.DIFFICULTY_BOSS_MULT = dict(saved, **{difficulty: mult})
+    try:
+        result = jtwh_ladder.complete_run(seed, difficulty, jtwh_ladder.PATHS[seed % 2])
+    finally:
+        combat.DIFFICULTY_BOSS_MULT = saved
+    if "outcome" not in result or result["walled"]:
+        return None
+    return result["outcome"] in ("chimera_victory", "patronus_victory")
+
+
+def current(kind, difficulty):
+    import combat
+    return getattr(combat, TABLES[kind])[difficulty]
+
+
+def tune(kind, difficulty, target=None, delta=None, alpha=ALPHA, beta=BETA, seed=1):
+    """Search one table entry. Returns search()'s dict plus the cell's settings."""
+    target = TARGETS[kind][difficulty] if target is None else target
+    delta = DELTA[kind] if delta is None else delta
+    if kind == "monster":
+        cache = {}
+
+        def sample(s, m):
+            return monster_fight(s, difficulty, m, cache)
+    else:
+        def sample(s, m):
+            return boss_fight(s, difficulty, m)
+    out = search(sample, target, delta, current(kind, difficulty), alpha, beta, seed)
+    out.update(kind=kind, difficulty=difficulty, target=target, delta=delta,
+               current=current(kind, difficulty))
+    return out
+
+
+def _tune_cell(args):
+    return tune(*args)
+
+
+def tune_all(cells, targets=None, delta=None, alpha=ALPHA, beta=BETA, seed=1, jobs=1):
+    """[tune() result] for each (kind, difficulty) in `cells`, over `jobs` processes."""
+    targets = targets or {}
+    tasks = [(k, d, targets.get((k, d)), delta, alpha, beta, seed) for k, d in cells]
+    if jobs <= 1 or len(tasks) == 1:
+        return [_tune_cell(t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        return list(pool.map(_tune_cell, tasks))
+
+
+# ============================================================
+# REPORT
+# ============================================================
+
+def render(results, seconds):
+    fights = sum(r["fights"] for r in results)
+    fixed = sum(r["fixed"] for r in results)
+    print(f"{fights} fights in {seconds:.1f}s — a fixed-size test per candidate would have "
+          f"needed {fixed} ({fixed / max(1, fights):.1f}×)")
+    for r in results:
+        print(f"\n── {TABLES[r['kind']]} · {r['difficulty']} · target {100 * r['target']:.0f}% "
+              f"± {100 * r['delta']:.0f}% " + "─" * 12)
+        for s in r["steps"]:
+            rate = f"{100 * s['wins'] / s['n']:.0f}%" if s["n"] else "-"
+            skipped = f"  ({s['skipped']} skipped)" if s["skipped"] else ""
+            print(f"  {s['mult']:>5.2f}   {s['verdict']:<9}{s['n']:>5} fights   won {rate}{skipped}")
+        edge = "  (search bound)" if r["mult"] in BOUNDS else ""
+        lo, hi = r["bracket"]
+        print(f"  now {r['current']:.2f} → suggest {r['mult']:.2f}{edge}   bracket [{lo:.2f}, {hi:.2f}]")
+
+
+def _parse_target(text):
+    cell, _, share = text.partition("=")
+    kind, _, difficulty = cell.partition(":")
+    if kind not in KINDS or difficulty not in DIFFICULTIES:
+        raise argparse.ArgumentTypeError(f"expected KIND:DIFFICULTY=RATE, got {text!r}")
+    try:
+        return (kind, difficulty), float(share)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected KIND:DIFFICULTY=RATE, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tune the difficulty multipliers to target win rates.")
+    parser.add_argument("--kind", action="append", choices=KINDS, help="repeatable (default: both)")
+    parser.add_argument("--difficulty", action="append", choices=DIFFICULTIES, help="repeatable (default: all)")
+    parser.add_argument("--target", action="append", type=_parse_target, default=[],
+                        help="KIND:DIFFICULTY=RATE, e.g. monster:warrior=0.75 (repeatable)")
+    parser.add_argument("--delta", type=float, help="indifference half-width (default: per kind)")
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    parser.add_argument("--beta", type=float, default=BETA)
+    parser.add_argument("--seed", type=int, default=1, help="first seed")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    cells = [(k, d) for k in (args.kind or KINDS) for d in (args.difficulty or DIFFICULTIES)]
+    t0 = time.perf_counter()
+    results = tune_all(cells, dict(args.target), args.delta, args.alpha, args.beta, args.seed, args.jobs)
+    render(results, time.perf_counter() - t0)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 """
 Journey to Winter Haven — Leaderboard System (v0.8)
 ----------------------------------------------------
-LOCAL:  Top 10 runs stored in scores.json (unchanged from v0.7)
+LOCAL:  Top 10 runs, from a SQLite table (leaderboard_db.py)
 GLOBAL: Top 25 per difficulty submitted to Supabase after each run
+        (in the background, spooled + retried offline — submit_queue.py)
 
 Difficulty tiers on the global board:
   🛡️  Noob      — Top 25
@@ -31,8 +32,10 @@ Module entry points:
   show_leaderboard(highlight_entry=None)         — display local top 10
   display_at_end_of_run(warrior, score, outcome) — record + show + global submit
   view_leaderboard_standalone()                  — main menu hook
+  resume_pending_submissions()                   — game launch: retry spooled scores
 
-Data file format (scores.json) — unchanged from v0.7:
+Local entry format (same shape as the old scores.json; rows come back as
+these dicts plus their "id"):
   [
     {
       "name":       "Nathan",
@@ -49,17 +52,22 @@ Data file format (scores.json) — unchanged from v0.7:
   ]
 
 Storage rules (local):
-  - Top 10 scores always retained (sorted by score desc, then date desc)
-  - Up to 10 most recent non-top-10 runs retained for placement display
-  - File created on first write
+  - Every run is kept (one row each); boards show the top 10
+  - Sorted by score desc, then oldest date, then first recorded
+  - Database created on first use; import an old scores.json with
+    python leaderboard_db.py scores.json
 """
 
 import json
 import os
-import urllib.request
-import urllib.error
+import sqlite3
 from datetime import datetime
 
+import board_fetch as _board_fetch
+import leaderboard_db as _db
+import savegame as _savegame
+import submit_queue as _submit_queue
+
 
 # ---------------------------------------------------------------
 # Supabase config — loaded from .env
@@ -93,10 +101,9 @@ SUPABASE_URL, SUPABASE_ANON_KEY = _load_env()
 # ---------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------
-SCORES_FILE    = "scores.json"
 TOP_N          = 10
-EXTRA_HISTORY  = 10
 GLOBAL_TOP_N   = 25
+GLOBAL_TIERS   = ("noob", "warrior", "champion", "debug")
 
 OUTCOME_SHORT = {
     "chimera_victory":  "Champion",
@@ -127,45 +134,17 @@ def _rank_for_score_safe(score):
 # ---------------------------------------------------------------
 # Local storage I/O
 # ---------------------------------------------------------------
-def _load_scores():
-    if not os.path.exists(SCORES_FILE):
-        return []
+# v0.7.21: the local board is a SQLite table (leaderboard_db.py) — indexed
+# top-N and placement queries, one transaction per run. Old scores.json
+# files are imported by hand (python leaderboard_db.py scores.json).
+def _top_scores(difficulty=None, limit=TOP_N):
     try:
-        with open(SCORES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, list):
-            return []
-        return data
-    except (OSError, json.JSONDecodeError):
+        return _db.top(limit, difficulty=difficulty)
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not read leaderboard: {e}")
         return []
 
 
-def _save_scores(scores):
-    try:
-        with open(SCORES_FILE, "w", encoding="utf-8") as f:
-            json.dump(scores, f, indent=2)
-    except OSError as e:
-        print(f"⚠️  Could not save leaderboard: {e}")
-
-
-def _sort_scores(scores):
-    return sorted(
-        scores,
-        key=lambda s: (-s.get("score", 0), s.get("date", "")),
-        reverse=False,
-    )
-
-
-def _trim_scores(scores):
-    sorted_by_score = _sort_scores(scores)
-    top = sorted_by_score[:TOP_N]
-    remainder = sorted_by_score[TOP_N:]
-    remainder_recent = sorted(
-        remainder, key=lambda s: s.get("date", ""), reverse=True
-    )[:EXTRA_HISTORY]
-    return top + remainder_recent
-
-
 # ---------------------------------------------------------------
 # Entry construction
 # ---------------------------------------------------------------
@@ -209,18 +188,19 @@ def _entries_equal(a, b):
 # ---------------------------------------------------------------
 # Global leaderboard — Supabase submission
 # ---------------------------------------------------------------
-def _submit_global_score(entry):
-    """
-    POST the run entry to Supabase. Fails silently if:
-      - .env is missing / keys not configured
-      - Network is unavailable
-      - Supabase returns an error
-    The local leaderboard always works regardless.
-    """
-    if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-        return  # Not configured — skip silently
+_http = _board_fetch.ConnectionPool(timeout=5)
+
 
-    payload = {
+def _auth_headers():
+    return {
+        "apikey":        SUPABASE_ANON_KEY,
+        "Authorization": f"Bearer {SUPABASE_ANON_KEY}",
+    }
+
+
+def _global_payload(entry):
+    """The row the Supabase `scores` table takes for one run entry."""
+    return {
         "player_name": entry.get("name", "Unknown"),
         "sex":         entry.get("sex", "male"),
         "score":       entry.get("score", 0),
@@ -238,33 +218,62 @@ def _submit_global_score(entry):
         "debug_run":   entry.get("debug_run", False),
     }
 
+
+def _post_global_payload(payload):
+    """
+    POST one payload to Supabase. Runs on the submit_queue worker thread,
+    never on the game's, over a kept-alive connection. Returns True on success, the HTTP status on an
+    error response, or None if the network is unavailable / not configured
+    (submit_queue decides what's worth retrying).
+    """
+    if not SUPABASE_URL or not SUPABASE_ANON_KEY:
+        return None
+
     try:
-        url      = f"{SUPABASE_URL}/rest/v1/scores"
-        data     = json.dumps(payload).encode("utf-8")
-        req      = urllib.request.Request(url, data=data, method="POST")
-        req.add_header("Content-Type",  "application/json")
-        req.add_header("apikey",        SUPABASE_ANON_KEY)
-        req.add_header("Authorization", f"Bearer {SUPABASE_ANON_KEY}")
-        req.add_header("Prefer",        "return=minimal")
-
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            if resp.status in (200, 201):
-                return True
-    except (urllib.error.URLError, OSError):
-        pass  # Network unavailable — silent fail, local board unaffected
+        url     = f"{SUPABASE_URL}/rest/v1/scores"
+        data    = json.dumps(payload).encode("utf-8")
+        headers = dict(_auth_headers(), **{
+            "Content-Type": "application/json",
+            "Prefer":       "return=minimal",
+        })
+        status, _body = _http.request("POST", url, body=data, headers=headers)
     except Exception:
-        pass
+        return None  # Network unavailable — spooled, retried later
 
-    return False
+    if status in (200, 201):
+        # the board for this tier is now out of date
+        _global_cache.expire(payload.get("difficulty"))
+        return True
+    return status
 
 
-def _fetch_global_scores(difficulty, limit=GLOBAL_TOP_N):
+# v0.7.21: submissions go through a background queue with an offline spool
+# (submit_queue.py) — the end-of-run screen never waits on the network and
+# a failed POST is retried on a later launch instead of being dropped.
+_submit_queue.set_poster(_post_global_payload)
+
+
+def _submit_global_score(entry):
+    """Queue a run for the global board. Returns at once."""
+    if not SUPABASE_URL or not SUPABASE_ANON_KEY:
+        return None  # Not configured — skip silently
+    return _submit_queue.submit(_global_payload(entry))
+
+
+def resume_pending_submissions():
+    """Game launch: retry any scores a previous session couldn't deliver."""
+    if SUPABASE_URL and SUPABASE_ANON_KEY:
+        _submit_queue.start()
+
+
+def _request_global_scores(difficulty, limit=GLOBAL_TOP_N):
     """
-    Fetch top scores for a difficulty from Supabase.
-    Returns a list of score dicts, or empty list on failure.
+    One GET of a tier's top scores from Supabase over the keep-alive pool.
+    Returns a list of score dicts, or None on any failure (so the cache
+    keeps serving what it had).
     """
     if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-        return []
+        return None
 
     try:
         url = (
@@ -274,14 +283,29 @@ def _fetch_global_scores(difficulty, limit=GLOBAL_TOP_N):
             f"&limit={limit}"
             f"&select=player_name,sex,score,rank,outcome,level,difficulty,debug_run,submitted_at"
         )
-        req = urllib.request.Request(url)
-        req.add_header("apikey",        SUPABASE_ANON_KEY)
-        req.add_header("Authorization", f"Bearer {SUPABASE_ANON_KEY}")
-
-        with urllib.request.urlopen(req, timeout=5) as resp:
-            return json.loads(resp.read().decode("utf-8"))
+        status, body = _http.request("GET", url, headers=_auth_headers())
+        if status != 200:
+            return None
+        data = json.loads(body.decode("utf-8"))
+        return data if isinstance(data, list) else None
     except Exception:
-        return []
+        return None
+
+
+# v0.7.21: global boards are fetched in parallel (one pool worker per tier,
+# each keeping its HTTPS connection alive) and cached — fresh for a minute,
+# then served stale while a background refresh runs (see board_fetch.py).
+_global_cache = _board_fetch.BoardCache(_request_global_scores)
+
+
+def _fetch_global_scores(difficulty, limit=GLOBAL_TOP_N):
+    """
+    Top scores for a difficulty, from the cache when possible.
+    Returns a list of score dicts, or empty list on failure.
+    """
+    if limit != GLOBAL_TOP_N:
+        return _request_global_scores(difficulty, limit) or []
+    return _global_cache.get(difficulty, [])
 
 
 # ---------------------------------------------------------------
@@ -320,18 +344,17 @@ def record_run(warrior, score, outcome):
     Returns (entry, placement_or_None).
     """
     entry = _build_entry(warrior, score, outcome)
-    all_scores = _load_scores()
-    all_scores.append(entry)
-    all_scores = _trim_scores(all_scores)
-    _save_scores(all_scores)
-
-    top = _sort_scores(all_scores)[:TOP_N]
-    placement = None
-    for i, s in enumerate(top):
-        if _entries_equal(s, entry):
-            placement = i + 1
-            break
+    # v0.7.21: the run is over — nothing left for "continue" to pick up.
+    _savegame.autosave(warrior, "run_over")
+    try:
+        entry["id"] = _db.insert(entry)
+    except sqlite3.Error as e:
+        print(f"⚠️  Could not save leaderboard: {e}")
+        return entry, None
 
+    placement = _full_placement(entry)
+    if placement is not None and placement > TOP_N:
+        placement = None
     return entry, placement
 
 
@@ -354,23 +377,21 @@ def _format_row(rank_no, e, highlight=False, width=76):
     return line
 
 
-def _full_placement(entry, all_scores):
-    sorted_all = _sort_scores(all_scores)
-    for i, s in enumerate(sorted_all):
-        if _entries_equal(s, entry):
-            return i + 1
-    return None
+def _full_placement(entry):
+    """Position of a recorded run on the all-difficulty board (None if unsaved)."""
+    if entry.get("id") is None:
+        return None
+    try:
+        return _db.placement(entry["id"])
+    except sqlite3.Error:
+        return None
 
 
 def show_leaderboard(highlight_entry=None, header="TOP 10 LEADERBOARD", difficulty=None):
     """Display the local leaderboard, optionally filtered by difficulty."""
-    all_scores = _load_scores()
+    top = _top_scores(difficulty)
     if difficulty:
-        filtered = [s for s in all_scores if s.get("difficulty", "warrior") == difficulty]
-        top   = _sort_scores(filtered)[:TOP_N]
         header = f"TOP 10 — {difficulty.upper()}"
-    else:
-        top = _sort_scores(all_scores)[:TOP_N]
 
     width = 76
     bar   = "═" * width
@@ -393,7 +414,7 @@ def show_leaderboard(highlight_entry=None, header="TOP 10 LEADERBOARD", difficul
     if highlight_entry is not None:
         in_top = any(_entries_equal(e, highlight_entry) for e in top)
         if not in_top:
-            placement = _full_placement(highlight_entry, all_scores)
+            placement = _full_placement(highlight_entry)
             print(" " + "─" * (width - 2))
             if placement is not None:
                 print(f"   Your run:  #{placement}")
@@ -436,6 +457,9 @@ def show_global_leaderboard(default_difficulty="warrior"):
         input("\nPress Enter to return...")
         return
 
+    # all four tiers load at once; switching tabs then reads the cache
+    _global_cache.prefetch(GLOBAL_TIERS)
+
     current = default_difficulty
     while True:
         scores = _fetch_global_scores(current)
@@ -503,17 +527,14 @@ def display_at_end_of_run(warrior, score, outcome):
     # Global submission
     is_debug = entry.get("debug_run", False)
     if SUPABASE_URL and SUPABASE_ANON_KEY:
-        print("  🌐 Submitting to global leaderboard...", end="", flush=True)
-        success = _submit_global_score(entry)
-        if success:
-            tier = "🐛 Debug" if is_debug else {
-                "noob": "🛡️ Noob",
-                "warrior": "⚔️ Warrior",
-                "champion": "👑 Champion",
-            }.get(entry.get("difficulty", "warrior"), "⚔️ Warrior")
-            print(f" submitted to {tier} board!")
-        else:
-            print(" (offline — score saved locally)")
+        _submit_global_score(entry)
+        tier = "🐛 Debug" if is_debug else {
+            "noob": "🛡️ Noob",
+            "warrior": "⚔️ Warrior",
+            "champion": "👑 Champion",
+        }.get(entry.get("difficulty", "warrior"), "⚔️ Warrior")
+        print(f"  🌐 Sending your score to the global {tier} board in the background.")
+        print("     (No connection? It'll go through next time you play.)")
 
     # v0.7.20: final screen of the run — names itself so it's distinct from
     # the score and combat-log prompts that precede it.
@@ -0,0 +1,262 @@
+"""
+leaderboard_db.py — SQLite store for the local leaderboard
+----------------------------------------------------------
+The local board used to be one JSON list that record_run() loaded, sorted,
+trimmed and rewrote in full on every run, then sorted again to find the
+placement. Fine for one player; on a shared kiosk or a hosted instance it
+was O(n log n) work per run and two runs finishing together could clobber
+each other's write.
+
+This keeps every run in one SQLite table instead:
+
+  - WAL journal + busy timeout, so several game processes can write at
+    once and readers never block the writer
+  - each insert is its own transaction (BEGIN IMMEDIATE)
+  - index (difficulty, score DESC, date) for the per-difficulty boards,
+    plus (score DESC, date) for the all-difficulty board
+  - placement is a COUNT over the index, never a sort of the whole table
+
+Ordering matches the old JSON board exactly: higher score first, then the
+older date, then whichever run was recorded first.
+
+Nothing is trimmed any more — rows are small and the queries only ever
+touch the top of the index — so "Your run: #37" is always exact.
+
+An old scores.json is not picked up automatically; import it by hand
+(below).
+
+Public API:
+    connect(path=None)                     — open a database
+    insert(entry, conn=None)               — store a run, returns its row id
+    top(limit, difficulty=None, conn=None) — best runs as entry dicts
+    placement(entry_id, difficulty=None, conn=None) — 1-based rank of a run
+    import_json(path, conn=None)           — load an old scores.json
+
+Import by hand (e.g. boards from other machines):
+    python leaderboard_db.py scores.json [more.json ...] [--db PATH]
+"""
+
+import json
+import os
+import sqlite3
+import threading
+
+
+DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "leaderboard.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    name        TEXT    NOT NULL,
+    sex         TEXT    NOT NULL DEFAULT 'male',
+    score       INTEGER NOT NULL,
+    rank        TEXT,
+    outcome     TEXT    NOT NULL DEFAULT 'defeat',
+    difficulty  TEXT    NOT NULL DEFAULT 'warrior',
+    level       INTEGER NOT NULL DEFAULT 1,
+    stats       TEXT    NOT NULL DEFAULT '{}',
+    date        TEXT    NOT NULL DEFAULT '',
+    debug_run   INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS scores_by_difficulty
+    ON scores (difficulty, score DESC, date, id);
+CREATE INDEX IF NOT EXISTS scores_overall
+    ON scores (score DESC, date, id);
+"""
+
+_COLUMNS = ("name", "sex", "score", "rank", "outcome", "difficulty",
+            "level", "stats", "date", "debug_run")
+
+
+# ============================================================
+# CONNECTION
+# ============================================================
+
+_conn = [None]
+_conn_path = [None]
+_lock = threading.RLock()
+
+
+def connect(path=None):
+    """
+    Open a database (creating the schema as needed). Without a path,
+    returns the shared connection to DB_FILE.
+    """
+    if path is not None:
+        return _open(path)
+    with _lock:
+        if _conn[0] is None or _conn_path[0] != DB_FILE:
+            _conn[0] = _open(DB_FILE)
+            _conn_path[0] = DB_FILE
+        return _conn[0]
+
+
+def _open(path):
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None,
+                           check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA busy_timeout = 5000")
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    except sqlite3.OperationalError:
+        pass                    # e.g. a network drive — rollback journal still works
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _conn_or_default(conn):
+    return conn if conn is not None else connect()
+
+
+# ============================================================
+# WRITE
+# ============================================================
+
+def _row_values(entry):
+    stats = entry.get("stats") or {}
+    return (
+        str(entry.get("name", "Unknown")),
+        entry.get("sex", "male"),
+        int(entry.get("score", 0)),
+        entry.get("rank"),
+        entry.get("outcome", "defeat"),
+        entry.get("difficulty", "warrior"),
+        int(entry.get("level", 1)),
+        json.dumps(stats, sort_keys=True),
+        entry.get("date", ""),
+        1 if entry.get("debug_run") else 0,
+    )
+
+
+_INSERT = (f"INSERT INTO scores ({', '.join(_COLUMNS)}) "
+           f"VALUES ({', '.join('?' * len(_COLUMNS))})")
+
+
+def insert(entry, conn=None):
+    """Store one run in its own transaction. Returns the new row id."""
+    conn = _conn_or_default(conn)
+    with _lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = conn.execute(_INSERT, _row_values(entry))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return cur.lastrowid
+
+
+# ============================================================
+# READ
+# ============================================================
+
+def _entry(row):
+    """Row -> the same dict shape the JSON board used (plus its id)."""
+    try:
+        stats = json.loads(row["stats"])
+    except (TypeError, ValueError):
+        stats = {}
+    return {
+        "id":         row["id"],
+        "name":       row["name"],
+        "sex":        row["sex"],
+        "score":      row["score"],
+        "rank":       row["rank"],
+        "outcome":    row["outcome"],
+        "difficulty": row["difficulty"],
+        "level":      row["level"],
+        "stats":      stats,
+        "date":       row["date"],
+        "debug_run":  bool(row["debug_run"]),
+    }
+
+
+def top(limit, difficulty=None, conn=None):
+    """Best `limit` runs, optionally for one difficulty."""
+    conn = _conn_or_default(conn)
+    if difficulty:
+        rows = conn.execute(
+            "SELECT * FROM scores WHERE difficulty = ? "
+            "ORDER BY score DESC, date, id LIMIT ?", (difficulty, limit))
+    else:
+        rows = conn.execute(
+            "SELECT * FROM scores ORDER BY score DESC, date, id LIMIT ?", (limit,))
+    return [_entry(r) for r in rows]
+
+
+def placement(entry_id, difficulty=None, conn=None):
+    """
+    1-based position of a stored run — on its difficulty's board when
+    `difficulty` is given, otherwise on the all-difficulty board. None if
+    the id doesn't exist. Counts the runs ahead of it via the index.
+    """
+    conn = _conn_or_default(conn)
+    row = conn.execute("SELECT score, date, difficulty FROM scores WHERE id = ?",
+                       (entry_id,)).fetchone()
+    if row is None:
+        return None
+    # Two range counts rather than one OR, so each is a single index seek.
+    where = "difficulty = :diff AND " if difficulty else ""
+    sql = (f"SELECT (SELECT COUNT(*) FROM scores WHERE {where}score > :s)"
+           f"     + (SELECT COUNT(*) FROM scores WHERE {where}score = :s"
+           f"        AND (date, id) < (:d, :i))")
+    params = {"s": row["score"], "d": row["date"], "i": entry_id, "diff": difficulty}
+    return conn.execute(sql, params).fetchone()[0] + 1
+
+
+def count(conn=None):
+    return _conn_or_default(conn).execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+# ============================================================
+# IMPORT
+# ============================================================
+
+def import_entries(entries, conn=None):
+    """
+    Insert old-format entry dicts in one transaction, skipping any run
+    already stored (same name, score, date and outcome). Returns how many
+    were added.
+    """
+    conn = _conn_or_default(conn)
+    added = 0
+    with _lock:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for e in entries:
+                if not isinstance(e, dict):
+                    continue
+                dup = conn.execute(
+                    "SELECT 1 FROM scores WHERE name = ? AND score = ? AND date = ? "
+                    "AND outcome = ? LIMIT 1",
+                    (str(e.get("name", "Unknown")), int(e.get("score", 0)),
+                     e.get("date", ""), e.get("outcome", "defeat"))).fetchone()
+                if dup is None:
+                    conn.execute(_INSERT, _row_values(e))
+                    added += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    return added
+
+
+def import_json(path, conn=None):
+    """Load an old scores.json into the database. Returns rows added."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ValueError(f"{path} is not a leaderboard file")
+    return import_entries(data, conn)
+
+
+if __name__ == "__main__":
+    import argparse
+    _parser = argparse.ArgumentParser(description="Import old scores.json files into the leaderboard database.")
+    _parser.add_argument("files", nargs="+", metavar="SCORES_JSON")
+    _parser.add_argument("--db", default=None, help=f"database path (default: {DB_FILE})")
+    _args = _parser.parse_args()
+    _c = connect(_args.db)
+    for _path in _args.files:
+        print(f"{_path}: {import_json(_path, _c)} run(s) imported")
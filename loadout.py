@@ -0,0 +1,543 @@
+"""
+loadout.py — The best loadout from everything the hero carries
+--------------------------------------------------------------
+Choosing gear used to be trial and error in inventory_menu: every
+equip_item call mutates the hero and may stop to ask which hand or
+finger. best_loadout(hero) scores every legal loadout from the bag +
+what's worn without touching the hero, and equip_loadout() puts the
+winner on in one go (the inventory menu's "best" action).
+
+Legal: one item per slot, two different rings on the two fingers, a
+two-handed weapon leaves the off hand empty, shields only go in a hand.
+
+Score — cached and deterministic, no dice rolled. For each opponent the
+next arena round can draw (monsters.ROUND_TIER_WEIGHTS, with the same
+level + difficulty scaling select_arena_enemy applies):
+    your hit    exact expectation over the ATK roll(s) of what a basic
+                attack does through its DEF: dual-wield off-hand roll,
+                untrained halving, Dual Wielder ATK %, Pack Hunter / Apex
+                Predator +10%, Brawl Master, weapon bonus damage, weapon
+                socket procs — or an accessory attack with its element,
+                whichever is better
+    its hit     the same through your DEF
+    edge        turns you last / (turns you last + turns to kill it)
+The score is the tier-weighted edge (+ a hair per max AP). Gear stats
+are what equip_item applies: set bonuses from crafter.SET_BONUS_STATS,
+socketed armor from crafter.armor_socket_stat_bonus.
+
+Search: branch-and-bound. Hand setups (main, off) are tried best-first;
+for each, the other slots are filled depth-first and a branch is cut
+when even the best stats left per slot plus every set bonus can't beat
+the best loadout so far (the score only grows with ATK, DEF, HP and AP).
+Items beaten on every stat by another copy for the same slot are dropped
+before the search, which keeps a few-hundred-item grind bag well under a
+second.
+"""
+
+import contextlib
+import functools
+import io
+import math
+import random
+
+
+HAND_SLOTS = ("main_hand", "off_hand")
+BODY_SLOTS = ("armor", "helm", "cape", "accessory", "trinket")
+RING_SLOTS = ("finger_1", "finger_2")
+ALL_SLOTS = HAND_SLOTS + BODY_SLOTS + RING_SLOTS
+
+STAT_FIELDS = ("atk_min", "atk_max", "defence", "max_hp", "max_ap")
+_ZERO = (0, 0, 0, 0, 0)
+
+AP_WEIGHT = 0.001        # max AP only breaks ties between equal fights
+KEEP_WEIGHT = 1e-7       # ...and worn items win exact ties (no needless swaps)
+SET_MULT = 1.10          # Pack Hunter / Apex Predator basic-attack bonus
+
+
+def _crafter():
+    import crafter
+    return crafter
+
+
+def _add(a, b):
+    return tuple(x + y for x, y in zip(a, b))
+
+
+def _sub(a, b):
+    return tuple(x - y for x, y in zip(a, b))
+
+
+# ============================================================
+# WHAT AN ITEM / A LOADOUT ADDS
+# ============================================================
+
+def item_stats(item, hero):
+    """(atk_min, atk_max, defence, max_hp, max_ap) `item` adds when worn."""
+    bonus = getattr(item, "atk_bonus", 0)
+    stats = [item.atk_min + bonus, item.atk_max + bonus, item.defence,
+             item.max_hp, getattr(item, "max_ap_bonus", 0)]
+    if item.slot == "armor" and getattr(item, "sockets", None):
+        d, h, a, k = _crafter().armor_socket_stat_bonus(item)
+        stats = [stats[0] + k, stats[1] + k, stats[2] + d, stats[3] + h, stats[4] + a]
+    if getattr(item, "name", "") == "Charged Jagged Rock":
+        extra = getattr(item, "base_atk", 0) + getattr(hero, "cjr_charges", 0)
+        stats[0] += extra
+        stats[1] += extra
+    return tuple(stats)
+
+
+def _set_label(item):
+    crafter = _crafter()
+    name = getattr(item, "name", "")
+    if name in crafter.WOLF_HIDE_PIECE_NAMES:
+        return "wolf_hide"
+    if name in crafter.DIRE_WOLF_PIECE_NAMES:
+        return "dire_wolf"
+    return None
+
+
+def _set_stats(counts):
+    crafter = _crafter()
+    total = _ZERO
+    for label, pieces in counts.items():
+        bonus = crafter.set_bonus_for(label, pieces)
+        total = _add(total, tuple(bonus[f] for f in STAT_FIELDS))
+    return total
+
+
+def _is_weapon(item):
+    return item is not None and getattr(item, "slot", None) == "weapon"
+
+
+def _dual_flat(hero, main, off):
+    """Dual-wield title bonus (1 or 0) equip would leave on this hand setup."""
+    if not (_is_weapon(main) and _is_weapon(off)):
+        return 0
+    titled = "dual_wielder" in getattr(hero, "titles", set())
+    return 1 if titled or hero.skill_ranks.get("dual_wielder", 0) >= 1 else 0
+
+
+def _dual_mod(hero, main, off):
+    """apply_dual_wield_modifier's (atk_min, atk_max) delta for this hand setup."""
+    if not (_is_weapon(main) and _is_weapon(off)):
+        return _ZERO
+    flat = _dual_flat(hero, main, off)
+    return (flat - off.atk_min, flat - off.atk_max, 0, 0, 0)
+
+
+def loadout_stats(hero, slots):
+    """Total stats `slots` ({slot: item or None}) adds — items, sets, dual wield."""
+    total, counts = _ZERO, {}
+    for item in slots.values():
+        if item is None:
+            continue
+        total = _add(total, item_stats(item, hero))
+        label = _set_label(item)
+        if label:
+            counts[label] = counts.get(label, 0) + 1
+    total = _add(total, _set_stats(counts))
+    return _add(total, _dual_mod(hero, slots.get("main_hand"), slots.get("off_hand")))
+
+
+def _worn(hero):
+    return {slot: hero.equipment.get(slot) for slot in ALL_SLOTS}
+
+
+def _bare(hero):
+    """The hero's stats with nothing worn (current stats minus what's applied)."""
+    now = (hero.min_atk, hero.max_atk, hero.defence, hero.max_hp, hero.max_ap)
+    worn = _worn(hero)
+    gear = _ZERO
+    for item in worn.values():
+        if item is not None:
+            gear = _add(gear, item_stats(item, hero))
+    for attr in ("_wolf_hide_bonus_applied", "_dire_wolf_bonus_applied"):
+        applied = getattr(hero, attr, None) or {}
+        gear = _add(gear, tuple(applied.get(f, 0) for f in STAT_FIELDS))
+    dual = getattr(hero, "_dual_wield_modifier_applied", None) or {}
+    gear = _add(gear, (dual.get("atk_min", 0), dual.get("atk_max", 0), 0, 0, 0))
+    return _sub(now, gear)
+
+
+# ============================================================
+# OPPONENTS
+# ============================================================
+
+_opponent_cache = {}
+
+
+def next_round():
+    """The arena round the hero faces next (1-5), from the session marker."""
+    import snapshot
+    session = snapshot.SESSION
+    round_num = session.get("round_num") or 0
+    if session.get("scene") == "arena_round":
+        round_num += 1                  # between fights: that round is over
+    return max(1, min(5, round_num or 1))
+
+
+def opponents(round_num):
+    """[(weight, hp, min_atk, max_atk, defence)] the round can draw."""
+    import sys
+    import monsters
+    main = sys.modules.get("__main__")
+    key = (round_num, getattr(main, "DIFFICULTY", "warrior"))
+    hit = _opponent_cache.get(key)
+    if hit is not None:
+        return hit
+
+    if round_num in monsters.ROUND_TIER_WEIGHTS:
+        tiers = monsters.ROUND_TIER_WEIGHTS[round_num]
+    else:
+        tiers = {4: 1.0} if round_num == 5 else {3: 1.0}
+    state = random.getstate()           # constructors may roll — keep the run's dice
+    out = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for tier, chance in tiers.items():
+                if tier == 4:
+                    total = sum(w for _, w in monsters.TIER4_BOSSES)
+                    pool = [(cls, w / total) for cls, w in monsters.TIER4_BOSSES]
+                else:
+                    classes = monsters.get_monsters_by_tier(tier)
+                    pool = [(cls, 1 / len(classes)) for cls in classes]
+                for cls, share in pool:
+                    m = cls()
+                    m.tier = tier
+                    if tier < 4:
+                        m.level = monsters.monster_level_for_round(tier, round_num)
+                        monsters.apply_level_scaling(m, tier)
+                    monsters.apply_difficulty_scaling(m)
+                    out.append((chance * share, m.hp, m.min_atk, m.max_atk, m.defence))
+    finally:
+        random.setstate(state)
+    _opponent_cache[key] = out
+    return out
+
+
+# ============================================================
+# SCORE
+# ============================================================
+
+@functools.lru_cache(maxsize=65536)
+def _expected_hit(lo, hi, olo, ohi, halve, pct, set_mult, bm, bonus, defence):
+    """
+    Mean damage through `defence` of one basic attack: the roll(s) as
+    warrior_attack_roll / warrior_dual_wield_attack_roll make them, then
+    Brawl Master, flat bonus, and apply_defence's max(1, dmg - DEF).
+    olo/ohi is None for a single roll.
+    """
+    hi = max(hi, lo)
+
+    def finish(total):
+        if set_mult:
+            total = int(round(total * SET_MULT))
+        total = max(1, total)
+        if bm != 1.0:
+            total = max(1, int(total * bm))
+        return max(1, total + bonus - defence)
+
+    if olo is None:
+        return sum(finish(r) for r in range(lo, hi + 1)) / (hi - lo + 1)
+    ohi = max(ohi, olo)
+    acc = 0
+    for r in range(lo, hi + 1):
+        for o in range(olo, ohi + 1):
+            total = r + (o // 2 if halve else o)
+            if pct:
+                total = math.ceil(total * (1 + pct))
+            acc += finish(total)
+    return acc / ((hi - lo + 1) * (ohi - olo + 1))
+
+
+@functools.lru_cache(maxsize=65536)
+def _expected_taken(lo, hi, defence):
+    hi = max(hi, lo)
+    return sum(max(1, r - defence) for r in range(lo, hi + 1)) / (hi - lo + 1)
+
+
+def _proc_damage(weapon):
+    """Expected extra damage per hit from a weapon's socketed procs."""
+    extra = 0.0
+    for proc in _crafter().get_weapon_socket_procs(weapon):
+        if proc["type"] == "element":
+            extra += proc["chance"] * proc["damage"]
+        elif proc["type"] == "bleed":
+            extra += proc["chance"] * (proc["dmg_min"] + proc["dmg_max"]) / 2
+        elif proc["type"] == "drain":
+            extra += proc["bonus"]
+    return extra
+
+
+def _element_damage(item):
+    if item is None or not getattr(item, "element", None):
+        return 0
+    return item.element_damage
+
+
+class _Hands:
+    """Everything the score needs from one (main, off) hand setup."""
+
+    def __init__(self, hero, main, off):
+        import combat
+        self.main, self.off = main, off
+        self.stats = _ZERO
+        for item in (main, off):
+            if item is not None:
+                self.stats = _add(self.stats, item_stats(item, hero))
+        self.stats = _add(self.stats, _dual_mod(hero, main, off))
+        self.dual = _is_weapon(main) and _is_weapon(off)
+        rank = hero.skill_ranks.get("dual_wielder", 0)
+        self.halve = self.dual and rank == 0
+        self.pct = combat.DUAL_WIELDER_ATK_PCT.get(rank, 0.0) if self.dual else 0.0
+        # get_off_hand_only_atk: strip main's ATK and the title's +1, add off's.
+        flat = _dual_flat(hero, main, off)
+        self.off_shift = ((off.atk_min - main.atk_min - flat, off.atk_max - main.atk_max - flat)
+                          if self.dual else None)
+        weapon = next((it for it in (main, off)
+                       if it is not None and getattr(it, "slot", None) != "shield"), None)
+        self.weapon = weapon
+        self.bonus = weapon.atk_min if weapon is not None else 0
+        self.procs = _proc_damage(weapon) if weapon is not None else 0.0
+
+
+class _Model:
+    def __init__(self, hero, round_num):
+        self.hero = hero
+        self.bare = _bare(hero)
+        self.bm = getattr(hero, "brawl_master_atk_mult", 1.0)
+        self.foes = opponents(round_num)
+
+    def score(self, hands, stats, set_full, acc_element, kept=0):
+        """stats: body + rings + set bonuses (hands are added here)."""
+        lo, hi, defence, max_hp, max_ap = _add(_add(self.bare, stats), hands.stats)
+        olo = ohi = None
+        if hands.off_shift is not None:
+            olo, ohi = lo + hands.off_shift[0], hi + hands.off_shift[1]
+        total = 0.0
+        for weight, m_hp, m_lo, m_hi, m_def in self.foes:
+            dealt = 0.0
+            if hands.weapon is not None:
+                dealt = _expected_hit(lo, hi, olo, ohi, hands.halve, hands.pct, set_full,
+                                      self.bm, hands.bonus, m_def) + hands.procs
+            if acc_element or hands.weapon is None:
+                # accessory attack: plain roll + its element, no weapon bonus
+                dealt = max(dealt, _expected_hit(lo, hi, olo, ohi, hands.halve, hands.pct,
+                                                 set_full, self.bm, 0, m_def) + acc_element)
+            taken = _expected_taken(m_lo, m_hi, defence)
+            last = max(max_hp, 1) / taken
+            kill = max(m_hp, 1) / dealt
+            total += weight * last / (last + kill)
+        return total + AP_WEIGHT * max_ap + KEEP_WEIGHT * kept
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _prune(entries, need):
+    """
+    Drop entries another `need` entries beat on every count. entries:
+    [(item, stats, extra, tag)] — only the same `tag` (set, handedness)
+    competes; earlier entries win exact ties (worn items come first).
+    """
+    keep = []
+    for i, (item, stats, extra, tag) in enumerate(entries):
+        beaten = 0
+        for j, (other, o_stats, o_extra, o_tag) in enumerate(entries):
+            if i == j or o_tag != tag or o_extra < extra:
+                continue
+            if all(o >= s for o, s in zip(o_stats, stats)):
+                if o_stats == stats and o_extra == extra and j > i:
+                    continue            # an exact twin later in line doesn't count
+                beaten += 1
+                if beaten >= need:
+                    break
+        if beaten < need:
+            keep.append((item, stats, extra, tag))
+    return keep
+
+
+def _candidates(hero):
+    """{slot group: [(item, stats, extra, tag)]} — worn first, then bag order."""
+    worn = [it for it in _worn(hero).values() if it is not None]
+    seen, items = set(), []
+    for item in worn + list(hero.inventory):
+        if id(item) not in seen:
+            seen.add(id(item))
+            items.append(item)
+    groups = {"weapon": [], "shield": [], "ring": []}
+    groups.update({slot: [] for slot in BODY_SLOTS})
+    for item in items:
+        slot = getattr(item, "slot", None)
+        if slot not in groups:
+            continue
+        extra = 0.0
+        tag = _set_label(item)
+        if slot == "weapon":
+            extra = _proc_damage(item)
+            tag = bool(getattr(item, "two_handed", False))
+        elif slot == "accessory":
+            extra = _element_damage(item)
+        groups[slot].append((item, item_stats(item, hero), extra, tag))
+    for slot, entries in groups.items():
+        need = 2 if slot == "ring" or slot == "weapon" else 1
+        groups[slot] = _prune(entries, need)
+    return groups
+
+
+def _hand_setups(groups):
+    weapons = [e[0] for e in groups["weapon"]]
+    shields = [e[0] for e in groups["shield"]]
+    one_handed = [w for w in weapons if not getattr(w, "two_handed", False)]
+    setups = [(None, None)]
+    setups += [(w, None) for w in weapons]
+    setups += [(s, None) for s in shields]
+    setups += [(w, s) for w in one_handed for s in shields]
+    setups += [(a, b) for a in one_handed for b in one_handed if a is not b]
+    return setups
+
+
+def _body_options(groups, slot):
+    """[(items, stats, set label or None, element, kept)] for one body slot."""
+    options = [((item,), stats, tag, extra if slot == "accessory" else 0, 0)
+               for item, stats, extra, tag in groups[slot]]
+    options.sort(key=lambda o: -sum(o[1]))
+    return options + [((None,), _ZERO, None, 0, 0)]
+
+
+def _ring_options(groups):
+    rings = groups["ring"]
+    options = [((a[0], b[0]), _add(a[1], b[1]), None, 0, 0)
+               for i, a in enumerate(rings) for b in rings[i + 1:]]
+    options += [((r[0], None), r[1], None, 0, 0) for r in rings]
+    options.sort(key=lambda o: -sum(o[1]))
+    return options + [((None, None), _ZERO, None, 0, 0)]
+
+
+def _max_set_stats():
+    crafter = _crafter()
+    return _set_stats({label: 4 for label in crafter.SET_BONUS_STATS})
+
+
+def best_loadout(hero, round_num=None):
+    """
+    The best legal loadout for the next round (or `round_num`). Returns
+    {"slots": {slot: item or None}, "score", "current" (score of what's
+    worn now), "stats" (predicted atk_min..max_ap), "round", "checked"}.
+    """
+    round_num = round_num or next_round()
+    model = _Model(hero, round_num)
+    groups = _candidates(hero)
+    worn = _worn(hero)
+    worn_ids = {id(it) for it in worn.values() if it is not None}
+
+    layers = [("body", slot, _body_options(groups, slot)) for slot in BODY_SLOTS]
+    layers.append(("rings", RING_SLOTS, _ring_options(groups)))
+    # Optimistic tail: the best of every stat each remaining layer offers.
+    tails = [_ZERO] * (len(layers) + 1)
+    tail_elem = [0] * (len(layers) + 1)
+    for i in range(len(layers) - 1, -1, -1):
+        best = _ZERO
+        for opt in layers[i][2]:
+            best = tuple(max(x, y) for x, y in zip(best, opt[1]))
+        tails[i] = _add(tails[i + 1], best)
+        tail_elem[i] = max(tail_elem[i + 1], max(opt[3] for opt in layers[i][2]))
+    set_cap = _max_set_stats()
+    max_kept = len(worn_ids)
+
+    best = {"score": -1.0, "picks": None, "hands": None}
+    checked = [0]
+
+    def kept_in(items):
+        return sum(1 for it in items if it is not None and id(it) in worn_ids)
+
+    def dfs(hands, i, stats, counts, elem, kept, picks):
+        if i == len(layers):
+            checked[0] += 1
+            full = any(n >= 4 for n in counts.values())
+            score = model.score(hands, _add(stats, _set_stats(counts)), full, elem, kept)
+            if score > best["score"]:
+                best.update(score=score, picks=list(picks), hands=hands)
+            return
+        bound = model.score(hands, _add(_add(stats, tails[i]), set_cap), True,
+                            max(elem, tail_elem[i]), max_kept)
+        if bound <= best["score"]:
+            return
+        for items, o_stats, tag, o_elem, _ in layers[i][2]:
+            new_counts = counts
+            if tag:
+                new_counts = dict(counts)
+                new_counts[tag] = new_counts.get(tag, 0) + 1
+            picks.append(items)
+            dfs(hands, i + 1, _add(stats, o_stats), new_counts, max(elem, o_elem),
+                kept + kept_in(items), picks)
+            picks.pop()
+
+    setups = []
+    for main, off in _hand_setups(groups):
+        hands = _Hands(hero, main, off)
+        hand_kept = kept_in((main, off))
+        optimistic = model.score(hands, _add(tails[0], set_cap), True, tail_elem[0], max_kept)
+        setups.append((optimistic, hands, hand_kept))
+    setups.sort(key=lambda s: -s[0])
+    for optimistic, hands, hand_kept in setups:
+        if optimistic <= best["score"]:
+            break
+        dfs(hands, 0, _ZERO, {}, 0, hand_kept, [])
+
+    slots = {"main_hand": best["hands"].main, "off_hand": best["hands"].off}
+    for (kind, slot, _), items in zip(layers, best["picks"]):
+        if kind == "body":
+            slots[slot] = items[0]
+        else:
+            slots["finger_1"], slots["finger_2"] = items
+    return {
+        "slots": slots,
+        "score": best["score"],
+        "current": score_loadout(hero, worn, round_num, model),
+        "stats": dict(zip(STAT_FIELDS, _add(model.bare, loadout_stats(hero, slots)))),
+        "round": round_num,
+        "checked": checked[0],
+    }
+
+
+def score_loadout(hero, slots, round_num=None, model=None):
+    """The model's score for `slots` ({slot: item or None}) — no search."""
+    model = model or _Model(hero, round_num or next_round())
+    worn_ids = {id(it) for it in _worn(hero).values() if it is not None}
+    hands = _Hands(hero, slots.get("main_hand"), slots.get("off_hand"))
+    body = {s: slots.get(s) for s in BODY_SLOTS + RING_SLOTS}
+    stats, counts = _ZERO, {}
+    for item in body.values():
+        if item is not None:
+            stats = _add(stats, item_stats(item, hero))
+            tag = _set_label(item)
+            if tag:
+                counts[tag] = counts.get(tag, 0) + 1
+    stats = _add(stats, _set_stats(counts))
+    full = any(n >= 4 for n in counts.values())
+    kept = sum(1 for it in slots.values() if it is not None and id(it) in worn_ids)
+    return model.score(hands, stats, full, _element_damage(slots.get("accessory")), kept)
+
+
+# ============================================================
+# PUTTING IT ON
+# ============================================================
+
+def equip_loadout(hero, slots):
+    """
+    Wear `slots` (a best_loadout()["slots"]): take off whatever changes,
+    then equip into the exact slots — no prompts. Returns the slots changed.
+    """
+    from equipment import equip_item, unequip_item
+    changed = [s for s in ALL_SLOTS if hero.equipment.get(s) is not slots.get(s)]
+    for slot in changed:
+        current = hero.equipment.get(slot)
+        if current is not None and hero.equipment.get(slot) is current:
+            unequip_item(hero, current)
+    for slot in changed:
+        item = slots.get(slot)
+        if item is not None and hero.equipment.get(slot) is not item:
+            equip_item(hero, item, slot=slot)
+    return changed
@@ -53,6 +53,8 @@ Why this lives in its own module:
 
 import random
 
+from inventory_index import bag as _bag
+
 
 # ============================================================
 # CONFIG — pricing
@@ -152,13 +154,14 @@ SELL_BACK_RATE = 0.5
 # independent rolls determine whether the same weapon also appears at
 # higher tiers:
 #   - UNCOMMON variant: 50% chance
-#   - RARE variant:     25% chance
+#   - RARE variant:     25% chance  (not on Noob)
+#   - EPIC variant:     20% chance  (Champion only)
 #
 # So each weapon slot expands into 1-3 listings of the same item type,
 # letting the player pick the rarity their gold can afford. This replaces
 # the old "one rarity per slot, weighted random" model.
 #
-# Example outcomes per weapon type:
+# Example outcomes per weapon type (Warrior):
 #   - normal only                    (75% × 50% = ~37.5%)
 #   - normal + uncommon              (50% × 75% = ~37.5%)
 #   - normal + rare                  (50% × 25% = ~12.5%)
@@ -174,6 +177,7 @@ SELL_BACK_RATE = 0.5
 MERCHANT_VARIANT_CHANCE = {
     "uncommon": 0.50,
     "rare":     0.25,
+    "epic":     0.20,
 }
 
 
@@ -491,12 +495,12 @@ def _get_factories():
 def _roll_weapon_variants():
     """
     For a single weapon type, decide which rarity variants appear at the
-    merchant. Normal is always included. Uncommon and rare are independent
-    yes/no rolls per MERCHANT_VARIANT_CHANCE.
+    merchant. Normal is always included. Uncommon, rare and (Champion)
+    epic are independent yes/no rolls per MERCHANT_VARIANT_CHANCE.
 
     Returns:
         list of rarity strings, in display order: ["normal", ...] possibly
-        plus "uncommon" and/or "rare". Always at least one entry.
+        plus "uncommon", "rare" and/or "epic". Always at least one entry.
     """
     import sys
     _main = sys.modules.get("__main__")
@@ -508,8 +512,8 @@ def _roll_weapon_variants():
     # Noob: no rare variants — uncommon is the ceiling at the merchant  — v0.7.11
     if _diff != "noob" and random.random() < MERCHANT_VARIANT_CHANCE["rare"]:
         variants.append("rare")
-    # Champion: also roll for epic variants (20% chance)
-    if _diff == "champion" and random.random() < 0.20:
+    # Champion: also roll for epic variants
+    if _diff == "champion" and random.random() < MERCHANT_VARIANT_CHANCE["epic"]:
         variants.append("epic")
     return variants
 
@@ -1065,10 +1069,11 @@ def _sell_back_menu(warrior):
                 continue
             candidates.append(item)
         # Also include equipped items so they can be sold (after unequip confirm)
+        bag = _bag(warrior)
         for item in equipped_items:
             if _is_resale_blocked(item):
                 continue
-            if item not in candidates:
+            if item not in bag:             # v0.7.21: O(1) — indexed bag
                 candidates.append(item)
 
         if not candidates:
@@ -21,6 +21,7 @@ circular-import trap, since the main file does `from monsters import *`.
 import random
 import math
 import time
+from bisect import bisect_left
 
 # Lazy back-imports happen inside functions. We pull common ones at
 # module load — they only resolve when a function in this module is
@@ -82,6 +83,7 @@ __all__ = [
     "monster_level_for_round", "title_for_level", "apply_level_scaling",
     "weight_to_tier", "get_monsters_by_tier", "random_encounter_by_tier",
     "random_tier4_boss", "pick_tier_from_weights", "get_round_tier",
+    "rebuild_encounter_tables",
     "select_arena_enemy", "random_encounter",
 
     # Constants
@@ -2531,7 +2533,7 @@ def weight_to_tier(weight):
     return 1  # fallback — unknown weight treated as tier 1
 
 def get_monsters_by_tier(tier):
-    return [cls for cls, weight in MONSTER_TYPES if weight_to_tier(weight) == tier]
+    return list(_ENCOUNTER_TABLES["pools"].get(tier, ()))
 
 def random_encounter_by_tier(tier, round_num):
     pool = get_monsters_by_tier(tier)
@@ -2557,17 +2559,11 @@ TIER4_BOSSES = [
 ]
 
 def random_tier4_boss():
-    total = sum(w for _, w in TIER4_BOSSES)
+    classes, cumulative, total = _ENCOUNTER_TABLES["tier4"]
     r = random.random() * total
-    cumulative = 0.0
-    for cls, w in TIER4_BOSSES:
-        cumulative += w
-        if r <= cumulative:
-            boss = cls()
-            boss.tier = 4  # ✅
-            return apply_difficulty_scaling(boss)
-    boss = TIER4_BOSSES[-1][0]()  # fallback
-    boss.tier = 4                 # ✅
+    # past the last running total -> last boss (the old loop's fallback)
+    boss = classes[min(bisect_left(cumulative, r), len(classes) - 1)]()
+    boss.tier = 4  # ✅
     return apply_difficulty_scaling(boss)
 
 # ---------- Weighted tier selection ----------
@@ -2580,16 +2576,56 @@ def pick_tier_from_weights(weight_map):
             return tier
     return list(weight_map.keys())[-1]
 
+# v0.7.21: the per-round tier odds as data (read by loadout.py to know
+# what the next round can throw at the hero). Round 5 is always the
+# Fallen boss (tier 4); anything past the table falls back to tier 3.
+ROUND_TIER_WEIGHTS = {
+    1: {1: 0.8, 2: 0.2},
+    2: {1: 0.4, 2: 0.6},
+    3: {1: 0.1, 2: .8, 3: 0.1},
+    4: {2: 0.1, 3: 0.9},
+}
+
+
+def _cumulative(pairs, start=0):
+    """(outcomes, running totals) — the same sums the weighted walks build,
+    so bisect_left on a draw lands where `if r <= cumulative` stopped."""
+    outcomes, totals, running = [], [], start
+    for outcome, weight in pairs:
+        running += weight
+        outcomes.append(outcome)
+        totals.append(running)
+    return tuple(outcomes), tuple(totals)
+
+
+# v0.7.21: tier pools and running totals, built once at import instead of
+# on every spawn. A draw is still exactly one random() — same dice, same
+# monster — so recordings and the golden corpus don't move. samplers.py
+# builds its alias tables for bulk draws on top of these.
+_ENCOUNTER_TABLES = {}
+
+
+def rebuild_encounter_tables():
+    """Recompile after editing MONSTER_TYPES / TIER4_BOSSES / ROUND_TIER_WEIGHTS."""
+    pools = {}
+    for cls, weight in MONSTER_TYPES:
+        pools.setdefault(weight_to_tier(weight), []).append(cls)
+    classes, cumulative = _cumulative(TIER4_BOSSES, start=0.0)
+    _ENCOUNTER_TABLES.clear()
+    _ENCOUNTER_TABLES["pools"] = {tier: tuple(pool) for tier, pool in pools.items()}
+    _ENCOUNTER_TABLES["tier4"] = (classes, cumulative, sum(w for _, w in TIER4_BOSSES))
+    _ENCOUNTER_TABLES["rounds"] = {
+        round_num: _cumulative(weights.items())
+        for round_num, weights in ROUND_TIER_WEIGHTS.items()
+    }
+
+
 def get_round_tier(round_num):
-    if round_num == 1:
-        return pick_tier_from_weights({1: 0.8, 2: 0.2})
-    if round_num == 2:
-        return pick_tier_from_weights({1: 0.4, 2: 0.6})
-    if round_num == 3:
-        return pick_tier_from_weights({1: 0.1, 2: .8, 3: 0.1})
-    if round_num == 4:
-        return pick_tier_from_weights({2: 0.1, 3: 0.9})
-    
+    table = _ENCOUNTER_TABLES["rounds"].get(round_num)
+    if table is not None:
+        tiers, cumulative = table
+        return tiers[min(bisect_left(cumulative, random.random()), len(tiers) - 1)]
+
     if round_num == 5:
         #calls random fallen
         return 4
@@ -2597,6 +2633,10 @@ def get_round_tier(round_num):
     # Fallback
     return 3
 
+
+rebuild_encounter_tables()
+
+
 def apply_difficulty_scaling(monster):
     """
     Scale a regular monster's stats based on current difficulty.
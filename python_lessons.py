@@ -14,8 +14,8 @@ Design notes
   code in a locked-down namespace: a small allow-list of safe builtins,
   NO imports, NO file/OS access. See run_sandbox() for the guard rails.
 - Unlock progress is difficulty-gated and persisted to the save file
-  (handled by the caller via lesson_progress on the warrior/save; this
-  module only reads/reports it, it does not own the save format).
+  (the "lessons" section; savegame.py owns the format, this module only
+  reads/reports it).
 
 This module is intentionally dependency-light: it imports only from
 `shared` (clear_screen / wrap / space) so it can't create import cycles
@@ -26,20 +26,19 @@ from shared import clear_screen, wrap, space
 
 import io
 import contextlib
-import json
 import os
 
 
 # ============================================================
-# PROGRESS PERSISTENCE (Stage 1 — self-contained)
+# PROGRESS PERSISTENCE
 # ============================================================
-# Until the game has a full save system, this module owns a tiny JSON
-# file recording which difficulties the player has beaten. Lesson unlocks
-# are derived from the COUNT of distinct difficulties cleared:
+# Which difficulties the player has beaten. Lesson unlocks are derived
+# from the COUNT of distinct difficulties cleared:
 #   - mode unlocks (and Lesson 1 opens) after the first win, any difficulty
 #   - Lesson 2 opens after a win on a SECOND distinct difficulty
 #   - Lesson 3 opens after a win on a THIRD distinct difficulty
-# When the real save system lands, fold this into it and delete this file.
+# v0.7.21: folded into the save file ("lessons" section, see savegame.py).
+# An old python_progress.json is imported the first time it's read.
 
 _PROGRESS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                               "python_progress.json")
@@ -47,24 +46,18 @@ _PROGRESS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
 
 def _load_progress():
     """Return the progress dict, or a fresh default if none/corrupt."""
-    try:
-        with open(_PROGRESS_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
-            raise ValueError
-        data.setdefault("difficulties_beaten", [])
-        return data
-    except (FileNotFoundError, ValueError, json.JSONDecodeError, OSError):
+    import savegame
+    data = savegame.migrate_legacy_json("lessons", _PROGRESS_FILE)
+    if not isinstance(data, dict):
         return {"difficulties_beaten": []}
+    data.setdefault("difficulties_beaten", [])
+    return data
 
 
 def _save_progress(data):
     """Best-effort write. A failed save never crashes the game."""
-    try:
-        with open(_PROGRESS_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-    except OSError:
-        pass
+    import savegame
+    savegame.save_section("lessons", data)
 
 
 def record_run_completed(difficulty):
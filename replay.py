@@ -0,0 +1,655 @@
+"""
+replay.py — Record a run's inputs and re-execute it deterministically
+---------------------------------------------------------------------
+A run is fully determined by three things: the seed of the global
+`random`, the build of the game, and the stream of answers typed at the
+prompts. The game records exactly that for every session (last_run.rec
+next to the game, or --record PATH), so a playtester's bug report can
+ship the file and we can re-run the session bit for bit.
+
+Recording:
+  - start_recording() seeds `random` from os.urandom (the same entropy
+    Python would use anyway) and keeps the seed
+  - every answer returned by input() is appended — the recorder sits
+    under the game's own input() override, so dev shortcuts replay too
+  - the save-file state that changes menus (Python-lesson unlocks) and,
+    for --resume / --continue, the file resumed from are embedded
+  - an EventLog follows the run: hero/enemy vitals and statuses at each
+    prompt (when they changed), battles, loot drops and fight scores
+  - at exit the file is written with a digest of the final state (hero
+    stats, fights, score, and a hash of the RNG state)
+
+Replaying — replay(path, render=False, step=False):
+  - runs the game's own play() loop with input() fed from the recording,
+    in a sandbox: a temporary save file, leaderboard database, snapshot
+    and spool; no network; no autosave
+  - render=False (default) is the fast path: no output, no sleeps, no
+    screen clears, wrap() and the HP bars stubbed out
+  - render=True prints the game as it was played (each recorded answer
+    echoed after its prompt); step=True also pauses at every prompt
+  - the event log is compared with the recorded one event by event, and
+    the final digest field by field; the first difference is reported
+    (jtwh_golden.py does this for a whole corpus of runs in parallel)
+
+File format: b"JTWHREC1" + zlib(JSON). Inputs are plain strings, so a
+few thousand prompts compress to a few KB.
+
+One replay per process gives an exact re-run: the game keeps some state
+in module globals, so a second replay in the same process starts from
+whatever the first left behind. The CLI (and a corpus runner) should use
+a fresh process per file.
+
+    python replay.py last_run.rec            # fast, prints the verdict
+    python replay.py last_run.rec --render   # watch it
+    python replay.py last_run.rec --step     # one prompt at a time
+    python replay.py last_run.rec --json     # one-line verdict for tools
+"""
+
+import atexit
+import builtins
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+import zlib
+
+
+_GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+REPLAY_MAGIC = b"JTWHREC1"
+REPLAY_VERSION = 1
+LAST_RUN_FILE = os.path.join(_GAME_DIR, "last_run.rec")
+
+
+class ReplayError(Exception):
+    """Raised when a file isn't a recording, or is from an unknown version."""
+
+
+class ReplayEnd(BaseException):
+    """
+    The recorded input ran out (the player quit, or the stream closed).
+    A BaseException so the game's own `except Exception` blocks can't
+    swallow it and keep prompting.
+    """
+
+
+# ============================================================
+# RECORDING FILE
+# ============================================================
+
+_build = [None]
+
+
+def build_id():
+    """Short hash of the game's source files — which build made a recording."""
+    if _build[0] is None:
+        h = hashlib.sha1()
+        for path in sorted(glob.glob(os.path.join(_GAME_DIR, "*.py"))):
+            name = os.path.basename(path)
+            if name.startswith("jtwh_"):
+                continue                # test / bench tooling, not the game
+            h.update(name.encode("utf-8"))
+            with open(path, "rb") as f:
+                h.update(f.read())
+        _build[0] = h.hexdigest()[:12]
+    return _build[0]
+
+
+def _game_label():
+    matches = sorted(glob.glob(os.path.join(_GAME_DIR, "Journey_To_Winter_Haven_v_*.py")))
+    return os.path.splitext(os.path.basename(matches[-1]))[0] if matches else "?"
+
+
+def new_recording(seed, resume_blob=None):
+    import auto_resolve
+    import savegame
+    return {
+        "version":  REPLAY_VERSION,
+        "game":     _game_label(),
+        "build":    build_id(),
+        "created":  time.strftime("%Y-%m-%d %H:%M:%S"),
+        "seed":     seed,
+        "hashseed": os.environ.get("PYTHONHASHSEED"),
+        "lessons":  savegame.load_section("lessons"),
+        "resume":   resume_blob.hex() if resume_blob else None,
+        "auto_resolve": auto_resolve.THRESHOLD[0],
+        "inputs":   [],
+        "events":   [],
+        "digest":   None,
+    }
+
+
+def dumps(rec):
+    body = json.dumps(rec, separators=(",", ":"), ensure_ascii=False, default=str)
+    return REPLAY_MAGIC + zlib.compress(body.encode("utf-8"), 9)
+
+
+def loads(blob):
+    if not blob.startswith(REPLAY_MAGIC):
+        raise ReplayError("not a Winter Haven recording")
+    try:
+        rec = json.loads(zlib.decompress(blob[len(REPLAY_MAGIC):]).decode("utf-8"))
+    except (zlib.error, UnicodeDecodeError, ValueError) as e:
+        raise ReplayError(f"corrupt recording: {e}") from None
+    if not isinstance(rec, dict) or rec.get("version") != REPLAY_VERSION:
+        raise ReplayError(f"unsupported recording version: {rec.get('version')!r}"
+                          if isinstance(rec, dict) else "corrupt recording")
+    return rec
+
+
+def save(rec, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(dumps(rec))
+    os.replace(tmp, path)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+# ============================================================
+# DIGEST
+# ============================================================
+
+def _current_warrior():
+    story = sys.modules.get("story")
+    w = story._gw_ref[0] if story is not None and hasattr(story, "_gw_ref") else None
+    if w is None:
+        combat = sys.modules.get("combat")
+        w = getattr(combat, "GAME_WARRIOR", None)
+    return w
+
+
+def digest(warrior=None):
+    """The end state a replay must reproduce."""
+    w = warrior if warrior is not None else _current_warrior()
+    out = {"rng": hashlib.sha1(repr(random.getstate()).encode("ascii")).hexdigest()[:16]}
+    if w is not None:
+        fights = getattr(w, "per_fight_scores", []) or []
+        out.update({
+            "name":       getattr(w, "name", None),
+            "difficulty": getattr(w, "difficulty", None),
+            "level":      getattr(w, "level", None),
+            "hp":         getattr(w, "hp", None),
+            "max_hp":     getattr(w, "max_hp", None),
+            "gold":       getattr(w, "gold", None),
+            "xp":         getattr(w, "xp", None),
+            "fights":     len(fights),
+            "score":      sum(int(f.get("score", 0)) for f in fights if isinstance(f, dict)),
+        })
+    return out
+
+
+def first_difference(expected, actual):
+    """(field, expected, actual) for the first digest field that differs, else None."""
+    for key in sorted(set(expected or {}) | set(actual or {})):
+        a, b = (expected or {}).get(key), (actual or {}).get(key)
+        if a != b:
+            return key, a, b
+    return None
+
+
+# ============================================================
+# EVENT LOG
+# ============================================================
+
+# Status counters worth comparing; zero / False ones are left out.
+STATUS_FIELDS = ("poison_turns", "blind_turns", "fire_stacks", "paralyze_turns",
+                 "turn_stop", "bleed_turns", "skip_turns", "rot_max_hp_loss",
+                 "berserk_active", "death_defier_active")
+
+# (module, function, event kind) — wrapped while a run is recorded or replayed.
+EVENT_HOOKS = [
+    ("combat",    "battle",             "battle"),
+    ("equipment", "make_loot",          "loot"),
+    ("score",     "record_fight_score", "score"),
+]
+
+
+def _statuses(entity):
+    out = {}
+    for field in STATUS_FIELDS:
+        value = getattr(entity, field, 0)
+        if value:
+            out[field] = value if isinstance(value, (int, float)) else bool(value)
+    return out
+
+
+def _plain(value):
+    """JSON-safe and stable across processes (no reprs with addresses)."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return type(value).__name__
+
+
+class EventLog:
+    """
+    What happened during a run, as a list of JSON-ready dicts:
+
+      state       hero (and current enemy) vitals + statuses at a prompt,
+                  logged only when they changed since the last prompt
+      battle      a fight starting: enemy, both HPs
+      battle_end  its result and both HPs
+      loot        a drop: source monster, item, rarity
+      score       a fight score as booked
+
+    Every event carries "at", the number of prompts seen so far, so a
+    divergence can be located in the input stream. Damage and healing
+    show up as HP changes between consecutive state events.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.prompts = 0
+        self.enemy = None
+        self._last_state = None
+
+    def _add(self, kind, **fields):
+        fields["kind"] = kind
+        fields["at"] = self.prompts
+        self.events.append(fields)
+
+    def at_prompt(self):
+        self.prompts += 1
+        w, e = _current_warrior(), self.enemy
+        if w is None:
+            return
+        state = {
+            "hp": getattr(w, "hp", None), "max_hp": getattr(w, "max_hp", None),
+            "ap": getattr(w, "ap", None), "gold": getattr(w, "gold", None),
+            "xp": getattr(w, "xp", None), "level": getattr(w, "level", None),
+            "status": _statuses(w),
+        }
+        if e is not None:
+            state.update(enemy=getattr(e, "name", None), enemy_hp=getattr(e, "hp", None),
+                         enemy_status=_statuses(e))
+        if state != self._last_state:
+            self._last_state = state
+            self._add("state", **state)
+
+    def _hooked(self, fn, kind):
+        log = self
+
+        def battle(warrior, enemy, *a, **k):
+            log.enemy = enemy
+            log._add("battle", enemy=getattr(enemy, "name", None),
+                     enemy_hp=getattr(enemy, "hp", None), hp=getattr(warrior, "hp", None))
+            try:
+                result = fn(warrior, enemy, *a, **k)
+            finally:
+                log.enemy = None
+            log._add("battle_end", result=_plain(result),
+                     enemy_hp=getattr(enemy, "hp", None), hp=getattr(warrior, "hp", None))
+            return result
+
+        def loot(*a, **k):
+            item = fn(*a, **k)
+            log._add("loot", source=_plain(a[0] if a else k.get("monster_name")),
+                     item=getattr(item, "name", None), rarity=getattr(item, "rarity", None))
+            return item
+
+        def score(warrior, *a, **k):
+            result = fn(warrior, *a, **k)
+            fights = getattr(warrior, "per_fight_scores", None) or []
+            last = fights[-1] if fights and isinstance(fights[-1], dict) else {}
+            log._add("score", score=_plain(last.get("score")), fights=len(fights))
+            return result
+
+        return {"battle": battle, "loot": loot, "score": score}[kind]
+
+    def install(self, patches):
+        """Wrap the EVENT_HOOKS functions in every game module (undo via `patches`)."""
+        for mod_name, attr, kind in EVENT_HOOKS:
+            try:
+                mod = __import__(mod_name)
+            except ImportError:
+                continue
+            original = getattr(mod, attr, None)
+            if original is not None:
+                patches.everywhere(original, self._hooked(original, kind))
+
+
+def first_event_difference(expected, actual):
+    """
+    (index, field, expected event, actual event) for the first event that
+    differs — field is the first differing key — or None when they match.
+    A log that stops early differs at its end (its event is None).
+    """
+    for i in range(max(len(expected), len(actual))):
+        a = expected[i] if i < len(expected) else None
+        b = actual[i] if i < len(actual) else None
+        if a != b:
+            if a is None or b is None:
+                return i, None, a, b
+            for key in ("kind",) + tuple(sorted(set(a) | set(b))):
+                if a.get(key) != b.get(key):
+                    return i, key, a, b
+    return None
+
+
+def describe_event_difference(diff):
+    i, field, want, got = diff
+    where = f"event {i + 1}"
+    ref = want or got
+    where += f" (prompt {ref.get('at')}, {ref.get('kind')})"
+    if want is None:
+        return f"{where}: the recording ends here, the replay goes on"
+    if got is None:
+        return f"{where}: the replay ends here, the recording goes on"
+    return f"{where}: {field}: recorded {want.get(field)!r}, replay {got.get(field)!r}"
+
+
+# ============================================================
+# INPUT SWAP
+# ============================================================
+
+def _game_modules():
+    for mod in list(sys.modules.values()):
+        path = getattr(mod, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == _GAME_DIR:
+            yield mod
+
+
+class _Patches:
+    """Attribute swaps that can all be put back."""
+
+    def __init__(self):
+        self._undo = []
+
+    def set(self, obj, attr, value):
+        self._undo.append((obj, attr, getattr(obj, attr)))
+        setattr(obj, attr, value)
+
+    def everywhere(self, original, value):
+        """Swap `original` in builtins-style homes: every game module holding it."""
+        for mod in [builtins, time, os] + list(_game_modules()):
+            for key, current in list(vars(mod).items()):
+                if current is original:
+                    self.set(mod, key, value)
+
+    def restore(self):
+        while self._undo:
+            obj, attr, value = self._undo.pop()
+            setattr(obj, attr, value)
+
+
+# ============================================================
+# RECORD
+# ============================================================
+
+_active = [None]           # (recording dict, path)
+
+
+def start_recording(path=LAST_RUN_FILE, resume_path=None, seed=None):
+    """
+    Seed `random`, start capturing input(), and write the recording to
+    `path` at exit. Call once, before the game starts.
+    """
+    if _active[0] is not None:
+        return _active[0][0]
+    seed = int.from_bytes(os.urandom(8), "big") if seed is None else seed
+    resume_blob = None
+    if resume_path and os.path.exists(resume_path):
+        with open(resume_path, "rb") as f:
+            resume_blob = f.read()
+    rec = new_recording(seed, resume_blob)
+    random.seed(seed)
+
+    original = builtins.input
+    inputs = rec["inputs"]
+    log = EventLog()
+    log.events = rec["events"]
+
+    def recording_input(prompt=""):
+        log.at_prompt()
+        raw = original(prompt)
+        inputs.append(raw)
+        return raw
+
+    patches = _Patches()
+    patches.everywhere(original, recording_input)
+    log.install(patches)
+    _active[0] = (rec, path)
+    atexit.register(finish_recording)
+    return rec
+
+
+def finish_recording():
+    """Write the active recording (with its final digest). Safe to call twice."""
+    if _active[0] is None:
+        return None
+    rec, path = _active[0]
+    rec["digest"] = digest()
+    try:
+        save(rec, path)
+    except OSError:
+        return None
+    return path
+
+
+# ============================================================
+# REPLAY
+# ============================================================
+
+class _NullOut:
+    """sys.stdout stand-in for the no-render path."""
+    encoding = "utf-8"
+
+    def write(self, s):
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+def _game_main():
+    """The main game module, imported once under the name the harness uses."""
+    mod = sys.modules.get("jtwh_main")
+    if mod is not None:
+        return mod
+    matches = sorted(glob.glob(os.path.join(_GAME_DIR, "Journey_To_Winter_Haven_v_*.py")))
+    if not matches:
+        raise ReplayError("main game file not found")
+    spec = importlib.util.spec_from_file_location("jtwh_main", matches[-1])
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["jtwh_main"] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@contextlib.contextmanager
+def _sandbox(rec, feeder, render):
+    """Temp files instead of the player's, no network, no autosave."""
+    import auto_resolve
+    import leaderboard
+    import leaderboard_db
+    import python_lessons
+    import savegame
+    import shared
+    import snapshot
+    import ui_bars
+
+    tmp = tempfile.mkdtemp(prefix="jtwh-replay-")
+    p = _Patches()
+    try:
+        savegame.flush()
+        p.set(savegame, "SAVE_FILE", os.path.join(tmp, "winter_haven.sav"))
+        p.set(savegame, "AUTOSAVE", [False])
+        p.set(snapshot, "SNAPSHOT_FILE", os.path.join(tmp, "session.snap"))
+        p.set(leaderboard_db, "DB_FILE", os.path.join(tmp, "leaderboard.db"))
+        p.set(python_lessons, "_PROGRESS_FILE", os.path.join(tmp, "python_progress.json"))
+        p.set(leaderboard, "_submit_global_score", lambda entry: None)
+        p.set(leaderboard._global_cache, "loader", lambda key: [])
+        p.set(auto_resolve, "THRESHOLD", [rec.get("auto_resolve")])
+        if rec.get("lessons") is not None:
+            savegame.save_section("lessons", rec["lessons"])
+
+        p.everywhere(builtins.input, feeder)
+        p.everywhere(time.sleep, lambda *a, **k: None)
+        p.everywhere(os.system, lambda *a, **k: 0)
+        if not render:
+            p.set(sys, "stdout", _NullOut())
+            p.everywhere(shared.wrap, lambda text, width=None: str(text))
+            p.everywhere(ui_bars._render, lambda *a, **k: "")
+        yield tmp
+    finally:
+        p.restore()
+        savegame.flush()
+        conn = leaderboard_db._conn[0]
+        if conn is not None and leaderboard_db._conn_path[0] != leaderboard_db.DB_FILE:
+            conn.close()
+            leaderboard_db._conn[0] = None
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def replay(source, render=False, step=False):
+    """
+    Re-execute a recording (path or loaded dict). Returns a dict:
+      ended      "exit" (the game exited), "inputs" (recording ran out),
+                 "error" (the game raised — see "error")
+      consumed   inputs fed / total recorded
+      seconds    wall time of the replay
+      digest     the end state reached; "diverged" names the first
+                 field that differs from the recorded one
+      events     the replay's event log; "event_diff" is the first
+                 event that differs (see first_event_difference)
+      match      digest and event log both match the recording
+    """
+    rec = load(source) if isinstance(source, (str, os.PathLike)) else source
+    inputs = rec["inputs"]
+    pos = [0]
+    real_input = builtins.input
+    state = {"step": step}
+    log = EventLog()
+
+    def feeder(prompt=""):
+        log.at_prompt()
+        i = pos[0]
+        if i >= len(inputs):
+            raise ReplayEnd()
+        pos[0] = i + 1
+        answer = inputs[i]
+        if render:
+            print(f"{prompt}{answer}")
+            if state["step"]:
+                cmd = real_input(f"  [{i + 1}/{len(inputs)}] Enter = next, c = run on, q = stop > ")
+                if cmd.strip().lower() == "q":
+                    raise ReplayEnd()
+                if cmd.strip().lower() == "c":
+                    state["step"] = False
+        return answer
+
+    result = {"ended": None, "error": None}
+    start = time.perf_counter()
+    hooks = _Patches()
+    with _sandbox(rec, feeder, render) as tmp:
+        main = _game_main()
+        log.install(hooks)
+        resume_path = None
+        if rec.get("resume"):
+            resume_path = os.path.join(tmp, "resume.bin")
+            with open(resume_path, "wb") as f:
+                f.write(bytes.fromhex(rec["resume"]))
+        saved_main = sys.modules.get("__main__")
+        sys.modules["__main__"] = main         # monsters/equipment read DIFFICULTY off __main__
+        random.seed(rec["seed"])
+        try:
+            main.play(resume_path)
+            result["ended"] = "exit"
+        except SystemExit:
+            result["ended"] = "exit"
+        except ReplayEnd:
+            result["ended"] = "inputs"
+        except Exception:
+            result["ended"] = "error"
+            result["error"] = traceback.format_exc()
+        finally:
+            sys.modules["__main__"] = saved_main
+            hooks.restore()
+        result["digest"] = digest()
+    result["seconds"] = time.perf_counter() - start
+    result["consumed"] = (pos[0], len(inputs))
+    result["events"] = log.events
+    expected = rec.get("digest")
+    diff = first_difference(expected, result["digest"]) if expected else None
+    # Recordings made before the event log existed only have the digest.
+    event_diff = (first_event_difference(rec["events"], log.events)
+                  if rec.get("events") else None)
+    result["match"] = expected is not None and diff is None and event_diff is None
+    result["diverged"] = diff
+    result["event_diff"] = event_diff
+    return result
+
+
+def _main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a recorded Winter Haven run.")
+    parser.add_argument("recording", nargs="?", default=LAST_RUN_FILE)
+    parser.add_argument("--render", action="store_true", help="show the game while replaying")
+    parser.add_argument("--step", action="store_true", help="pause at every prompt (implies --render)")
+    parser.add_argument("--json", action="store_true",
+                        help="print one JSON verdict line instead (for jtwh_golden.py)")
+    args = parser.parse_args(argv)
+
+    try:
+        rec = load(args.recording)
+    except (OSError, ReplayError) as e:
+        if args.json:
+            print(json.dumps({"file": args.recording, "ended": "unreadable", "error": str(e),
+                              "match": False}))
+        else:
+            print(f"Can't load {args.recording}: {e}")
+        return 2
+    # String hashing must match the recording if it was pinned.
+    if rec.get("hashseed") is not None and os.environ.get("PYTHONHASHSEED") != rec["hashseed"]:
+        env = dict(os.environ, PYTHONHASHSEED=rec["hashseed"])
+        os.execve(sys.executable, [sys.executable, os.path.abspath(__file__)] + sys.argv[1:], env)
+
+    if args.json:
+        res = replay(rec)
+        print(json.dumps({
+            "file": args.recording, "build": rec["build"], "ended": res["ended"],
+            "error": res["error"], "consumed": res["consumed"], "seconds": res["seconds"],
+            "events": len(res["events"]), "match": res["match"],
+            "diverged": res["diverged"], "event_diff": res["event_diff"],
+        }, default=str))
+        return 0 if res["match"] else 1
+
+    print(f"{args.recording}: {rec['game']} build {rec['build']}, seed {rec['seed']}, "
+          f"{len(rec['inputs'])} inputs, recorded {rec['created']}")
+    if rec["build"] != build_id():
+        print(f"  (replaying on build {build_id()} — differences may be real changes)")
+    res = replay(rec, render=args.render or args.step, step=args.step)
+    used, total = res["consumed"]
+    print(f"\nReplay ended ({res['ended']}) after {used}/{total} inputs in {res['seconds']:.3f}s")
+    if res["error"]:
+        print(res["error"])
+    if res["match"]:
+        print("Final state matches the recording.")
+        return 0
+    if rec.get("digest") is None:
+        print("The recording has no final state to compare against.")
+        return 0 if res["ended"] != "error" else 1
+    if res["event_diff"]:
+        print(f"DIVERGED at {describe_event_difference(res['event_diff'])}")
+    if res["diverged"]:
+        field, want, got = res["diverged"]
+        print(f"Final state differs: {field}: recorded {want!r}, replay {got!r}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
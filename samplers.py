@@ -0,0 +1,200 @@
+"""
+samplers.py — O(1) draws from the encounter and loot tables, in bulk
+--------------------------------------------------------------------
+The balance tooling (fight_sim sweeps, loot / gold / score simulators)
+draws spawns and rarities by the hundred thousand. This module compiles
+each game table into a Vose alias table once and draws from it in O(1)
+with a single uniform per sample:
+
+    tiers(round_num, n)                       get_round_tier
+    encounters(round_num, n)                  select_arena_enemy's class pick
+    tier4_bosses(n)                           random_tier4_boss
+    rarities(n, monster_level, round_num, difficulty)   roll_rarity
+    wildcard_rarities(n, difficulty)          crafter's _roll_wildcard_rarity
+
+Tables are keyed by (round, difficulty, level) — whatever the source table
+depends on — built on first use and kept in TABLES. Every batch call takes
+an `rng` (the `random` module by default, or a random.Random for a private,
+reproducible stream).
+
+The distributions match the live functions exactly (see probabilities());
+the individual draws don't — the live game keeps its own weighted walks so
+a seed still produces the same run. Call reset() after editing a source
+table at runtime.
+"""
+
+import random
+
+
+TABLES = {}                 # (kind, key...) -> AliasTable
+
+
+# ============================================================
+# ALIAS TABLE
+# ============================================================
+
+class AliasTable:
+    """Vose's alias method over (outcome, weight) pairs: O(n) build, O(1) draw."""
+
+    __slots__ = ("outcomes", "prob", "alias", "n")
+
+    def __init__(self, pairs):
+        pairs = [(o, w) for o, w in pairs if w > 0]
+        if not pairs:
+            raise ValueError("AliasTable needs at least one positive weight")
+        self.outcomes = tuple(o for o, _ in pairs)
+        self.n = n = len(pairs)
+        total = float(sum(w for _, w in pairs))
+        scaled = [w * n / total for _, w in pairs]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding — keeps prob 1, aliases itself.
+
+    def draw(self, u):
+        """The outcome for one uniform u in [0, 1)."""
+        x = u * self.n
+        i = min(int(x), self.n - 1)
+        return self.outcomes[i] if x - i < self.prob[i] else self.outcomes[self.alias[i]]
+
+    def sample(self, rng=random):
+        return self.draw(rng.random())
+
+    def sample_n(self, k, rng=random):
+        rand, n, outcomes, prob, alias = rng.random, self.n, self.outcomes, self.prob, self.alias
+        out = []
+        append = out.append
+        for _ in range(k):
+            x = rand() * n
+            i = int(x)
+            if i == n:
+                i -= 1
+            append(outcomes[i] if x - i < prob[i] else outcomes[alias[i]])
+        return out
+
+    def probabilities(self):
+        """{outcome: probability} as encoded in the table."""
+        p = dict.fromkeys(self.outcomes, 0.0)
+        for i, o in enumerate(self.outcomes):
+            p[o] += self.prob[i] / self.n
+            p[self.outcomes[self.alias[i]]] += (1.0 - self.prob[i]) / self.n
+        return p
+
+
+# ============================================================
+# SOURCE TABLES
+# ============================================================
+
+def _tier_weights(round_num):
+    import monsters
+    weights = monsters.ROUND_TIER_WEIGHTS.get(round_num)
+    if weights is not None:
+        return list(weights.items())
+    return [(4 if round_num == 5 else 3, 1)]
+
+
+def _encounter_weights(round_num):
+    import monsters
+    pairs = []
+    for tier, chance in _tier_weights(round_num):
+        if tier == 4:
+            total = sum(w for _, w in monsters.TIER4_BOSSES)
+            pairs += [(cls, chance * w / total) for cls, w in monsters.TIER4_BOSSES]
+        else:
+            pool = monsters.get_monsters_by_tier(tier)
+            pairs += [(cls, chance / len(pool)) for cls in pool]
+    return pairs
+
+
+def _tier4_weights():
+    import monsters
+    return list(monsters.TIER4_BOSSES)
+
+
+def _rarity_weights(monster_level, round_num, difficulty):
+    import equipment
+    pairs, prev = [], 0
+    for cut, rarity in equipment.RARITY_CUTS[equipment.rarity_key(monster_level, round_num, difficulty)]:
+        pairs.append((rarity, cut - prev))
+        prev = cut
+    return pairs
+
+
+def _wildcard_weights(difficulty):
+    import crafter
+    weights = {}
+    for rarity, w in crafter.WILDCARD_RARITY_WEIGHTS:
+        if rarity == "rare" and difficulty == "noob":
+            rarity = "uncommon"
+        weights[rarity] = weights.get(rarity, 0) + w
+    if difficulty == "champion":
+        # the epic bump is an independent roll on top of whatever was picked
+        total = sum(weights.values())
+        weights = {r: w * (1 - crafter.CHAMPION_EPIC_CHANCE) for r, w in weights.items()}
+        weights["epic"] = total * crafter.CHAMPION_EPIC_CHANCE
+    return list(weights.items())
+
+
+_SOURCES = {
+    "tier": _tier_weights,
+    "encounter": _encounter_weights,
+    "tier4": _tier4_weights,
+    "rarity": _rarity_weights,
+    "wildcard": _wildcard_weights,
+}
+
+
+def weights(kind, *key):
+    """[(outcome, weight), ...] of a source table: ("tier", round) /
+    ("encounter", round) / ("tier4",) / ("rarity", level, round, difficulty)
+    / ("wildcard", difficulty)."""
+    return _SOURCES[kind](*key)
+
+
+def table(kind, *key):
+    """The cached AliasTable for weights(kind, *key)."""
+    cached = TABLES.get((kind,) + key)
+    if cached is None:
+        cached = TABLES[(kind,) + key] = AliasTable(weights(kind, *key))
+    return cached
+
+
+def reset():
+    """Drop every compiled table (and the live game's) after a table edit."""
+    import monsters
+    monsters.rebuild_encounter_tables()
+    TABLES.clear()
+
+
+# ============================================================
+# BATCH API
+# ============================================================
+
+def tiers(round_num, n, rng=random):
+    return table("tier", round_num).sample_n(n, rng)
+
+
+def encounters(round_num, n, rng=random):
+    """n monster classes as select_arena_enemy would pick them (unscaled)."""
+    return table("encounter", round_num).sample_n(n, rng)
+
+
+def tier4_bosses(n, rng=random):
+    return table("tier4").sample_n(n, rng)
+
+
+def rarities(n, monster_level=1, round_num=0, difficulty="warrior", rng=random):
+    # level / round collapse to roll_rarity's buckets so the cache stays small
+    bucket = 3 if monster_level >= 3 else 2 if monster_level == 2 else 1
+    return table("rarity", bucket, 1 if round_num == 1 else 0, difficulty).sample_n(n, rng)
+
+
+def wildcard_rarities(n, difficulty="warrior", rng=random):
+    return table("wildcard", difficulty).sample_n(n, rng)
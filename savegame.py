@@ -0,0 +1,802 @@
+"""
+savegame.py — Compact save file + incremental autosave for Journey to Winter Haven
+----------------------------------------------------------------------------------
+snapshot.py is for the hosted build (trusted, pickled, whole-session). This
+is the player-facing save: one small versioned file that also holds the
+lesson progress that used to live in python_progress.json.
+
+File layout (all integers are unsigned LEB128 varints):
+
+    SAVE_MAGIC  version  section_count
+    section_count x ( name  crc32(4 bytes, big-endian)  length  zlib(payload) )
+
+Each section is compressed and checksummed on its own, so a damaged
+"lessons" section can't take the run down with it, and an autosave only
+re-encodes and recompresses the sections that actually changed.
+
+Section "run" — the hero is mostly Equipment objects (~48 fields each,
+sockets nested), and most of those fields are identical between two drops
+of the same item. So items are stored as:
+
+    fields     list of Equipment attribute names (index -> name)
+    templates  one full field set per distinct item name
+    items      template index + only the fields that differ from it
+    state      warrior attrs, scene position, settings, run stats
+
+Every Equipment reference (inventory, equipped slots, sockets) is an index
+into the items table, so an equipped item that also sits in the bag is
+still the same object after loading. Encoded item deltas are cached per
+item between autosaves; an item that hasn't changed costs one comparison.
+
+Values use a tiny tagged encoding (see _Encoder). Anything it doesn't know
+falls back to pickle, so an odd attribute never breaks a save.
+
+Autosave:
+    Scenes call autosave(warrior, reason) after battle(), rest_phase() and
+    a merchant / crafter visit. Encoding happens right there (a few ms for
+    a late-game hero); the atomic write + fsync runs on a background writer
+    thread that coalesces bursts, so saving never blocks input. Autosave is
+    off until enable_autosave() — only the real game entry point turns it
+    on, so the test harness and tools never touch the player's save.
+
+Public API:
+    SaveStore(path)                     — section store (read / stage / write)
+    default_store()                     — the store at SAVE_FILE
+    load_section(name, default)         — decoded section from the default store
+    save_section(name, value)           — stage + queue a background write
+    encode_run(warrior) / decode_run(payload)
+    autosave(warrior, reason)           — scene-boundary hook (no-op when off)
+    load_game(path) / is_save_file(path)
+    enable_autosave() / flush()
+"""
+
+import atexit
+import inspect
+import os
+import pickle
+import random
+import struct
+import threading
+import time
+import zlib
+
+from shared import Equipment
+import inventory_index
+
+
+SAVE_VERSION = 1
+SAVE_MAGIC   = b"JTWHSAVE"
+
+SAVE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "winter_haven.sav")
+
+# Reasons autosave() accepts after a won fight — the run moves on to the
+# next arena step, so the saved scene position does too.
+_POST_VICTORY_REASONS = {"battle", "rest"}
+
+
+class SaveError(Exception):
+    """Raised when a save file (or one of its sections) can't be read."""
+
+
+# ============================================================
+# VALUE ENCODING
+# ============================================================
+# One tag byte, then the body:
+#   N None   T True   F False   i int (zigzag varint)   f float (8 bytes)
+#   s str    y bytes  l list    u tuple   e set   z frozenset   d dict
+#   E Equipment (varint index into the items table)
+#   X "attribute absent" (only inside item deltas)
+#   P pickle fallback
+
+_ABSENT = object()
+
+
+def _write_varint(out, n):
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def _read_varint(buf, pos):
+    result = shift = 0
+    while True:
+        try:
+            byte = buf[pos]
+        except IndexError:
+            raise SaveError("truncated varint") from None
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Encoder:
+    """
+    Writes tagged values into self.out. Equipment is never written inline:
+    it's handed to `item_ref`, which returns its index in the items table.
+    """
+
+    def __init__(self, item_ref=None):
+        self.out = bytearray()
+        self.item_ref = item_ref
+        self.refs = 0           # Equipment refs written (uncacheable if > 0)
+
+    def value(self, v):
+        out = self.out
+        if v is None:
+            out += b"N"
+        elif v is True:
+            out += b"T"
+        elif v is False:
+            out += b"F"
+        elif type(v) is int:
+            out += b"i"
+            _write_varint(out, v * 2 if v >= 0 else -v * 2 - 1)
+        elif type(v) is float:
+            out += b"f"
+            out += struct.pack(">d", v)
+        elif type(v) is str:
+            raw = v.encode("utf-8")
+            out += b"s"
+            _write_varint(out, len(raw))
+            out += raw
+        elif type(v) is bytes:
+            out += b"y"
+            _write_varint(out, len(v))
+            out += v
+        elif type(v) in (list, tuple, set, frozenset):
+            out += {list: b"l", tuple: b"u", set: b"e", frozenset: b"z"}[type(v)]
+            _write_varint(out, len(v))
+            for x in v:
+                self.value(x)
+        elif type(v) is dict:
+            out += b"d"
+            _write_varint(out, len(v))
+            for k, x in v.items():
+                self.value(k)
+                self.value(x)
+        elif isinstance(v, Equipment) and self.item_ref is not None:
+            out += b"E"
+            _write_varint(out, self.item_ref(v))
+            self.refs += 1
+        elif v is _ABSENT:
+            out += b"X"
+        else:
+            raw = pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+            out += b"P"
+            _write_varint(out, len(raw))
+            out += raw
+
+
+class _Decoder:
+    def __init__(self, buf, items=None):
+        self.buf = buf
+        self.pos = 0
+        self.items = items
+
+    def varint(self):
+        n, self.pos = _read_varint(self.buf, self.pos)
+        return n
+
+    def _raw(self):
+        n = self.varint()
+        start, self.pos = self.pos, self.pos + n
+        if self.pos > len(self.buf):
+            raise SaveError("truncated value")
+        return bytes(self.buf[start:self.pos])
+
+    def value(self):
+        try:
+            tag = self.buf[self.pos]
+        except IndexError:
+            raise SaveError("truncated value") from None
+        self.pos += 1
+        if tag == 0x4E:                                     # N
+            return None
+        if tag == 0x54:                                     # T
+            return True
+        if tag == 0x46:                                     # F
+            return False
+        if tag == 0x69:                                     # i
+            n = self.varint()
+            return n >> 1 if not n & 1 else -((n + 1) >> 1)
+        if tag == 0x66:                                     # f
+            start, self.pos = self.pos, self.pos + 8
+            return struct.unpack(">d", self.buf[start:self.pos])[0]
+        if tag == 0x73:                                     # s
+            return self._raw().decode("utf-8")
+        if tag == 0x79:                                     # y
+            return self._raw()
+        if tag in (0x6C, 0x75, 0x65, 0x7A):                 # l u e z
+            seq = [self.value() for _ in range(self.varint())]
+            if tag == 0x6C:
+                return seq
+            return {0x75: tuple, 0x65: set, 0x7A: frozenset}[tag](seq)
+        if tag == 0x64:                                     # d
+            n = self.varint()
+            result = {}
+            for _ in range(n):
+                k = self.value()
+                result[k] = self.value()
+            return result
+        if tag == 0x45:                                     # E
+            idx = self.varint()
+            if self.items is None or idx >= len(self.items):
+                raise SaveError(f"bad item reference {idx}")
+            return self.items[idx]
+        if tag == 0x58:                                     # X
+            return _ABSENT
+        if tag == 0x50:                                     # P
+            try:
+                return pickle.loads(self._raw())
+            except Exception as e:
+                raise SaveError(f"corrupt pickled value: {e}") from e
+        raise SaveError(f"unknown value tag {tag!r}")
+
+
+def encode_value(v):
+    enc = _Encoder()
+    enc.value(v)
+    return bytes(enc.out)
+
+
+def decode_value(payload):
+    return _Decoder(payload).value()
+
+
+# ============================================================
+# SECTION "run" — templates + deltas
+# ============================================================
+
+# Attribute name registry, append-only for the life of the process so a
+# cached delta's field indices stay valid across autosaves.
+_FIELDS = []
+_FIELD_INDEX = {}
+
+# Item name -> template field dict. The first item seen under a name
+# becomes its template; later drops of it are stored as differences.
+_TEMPLATES = {}
+
+# id(item) -> (item, fingerprint, template name, encoded delta). The item
+# itself is held so its id can't be recycled while cached.
+_ITEM_CACHE = {}
+
+_EQUIPMENT_DEFAULTS = None
+
+
+def _equipment_defaults():
+    """Constructor defaults — fill in fields a newer build added."""
+    global _EQUIPMENT_DEFAULTS
+    if _EQUIPMENT_DEFAULTS is None:
+        params = inspect.signature(Equipment.__init__).parameters.values()
+        _EQUIPMENT_DEFAULTS = {p.name: p.default for p in params
+                               if p.default is not inspect.Parameter.empty}
+        _EQUIPMENT_DEFAULTS["sockets"] = []
+    return _EQUIPMENT_DEFAULTS
+
+
+def _field_idx(name):
+    idx = _FIELD_INDEX.get(name)
+    if idx is None:
+        idx = _FIELD_INDEX[name] = len(_FIELDS)
+        _FIELDS.append(name)
+    return idx
+
+
+def _fingerprint(attrs):
+    # Sockets are mutated in place, so compare a copy of their contents.
+    return {k: (tuple(v) if type(v) is list else v) for k, v in attrs.items()}
+
+
+def _encode_delta(attrs, template, item_ref):
+    enc = _Encoder(item_ref)
+    changed = [(k, v) for k, v in attrs.items()
+               if k not in template or template[k] != v or type(template[k]) is not type(v)]
+    missing = [k for k in template if k not in attrs]
+    _write_varint(enc.out, len(changed) + len(missing))
+    for k, v in changed:
+        _write_varint(enc.out, _field_idx(k))
+        enc.value(v)
+    for k in missing:
+        _write_varint(enc.out, _field_idx(k))
+        enc.value(_ABSENT)
+    return bytes(enc.out), enc.refs
+
+
+def _warrior_vars(warrior):
+    """vars(warrior) with the indexed bag as the plain list it encodes as."""
+    attrs = dict(vars(warrior))
+    if isinstance(attrs.get("inventory"), list):
+        attrs["inventory"] = list(attrs["inventory"])
+    return attrs
+
+
+def encode_run(warrior, reason=None):
+    """Encode the current run (warrior + scene position) as a section payload."""
+    import combat_log
+    import snapshot
+
+    items, index = [], {}
+
+    def item_ref(item):
+        idx = index.get(id(item))
+        if idx is None:
+            idx = index[id(item)] = len(items)
+            items.append(item)
+        return idx
+
+    # 1) state — discovers the items reachable from the warrior
+    difficulty, detail = snapshot._current_settings()
+    session = _session_for_save(reason)
+    state_enc = _Encoder(item_ref)
+    state_enc.value({
+        "class":         type(warrior).__name__,
+        "warrior":       _warrior_vars(warrior),
+        "session":       session,
+        "difficulty":    difficulty,
+        "combat_detail": detail,
+        "run_stats":     dict(combat_log._run_stats),
+        "reason":        reason,
+    })
+
+    # 2) items — sockets may pull in more items, so the list grows as we go
+    used_templates, template_slot = [], {}
+    item_records = bytearray()
+    seen = set()
+    i = 0
+    while i < len(items):
+        item = items[i]
+        i += 1
+        attrs = vars(item)
+        name = attrs.get("name")
+        template = _TEMPLATES.get(name)
+        if template is None:
+            template = _TEMPLATES[name] = {
+                k: ([None] * len(v) if k == "sockets" else
+                    list(v) if type(v) is list else v)
+                for k, v in attrs.items()}
+        if name not in template_slot:
+            template_slot[name] = len(used_templates)
+            used_templates.append(name)
+
+        fp = _fingerprint(attrs)
+        cached = _ITEM_CACHE.get(id(item))
+        if cached is not None and cached[0] is item and cached[1] == fp:
+            delta = cached[3]
+        else:
+            delta, refs = _encode_delta(attrs, template, item_ref)
+            if refs:
+                _ITEM_CACHE.pop(id(item), None)      # indices are per-save
+            else:
+                _ITEM_CACHE[id(item)] = (item, fp, name, delta)
+        seen.add(id(item))
+        _write_varint(item_records, template_slot[name])
+        item_records += delta
+
+    for stale in [k for k in _ITEM_CACHE if k not in seen]:
+        del _ITEM_CACHE[stale]
+
+    # 3) templates (field index -> value; template sockets are always empty)
+    tmpl_enc = _Encoder(item_ref)
+    _write_varint(tmpl_enc.out, len(used_templates))
+    for name in used_templates:
+        template = _TEMPLATES[name]
+        _write_varint(tmpl_enc.out, len(template))
+        for k, v in template.items():
+            _write_varint(tmpl_enc.out, _field_idx(k))
+            tmpl_enc.value(v)
+
+    out = bytearray()
+    fields_enc = _Encoder()
+    fields_enc.value(list(_FIELDS))
+    out += fields_enc.out
+    out += tmpl_enc.out
+    _write_varint(out, len(items))
+    out += item_records
+    out += state_enc.out
+    return bytes(out)
+
+
+def _session_for_save(reason):
+    """
+    SESSION as the save should record it. After a won arena fight the live
+    SESSION still points at the round just fought; a save taken then must
+    resume at the NEXT step (next round, or the quarters interlude).
+    """
+    import snapshot
+
+    session = dict(snapshot.SESSION)
+    session["defeated_names"] = list(session.get("defeated_names", []))
+    if reason in _POST_VICTORY_REASONS and session.get("scene") == "arena_round":
+        done = session.get("round_num", 0)
+        rounds = session.get("rounds_to_win", 5)
+        if done == rounds - 1:
+            session.update(scene="arena_quarters", round_num=done + 1,
+                           merchant_stock=None, crafter_stock=None)
+        else:
+            session["round_num"] = done + 1
+    return session
+
+
+def decode_run(payload):
+    """Section payload -> dict (warrior, session, difficulty, ...)."""
+    try:
+        return _decode_run(payload)
+    except (ValueError, TypeError, KeyError, struct.error) as e:
+        raise SaveError(f"run section is corrupt: {e}") from e
+
+
+def _decode_run(payload):
+    import hero
+
+    dec = _Decoder(payload)
+    fields = dec.value()
+    if not isinstance(fields, list):
+        raise SaveError("run section has no field table")
+
+    def read_fields(d):
+        attrs = {}
+        for _ in range(d.varint()):
+            idx = d.varint()
+            if idx >= len(fields):
+                raise SaveError(f"bad field index {idx}")
+            attrs[fields[idx]] = d.value()
+        return attrs
+
+    templates = [read_fields(dec) for _ in range(dec.varint())]
+
+    count = dec.varint()
+    items = [Equipment.__new__(Equipment) for _ in range(count)]
+    dec.items = items
+    defaults = _equipment_defaults()
+    for item in items:
+        t = dec.varint()
+        if t >= len(templates):
+            raise SaveError(f"bad template index {t}")
+        attrs = dict(defaults)
+        attrs.update(templates[t])
+        attrs.update(read_fields(dec))
+        for k in [k for k, v in attrs.items() if v is _ABSENT]:
+            del attrs[k]
+        attrs["sockets"] = list(attrs.get("sockets", []))
+        item.__dict__.update(attrs)
+
+    state = dec.value()
+    if not isinstance(state, dict) or "warrior" not in state:
+        raise SaveError("run section has no warrior")
+
+    cls = getattr(hero, state.get("class") or "Warrior", hero.Warrior)
+    warrior = cls()                       # defaults for attrs added since
+    warrior.__dict__.update(state["warrior"])
+    inventory_index.bag(warrior)          # plain list -> indexed bag
+    state["warrior"] = warrior
+    return state
+
+
+# ============================================================
+# SECTION STORE
+# ============================================================
+
+class SaveStore:
+    """
+    All sections of one save file. Sections are kept compressed in memory
+    and only rewritten when their payload changes; write() always puts the
+    whole file down atomically (tmp + fsync + replace).
+    """
+
+    def __init__(self, path=SAVE_FILE):
+        self.path = path
+        self._sections = None       # name -> (crc32, compressed bytes)
+        self._lock = threading.RLock()
+        self.dirty = False
+
+    # ---------- reading ----------
+
+    def _ensure_loaded(self):
+        if self._sections is not None:
+            return
+        self._sections = {}
+        try:
+            with open(self.path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return
+        try:
+            self._sections = parse_sections(blob)
+        except SaveError:
+            # Keep the damaged file for a bug report instead of writing
+            # straight over it on the next save.
+            try:
+                os.replace(self.path, f"{self.path}.corrupt")
+            except OSError:
+                pass
+
+    def names(self):
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._sections)
+
+    def payload(self, name):
+        """Uncompressed section payload, or None if absent."""
+        with self._lock:
+            self._ensure_loaded()
+            return section_payload(self._sections, name)
+
+    def read(self, name, default=None):
+        """Decoded generic section; `default` if missing or unreadable."""
+        try:
+            payload = self.payload(name)
+            return default if payload is None else decode_value(payload)
+        except SaveError:
+            return default
+
+    # ---------- writing ----------
+
+    def stage(self, name, payload):
+        """
+        Replace a section's payload. Returns False (and does nothing) if it
+        is byte-identical to what's already staged — that's what keeps
+        autosaves incremental.
+        """
+        blob = zlib.compress(payload, 6)
+        crc = zlib.crc32(blob)
+        with self._lock:
+            self._ensure_loaded()
+            old = self._sections.get(name)
+            if old is not None and old[0] == crc and old[1] == blob:
+                return False
+            self._sections[name] = (crc, blob)
+            self.dirty = True
+            return True
+
+    def drop(self, name):
+        with self._lock:
+            self._ensure_loaded()
+            if self._sections.pop(name, None) is not None:
+                self.dirty = True
+
+    def to_bytes(self):
+        with self._lock:
+            self._ensure_loaded()
+            sections = dict(self._sections)
+        out = bytearray(SAVE_MAGIC)
+        _write_varint(out, SAVE_VERSION)
+        _write_varint(out, len(sections))
+        for name, (crc, blob) in sections.items():
+            raw = name.encode("utf-8")
+            _write_varint(out, len(raw))
+            out += raw
+            out += crc.to_bytes(4, "big")
+            _write_varint(out, len(blob))
+            out += blob
+        return bytes(out)
+
+    def write(self):
+        """Write the file now (atomic). Clears the dirty flag."""
+        with self._lock:
+            blob = self.to_bytes()
+            self.dirty = False
+        _write_atomic(self.path, blob)
+
+
+def parse_sections(blob):
+    """Save file bytes -> {name: (crc32, compressed payload)}."""
+    if not blob.startswith(SAVE_MAGIC):
+        raise SaveError("not a Journey to Winter Haven save")
+    pos = len(SAVE_MAGIC)
+    version, pos = _read_varint(blob, pos)
+    if version > SAVE_VERSION:
+        raise SaveError(f"save is from a newer version ({version})")
+    count, pos = _read_varint(blob, pos)
+    sections = {}
+    for _ in range(count):
+        n, pos = _read_varint(blob, pos)
+        name = blob[pos:pos + n].decode("utf-8")
+        pos += n
+        crc = int.from_bytes(blob[pos:pos + 4], "big")
+        pos += 4
+        n, pos = _read_varint(blob, pos)
+        if pos + n > len(blob):
+            raise SaveError(f"section {name!r} is truncated")
+        sections[name] = (crc, blob[pos:pos + n])
+        pos += n
+    return sections
+
+
+def section_payload(sections, name):
+    """Checked + decompressed payload of one parsed section (None if absent)."""
+    entry = sections.get(name)
+    if entry is None:
+        return None
+    crc, blob = entry
+    if zlib.crc32(blob) != crc:
+        raise SaveError(f"section {name!r} failed its checksum")
+    try:
+        return zlib.decompress(blob)
+    except zlib.error as e:
+        raise SaveError(f"section {name!r} is corrupt: {e}") from e
+
+
+def _write_atomic(path, blob):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ============================================================
+# BACKGROUND WRITER
+# ============================================================
+# One daemon thread, started on first use. Stores are queued by identity;
+# several autosaves before the thread wakes collapse into one write.
+
+_pending = []
+_cond = threading.Condition()
+_writer = [None]
+_busy = [False]
+
+
+def _writer_loop():
+    while True:
+        with _cond:
+            while not _pending:
+                _cond.wait()
+            store = _pending.pop(0)
+            _busy[0] = True
+        try:
+            if store.dirty:
+                store.write()
+        except OSError:
+            pass                    # a failed autosave never crashes the game
+        finally:
+            with _cond:
+                _busy[0] = False
+                _cond.notify_all()
+
+
+def queue_write(store):
+    with _cond:
+        if _writer[0] is None:
+            _writer[0] = threading.Thread(target=_writer_loop, name="jtwh-save",
+                                          daemon=True)
+            _writer[0].start()
+            atexit.register(flush)
+        if store not in _pending:
+            _pending.append(store)
+        _cond.notify_all()
+
+
+def flush(timeout=5.0):
+    """Block until every queued write has hit the disk (or timeout)."""
+    deadline = time.monotonic() + timeout
+    with _cond:
+        while _pending or _busy[0]:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            _cond.wait(remaining)
+    return True
+
+
+# ============================================================
+# DEFAULT STORE + LEGACY FILES
+# ============================================================
+
+_default = [None]
+
+
+def default_store():
+    if _default[0] is None or _default[0].path != SAVE_FILE:
+        _default[0] = SaveStore(SAVE_FILE)
+    return _default[0]
+
+
+def load_section(name, default=None):
+    return default_store().read(name, default)
+
+
+def save_section(name, value):
+    """Stage a generic section in the default store and queue the write."""
+    store = default_store()
+    if store.stage(name, encode_value(value)):
+        queue_write(store)
+
+
+def migrate_legacy_json(name, path, default=None):
+    """
+    Read a section, importing it from an old standalone JSON file the first
+    time. The JSON file is kept as *.migrated rather than deleted, so
+    nothing is lost if the player goes back to an older build.
+    """
+    import json
+
+    store = default_store()
+    try:
+        if store.payload(name) is not None:
+            return store.read(name, default)
+    except SaveError:
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            value = json.load(f)
+    except (OSError, ValueError):
+        return default
+    store.stage(name, encode_value(value))
+    try:
+        store.write()
+        os.replace(path, f"{path}.migrated")
+    except OSError:
+        pass
+    return value
+
+
+# ============================================================
+# AUTOSAVE
+# ============================================================
+
+AUTOSAVE = [False]
+
+
+def enable_autosave(on=True):
+    AUTOSAVE[0] = on
+
+
+def autosave(warrior, reason):
+    """
+    Scene-boundary hook: "battle" / "rest" (after a won fight), "merchant",
+    "crafter", or "run_over" (the run ended — nothing left to continue).
+    Cheap no-op unless enable_autosave() was called.
+    """
+    if not AUTOSAVE[0] or warrior is None:
+        return
+    store = default_store()
+    if reason == "run_over":
+        store.drop("run")
+    else:
+        store.stage("run", encode_run(warrior, reason))
+    if store.dirty:
+        queue_write(store)
+
+
+def is_save_file(path):
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(SAVE_MAGIC)) == SAVE_MAGIC
+    except OSError:
+        return False
+
+
+def load_game(path=None):
+    """
+    Load the run section of a save and put it into the running game the
+    same way a snapshot restore does. Returns the warrior, or None if the
+    save holds no run to continue.
+    """
+    import combat_log
+    import snapshot
+
+    with open(path or SAVE_FILE, "rb") as f:
+        payload = section_payload(parse_sections(f.read()), "run")
+    if payload is None:
+        return None
+    state = decode_run(payload)
+    return snapshot.restore_snapshot({
+        "version":       snapshot.SNAPSHOT_VERSION,
+        "warrior":       state["warrior"],
+        "difficulty":    state.get("difficulty") or "warrior",
+        "combat_detail": state.get("combat_detail") or "summary",
+        "rng":           random.getstate(),
+        "combat_log":    [],
+        "battle_stats":  dict(combat_log._battle_stats),
+        "run_stats":     state.get("run_stats") or {},
+        "session":       state.get("session") or {},
+    })
@@ -0,0 +1,454 @@
+"""
+scene_engine.py — Scene scripts for the story, and the interpreter that plays them
+----------------------------------------------------------------------------------
+Narrative used to be Python: hundreds of lines of print(wrap(...)) /
+space() / continue_text() per chapter, all compiled at import whether the
+player ever reached them or not. Each chapter now lives in
+scenes/<chapter>.scene and is parsed the first time it is played.
+
+Script format (one command per line; "#" lines are comments):
+
+    scene prologue.forest          start a scene — IDs are what skip /
+                                   start / fast-forward refer to
+    clear                          clear_screen()
+    space [n]                      blank line(s)
+    continue                       "Press Enter to continue..."
+    say <text>                     print(wrap(text))
+    print <text>                   print(text), unwrapped
+    set <var> <text>               a scene variable
+    choice <var> <a,b,..> <text>   ask until one of the options is typed
+                                   (the first option is the fast-forward
+                                   answer); the answer goes in <var>
+    ask <var> <a,b,..> <text>      choice, with the prompt wrapped like say
+    roll <var> <dice>              e.g. 1d20 or 1d6+1d8+6 — one
+                                   random.randint(1, sides) per die, left
+                                   to right; the total goes in <var>
+    wait <seconds>                 a dramatic pause (skipped when fast)
+    action <name>                  run a Python action registered by the
+                                   game (inventory, stats — not narrative)
+    if <cond> / elif <cond> / else / end
+    goto <scene id>
+    stop                           end the chapter here
+
+  <text> runs on over following lines that start with "+", joined with
+  one space. Text that needs exact whitespace or newlines is written as
+  a JSON string instead: say "\\nTwo  spaces\\n". {name} placeholders are
+  filled from the scene variables, then the hero's attributes ({name},
+  {sex}, ...); write {{ }} for literal braces.
+
+  <cond> is  flag <story flag> | seen <trainer_seen key> |
+             <var or hero attr> <op> <value>  with <op> one of == !=
+             (compared as text) or < <= > >= (as numbers) — optionally
+             prefixed by "not".
+
+Playing: play(chapter, warrior, io, start=None, skip=(), fast=False,
+vars=None). `io` supplies the screen and the prompts (see SceneIO), so
+the game, the headless harness and a fast-forward all run the same
+script. A chapter plays from `start` until a stop (or its last scene), so
+one file can hold several entry points; vars seeds the scene variables
+(e.g. a payout the caller already knows). fast=True prints nothing and
+asks nothing — choices take their first option, and rolls and actions
+still run, so the hero ends up exactly as a player who went through
+would (bar their choices). SKIP_SCENES / FAST_FORWARD let a
+headless run skip scenes by ID or fast-forward everything.
+"""
+
+import contextlib
+import io as _io
+import json
+import os
+import random
+import time
+
+
+SCENES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenes")
+
+# Headless knobs: scene IDs to skip outright, and fast-forward for all play().
+SKIP_SCENES = set()
+FAST_FORWARD = [False]
+
+_chapters = {}             # chapter name -> parsed chapter (loaded on first play)
+
+
+class SceneError(Exception):
+    """A scene script that can't be parsed or played."""
+
+
+# ============================================================
+# PARSER
+# ============================================================
+# A chapter parses to [(scene_id, [op, ...]), ...]. Ops are tuples:
+#   ("clear",)  ("space", n)  ("continue",)  ("say", text)  ("print", text)
+#   ("set", var, text)  ("choice", var, [options], text)  ("ask", ...)
+#   ("roll", var, [sides or -constant, ...])  ("wait", seconds)  ("action", name)
+#   ("if", [(cond, [ops]), ...], [else ops])  ("goto", id)  ("stop",)
+# A cond is (negate, kind, name, value) with kind "flag", "seen" or an
+# operator from _COMPARE.
+
+_TEXT_COMMANDS = {"say", "print"}
+_COMPARE = {
+    "==": None, "!=": None,             # text
+    "<": float.__lt__, "<=": float.__le__, ">": float.__gt__, ">=": float.__ge__,
+}
+
+
+def _text(raw, where):
+    """The text of a command: JSON string if written as one, else as-is."""
+    if raw.startswith('"'):
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = None
+        if isinstance(value, str):
+            return value
+    return raw
+
+
+def _cond(words, where):
+    negate = False
+    if words and words[0] == "not":
+        negate, words = True, words[1:]
+    if len(words) == 2 and words[0] in ("flag", "seen"):
+        return (negate, words[0], words[1], None)
+    if len(words) == 3 and words[1] in _COMPARE:
+        if _COMPARE[words[1]] is not None:
+            try:
+                float(words[2])
+            except ValueError:
+                raise SceneError(f"{where}: {words[1]} needs a number, got {words[2]!r}") from None
+        return (negate, words[1], words[0], words[2])
+    raise SceneError(f"{where}: can't read condition {' '.join(words)!r}")
+
+
+def _dice(text, where):
+    """'1d6+1d8+6' -> [6, 8, -6]: sides per die, constants negated."""
+    terms = []
+    for term in text.replace(" ", "").split("+"):
+        count, d, sides = term.partition("d")
+        try:
+            if d:
+                terms += [int(sides)] * int(count or 1)
+            else:
+                terms.append(-int(term))
+        except ValueError:
+            raise SceneError(f"{where}: can't read dice {text!r}") from None
+    return terms
+
+
+def _logical_lines(source, name):
+    """(line number, text) with "+" continuation lines folded in."""
+    lines = []
+    for number, line in enumerate(source.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("+"):
+            if not lines:
+                raise SceneError(f"{name}:{number}: continuation with nothing to continue")
+            lines[-1][1] += " " + stripped[1:].strip()
+            continue
+        lines.append([number, stripped])
+    return lines
+
+
+def parse(source, name="<scene>"):
+    """Scene script text -> [(scene_id, ops), ...]."""
+    scenes = []
+    stack = []                 # open if blocks: [branches, else_ops or None, target]
+    ops = None
+
+    def target():
+        if stack:
+            block = stack[-1]
+            return block[1] if block[1] is not None else block[0][-1][1]
+        return ops
+
+    for number, line in _logical_lines(source, name):
+        where = f"{name}:{number}"
+        cmd, _, rest = line.partition(" ")
+        rest = rest.strip()
+        if cmd == "scene":
+            if stack:
+                raise SceneError(f"{where}: scene {rest!r} starts inside an open if")
+            ops = []
+            scenes.append((rest, ops))
+            continue
+        if ops is None:
+            raise SceneError(f"{where}: {cmd!r} before the first scene")
+        if cmd == "if":
+            block = [[(_cond(rest.split(), where), [])], None]
+            target().append(("if", block[0], block))
+            stack.append(block)
+        elif cmd in ("elif", "else", "end"):
+            if not stack:
+                raise SceneError(f"{where}: {cmd} without if")
+            block = stack[-1]
+            if cmd == "elif":
+                block[0].append((_cond(rest.split(), where), []))
+            elif cmd == "else":
+                block[1] = []
+            else:
+                stack.pop()
+        elif cmd in ("clear", "continue", "stop"):
+            target().append((cmd,))
+        elif cmd == "space":
+            target().append(("space", int(rest or 1)))
+        elif cmd in _TEXT_COMMANDS:
+            target().append((cmd, _text(rest, where)))
+        elif cmd == "set":
+            var, _, text = rest.partition(" ")
+            target().append(("set", var, _text(text.strip(), where)))
+        elif cmd in ("choice", "ask"):
+            parts = rest.split(" ", 2)
+            if len(parts) != 3:
+                raise SceneError(f"{where}: {cmd} needs a variable, options and a prompt")
+            target().append((cmd, parts[0], parts[1].split(","), _text(parts[2], where)))
+        elif cmd == "roll":
+            var, _, dice = rest.partition(" ")
+            target().append(("roll", var, _dice(dice, where)))
+        elif cmd == "wait":
+            target().append(("wait", float(rest or 1)))
+        elif cmd in ("action", "goto"):
+            target().append((cmd, rest))
+        else:
+            raise SceneError(f"{where}: unknown command {cmd!r}")
+    if stack:
+        raise SceneError(f"{name}: if without end")
+    return [(sid, _resolve(ops)) for sid, ops in scenes]
+
+
+def _resolve(ops):
+    """Turn the parser's mutable if blocks into ("if", branches, else_ops)."""
+    out = []
+    for op in ops:
+        if op[0] == "if":
+            block = op[2]
+            out.append(("if", [(cond, _resolve(body)) for cond, body in block[0]],
+                        _resolve(block[1] or [])))
+        else:
+            out.append(op)
+    return out
+
+
+def load_chapter(chapter):
+    """The parsed chapter, read from scenes/<chapter>.scene on first use."""
+    parsed = _chapters.get(chapter)
+    if parsed is None:
+        path = os.path.join(SCENES_DIR, f"{chapter}.scene")
+        with open(path, encoding="utf-8") as f:
+            parsed = _chapters[chapter] = parse(f.read(), f"{chapter}.scene")
+    return parsed
+
+
+def scene_ids(chapter):
+    return [sid for sid, _ in load_chapter(chapter)]
+
+
+def iter_texts(ops):
+    """Every wrapped text (say, ask) in `ops`, including inside branches
+    (for text_bundle.py)."""
+    for op in ops:
+        if op[0] == "say":
+            yield op[1]
+        elif op[0] == "ask":
+            yield op[3]
+        elif op[0] == "if":
+            for _, body in op[1]:
+                yield from iter_texts(body)
+            yield from iter_texts(op[2])
+
+
+# ============================================================
+# INTERPRETER
+# ============================================================
+
+class SceneIO:
+    """
+    What a script can do to the screen. The game passes one built from
+    its own clear_screen / wrap / continue_text / check; the defaults
+    here are plain print() and input().
+    """
+
+    def clear(self):
+        pass
+
+    def space(self, n):
+        for _ in range(n):
+            print()
+
+    def pause(self):
+        input("\nPress Enter to continue...\n")
+
+    def say(self, text):
+        print(text)
+
+    def print(self, text):
+        print(text)
+
+    def choose(self, prompt, options):
+        while True:
+            answer = input(prompt).strip().lower()
+            if answer in options:
+                return answer
+
+    def ask(self, prompt, options):
+        return self.choose(prompt, options)
+
+    def wait(self, seconds):
+        time.sleep(seconds)
+
+
+class _Silent(SceneIO):
+    """fast-forward: nothing shown, nothing asked."""
+
+    def space(self, n):
+        pass
+
+    def pause(self):
+        pass
+
+    def say(self, text):
+        pass
+
+    def print(self, text):
+        pass
+
+    def choose(self, prompt, options):
+        return options[0]
+
+    def wait(self, seconds):
+        pass
+
+
+class _Lookup(dict):
+    """format_map() source: scene variables, then the hero's attributes."""
+
+    def __init__(self, variables, warrior):
+        super().__init__(variables)
+        self.warrior = warrior
+
+    def __missing__(self, key):
+        if hasattr(self.warrior, key):
+            return getattr(self.warrior, key)
+        raise SceneError(f"unknown placeholder {{{key}}}")
+
+
+class _Goto(Exception):
+    def __init__(self, scene_id):
+        self.scene_id = scene_id
+
+
+class _Stop(Exception):
+    pass
+
+
+class Runner:
+    """Plays scenes for one warrior. `actions`: name -> fn(warrior, runner)."""
+
+    def __init__(self, warrior, io, actions=None, fast=False):
+        self.warrior = warrior
+        self.fast = fast
+        self.io = _Silent() if fast else io
+        self.actions = actions or {}
+        self.vars = {}
+
+    def fill(self, text):
+        if "{" not in text:
+            return text
+        return text.format_map(_Lookup(self.vars, self.warrior))
+
+    def value(self, name):
+        if name in self.vars:
+            return self.vars[name]
+        return getattr(self.warrior, name, None)
+
+    def test(self, cond):
+        negate, kind, name, value = cond
+        if kind == "flag":
+            result = name in (getattr(self.warrior, "story_flags", None) or ())
+        elif kind == "seen":
+            result = name in (getattr(self.warrior, "trainer_seen", None) or ())
+        elif _COMPARE[kind] is None:
+            result = (str(self.value(name)) == value) == (kind == "==")
+        else:
+            try:
+                result = _COMPARE[kind](float(self.value(name)), float(value))
+            except (TypeError, ValueError):
+                raise SceneError(f"{name} = {self.value(name)!r} is not a number") from None
+        return result != negate
+
+    def run_ops(self, ops):
+        io = self.io
+        for op in ops:
+            kind = op[0]
+            if kind == "say":
+                io.say(self.fill(op[1]))
+            elif kind == "space":
+                io.space(op[1])
+            elif kind == "continue":
+                io.pause()
+            elif kind == "clear":
+                io.clear()
+            elif kind == "print":
+                io.print(self.fill(op[1]))
+            elif kind == "if":
+                for cond, body in op[1]:
+                    if self.test(cond):
+                        self.run_ops(body)
+                        break
+                else:
+                    self.run_ops(op[2])
+            elif kind == "set":
+                self.vars[op[1]] = self.fill(op[2])
+            elif kind == "choice":
+                self.vars[op[1]] = io.choose(self.fill(op[3]), op[2])
+            elif kind == "ask":
+                self.vars[op[1]] = io.ask(self.fill(op[3]), op[2])
+            elif kind == "roll":
+                self.vars[op[1]] = sum(random.randint(1, t) if t > 0 else -t for t in op[2])
+            elif kind == "wait":
+                io.wait(op[1])
+            elif kind == "action":
+                fn = self.actions.get(op[1])
+                if fn is None:
+                    raise SceneError(f"unknown action {op[1]!r}")
+                if self.fast:               # actions may print ("Equipped: ...")
+                    with contextlib.redirect_stdout(_io.StringIO()):
+                        fn(self.warrior, self)
+                else:
+                    fn(self.warrior, self)
+            elif kind == "goto":
+                raise _Goto(op[1])
+            elif kind == "stop":
+                raise _Stop()
+
+    def play(self, scenes, start=None, skip=()):
+        index = {sid: i for i, (sid, _) in enumerate(scenes)}
+        if start is not None and start not in index:
+            raise SceneError(f"no scene {start!r}")
+        i = index[start] if start is not None else 0
+        while i < len(scenes):
+            sid, ops = scenes[i]
+            i += 1
+            if sid in skip or sid in SKIP_SCENES:
+                continue
+            try:
+                self.run_ops(ops)
+            except _Goto as jump:
+                if jump.scene_id not in index:
+                    raise SceneError(f"goto unknown scene {jump.scene_id!r}") from None
+                i = index[jump.scene_id]
+            except _Stop:
+                break
+        return self.vars
+
+
+def play(chapter, warrior, io=None, actions=None, start=None, skip=(), fast=False, vars=None):
+    """
+    Play a chapter (loading it if this is the first time). Returns the
+    scene variables it set. See the module docs for start / skip / fast /
+    vars.
+    """
+    runner = Runner(warrior, io or SceneIO(), actions, fast=fast or FAST_FORWARD[0])
+    runner.vars.update(vars or {})
+    return runner.play(load_chapter(chapter), start=start, skip=skip)
@@ -16,6 +16,7 @@ Contains:
   * Base classes        (Equipment, Creator, Monster, Hero)
 """
 
+import functools
 import textwrap
 import os
 import random
@@ -74,15 +75,29 @@ def space(line=1):
         print()
 
 
+# v0.7.21: wrap() is memoised per (text, width) and, on a miss, first
+# looks in the pre-wrapped text bundle (see text_bundle.py) — cinematics
+# re-wrap the same story paragraphs every time they are shown.
+WRAP_OPTIONS = {"break_long_words": False, "replace_whitespace": False}
+WRAP_CACHE_SIZE = 2048
+
+
+def fill(text, width=WIDTH):
+    """textwrap.fill with the game's options — uncached (text must be a str)."""
+    return textwrap.fill(text, width=width, **WRAP_OPTIONS)
+
+
+@functools.lru_cache(maxsize=WRAP_CACHE_SIZE)
+def _wrap_cached(text, width):
+    from text_bundle import lookup
+    wrapped = lookup(text, width)
+    return wrapped if wrapped is not None else fill(text, width)
+
+
 def wrap(text, width=WIDTH):
     if not isinstance(text, str):
         text = str(text)
-    return textwrap.fill(
-        text,
-        width=width,
-        break_long_words=False,
-        replace_whitespace=False,
-    )
+    return _wrap_cached(text, width)
 
 
 # v0.7.18: hook injected by the main file (see its injection block) so dev
@@ -0,0 +1,328 @@
+"""
+snapshot.py — Session snapshot / restore for Journey to Winter Haven
+--------------------------------------------------------------------
+There is no save system yet, so a dropped connection on the hosted build
+used to lose the whole run, and a session could never be moved to another
+worker during a deploy. This module captures the COMPLETE session state in
+one blob and puts it back just as fast:
+
+  - the Warrior (every status field, potions, skills, titles, flags,
+    per_fight_scores, inventory + equipment with nested sockets)
+  - merchant / crafter stock for the current interlude
+  - the global `random` state, so the next roll after a restore is the
+    same roll the player would have seen
+  - combat log + run/battle stat accumulators
+  - difficulty / combat-detail settings
+  - the current scene position (see SESSION below)
+
+Format: one pickle (highest protocol) of a plain dict. Pickle keeps shared
+references intact — a stock item and the same item sitting in inventory
+stay the same object after restore — and both directions take well under
+a few milliseconds for a late-game hero with a hundred-odd items.
+Snapshots are trusted server-side data; never load one from a player.
+
+Scene position:
+    Scenes call mark_scene() at their boundaries (end of the prologue,
+    start of each arena round, entering the quarters interlude, after a
+    merchant/crafter visit, just before the final boss). That records
+    where the run is AND keeps a snapshot of that boundary in memory, so
+    on a disconnect the last clean boundary can be written out
+    (write_last_boundary) instead of a half-finished fight.
+
+Warm-start checkpoints:
+    The latest snapshot of each named boundary (post_prologue,
+    arena_round_<n>, arena_quarters, finale) is also kept for the rest of
+    the process, across runs. "Play again" uses post_prologue to skip the
+    thousands of prompts of the opening story, and the test harness
+    restores them instead of replaying the opening for every case.
+
+Public API:
+    mark_scene(scene, warrior=None, **extra)   — record a scene boundary
+    reset_session()                            — fresh-run SESSION state
+    take_snapshot(warrior)                     — dict of the full state
+    restore_snapshot(snap)                     — apply it, returns warrior
+    dumps(snap) / loads(blob)                  — bytes <-> snapshot dict
+    save_snapshot(path, warrior) / load_snapshot(path)
+    write_last_boundary(path)                  — persist last boundary
+    checkpoint(name) / checkpoint_names()      — warm-start snapshots (bytes)
+    warm_start(name)                           — new run from a checkpoint
+    save_checkpoints(path) / load_checkpoints(path)
+"""
+
+import os
+import pickle
+import random
+import sys
+import time
+
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAGIC   = b"JTWHSNAP"
+
+SNAPSHOT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "session.snap")
+
+
+class SnapshotError(Exception):
+    """Raised when a blob isn't a snapshot, or is from an unknown version."""
+
+
+# ============================================================
+# SCENE POSITION
+# ============================================================
+# Where the session currently is. Only boundaries the game can resume
+# from are recorded:
+#   "main_menu"       — nothing to resume
+#   "post_prologue"   — the prologue is over, the rest of the intro is next
+#   "arena_round"     — about to fight round `round_num`
+#   "arena_quarters"  — in the round 4-5 interlude hub (stock persists)
+#   "finale"          — about to face the final boss of `path` ("good" /
+#                       "evil"), after the Fallen Warrior's moral choice
+
+def _fresh_session():
+    return {
+        "scene":          "main_menu",
+        "round_num":      0,
+        "rounds_to_win":  5,
+        "defeated_names": [],
+        "merchant_stock": None,
+        "crafter_stock":  None,
+        "path":           None,
+    }
+
+
+SESSION = _fresh_session()
+
+# Serialised snapshot of the most recent scene boundary (None before the
+# first one). Kept as bytes so later mutation of the live warrior can't
+# leak into it.
+_last_boundary = [None]
+
+# Checkpoint name -> serialised snapshot. Unlike _last_boundary these
+# outlive reset_session(): they are what the next run warm-starts from.
+_checkpoints = {}
+
+
+def reset_session():
+    """Called at the start of every run so nothing leaks from the last one."""
+    SESSION.clear()
+    SESSION.update(_fresh_session())
+    _last_boundary[0] = None
+
+
+def _checkpoint_name(scene):
+    if scene == "arena_round":
+        return f"arena_round_{SESSION.get('round_num', 0)}"
+    return scene
+
+
+def mark_scene(scene, warrior=None, **extra):
+    """
+    Record a scene boundary. Any keyword args are stored on SESSION too
+    (round_num, defeated_names, merchant_stock, ...). When `warrior` is
+    given, a snapshot of this boundary is kept for write_last_boundary().
+    """
+    previous = _checkpoint_name(SESSION["scene"])
+    SESSION["scene"] = scene
+    SESSION.update(extra)
+    if warrior is not None:
+        _last_boundary[0] = dumps(take_snapshot(warrior))
+        # A checkpoint is the moment a scene is *entered* — later marks of
+        # the same scene (merchant / crafter visits) don't replace it.
+        name = _checkpoint_name(scene)
+        if name != previous:
+            _checkpoints[name] = _last_boundary[0]
+
+
+# ============================================================
+# CAPTURE / RESTORE
+# ============================================================
+
+def _current_settings():
+    """Difficulty + combat detail as the running game sees them."""
+    main = sys.modules.get("__main__")
+    combat = sys.modules.get("combat")
+    difficulty = getattr(main, "DIFFICULTY", None) or getattr(combat, "DIFFICULTY", "warrior")
+    detail = getattr(combat, "COMBAT_DETAIL", "summary") if combat else "summary"
+    return difficulty, detail
+
+
+def take_snapshot(warrior):
+    """Capture the full session state as a plain dict (see module docs)."""
+    import combat_log
+
+    difficulty, detail = _current_settings()
+    return {
+        "version":       SNAPSHOT_VERSION,
+        "taken_at":      time.time(),
+        "warrior":       warrior,
+        "difficulty":    difficulty,
+        "combat_detail": detail,
+        "rng":           random.getstate(),
+        "combat_log":    list(combat_log.COMBAT_LOG),
+        "battle_stats":  dict(combat_log._battle_stats),
+        "run_stats":     dict(combat_log._run_stats),
+        "session":       dict(SESSION),
+    }
+
+
+def _set_game_warrior(warrior):
+    """Point every module that caches GAME_WARRIOR at the restored hero."""
+    for name in ("__main__", "jtwh_main", "combat"):
+        mod = sys.modules.get(name)
+        if mod is not None and hasattr(mod, "GAME_WARRIOR"):
+            mod.GAME_WARRIOR = warrior
+    story = sys.modules.get("story")
+    if story is not None and hasattr(story, "_set_gw"):
+        story._set_gw(warrior)
+
+
+def _set_difficulty(difficulty, detail):
+    for name in ("__main__", "jtwh_main", "combat", "debug"):
+        mod = sys.modules.get(name)
+        if mod is not None and hasattr(mod, "DIFFICULTY"):
+            mod.DIFFICULTY = difficulty
+    for name in ("__main__", "jtwh_main", "combat"):
+        mod = sys.modules.get(name)
+        if mod is not None and hasattr(mod, "COMBAT_DETAIL"):
+            mod.COMBAT_DETAIL = detail
+
+
+def restore_snapshot(snap):
+    """
+    Put a snapshot back into the running game and return its warrior.
+    Everything is applied in place (COMBAT_LOG, stat dicts, SESSION) so
+    modules holding references to those objects see the restored data.
+    """
+    import combat_log
+
+    if not isinstance(snap, dict) or snap.get("version") != SNAPSHOT_VERSION:
+        version = snap.get("version") if isinstance(snap, dict) else None
+        raise SnapshotError(f"unsupported snapshot version: {version!r}")
+
+    warrior = snap["warrior"]
+    random.setstate(snap["rng"])
+
+    combat_log.COMBAT_LOG[:] = snap["combat_log"]
+    combat_log._battle_stats.update(snap["battle_stats"])
+    combat_log._run_stats.update(snap["run_stats"])
+
+    SESSION.clear()
+    SESSION.update(_fresh_session())
+    SESSION.update(snap["session"])
+
+    warrior.difficulty = snap["difficulty"]
+    _set_difficulty(snap["difficulty"], snap["combat_detail"])
+    _set_game_warrior(warrior)
+    _last_boundary[0] = dumps(snap)
+    return warrior
+
+
+# ============================================================
+# SERIALISATION
+# ============================================================
+
+def dumps(snap):
+    """Snapshot dict -> bytes (magic header + pickle)."""
+    return SNAPSHOT_MAGIC + pickle.dumps(snap, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def loads(blob):
+    """bytes -> snapshot dict. Raises SnapshotError on a foreign blob."""
+    if not blob.startswith(SNAPSHOT_MAGIC):
+        raise SnapshotError("not a Journey to Winter Haven snapshot")
+    try:
+        return pickle.loads(blob[len(SNAPSHOT_MAGIC):])
+    except Exception as e:
+        raise SnapshotError(f"corrupt snapshot: {e}") from e
+
+
+def _write_atomic(path, blob):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save_snapshot(path, warrior):
+    """Capture the current state and write it to `path` atomically."""
+    _write_atomic(path, dumps(take_snapshot(warrior)))
+
+
+def load_snapshot(path):
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def write_last_boundary(path=SNAPSHOT_FILE):
+    """
+    Persist the snapshot taken at the most recent scene boundary. Returns
+    True if one existed. Used when the player's connection drops — the
+    resumed run starts from that boundary, never from mid-fight.
+    """
+    blob = _last_boundary[0]
+    if blob is None:
+        return False
+    try:
+        _write_atomic(path, blob)
+    except OSError:
+        return False
+    return True
+
+
+# ============================================================
+# WARM-START CHECKPOINTS
+# ============================================================
+
+def checkpoint(name):
+    """The latest snapshot (bytes) taken at checkpoint `name`, or None."""
+    return _checkpoints.get(name)
+
+
+def checkpoint_names():
+    return sorted(_checkpoints)
+
+
+def clear_checkpoints():
+    _checkpoints.clear()
+
+
+def warm_start(name, keep_settings=True, keep_rng=True):
+    """
+    Start a new run from checkpoint `name` of an earlier run: the hero
+    exactly as it was there, but (by default) with the difficulty and
+    combat detail the player just picked and the RNG left where it is,
+    so the new run doesn't re-roll the old one. Returns the warrior, or
+    None when there is no such checkpoint.
+    """
+    blob = _checkpoints.get(name)
+    if blob is None:
+        return None
+    difficulty, detail = _current_settings()
+    rng = random.getstate()
+    warrior = restore_snapshot(loads(blob))
+    if keep_rng:
+        random.setstate(rng)
+    if keep_settings:
+        warrior.difficulty = difficulty
+        _set_difficulty(difficulty, detail)
+    return warrior
+
+
+def save_checkpoints(path):
+    """Write every checkpoint to one file (for a later process to warm-start)."""
+    _write_atomic(path, SNAPSHOT_MAGIC + pickle.dumps(
+        {"version": SNAPSHOT_VERSION, "checkpoints": dict(_checkpoints)},
+        protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load_checkpoints(path):
+    """Merge the checkpoints saved by save_checkpoints(); returns their names."""
+    with open(path, "rb") as f:
+        data = loads(f.read())
+    if data.get("version") != SNAPSHOT_VERSION or "checkpoints" not in data:
+        raise SnapshotError("not a checkpoint file")
+    _checkpoints.update(data["checkpoints"])
+    return sorted(data["checkpoints"])
@@ -0,0 +1,457 @@
+"""
+socket_planner.py — Best socket layout for the gear you're wearing
+------------------------------------------------------------------
+Sacs, tusks, Soul Pendants, cured pelts and Reinforcement Crystals all fit
+sockets at SOCKET_POWER_RATIO, and a player with a few of each plus a
+socketed weapon and chest piece faces a lot of combinations — a Fire Sac
+is burst damage in the weapon but burn resistance in the armor, only the
+first tusk / pendant in armor does anything, and same-element sacs don't
+stack.
+
+plan(warrior, objective) finds the best layout for the two socket hosts
+that actually work in combat:
+
+    weapon   hero.get_weapon() — the only weapon whose socket procs fire
+    armor    the equipped chest armor
+
+Every other socketed weapon / armor piece (bag gear, a second hand) is a
+source only: its contents can be pulled out (SOCKET_OPERATION_COST each,
+same as the menus) and reused. The equipped accessory is left alone.
+
+Values come straight from the crafter's own readers: a host's contents are
+scored by running get_weapon_socket_procs / armor_socket_stat_bonus /
+armor_socket_resistance on a stand-in holding them, memoised per
+(host kind, contents) — copies with the same name, rarity and stats are
+interchangeable, so those calls run once per distinct combination.
+OBJECTIVES weighs the effects:
+
+    "burst"        expected socket damage per hit, ATK, retaliation bleed
+    "sustain"      heal per hit dealt / taken, DEF, HP
+    "resistance"   poison + fire + acid resistance, then DEF and HP
+
+Search: each host's layouts (multisets up to its socket count) are listed
+best-first; a branch-and-bound over the hosts takes the best pair that the
+owned copies can cover, ties -> least gold. Plans the player can't afford
+are skipped, so keeping the current layout (0g) is always a candidate.
+
+apply_plan(warrior, plan) carries it out in one go: one gold charge, every
+removal and insert, live stat deltas for worn armor.
+"""
+
+from types import SimpleNamespace
+
+
+OBJECTIVES = {
+    # effect weights; effects not listed count OTHER_WEIGHT so a spare
+    # socket still takes something useful
+    "burst":      {"hit_damage": 1.0, "atk": 1.0, "retaliation": 0.5},
+    "sustain":    {"hit_heal": 1.0, "ward_heal": 1.0, "defence": 1.0, "max_hp": 0.25},
+    "resistance": {"resist": 10.0, "defence": 0.5, "max_hp": 0.1},
+}
+OTHER_WEIGHT = 0.05
+
+EFFECTS = ("hit_damage", "hit_heal", "atk", "defence", "max_hp", "max_ap",
+           "resist", "retaliation", "ward_heal")
+
+_ELEMENTS = ("poison", "fire", "acid")
+_TUSKS = ("Javelina Tusk", "Sharpened Tusk")
+
+# Stats that tell two copies of a socketable apart
+_SIG_FIELDS = ("element", "element_damage", "element_turns", "bleed_turns",
+               "bleed_dmg_min", "bleed_dmg_max", "drain_bonus", "drain_heal_min",
+               "drain_heal_max", "defence", "max_hp")
+
+
+def _crafter():
+    import crafter
+    return crafter
+
+
+def _sig(item):
+    return (item.name, item.rarity) + tuple(getattr(item, f, None) for f in _SIG_FIELDS)
+
+
+# ============================================================
+# EVALUATION
+# ============================================================
+
+_host_cache = {}
+
+
+def _avg(lo, hi):
+    return (lo + hi) / 2.0
+
+
+def _weapon_effects(items):
+    crafter = _crafter()
+    out = dict.fromkeys(EFFECTS, 0.0)
+    for proc in crafter.get_weapon_socket_procs(SimpleNamespace(sockets=list(items))):
+        chance = proc.get("chance", 1.0)
+        if proc["type"] == "element":
+            out["hit_damage"] += chance * proc["damage"] * max(1, proc["turns"] or 1)
+        elif proc["type"] == "bleed":
+            out["hit_damage"] += chance * _avg(proc["dmg_min"], proc["dmg_max"]) * proc["turns"]
+        elif proc["type"] == "drain":
+            out["hit_damage"] += proc["bonus"]
+            out["hit_heal"] += _avg(proc["heal_min"], proc["heal_max"])
+    return out
+
+
+def _first(items, names):
+    return next((it for it in items if it.name in names), None)
+
+
+def _armor_effects(items):
+    """Mirrors combat._tusk_retaliation / _soul_pendant_armor_heal for the
+    combat-time effects: only the first tusk and first pendant count."""
+    from equipment import JAVELINA_TUSK_STATS, SHARPENED_TUSK_STATS, SOUL_PENDANT_STATS
+    crafter = _crafter()
+    ratio = crafter.SOCKET_POWER_RATIO
+    probe = SimpleNamespace(sockets=list(items))
+    out = dict.fromkeys(EFFECTS, 0.0)
+    d, h, a, k = crafter.armor_socket_stat_bonus(probe)
+    out.update(defence=d, max_hp=h, max_ap=a, atk=k)
+    out["resist"] = sum(crafter.armor_socket_resistance(probe, el) for el in _ELEMENTS)
+
+    tusk = _first(items, _TUSKS)
+    if tusk is not None:
+        table = JAVELINA_TUSK_STATS if tusk.name == "Javelina Tusk" else SHARPENED_TUSK_STATS
+        stats = table.get(tusk.rarity) or {}
+        if stats.get("bleed_turns", 0) > 0:
+            lo = max(1, int(stats["bleed_dmg_min"] * ratio))
+            hi = max(lo, int(stats["bleed_dmg_max"] * ratio))
+            out["retaliation"] = _avg(lo, hi) * stats["bleed_turns"]
+
+    pendant = _first(items, ("Soul Pendant",))
+    if pendant is not None:
+        stats = SOUL_PENDANT_STATS.get(pendant.rarity)
+        if stats:
+            lo = max(1, int(stats["drain_heal_min"] * ratio))
+            hi = max(lo, int(stats["drain_heal_max"] * ratio))
+            out["ward_heal"] = _avg(lo, hi)
+    return out
+
+
+def host_effects(kind, items):
+    """Effect totals for a "weapon" / "armor" host holding `items` (in
+    socket order). Memoised on the contents."""
+    key = (kind, tuple(_sig(it) for it in items))
+    hit = _host_cache.get(key)
+    if hit is None:
+        fn = _weapon_effects if kind == "weapon" else _armor_effects
+        hit = _host_cache[key] = fn(items)
+    return hit
+
+
+def objective_value(effects, objective):
+    weights = OBJECTIVES[objective]
+    return sum(effects[e] * weights.get(e, OTHER_WEIGHT) for e in EFFECTS)
+
+
+# ============================================================
+# SEARCH
+# ============================================================
+
+def _hosts(warrior):
+    """[(kind, item)] — the worn hosts whose sockets work in combat."""
+    out = []
+    weapon = warrior.get_weapon()
+    if weapon is not None and weapon.socket_count() > 0:
+        out.append(("weapon", weapon))
+    armor = warrior.equipment.get("armor")
+    if armor is not None and getattr(armor, "slot", None) == "armor" and armor.socket_count() > 0:
+        out.append(("armor", armor))
+    return out
+
+
+def _sources(warrior, hosts):
+    """(bag socketables, [(holder, socket idx, item)] in other gear)."""
+    from inventory_index import bag as _bag
+    crafter = _crafter()
+    bag = _bag(warrior).named(*(crafter.SOCKETABLE_INTO_WEAPON | crafter.SOCKETABLE_INTO_ARMOR))
+    worn = {id(item) for _, item in hosts}
+    holders = [item for _, item in crafter._weapons_with_sockets_in_inventory(warrior)]
+    holders += [item for _, item in crafter._armor_with_sockets_in_inventory(warrior)]
+    held, seen = [], set()
+    for holder in holders:
+        if id(holder) in worn or id(holder) in seen:
+            continue
+        seen.add(id(holder))
+        for i, s in enumerate(holder.sockets):
+            if s is not None:
+                held.append((holder, i, s))
+    return bag, held
+
+
+def _ordered(kind, items, objective):
+    """Socket order for a layout — best single item first, so the tusk /
+    pendant that combat reads first is the strongest one."""
+    return sorted(items, key=lambda it: -objective_value(host_effects(kind, [it]), objective))
+
+
+def _group(kind, item):
+    """Armor-side exclusivity group — only the best copy in a group does
+    anything (same-element sacs, the first tusk, the first pendant)."""
+    if kind != "armor":
+        return None
+    if item.name in ("Poison Sac", "Fire Sac", "Acid Sac"):
+        return item.element
+    if item.name in _TUSKS:
+        return "tusk"
+    if item.name == "Soul Pendant":
+        return "pendant"
+    return None
+
+
+def _layouts(kind, n, n_other, reps, counts, current, loose, objective):
+    """Every multiset of at most n sigs for a host, best value first, as
+    (value, sig tuple). `reps` maps sig -> a representative item; n_other
+    is how many sockets the other host has; `loose` holds the sigs with a
+    copy in the bag (preferred on ties — no extraction fee)."""
+    crafter = _crafter()
+    allowed = crafter.SOCKETABLE_INTO_WEAPON if kind == "weapon" else crafter.SOCKETABLE_INTO_ARMOR
+    shared = crafter.SOCKETABLE_INTO_WEAPON & crafter.SOCKETABLE_INTO_ARMOR
+    solo = {}
+    for sig, item in reps.items():
+        if item.name in allowed:
+            solo[sig] = objective_value(host_effects(kind, [item]), objective)
+    # Copies that can never make the cut: everything outside a group adds
+    # up, so only the best n copies are worth a socket here — n + n_other
+    # when the other host may claim some of them first. In a group only the
+    # best copy counts, and the other host can take at most n_other ahead
+    # of it. Whatever already sits in the host stays a candidate (keeping
+    # it is free).
+    keep, seen = set(current), {}
+    for sig in sorted(solo, key=lambda s: (-solo[s], s not in loose)):
+        item = reps[sig]
+        group = _group(kind, item)
+        if group is not None:
+            room = 1 + n_other
+        elif item.name in shared:
+            group, room = "shared", n + n_other
+        else:
+            group, room = "own", n
+        if solo[sig] > 0 and seen.get(group, 0) < room:
+            keep.add(sig)
+            seen[group] = seen.get(group, 0) + min(counts[sig], room)
+    cands = sorted(keep, key=lambda s: -solo.get(s, 0.0))
+
+    out = []
+
+    def walk(start, chosen):
+        # cands run best-first, so `chosen` is already in socket order
+        items = [reps[s] for s in chosen]
+        out.append((objective_value(host_effects(kind, items), objective), tuple(chosen)))
+        if len(chosen) == n:
+            return
+        for i in range(start, len(cands)):
+            sig = cands[i]
+            if chosen.count(sig) < counts[sig]:
+                chosen.append(sig)
+                walk(i, chosen)
+                chosen.pop()
+
+    walk(0, [])
+    out.sort(key=lambda t: -t[0])
+    return out
+
+
+def _layout_cost(hosts, layout, current, bag_counts):
+    """Gold for moving from the current layout to `layout`: one operation
+    per removal from a worn host, per insert, and per copy pulled out of
+    other gear (bag copies and copies freed from a worn host are free)."""
+    from collections import Counter
+    ops = 0
+    need, free = Counter(), Counter(bag_counts)
+    for h in range(len(hosts)):
+        want, have = Counter(layout[h]), Counter(current[h])
+        gone, new = have - want, want - have
+        ops += sum(gone.values()) + sum(new.values())
+        free.update(gone)
+        need.update(new)
+    for sig, n in need.items():
+        ops += max(0, n - free[sig])
+    return ops * _crafter().SOCKET_OPERATION_COST
+
+
+def plan(warrior, objective="burst", gold=None):
+    """
+    Best affordable socket layout for the worn weapon + chest armor.
+
+    Returns a dict:
+        objective, hosts [(kind, item)], layout / current [[item, ...] per
+        host, in socket order], value, current_value, cost, changes (# hosts
+        whose layout changes), moves [(item, from, to)] — `from` is "bag" or
+        (holder, socket idx), `to` is a host or "bag".
+    """
+    from collections import Counter
+    if objective not in OBJECTIVES:
+        raise KeyError(f"unknown objective {objective!r}")
+    gold = warrior.gold if gold is None else gold
+    hosts = _hosts(warrior)
+    bag, held = _sources(warrior, hosts)
+
+    reps, counts = {}, Counter()
+    current = []
+    for _, item in hosts:
+        row = []
+        for s in item.sockets:
+            if s is not None:
+                reps.setdefault(_sig(s), s)
+                row.append(_sig(s))
+        counts.update(row)
+        current.append(tuple(sorted(row)))
+    bag_counts = Counter(_sig(it) for it in bag)
+    held_counts = Counter(_sig(it) for _, _, it in held)
+    for it in bag + [it for _, _, it in held]:
+        reps.setdefault(_sig(it), it)
+    counts.update(bag_counts)
+    counts.update(held_counts)
+
+    total = sum(item.socket_count() for _, item in hosts)
+    options = [_layouts(kind, item.socket_count(), total - item.socket_count(),
+                        reps, counts, current[h], bag_counts, objective)
+               for h, (kind, item) in enumerate(hosts)]
+    # optimistic value of the hosts after h (ignores shared copies)
+    rest = [0.0] * (len(hosts) + 1)
+    for h in range(len(hosts) - 1, -1, -1):
+        rest[h] = rest[h + 1] + options[h][0][0]
+
+    best = {"key": None, "layout": None}
+
+    def key(value, cost):
+        return (round(value, 9), -cost)
+
+    def walk(h, value, chosen, left):
+        if h == len(hosts):
+            cost = _layout_cost(hosts, chosen, current, bag_counts)
+            if cost > gold:
+                return
+            k = key(value, cost)
+            if best["key"] is None or k > best["key"]:
+                best["key"], best["layout"] = k, list(chosen)
+            return
+        for val, sigs in options[h]:
+            if best["key"] is not None and round(value + val + rest[h + 1], 9) < best["key"][0]:
+                break  # best-first: nothing further down can catch up
+            use = Counter(sigs)
+            if any(left[s] < n for s, n in use.items()):
+                continue
+            chosen.append(sigs)
+            walk(h + 1, value + val, chosen, left - use)
+            chosen.pop()
+
+    walk(0, 0.0, [], counts)
+
+    layout_sigs = best["layout"] if best["layout"] is not None else current
+    layout = _concrete(warrior, hosts, layout_sigs, bag, held, objective)
+    cur_items = [[s for s in item.sockets if s is not None] for _, item in hosts]
+    value = sum(objective_value(host_effects(kind, layout[h]["items"]), objective)
+                for h, (kind, _) in enumerate(hosts))
+    current_value = sum(objective_value(host_effects(kind, _ordered(kind, cur_items[h], objective)),
+                                        objective)
+                        for h, (kind, _) in enumerate(hosts))
+    return {
+        "objective": objective,
+        "hosts": hosts,
+        "layout": [row["items"] for row in layout],
+        "current": cur_items,
+        "moves": [m for row in layout for m in row["moves"]],
+        "value": value,
+        "current_value": current_value,
+        "cost": _layout_cost(hosts, layout_sigs, current, bag_counts),
+        "changes": sum(1 for h in range(len(hosts)) if tuple(sorted(layout_sigs[h])) != current[h]),
+    }
+
+
+def _concrete(warrior, hosts, layout_sigs, bag, held, objective):
+    """Turn per-host sig multisets into real copies: keep what already sits
+    in place, then draw bag copies, copies freed from worn hosts, and only
+    then copies in other gear."""
+    from collections import Counter, defaultdict
+    pool = defaultdict(list)
+    for it in bag:
+        pool[_sig(it)].append((it, "bag"))
+    rows, freed = [], []
+    for h, (kind, item) in enumerate(hosts):
+        want = Counter(layout_sigs[h])
+        kept = []
+        for i, s in enumerate(item.sockets):
+            if s is None:
+                continue
+            if want[_sig(s)] > 0:
+                want[_sig(s)] -= 1
+                kept.append(s)
+            else:
+                freed.append((s, (item, i)))
+        rows.append({"kind": kind, "host": item, "kept": kept, "want": want})
+    for s, where in freed:
+        pool[_sig(s)].append((s, where))
+    for holder, i, s in held:
+        pool[_sig(s)].append((s, (holder, i)))
+
+    out = []
+    for row in rows:
+        items, moves = list(row["kept"]), []
+        for sig, n in row["want"].items():
+            for _ in range(n):
+                it, where = pool[sig].pop(0)
+                items.append(it)
+                moves.append((it, where, row["host"]))
+        out.append({"items": _ordered(row["kind"], items, objective), "moves": moves})
+    # copies pulled out of a worn host and not reused go back to the bag
+    placed = {id(it) for row in out for it in row["items"]}
+    for s, where in freed:
+        if id(s) not in placed:
+            out[-1]["moves"].append((s, where, "bag"))
+    return out
+
+
+# ============================================================
+# APPLY
+# ============================================================
+
+def apply_plan(warrior, socket_plan):
+    """
+    Carry out a plan from plan() as one transaction: a single gold charge,
+    then every move. Returns False (nothing touched) if the player can't
+    afford it or the gear changed since it was planned.
+    """
+    crafter = _crafter()
+    cost = socket_plan["cost"]
+    if warrior.gold < cost:
+        return False
+    for it, where, _ in socket_plan["moves"]:
+        if where == "bag":
+            if it not in warrior.inventory:
+                return False
+        elif where[0].sockets[where[1]] is not it:
+            return False
+    armor = warrior.equipment.get("armor")
+    before = crafter.armor_socket_stat_bonus(armor) if armor is not None else None
+
+    if cost:
+        from gold import spend_gold
+        spend_gold(warrior, cost)
+    for it, where, _ in socket_plan["moves"]:
+        if where == "bag":
+            warrior.inventory.remove(it)
+        else:
+            where[0].sockets[where[1]] = None
+    for (_, host), items in zip(socket_plan["hosts"], socket_plan["layout"]):
+        host.sockets = list(items) + [None] * (host.socket_count() - len(items))
+    for it, _, to in socket_plan["moves"]:
+        if to == "bag":
+            warrior.inventory.append(it)
+
+    if armor is not None:
+        after = crafter.armor_socket_stat_bonus(armor)
+        d_def, d_hp, d_ap, d_atk = (a - b for a, b in zip(after, before))
+        crafter._apply_equipped_armor_socket_delta(warrior, armor, d_def, d_hp)
+        if d_atk:
+            warrior.min_atk += d_atk
+            warrior.max_atk += d_atk
+        if d_ap:
+            warrior.max_ap = max(1, warrior.max_ap + d_ap)
+            warrior.ap = min(max(0, warrior.ap + max(0, d_ap)), warrior.max_ap)
+    return True
@@ -0,0 +1,309 @@
+"""
+spans.py — Turn-level instrumentation and Chrome/Perfetto trace export
+----------------------------------------------------------------------
+Answers "where does a hosted turn spend its time?" without a sampling
+profiler. Off by default; while off nothing is wrapped and the few hooks
+left in combat.py are one function call and a flag check each.
+
+When enabled (--profile on the main script or jtwh_test.py) it records:
+
+  battle          one combat.battle() call
+  player_turn     a player turn, from the turn header to the next phase
+  enemy_turn      an enemy turn, ditto (both carry turn + enemy args)
+  dot_ticks       combat.collect_dot_ticks
+  render.bar      ui_bars HP/AP/SP bar rendering
+  render.wrap     shared.wrap
+  input_wait      time blocked in input() — the player, or the auto-player
+  loot            equipment.make_loot
+  scoring         score.record_fight_score
+
+Turns are "phases" rather than `with` blocks: the turn bodies in
+battle_inner are hundreds of lines with returns and continues all over,
+so a phase simply ends when the next one begins (or the fight exits).
+The function-level spans are installed by swapping wrappers into every
+game module that holds a reference to the function, and removed again by
+disable() — so a disabled build runs the original functions untouched.
+
+Output (write_trace): Chrome trace-event JSON, loadable in
+chrome://tracing or https://ui.perfetto.dev. Per-span aggregates
+(count, total, mean, p50/p90/p99, max — all ms) go in "otherData" and
+are printed by print_stats(), so two versions can be compared turn by
+turn or in aggregate.
+
+Public API:
+    enable(label=None) / disable()      — start / stop recording
+    span(name, **args)                  — context manager
+    phase(name, **args)                 — end the open phase, start another
+    stats()                             — {span: aggregate dict}
+    write_trace(path)                   — dump the trace JSON
+    start_profile(path, label=None)     — enable now, write + print at exit
+"""
+
+import atexit
+import builtins
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+TRACE_FILE = "jtwh_profile.trace.json"
+MAX_EVENTS = 500_000           # stop keeping raw events past this (aggregates continue)
+
+# (module, attribute, span name) — wrapped while profiling is on.
+INSTRUMENTED = [
+    ("combat",    "collect_dot_ticks",  "dot_ticks"),
+    ("ui_bars",   "_render",            "render.bar"),
+    ("shared",    "wrap",               "render.wrap"),
+    ("builtins",  "input",              "input_wait"),
+    ("equipment", "make_loot",          "loot"),
+    ("score",     "record_fight_score", "scoring"),
+]
+
+_GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_ON = [False]
+_clock = time.perf_counter_ns
+_origin = [0]
+_label = [None]
+_events = []                   # (name, start_ns, dur_ns, tid, args)
+_durations = {}                # name -> [dur_ns, ...]
+_dropped = [0]
+_lock = threading.Lock()
+_phase = threading.local()     # .open = (name, start_ns, args) | None
+_patched = []                  # (owner, attr, original) to restore
+
+_NULL = contextlib.nullcontext()
+
+
+# ============================================================
+# RECORDING
+# ============================================================
+
+def _record(name, start, end, args=None):
+    dur = end - start
+    tid = threading.get_ident()
+    with _lock:
+        _durations.setdefault(name, []).append(dur)
+        if len(_events) < MAX_EVENTS:
+            _events.append((name, start, dur, tid, args))
+        else:
+            _dropped[0] += 1
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args or None
+        self.start = 0
+
+    def __enter__(self):
+        self.start = _clock()
+        return self
+
+    def __exit__(self, *exc):
+        _record(self.name, self.start, _clock(), self.args)
+        return False
+
+
+def span(name, **args):
+    """`with span("loot"):` — a no-op shared context while profiling is off."""
+    if not _ON[0]:
+        return _NULL
+    return _Span(name, args)
+
+
+def phase(name, **args):
+    """
+    Close this thread's open phase (if any) and, unless `name` is None,
+    open a new one. Used for the player / enemy turns in battle_inner.
+    """
+    if not _ON[0]:
+        return
+    now = _clock()
+    cur = getattr(_phase, "open", None)
+    if cur is not None:
+        _record(cur[0], cur[1], now, cur[2])
+    _phase.open = (name, now, args or None) if name is not None else None
+
+
+def _traced(fn, name):
+    @functools.wraps(fn)
+    def traced(*a, **k):
+        start = _clock()
+        try:
+            return fn(*a, **k)
+        finally:
+            _record(name, start, _clock())
+    traced._span_original = fn
+    return traced
+
+
+# ============================================================
+# ENABLE / DISABLE
+# ============================================================
+
+def _game_modules():
+    """builtins plus every loaded module that lives in the game folder."""
+    yield builtins
+    for mod in list(sys.modules.values()):
+        path = getattr(mod, "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == _GAME_DIR:
+            yield mod
+
+
+def _install():
+    mods = list(_game_modules())
+    for mod_name, attr, name in INSTRUMENTED:
+        try:
+            owner = builtins if mod_name == "builtins" else __import__(mod_name)
+        except ImportError:
+            continue
+        original = getattr(owner, attr, None)
+        if original is None or hasattr(original, "_span_original"):
+            continue
+        wrapper = _traced(original, name)
+        # `from shared import wrap` etc. copied the function into each
+        # importer, so swap every reference, not just the defining one.
+        for mod in mods:
+            for key, value in list(vars(mod).items()):
+                if value is original:
+                    setattr(mod, key, wrapper)
+                    _patched.append((mod, key, original))
+
+
+def _uninstall():
+    while _patched:
+        mod, key, original = _patched.pop()
+        current = getattr(mod, key, None)
+        if getattr(current, "_span_original", None) is original:
+            setattr(mod, key, original)
+
+
+def enable(label=None):
+    """Start a fresh recording. `label` (e.g. the game build) goes in the trace."""
+    if _ON[0]:
+        disable()
+    with _lock:
+        _events.clear()
+        _durations.clear()
+        _dropped[0] = 0
+    _origin[0] = _clock()
+    _label[0] = label
+    _install()
+    _ON[0] = True
+
+
+def disable():
+    """Stop recording (closing this thread's phase) and unwrap everything."""
+    if not _ON[0]:
+        return
+    phase(None)
+    _ON[0] = False
+    _uninstall()
+
+
+def enabled():
+    return _ON[0]
+
+
+# ============================================================
+# OUTPUT
+# ============================================================
+
+def _pct(sorted_vals, q):
+    """Nearest-rank percentile of an already-sorted list."""
+    if not sorted_vals:
+        return 0
+    k = max(0, min(len(sorted_vals) - 1, int(-(-q * len(sorted_vals) // 100)) - 1))
+    return sorted_vals[k]
+
+
+def stats():
+    """{span name: {count, total_ms, mean_ms, p50_ms, p90_ms, p99_ms, max_ms}}"""
+    with _lock:
+        snapshot = {name: sorted(vals) for name, vals in _durations.items()}
+    out = {}
+    for name, vals in sorted(snapshot.items()):
+        total = sum(vals)
+        out[name] = {
+            "count":    len(vals),
+            "total_ms": total / 1e6,
+            "mean_ms":  total / len(vals) / 1e6,
+            "p50_ms":   _pct(vals, 50) / 1e6,
+            "p90_ms":   _pct(vals, 90) / 1e6,
+            "p99_ms":   _pct(vals, 99) / 1e6,
+            "max_ms":   vals[-1] / 1e6,
+        }
+    return out
+
+
+def trace_document():
+    pid = os.getpid()
+    origin = _origin[0]
+    with _lock:
+        events = list(_events)
+        dropped = _dropped[0]
+    trace = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+              "args": {"name": _label[0] or "Journey To Winter Haven"}}]
+    for name, start, dur, tid, args in events:
+        ev = {"name": name, "cat": name.split(".", 1)[0], "ph": "X", "pid": pid,
+              "tid": tid, "ts": (start - origin) / 1000, "dur": dur / 1000}
+        if args:
+            ev["args"] = args
+        trace.append(ev)
+    return {
+        "traceEvents": trace,
+        "displayTimeUnit": "ms",
+        "otherData": {"label": _label[0], "dropped_events": dropped, "spans": stats()},
+    }
+
+
+def write_trace(path=TRACE_FILE):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(trace_document(), f, separators=(",", ":"), default=str)
+    os.replace(tmp, path)
+    return path
+
+
+def print_stats(file=None):
+    file = file or sys.stderr
+    rows = stats()
+    if not rows:
+        print("profile: no spans recorded", file=file)
+        return
+    width = max(len(n) for n in rows)
+    print(f"\n{'span':<{width}}  {'count':>7}  {'total ms':>10}  {'p50':>8}  "
+          f"{'p90':>8}  {'p99':>8}  {'max':>8}", file=file)
+    for name, s in rows.items():
+        print(f"{name:<{width}}  {s['count']:>7}  {s['total_ms']:>10.1f}  {s['p50_ms']:>8.3f}  "
+              f"{s['p90_ms']:>8.3f}  {s['p99_ms']:>8.3f}  {s['max_ms']:>8.3f}", file=file)
+
+
+def finish_profile(path=TRACE_FILE):
+    """Stop, write the trace and print the per-span table (stderr)."""
+    if not _ON[0] and not _durations:
+        return None
+    disable()
+    try:
+        write_trace(path)
+    except OSError as e:
+        print(f"profile: couldn't write {path}: {e}", file=sys.stderr)
+        path = None
+    print_stats()
+    if path:
+        print(f"profile: trace written to {path} (open in https://ui.perfetto.dev)",
+              file=sys.stderr)
+    return path
+
+
+def start_profile(path=TRACE_FILE, label=None):
+    """Enable now; write the trace and print the table when the process exits."""
+    enable(label)
+    atexit.register(finish_profile, path)
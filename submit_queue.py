@@ -0,0 +1,264 @@
+"""
+submit_queue.py — Background global-leaderboard submission with an offline spool
+--------------------------------------------------------------------------------
+Submitting a run used to be a blocking urlopen (5 s timeout) on the
+end-of-run screen, and a failed POST silently dropped the score. Now:
+
+  - submit(payload) appends the score to an append-only spool file
+    (fsync'd) and hands it to a background worker — it returns at once
+  - the worker POSTs it; success appends a "done" record to the spool
+  - a network error / 5xx / 429 appends a "retry" record with the next
+    attempt time, backing off exponentially (BACKOFF_BASE doubling up to
+    BACKOFF_MAX, with jitter so a kiosk full of clients doesn't stampede)
+  - a 4xx the server will never accept is recorded as "rejected" and not
+    retried
+  - on the next launch start() replays the spool and queues everything
+    still pending; once nothing is pending the spool is compacted away
+
+Spool format — one JSON object per line:
+    {"op": "add",    "sid": ..., "payload": {...}, "queued_at": t}
+    {"op": "retry",  "sid": ..., "attempts": n, "next_try": t}
+    {"op": "done",   "sid": ...}
+    {"op": "rejected", "sid": ..., "status": code}
+A torn last line (power cut mid-append) is ignored on replay.
+
+The spool is per install; two game processes sharing one install can
+both retry the same pending score on launch (the board may then show it
+twice — never zero times).
+
+Public API:
+    start()              — replay the spool, start the worker (game launch)
+    submit(payload)      — spool + queue one score payload
+    pending()            — spooled scores not yet delivered
+    drain(timeout)       — wait for the in-flight queue (tests / exit)
+"""
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+
+
+SPOOL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "leaderboard_spool.jsonl")
+
+BACKOFF_BASE = 30.0            # seconds before the first retry
+BACKOFF_MAX  = 6 * 60 * 60     # never wait longer than this between tries
+EXIT_GRACE   = 2.0             # at exit, give an in-flight POST this long
+
+# Status codes worth retrying. Every other 4xx is the server saying no.
+_RETRYABLE_4XX = {408, 425, 429}
+
+
+# ============================================================
+# SPOOL
+# ============================================================
+
+_spool_lock = threading.Lock()
+
+
+def _append(record, path=None):
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _spool_lock:
+        with open(path or SPOOL_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _replay(path=None):
+    """Spool -> {sid: {"payload", "queued_at", "attempts", "next_try"}} still pending."""
+    pending = {}
+    try:
+        with open(path or SPOOL_FILE, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return pending
+    for line in lines:
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            continue                    # torn write — the add never finished
+        sid = rec.get("sid")
+        op = rec.get("op")
+        if op == "add":
+            pending[sid] = {"payload": rec.get("payload") or {},
+                            "queued_at": rec.get("queued_at", 0),
+                            "attempts": 0, "next_try": 0.0}
+        elif op == "retry" and sid in pending:
+            pending[sid]["attempts"] = rec.get("attempts", 0)
+            pending[sid]["next_try"] = rec.get("next_try", 0.0)
+        elif op in ("done", "rejected"):
+            pending.pop(sid, None)
+    return pending
+
+
+def _compact(path=None):
+    """Rewrite the spool with only what's still pending (atomic)."""
+    path = path or SPOOL_FILE
+    with _spool_lock:
+        pending = _replay(path)
+        if not pending:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for sid, item in pending.items():
+                f.write(json.dumps({"op": "add", "sid": sid, "payload": item["payload"],
+                                    "queued_at": item["queued_at"]},
+                                   separators=(",", ":")) + "\n")
+                if item["attempts"]:
+                    f.write(json.dumps({"op": "retry", "sid": sid,
+                                        "attempts": item["attempts"],
+                                        "next_try": item["next_try"]},
+                                       separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+
+def pending(path=None):
+    return _replay(path)
+
+
+# Jitter has its own generator: the worker thread must never draw from the
+# game's global `random`, or a failed POST would shift every roll after it
+# and a recorded run (replay.py) would no longer replay.
+_jitter = random.Random()
+
+
+def backoff_delay(attempts, rng=None):
+    """Seconds to wait after `attempts` failed tries (1-based), with jitter."""
+    rng = rng or _jitter
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** max(0, attempts - 1)))
+    return delay * rng.uniform(0.5, 1.0)
+
+
+# ============================================================
+# WORKER
+# ============================================================
+# Items on the queue are (sid, payload, attempts). The worker handles one
+# at a time; anything that fails goes back in the spool with its next
+# try time and is picked up again on a later launch (or later this
+# session, if the game is still running when it comes due).
+
+_queue = queue.Queue()
+_worker = [None]
+_busy = [False]
+_idle = threading.Event()       # only ever waited on with a timeout
+
+# The function that actually talks to the server: payload -> True on
+# success, or an int HTTP status / None (network error) on failure.
+# leaderboard.py installs its Supabase POST here.
+_post = [None]
+
+
+def set_poster(fn):
+    _post[0] = fn
+
+
+def _classify(result):
+    if result is True:
+        return "done"
+    if isinstance(result, int) and 400 <= result < 500 and result not in _RETRYABLE_4XX:
+        return "rejected"
+    return "retry"
+
+
+def _deliver(sid, payload, attempts):
+    poster = _post[0]
+    try:
+        result = poster(payload) if poster else None
+    except Exception:
+        result = None
+    outcome = _classify(result)
+    try:
+        if outcome == "done":
+            _append({"op": "done", "sid": sid})
+        elif outcome == "rejected":
+            _append({"op": "rejected", "sid": sid, "status": result})
+        else:
+            attempts += 1
+            delay = backoff_delay(attempts)
+            _append({"op": "retry", "sid": sid, "attempts": attempts,
+                     "next_try": time.time() + delay})
+            _schedule(sid, payload, attempts, delay)
+    except OSError:
+        pass                        # spool unwritable — the add is still there
+    return outcome
+
+
+def _schedule(sid, payload, attempts, delay):
+    """Retry later this session too, if the game is still open by then."""
+    t = threading.Timer(delay, _queue.put, args=((sid, payload, attempts),))
+    t.daemon = True
+    t.start()
+
+
+def _worker_loop():
+    while True:
+        sid, payload, attempts = _queue.get()
+        _busy[0] = True
+        try:
+            _deliver(sid, payload, attempts)
+        finally:
+            _busy[0] = False
+            _queue.task_done()
+
+
+def _ensure_worker():
+    if _worker[0] is None:
+        _worker[0] = threading.Thread(target=_worker_loop, name="jtwh-submit", daemon=True)
+        _worker[0].start()
+        atexit.register(drain, EXIT_GRACE)
+
+
+def start():
+    """
+    Game launch: compact the spool, then queue every pending score that is
+    due (the rest get a timer for when they are). Safe to call twice.
+    """
+    if _worker[0] is not None:
+        return
+    try:
+        _compact()
+    except OSError:
+        pass
+    _ensure_worker()
+    now = time.time()
+    for sid, item in _replay().items():
+        wait = item["next_try"] - now
+        if wait <= 0:
+            _queue.put((sid, item["payload"], item["attempts"]))
+        else:
+            _schedule(sid, item["payload"], item["attempts"], wait)
+
+
+def submit(payload):
+    """
+    Spool a score payload and queue it for the worker. Never blocks on the
+    network. Returns the submission id.
+    """
+    sid = uuid.uuid4().hex
+    try:
+        _append({"op": "add", "sid": sid, "payload": payload, "queued_at": time.time()})
+    except OSError:
+        pass                        # no spool — still try this session
+    _ensure_worker()
+    _queue.put((sid, payload, 0))
+    return sid
+
+
+def drain(timeout=EXIT_GRACE):
+    """Wait (up to `timeout`) for queued submissions to be attempted."""
+    deadline = time.monotonic() + timeout
+    while (_queue.unfinished_tasks or _busy[0]) and time.monotonic() < deadline:
+        _idle.wait(0.02)
+    return not (_queue.unfinished_tasks or _busy[0])
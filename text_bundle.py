@@ -0,0 +1,178 @@
+"""
+text_bundle.py — Pre-wrapped narrative text for shared.wrap()
+-------------------------------------------------------------
+Most of what the game passes to wrap() is fixed story and flavour text
+(story.py, the arena, the boss cutscenes), and the cinematics wrap it
+paragraph after paragraph. shared.wrap() keeps an LRU cache, so a string
+is only wrapped once per process; this bundle removes that first wrap
+too, by doing it at build time.
+
+Build step (run before packaging; re-run when the story text changes):
+
+    python text_bundle.py            # writes text_bundle.bin next to the game
+
+It parses every game module, finds each wrap("literal", width) call whose
+text and width are constants — plus every `say` line and `ask` prompt
+in the scene scripts (scenes/*.scene) that has no placeholders — and
+stores the wrapped result. At runtime the bundle is loaded lazily — on
+the first wrap() cache miss — and a missing, stale or damaged bundle
+simply means wrap() does the work itself. Entries are keyed by the exact text and width, so an edited
+string just misses; the wrap options are stored in the header and a
+bundle built with different ones is ignored.
+
+File format: b"JTWHTXT1" + zlib(JSON {"options": ..., "texts": {width: {text: wrapped}}}).
+"""
+
+import ast
+import glob
+import json
+import os
+import sys
+import zlib
+
+
+BUNDLE_MAGIC = b"JTWHTXT1"
+BUNDLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "text_bundle.bin")
+
+_GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_loaded = [None]           # {width: {text: wrapped}} once loaded ({} if unusable)
+
+
+# ============================================================
+# RUNTIME
+# ============================================================
+
+def _options():
+    """The wrap options the bundle must have been built with."""
+    from shared import WRAP_OPTIONS
+    return dict(WRAP_OPTIONS)
+
+
+def load(path=None):
+    """The bundle's texts, loading them on first use. Never raises."""
+    if _loaded[0] is not None and path is None:
+        return _loaded[0]
+    texts = {}
+    try:
+        with open(path or BUNDLE_FILE, "rb") as f:
+            blob = f.read()
+        if blob.startswith(BUNDLE_MAGIC):
+            doc = json.loads(zlib.decompress(blob[len(BUNDLE_MAGIC):]).decode("utf-8"))
+            if doc.get("options") == _options():
+                texts = {int(w): t for w, t in doc["texts"].items()}
+    except (OSError, ValueError, KeyError, zlib.error, UnicodeDecodeError, AttributeError):
+        texts = {}
+    _loaded[0] = texts
+    return texts
+
+
+def lookup(text, width):
+    """Pre-wrapped `text` at `width`, or None."""
+    by_width = load().get(width)
+    return by_width.get(text) if by_width else None
+
+
+def reset():
+    """Forget the loaded bundle (tests, or after rebuilding it)."""
+    _loaded[0] = None
+
+
+# ============================================================
+# BUILD
+# ============================================================
+
+def _game_sources():
+    for path in sorted(glob.glob(os.path.join(_GAME_DIR, "*.py"))):
+        name = os.path.basename(path)
+        if name.startswith("jtwh_") or name == "text_bundle.py":
+            continue                # test / bench tooling, not the game
+        yield path
+
+
+def _width_of(call, default):
+    """The constant width of a wrap() call, or None if it's computed."""
+    node = call.args[1] if len(call.args) > 1 else None
+    for kw in call.keywords:
+        if kw.arg == "width":
+            node = kw.value
+    if node is None:
+        return default
+    if isinstance(node, ast.Constant) and isinstance(node.value, int):
+        return node.value
+    if isinstance(node, ast.Name) and node.id == "WIDTH":
+        return default
+    return None
+
+
+def _scene_texts(width):
+    """{(text, width)} for each placeholder-free say / ask in scenes/*.scene."""
+    import scene_engine
+    found = set()
+    for path in sorted(glob.glob(os.path.join(scene_engine.SCENES_DIR, "*.scene"))):
+        chapter = os.path.splitext(os.path.basename(path))[0]
+        try:
+            scenes = scene_engine.load_chapter(chapter)
+        except (OSError, scene_engine.SceneError):
+            continue
+        for _, ops in scenes:
+            found.update((text, width) for text in scene_engine.iter_texts(ops)
+                         if "{" not in text)
+    return found
+
+
+def static_texts(paths=None):
+    """{(text, width)} for every wrap() call with a literal text and width."""
+    from shared import WIDTH
+    found = set() if paths else _scene_texts(WIDTH)
+    for path in paths or _game_sources():
+        with open(path, encoding="utf-8") as f:
+            try:
+                tree = ast.parse(f.read(), filename=path)
+            except SyntaxError:
+                continue
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and node.args):
+                continue
+            func = node.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if name != "wrap":
+                continue
+            text = node.args[0]
+            if not (isinstance(text, ast.Constant) and isinstance(text.value, str)):
+                continue            # f-strings and variables are wrapped at runtime
+            width = _width_of(node, WIDTH)
+            if width is not None:
+                found.add((text.value, width))
+    return found
+
+
+def build(path=BUNDLE_FILE):
+    """Pre-wrap every static narrative string; returns (entries, bytes written)."""
+    import shared
+    texts = {}
+    for text, width in sorted(static_texts()):
+        texts.setdefault(str(width), {})[text] = shared.fill(text, width)
+    doc = {"options": _options(), "texts": texts}
+    blob = BUNDLE_MAGIC + zlib.compress(
+        json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(blob)
+    os.replace(tmp, path)
+    reset()
+    return sum(len(t) for t in texts.values()), len(blob)
+
+
+def _main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Build the pre-wrapped text bundle.")
+    parser.add_argument("--out", default=BUNDLE_FILE)
+    args = parser.parse_args(argv)
+    entries, size = build(args.out)
+    print(f"text bundle: {entries} texts pre-wrapped -> {args.out} ({size / 1024:.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,327 @@
+"""
+win_odds.py — How likely is the hero to win this fight, and how long will it take
+--------------------------------------------------------------------------------
+estimate(hero, enemy) → {"win": P(win), "turns": expected hero turns,
+"method": "exact" | "sim"}, computed once per matchup and kept in TABLE,
+keyed by fight_key() — the hero's and the enemy's fight-relevant stats
+(vitals, attack range, defence, gear down to each socket's rarity and
+stats, skills, titles, statuses). TABLE keeps the TABLE_SIZE most
+recently used matchups.
+Both sides are left exactly as they were.
+
+Two ways to get the number:
+
+  exact   a plain exchange: the enemy has no special left to use (out of AP
+          or none assigned), nobody carries a status, and the hero's gear
+          has no procs, sockets or set bonus. Then the fight is a Markov
+          chain over (hero HP, enemy HP, berserk phase) — the 50/50
+          initiative, the weapon / dual-wield roll, Brawl Master,
+          adrenaline by HP tier, Berserk at 10% and both sides'
+          apply_defence all follow the combat code — and solve() gives the
+          probability and mean length with no dice at all.
+  sim     everything else (specials, DoTs, procs, titles that tick):
+          SIM_RUNS headless fights (fight_sim.run) on scratch copies, in a
+          sandbox seeded from the key so the same matchup always gives the
+          same answer and the run's own dice are never touched.
+
+Boss fights run scripted flows on top of battle_inner and get no estimate
+(None).
+
+odds_line() is the one-liner the arena and the debug monster select print.
+"""
+
+import zlib
+
+
+SIM_RUNS = 100              # ~0.1 s once per matchup, then cached
+SIM_POLICY = "attack"
+EXACT_MAX_HP = 150          # recursion depth is ~2 frames per turn
+EXACT_MAX_CELLS = 40000     # hero HP × enemy HP the solver will walk
+
+TABLE = {}                  # fight_key -> estimate dict, least recently used first
+TABLE_SIZE = 1024
+SHOW_ODDS = [True]          # mutable flag: the pre-fight odds line
+
+
+# ============================================================
+# KEY
+# ============================================================
+
+_HERO_FIELDS = (
+    "hp", "max_hp", "min_atk", "max_atk", "defence", "acid_defence_loss", "ap",
+    "total_special", "perm_special", "max_rage", "equipment_bonus_damage",
+    "brawl_master_atk_mult", "war_cry_turns", "war_cry_bonus",
+    "berserk_active", "berserk_turns", "berserk_used",
+    "death_defier", "death_defier_active", "death_defier_used",
+    "poison_active", "poison_turns", "bleed_turns", "blind_turns", "blind_type",
+    "is_blinded", "is_paralyzed", "paralyzed", "turn_stop", "paralyze_turns",
+    "paralyze_vulnerable", "drown_stacks", "psychic_debuff_turns",
+    "chimera_weakened_turns", "last_turn_skipped",
+)
+_ENEMY_FIELDS = (
+    "name", "variant_title", "level", "tier", "hp", "max_hp", "min_atk", "max_atk",
+    "defence", "acid_defence_loss", "ap", "rounds_in_combat", "flayed_charges",
+    "poison_active", "poison_turns", "bleed_turns", "blind_turns", "skip_turns",
+    "defence_break_turns", "psychic_exposed", "shield_equipped",
+    "chimera_atk_reduction",
+)
+_LIST_FIELDS = ("poison_dots", "burns", "acid_stacks", "warrior_bleed_dots", "rot_stacks")
+
+
+def _fields(obj, names):
+    return tuple(getattr(obj, name, None) for name in names) + tuple(
+        len(getattr(obj, name, None) or ()) for name in _LIST_FIELDS)
+
+
+_SCALARS = (int, float, str, bool, type(None))
+
+
+def _item(item):
+    """An item's plain stats (name and rarity among them), sockets included."""
+    if item is None:
+        return None
+    stats = tuple(sorted((k, v) for k, v in vars(item).items() if isinstance(v, _SCALARS)))
+    return stats, tuple(_item(s) for s in (getattr(item, "sockets", None) or ()))
+
+
+def _gear(hero):
+    return tuple((slot, _item(item)) for slot, item in sorted(hero.equipment.items())
+                 if item is not None)
+
+
+def fight_key(hero, enemy):
+    """Everything about the pair that can change how the fight goes."""
+    return (
+        _fields(hero, _HERO_FIELDS),
+        _gear(hero),
+        tuple(sorted(getattr(hero, "skill_ranks", {}).items())),
+        tuple(sorted(getattr(hero, "titles", ()))),
+        _fields(enemy, _ENEMY_FIELDS),
+        getattr(getattr(enemy, "special_move", None), "__name__", None),
+    )
+
+
+# ============================================================
+# EXACT SOLVER
+# ============================================================
+
+_READY, _USED = 0, 3        # berserk phases; 2 and 1 = active, attacks left
+_TICKING_TITLES = ("charismatic_speaker", "combat_medic", "armor_piercer")
+_PROC_FIELDS = ("proc_chance", "blind_chance", "rot_chance", "bleed_turns",
+                "paralyze_chance", "element", "drain_bonus")
+
+
+def _quiet(entity, names):
+    return not any(getattr(entity, name, None) for name in names + _LIST_FIELDS)
+
+
+def _plain_item(item):
+    return (item is None
+            or not (any(getattr(item, f, None) for f in _PROC_FIELDS) or any(getattr(item, "sockets", None) or ())))
+
+
+def exact_ok(hero, enemy):
+    """Is this fight a plain exchange of basic attacks (see module doc)?"""
+    import fight_sim
+    from crafter import pack_hunter_active, apex_predator_active
+    from ui import _cjr_rock
+    if not fight_sim.supported(enemy) or getattr(enemy, "tier", 1) >= 5:
+        return False
+    if enemy.ap > 0 and callable(getattr(enemy, "special_move", None)):
+        return False
+    if hasattr(enemy, "flayed_charges") or not _quiet(enemy, (
+            "poison_active", "bleed_turns", "blind_turns", "skip_turns", "acid_defence_loss",
+            "defence_break_turns", "psychic_exposed", "shield_equipped", "chimera_atk_reduction")):
+        return False
+    if not _quiet(hero, (
+            "poison_active", "bleed_turns", "blind_turns", "is_blinded", "is_paralyzed",
+            "paralyzed", "turn_stop", "paralyze_vulnerable", "acid_defence_loss", "drown_stacks",
+            "psychic_debuff_turns", "chimera_weakened_turns", "war_cry_turns", "berserk_active",
+            "rot_max_hp_loss")):
+        return False
+    if hero.death_defier and hero.death_defier_active and not hero.death_defier_used:
+        return False
+    if set(getattr(hero, "titles", ())) & set(_TICKING_TITLES):
+        return False
+    if not all(_plain_item(item) for item in hero.equipment.values()):
+        return False
+    if pack_hunter_active(hero) or apex_predator_active(hero) or _cjr_rock(hero):
+        return False
+    return min(hero.hp, enemy.hp) <= EXACT_MAX_HP and hero.hp * enemy.hp <= EXACT_MAX_CELLS
+
+
+def _after_defence(damage, defender, halve=False):
+    """shared.Creator.apply_defence's arithmetic (no acid loss — exact_ok)."""
+    if halve:
+        damage = max(1, damage // 2)
+    actual = max(1, damage - max(0, defender.defence))
+    if defender.defence < 0:
+        actual += max(1, round(actual * abs(defender.defence) * 0.10))
+    return actual
+
+
+def _roll_pmf(hero):
+    """The hero's basic-attack roll after Brawl Master, as {roll: p}."""
+    import math
+    from combat import DUAL_WIELDER_ATK_PCT
+    from equipment import get_main_hand_only_atk, get_off_hand_only_atk
+    main, off = hero.equipment.get("main_hand"), hero.equipment.get("off_hand")
+    dual = all(item is not None and getattr(item, "slot", None) == "weapon" for item in (main, off))
+    if dual:
+        lo, hi = get_main_hand_only_atk(hero)
+        olo, ohi = get_off_hand_only_atk(hero)
+        rank = hero.skill_ranks.get("dual_wielder", 0)
+        pct = DUAL_WIELDER_ATK_PCT.get(rank, 0.0)
+        rolls = []
+        for r in range(lo, max(lo, hi) + 1):
+            for o in range(olo, max(olo, ohi) + 1):
+                total = r + (o // 2 if rank == 0 else o)
+                if pct:
+                    total = math.ceil(total * (1 + pct))
+                rolls.append(max(1, total))
+    else:
+        rolls = list(range(hero.min_atk, max(hero.min_atk, hero.max_atk) + 1))
+    bm = getattr(hero, "brawl_master_atk_mult", 1.0)
+    pmf = {}
+    for roll in rolls:
+        if bm != 1.0:
+            roll = max(1, int(roll * bm))
+        pmf[roll] = pmf.get(roll, 0) + 1 / len(rolls)
+    return pmf
+
+
+def _adrenaline(hero, hp):
+    """hero.compute_adrenaline_bonus at this HP, without its side effects."""
+    pct = hp / hero.max_hp
+    tier = 3 if pct <= 0.25 else 2 if pct <= 0.50 else 1 if pct <= 0.75 else 0
+    return (tier + getattr(hero, "perm_special", 0) if tier > 0 else 0) + hero.max_rage
+
+
+def solve(hero, enemy):
+    """(P(win), expected hero turns) for a fight exact_ok() accepts."""
+    import functools
+    max_hp = hero.max_hp
+    rolls = _roll_pmf(hero)
+    use_accessory = hero.get_weapon() is None and hero.equipment.get("accessory") is not None
+    equip = 0 if use_accessory else hero.equipment_bonus_damage
+    berserk_bonus = 6 + hero.max_rage
+    lo, hi = enemy.min_atk, max(enemy.min_atk, enemy.max_atk)
+
+    @functools.lru_cache(maxsize=None)
+    def hits(bonus):
+        out = {}
+        for roll, p in rolls.items():
+            d = _after_defence(roll + bonus, enemy)
+            out[d] = out.get(d, 0) + p
+        return tuple(out.items())
+
+    def taken(halve):
+        out = {}
+        for roll in range(lo, hi + 1):
+            d = _after_defence(roll, hero, halve)
+            out[d] = out.get(d, 0) + 1 / (hi - lo + 1)
+        return tuple(out.items())
+
+    enemy_hits = {False: taken(False), True: taken(True)}
+
+    def check(phase, hp):
+        """check_berserk_trigger."""
+        if phase in (1, 2):
+            return phase
+        if phase == _USED and hp / max_hp > 0.20:
+            phase = _READY
+        if phase == _READY and hp / max_hp <= 0.10:
+            return 2
+        return phase
+
+    memo = {}
+
+    def hero_turn(h, e, phase, adrenaline):
+        win = turns = 0.0
+        active = phase in (1, 2)
+        after = (_USED if phase == 1 else 1) if active else phase
+        after = check(after, h)
+        for d, p in hits(adrenaline + equip + (berserk_bonus if active else 0)):
+            if d >= e:
+                win += p
+                turns += p
+                continue
+            w, t = enemy_turn(h, e - d, after)
+            win += p * w
+            turns += p * (1 + t)
+        return win, turns
+
+    def enemy_turn(h, e, phase):
+        key = (h, e, phase)
+        if key in memo:
+            return memo[key]
+        win = turns = 0.0
+        for x, q in enemy_hits[phase in (1, 2)]:
+            if x >= h:
+                continue
+            h2 = h - x
+            w, t = hero_turn(h2, e, check(phase, h2), _adrenaline(hero, h2))
+            win += q * w
+            turns += q * t
+        memo[key] = (win, turns)
+        return win, turns
+
+    phase = _USED if getattr(hero, "berserk_used", False) else _READY
+    first_w, first_t = hero_turn(hero.hp, enemy.hp, phase, int(getattr(hero, "total_special", 0)))
+    second_w, second_t = enemy_turn(hero.hp, enemy.hp, phase)
+    return (first_w + second_w) / 2, (first_t + second_t) / 2
+
+
+# ============================================================
+# SIMULATION
+# ============================================================
+
+def simulate(hero, enemy, runs=SIM_RUNS, seed=0, policy=SIM_POLICY):
+    """(win rate, mean hero turns) over `runs` headless fights on copies."""
+    import fight_sim
+    wins = turns = 0
+    with fight_sim.sandbox(seed=seed):
+        for _ in range(runs):
+            h, e = fight_sim.scratch(hero, enemy)
+            won, taken, _ = fight_sim.run(h, e, policy)
+            wins += bool(won)
+            turns += taken
+    return wins / runs, turns / runs
+
+
+# ============================================================
+# PUBLIC
+# ============================================================
+
+def estimate(hero, enemy):
+    """Cached {"win", "turns", "method"} for this matchup; None for bosses."""
+    import fight_sim
+    if not fight_sim.supported(enemy):
+        return None
+    key = fight_key(hero, enemy)
+    if key in TABLE:
+        TABLE[key] = TABLE.pop(key)         # most recently used goes last
+        return TABLE[key]
+    if exact_ok(hero, enemy):
+        win, turns = solve(hero, enemy)
+        method = "exact"
+    else:
+        win, turns = simulate(hero, enemy, seed=zlib.crc32(repr(key).encode()))
+        method = "sim"
+    while len(TABLE) >= TABLE_SIZE:
+        del TABLE[next(iter(TABLE))]
+    TABLE[key] = {"win": win, "turns": turns, "method": method}
+    return TABLE[key]
+
+
+def odds_line(hero, enemy):
+    """"🎲 Win odds: 87% · ~6 turns", or None (boss, flag off, no hero)."""
+    if not SHOW_ODDS[0] or hero is None:
+        return None
+    try:
+        est = estimate(hero, enemy)
+    except Exception:
+        return None             # a hint must never cost the player a fight
+    if est is None:
+        return None
+    return f"🎲 Win odds: {est['win']:.0%} · ~{max(1, round(est['turns']))} turns"